@@ -21,7 +21,7 @@ from fastapi.staticfiles import StaticFiles
 from starlette.responses import Response
 from fastapi import HTTPException, status
 
-from src.common.middleware import ErrorHandlingMiddleware, LoggingMiddleware
+from src.common.middleware import ErrorHandlingMiddleware, LoggingMiddleware, SQLInstrumentationMiddleware
 from src.routes import (
     business_glossary_routes,
     catalog_commander_routes,
@@ -52,7 +52,7 @@ from src.routes import (
     projects_routes,
 )
 
-from src.common.database import init_db, get_session_factory, SQLAlchemySession
+from src.common.database import init_db, get_session_factory, SQLAlchemySession, dispose_async_engine
 from src.controller.data_products_manager import DataProductsManager
 from src.controller.data_asset_reviews_manager import DataAssetReviewManager
 from src.controller.data_contracts_manager import DataContractsManager
@@ -104,6 +104,10 @@ async def startup_event():
 # Application Shutdown Event
 async def shutdown_event():
     logger.info("Running application shutdown event...")
+    search_manager = getattr(app.state, 'search_manager', None)
+    if search_manager:
+        search_manager.stop_periodic_rebuild()
+    await dispose_async_engine()
     logger.info("Application shutdown complete.")
 
 # --- FastAPI App Instantiation (AFTER defining lifecycle functions) ---
@@ -149,6 +153,8 @@ app.add_middleware(
 # Add custom middleware
 app.add_middleware(ErrorHandlingMiddleware)
 app.add_middleware(LoggingMiddleware)
+if settings.DB_QUERY_INSTRUMENTATION_ENABLED:
+    app.add_middleware(SQLInstrumentationMiddleware, n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD)
 
 # Mount static files for the React application
 app.mount("/static", StaticFiles(directory=STATIC_ASSETS_PATH, html=True), name="static")
@@ -0,0 +1,9 @@
+"""
+Performance benchmarks for the backend.
+
+Each benchmark module is runnable on its own, e.g. from ``src/backend``::
+
+    python -m src.benchmarks.search_benchmark --sizes 10k,100k --output search.json
+
+and writes a machine-readable JSON report so results can be compared over time.
+"""
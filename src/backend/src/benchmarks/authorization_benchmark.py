@@ -0,0 +1,308 @@
+"""
+Authorization hot-path benchmark over a synthetic role/team/project estate.
+
+Builds hundreds of roles, thousands of groups and a few hundred teams and
+projects in an in-memory SQLite database, then measures per-call latency and
+allocations, cold (caches cleared before every call) and warm, for:
+
+- AuthorizationManager.get_user_effective_permissions,
+- team role override resolution (get_user_team_role_overrides),
+- project access checks (ProjectsManager.check_user_project_access),
+- PermissionChecker.__call__ end to end.
+
+A previous report can be passed as baseline; the run fails when a scenario's
+p50 latency regresses by more than the allowed fraction.
+
+Usage (from ``src/backend``)::
+
+    python -m src.benchmarks.authorization_benchmark --output auth.json
+    python -m src.benchmarks.authorization_benchmark --baseline auth.json --max-regression 0.25
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.benchmarks.utils import compare_to_baseline, environment_info, summarize_latencies, write_report
+from src.common.authorization import PermissionChecker, get_user_team_role_overrides
+from src.common.config import Settings
+from src.common.database import Base
+from src.common.features import APP_FEATURES, FeatureAccessLevel
+from src.controller.authorization_manager import AuthorizationManager
+from src.controller.projects_manager import ProjectsManager
+from src.controller.settings_manager import SettingsManager
+from src.controller.teams_manager import TeamsManager
+from src.db_models.data_domains import DataDomain  # noqa: F401 - registers the table teams reference
+from src.db_models.projects import ProjectDb, project_team_association
+from src.db_models.settings import AppRoleDb
+from src.db_models.teams import TeamDb, TeamMemberDb
+from src.models.users import UserInfo
+
+DEFAULT_ROLES = 200
+DEFAULT_GROUPS = 2000
+DEFAULT_TEAMS = 300
+DEFAULT_PROJECTS = 200
+DEFAULT_USERS = 200
+DEFAULT_CALLS = 200
+DEFAULT_SEED = 42
+
+LEVELS = [level for level in FeatureAccessLevel if level != FeatureAccessLevel.NONE]
+
+
+class AuthorizationEstate:
+    """Synthetic roles, groups, teams and projects persisted in an in-memory database."""
+
+    def __init__(self, roles: int, groups: int, teams: int, projects: int, users: int, seed: int = DEFAULT_SEED):
+        self.random = random.Random(seed)
+        self.groups = [f"group-{n}" for n in range(groups)]
+        self.role_names = [f"role-{n}" for n in range(roles)]
+        self.users = [
+            UserInfo(
+                email=f"user{n}@example.com",
+                username=f"user{n}",
+                user=f"User {n}",
+                ip=None,
+                groups=self._sample(self.groups, 5, 30),
+            )
+            for n in range(users)
+        ]
+        engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+        Base.metadata.create_all(engine, tables=[
+            table for table in Base.metadata.sorted_tables
+            if table.name in ("data_domains", "app_roles", "teams", "team_members", "projects", "project_teams")
+        ])
+        self.session: Session = sessionmaker(bind=engine, autoflush=False)()
+        self.project_ids: List[str] = []
+        self._seed_roles()
+        self._seed_teams_and_projects(teams, projects)
+        self.session.commit()
+
+    def _sample(self, population: Sequence[Any], low: int, high: int) -> List[Any]:
+        """Random sample of between low and high items, capped at the population size."""
+        high = min(high, len(population))
+        return self.random.sample(population, self.random.randint(min(low, high), high))
+
+    def _seed_roles(self) -> None:
+        feature_ids = list(APP_FEATURES)
+        for name in self.role_names:
+            permissions = {
+                feature_id: self.random.choice(LEVELS).value
+                for feature_id in self._sample(feature_ids, 3, len(feature_ids))
+            }
+            self.session.add(AppRoleDb(
+                name=name,
+                assigned_groups=json.dumps(self._sample(self.groups, 5, 40)),
+                feature_permissions=json.dumps(permissions),
+                home_sections='["DISCOVERY"]',
+            ))
+
+    def _seed_teams_and_projects(self, teams: int, projects: int) -> None:
+        team_ids = []
+        for n in range(teams):
+            team = TeamDb(id=str(uuid.uuid4()), name=f"team-{n}", created_by="bench", updated_by="bench")
+            self.session.add(team)
+            team_ids.append(team.id)
+            members = self._sample(self.users, 2, 10)
+            groups = self._sample(self.groups, 1, 10)
+            for identifier, member_type in [(u.email, "user") for u in members] + [(g, "group") for g in groups]:
+                override = self.random.choice(self.role_names) if self.random.random() < 0.1 else None
+                self.session.add(TeamMemberDb(
+                    team_id=team.id, member_type=member_type, member_identifier=identifier,
+                    app_role_override=override, added_by="bench",
+                ))
+        self.session.flush()
+        assignments = []
+        for n in range(projects):
+            project = ProjectDb(id=str(uuid.uuid4()), name=f"project-{n}", created_by="bench", updated_by="bench")
+            self.session.add(project)
+            self.project_ids.append(project.id)
+            assignments.extend(
+                {"project_id": project.id, "team_id": team_id, "assigned_by": "bench"}
+                for team_id in self._sample(team_ids, 1, 3)
+            )
+        self.session.flush()
+        self.session.execute(project_team_association.insert(), assignments)
+
+    def requests(self, count: int) -> List[Tuple[UserInfo, str]]:
+        """(user, project id) pairs; users repeat, as they do across a user's page loads."""
+        return [(self.random.choice(self.users), self.random.choice(self.project_ids)) for _ in range(count)]
+
+
+def _measure(call: Callable[[Any], Any], inputs: Sequence[Any], reset: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """Times each call and then measures its allocations in a second pass.
+
+    With reset, caches are cleared before every call (cold); without it the
+    inputs are run once beforehand so the measured calls hit warm caches.
+    """
+    if reset is None:
+        for value in inputs:
+            call(value)
+
+    latencies = []
+    for value in inputs:
+        if reset:
+            reset()
+        started = time.perf_counter()
+        call(value)
+        latencies.append(time.perf_counter() - started)
+    summary = summarize_latencies(latencies)
+
+    # Allocation pass; tracemalloc slows calls down, so it is kept out of the timings and the resets
+    peaks = []
+    for value in inputs:
+        if reset:
+            reset()
+        tracemalloc.start()
+        try:
+            call(value)
+            peaks.append(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    summary["mean_alloc_bytes"] = round(sum(peaks) / len(peaks)) if peaks else 0
+    summary["max_alloc_bytes"] = max(peaks, default=0)
+    return summary
+
+
+def run_benchmark(
+    roles: int = DEFAULT_ROLES,
+    groups: int = DEFAULT_GROUPS,
+    teams: int = DEFAULT_TEAMS,
+    projects: int = DEFAULT_PROJECTS,
+    users: int = DEFAULT_USERS,
+    calls: int = DEFAULT_CALLS,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """Runs all scenarios and returns the JSON-serializable report."""
+    started = time.perf_counter()
+    estate = AuthorizationEstate(roles, groups, teams, projects, users, seed)
+    setup_seconds = time.perf_counter() - started
+    db = estate.session
+
+    settings_manager = SettingsManager(db=db, settings=Settings.model_construct(ENV="BENCHMARK"))
+    projects_manager = ProjectsManager()
+    teams_manager = TeamsManager()
+    # Reloads are timed explicitly as the cold path; none happen in between
+    teams_manager.configure_membership_refresh(0)
+    teams_manager.add_membership_listener(projects_manager.invalidate_access_cache)
+    auth_manager = AuthorizationManager(settings_manager, projects_manager=projects_manager)
+    teams_manager.refresh_membership_index(db)
+
+    # PermissionChecker reads the method (GET enables replica reads) and app.state.teams_manager
+    request = SimpleNamespace(method="GET", app=SimpleNamespace(state=SimpleNamespace(teams_manager=teams_manager)))
+    checker = PermissionChecker("data-products", FeatureAccessLevel.READ_ONLY)
+    loop = asyncio.new_event_loop()
+    workload = estate.requests(calls)
+
+    def reset_permissions() -> None:
+        # A role change drops the role snapshot, role index and permission cache
+        settings_manager._bump_roles_version()
+
+    def reset_all() -> None:
+        reset_permissions()
+        teams_manager.refresh_membership_index(db)
+        projects_manager.invalidate_access_cache()
+
+    def effective_permissions(value) -> None:
+        auth_manager.get_user_effective_permissions(value[0].groups)
+
+    def team_override(value) -> None:
+        loop.run_until_complete(get_user_team_role_overrides(value[0].email, value[0].groups, request))
+
+    def project_access(value) -> None:
+        projects_manager.check_user_project_access(db, value[0].email, value[0].groups, value[1])
+
+    check_outcomes: Counter = Counter()
+
+    def permission_checker(value) -> None:
+        try:
+            loop.run_until_complete(checker(request, user_details=value[0], auth_manager=auth_manager))
+            check_outcomes["granted"] += 1
+        except HTTPException as e:
+            # Denials are part of the workload; any other status means the checker itself failed
+            if e.status_code != 403:
+                raise RuntimeError(f"PermissionChecker failed with status {e.status_code}: {e.detail}") from e
+            check_outcomes["denied"] += 1
+
+    scenarios = {
+        "effective_permissions": (effective_permissions, reset_permissions),
+        "team_override": (team_override, lambda: teams_manager.refresh_membership_index(db)),
+        "project_access": (project_access, projects_manager.invalidate_access_cache),
+        "permission_checker": (permission_checker, reset_all),
+    }
+    results: Dict[str, Any] = {}
+    try:
+        for name, (call, reset) in scenarios.items():
+            results[f"{name}_cold"] = _measure(call, workload, reset)
+            results[f"{name}_warm"] = _measure(call, workload)
+    finally:
+        loop.close()
+        db.close()
+
+    return {
+        "benchmark": "authorization",
+        "environment": environment_info(),
+        "parameters": {
+            "roles": roles,
+            "groups": groups,
+            "teams": teams,
+            "projects": projects,
+            "users": users,
+            "calls_per_scenario": calls,
+            "seed": seed,
+        },
+        "setup_seconds": round(setup_seconds, 3),
+        "permission_checks": {"granted": check_outcomes["granted"], "denied": check_outcomes["denied"]},
+        "scenarios": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark permission checks on a synthetic role/team/project estate.")
+    parser.add_argument("--roles", type=int, default=DEFAULT_ROLES)
+    parser.add_argument("--groups", type=int, default=DEFAULT_GROUPS)
+    parser.add_argument("--teams", type=int, default=DEFAULT_TEAMS)
+    parser.add_argument("--projects", type=int, default=DEFAULT_PROJECTS)
+    parser.add_argument("--users", type=int, default=DEFAULT_USERS)
+    parser.add_argument("--calls", type=int, default=DEFAULT_CALLS, help="Calls per scenario")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default="-", help="Report file; '-' writes to stdout")
+    parser.add_argument("--baseline", help="Earlier report to compare p50 latencies against")
+    parser.add_argument("--max-regression", type=float, default=0.25, help="Allowed p50 slowdown as a fraction of the baseline")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        roles=args.roles,
+        groups=args.groups,
+        teams=args.teams,
+        projects=args.projects,
+        users=args.users,
+        calls=args.calls,
+        seed=args.seed,
+    )
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        report["baseline_comparison"] = compare_to_baseline(report["scenarios"], baseline["scenarios"], args.max_regression)
+        regressions = [name for name, result in report["baseline_comparison"].items() if result["regressed"]]
+    write_report(report, args.output)
+    if regressions:
+        print(f"p50 latency regressed by more than {args.max_regression:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
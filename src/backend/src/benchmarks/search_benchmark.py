@@ -0,0 +1,341 @@
+"""
+Search benchmark over synthetic corpora.
+
+Measures, per corpus size:
+
+- index build time (SearchManager.build_index) and retained/peak memory,
+- p50/p95/p99 query latency for prefix, multi-term, typo and
+  permission-filtered queries, plus repeated queries served by the cache,
+- a full rebuild while query threads keep searching,
+- SearchService (log-backed) indexing throughput and query latency.
+
+Usage (from ``src/backend``)::
+
+    python -m src.benchmarks.search_benchmark --sizes 10k,100k,1m --output search.json
+"""
+
+import argparse
+import random
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.benchmarks.utils import environment_info, parse_size, summarize_latencies, write_report
+from src.common.features import FeatureAccessLevel
+from src.common.search import SearchService
+from src.common.search_index import PartitionedSearchIndex
+from src.common.search_interfaces import SearchableAsset, SearchIndexItem
+from src.controller.search_manager import SearchManager
+from src.models.users import UserInfo
+
+DEFAULT_SIZES = "10k,100k,1m"
+DEFAULT_QUERIES = 200
+DEFAULT_SEED = 42
+
+# (feature_id, type, id prefix, share of the corpus) - roughly what a catalog estate looks like
+FEATURE_MIX = [
+    ("business-glossary", "glossary-term", "term", 0.35),
+    ("tags", "tag", "tag", 0.25),
+    ("data-products", "data-product", "product", 0.15),
+    ("data-contracts", "data-contract", "contract", 0.15),
+    ("data-asset-reviews", "data-asset-review", "review", 0.10),
+]
+
+# Features a typical non-admin user can read in the permission-filtered scenario
+READABLE_FEATURES = ("data-products", "business-glossary")
+
+DOMAIN_WORDS = [
+    "customer", "sales", "revenue", "order", "invoice", "product", "inventory", "supplier",
+    "shipment", "payment", "account", "ledger", "forecast", "churn", "campaign", "marketing",
+    "finance", "risk", "fraud", "claim", "policy", "patient", "device", "sensor", "telemetry",
+    "session", "clickstream", "subscription", "pricing", "margin", "region", "country", "store",
+    "employee", "payroll", "contract", "vendor", "asset", "portfolio", "trade", "position",
+    "quote", "lead", "opportunity", "pipeline", "support", "ticket", "survey", "loyalty",
+    "retention", "segment", "profile", "address", "household", "weekly", "monthly", "daily",
+    "summary", "report", "model", "feature", "score", "raw", "curated", "gold", "silver", "bronze",
+]
+
+TAG_NAMESPACES = ["pii", "domain", "quality", "tier", "owner", "lifecycle", "compliance"]
+
+
+class _CorpusAsset(SearchableAsset):
+    """Searchable manager serving a fixed list of items."""
+
+    def __init__(self, items: List[SearchIndexItem]):
+        self.items = items
+
+    def get_search_index_items(self) -> List[SearchIndexItem]:
+        return self.items
+
+
+class _StaticAuthorization:
+    """Stand-in for AuthorizationManager granting read access to a fixed set of features."""
+
+    def __init__(self, readable_features: Sequence[str]):
+        self._permissions = {feature_id: FeatureAccessLevel.READ_ONLY for feature_id in readable_features}
+
+    def get_user_effective_permissions(self, user_groups, team_role_override=None) -> Dict[str, FeatureAccessLevel]:
+        return dict(self._permissions)
+
+    def has_permission(self, effective_permissions, feature_id, required_level) -> bool:
+        return feature_id in effective_permissions
+
+
+@dataclass
+class _ServiceDoc:
+    id: str
+    name: str
+    description: str
+
+
+class CorpusGenerator:
+    """Generates SearchIndexItems with Zipf-distributed words and tags."""
+
+    def __init__(self, size: int, seed: int = DEFAULT_SEED):
+        self.size = size
+        self.random = random.Random(seed)
+        vocabulary_size = min(50_000, max(2_000, size // 20))
+        self.words = DOMAIN_WORDS + self._synthetic_words(vocabulary_size - len(DOMAIN_WORDS))
+        self.word_weights = self._zipf_cumulative(len(self.words))
+        tag_count = min(5_000, max(200, size // 500))
+        self.tags = [
+            f"{self.random.choice(TAG_NAMESPACES)}/{self.words[i % len(self.words)]}" if i % 3 else self.words[i]
+            for i in range(tag_count)
+        ]
+        self.tag_weights = self._zipf_cumulative(len(self.tags))
+
+    def _synthetic_words(self, count: int) -> List[str]:
+        syllables = [c + v for c in "bcdfghklmnprstvz" for v in "aeiou"]
+        words = set(DOMAIN_WORDS)
+        result = []
+        while len(result) < count:
+            word = "".join(self.random.choice(syllables) for _ in range(self.random.randint(2, 4)))
+            if word not in words:
+                words.add(word)
+                result.append(word)
+        return result
+
+    @staticmethod
+    def _zipf_cumulative(count: int, exponent: float = 1.07) -> List[float]:
+        total = 0.0
+        cumulative = []
+        for rank in range(1, count + 1):
+            total += 1.0 / rank ** exponent
+            cumulative.append(total)
+        return cumulative
+
+    def sample_words(self, count: int) -> List[str]:
+        return self.random.choices(self.words, cum_weights=self.word_weights, k=count)
+
+    def items(self) -> List[SearchIndexItem]:
+        kinds = self.random.choices(FEATURE_MIX, weights=[share for *_, share in FEATURE_MIX], k=self.size)
+        items = []
+        for position, (feature_id, item_type, prefix, _) in enumerate(kinds):
+            title = " ".join(word.capitalize() for word in self.sample_words(self.random.randint(2, 4)))
+            description = " ".join(self.sample_words(self.random.randint(6, 15))) if self.random.random() < 0.7 else None
+            tags = sorted(set(self.random.choices(self.tags, cum_weights=self.tag_weights, k=self.random.randint(0, 3))))
+            items.append(SearchIndexItem(
+                id=f"{prefix}::{position}",
+                type=item_type,
+                title=title,
+                description=description,
+                link=f"/{feature_id}/{position}",
+                tags=tags,
+                feature_id=feature_id,
+            ))
+        return items
+
+    def queries(self, count: int) -> Dict[str, List[str]]:
+        prefix = [word[:self.random.randint(2, 4)] for word in self.sample_words(count)]
+        multi_term = [" ".join(self.sample_words(self.random.randint(2, 3))) for _ in range(count)]
+        typo = []
+        for word in self.sample_words(count * 4):
+            if len(typo) == count:
+                break
+            if len(word) >= 5:
+                i = self.random.randrange(len(word) - 1)
+                typo.append(word[:i] + word[i + 1] + word[i] + word[i + 2:])
+        return {"prefix": prefix, "multi_term": multi_term, "typo": typo}
+
+
+def _time_queries(search, queries: List[str]) -> Dict[str, Any]:
+    latencies = []
+    result_counts = []
+    for query in queries:
+        started = time.perf_counter()
+        results = search(query)
+        latencies.append(time.perf_counter() - started)
+        result_counts.append(len(results))
+    summary = summarize_latencies(latencies)
+    summary["mean_results"] = round(sum(result_counts) / len(result_counts), 2) if result_counts else 0
+    return summary
+
+
+def _measure_memory(items: List[SearchIndexItem]) -> Dict[str, Any]:
+    tracemalloc.start()
+    try:
+        index = PartitionedSearchIndex(items)
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del index
+    return {"index_retained_mb": round(retained / 2 ** 20, 2), "index_peak_mb": round(peak / 2 ** 20, 2)}
+
+
+def _rebuild_under_load(manager: SearchManager, auth, user: UserInfo, queries: List[str], threads: int) -> Dict[str, Any]:
+    stop = threading.Event()
+    latencies: List[float] = []
+    errors = []
+    lock = threading.Lock()
+
+    def _query_loop(offset: int) -> None:
+        position = offset
+        while not stop.is_set():
+            query = queries[position % len(queries)]
+            position += 1
+            started = time.perf_counter()
+            try:
+                manager.search(query, auth, user, limit=20)
+            except Exception as e:  # Recorded, a benchmark should not abort on one failed query
+                errors.append(repr(e))
+            with lock:
+                latencies.append(time.perf_counter() - started)
+
+    workers = [threading.Thread(target=_query_loop, args=(n,), daemon=True) for n in range(threads)]
+    for worker in workers:
+        worker.start()
+    started = time.perf_counter()
+    manager.build_index()
+    rebuild_seconds = time.perf_counter() - started
+    stop.set()
+    for worker in workers:
+        worker.join()
+    return {
+        "rebuild_seconds": round(rebuild_seconds, 4),
+        "query_threads": threads,
+        "queries_during_rebuild": summarize_latencies(latencies),
+        "errors": len(errors),
+    }
+
+
+def _benchmark_search_service(items: List[SearchIndexItem], queries: Dict[str, List[str]]) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory(prefix="search-benchmark-") as index_dir:
+        service = SearchService(index_dir=index_dir)
+        service.register_index("benchmark", _ServiceDoc, ["name", "description"])
+        started = time.perf_counter()
+        for item in items:
+            service.index_item("benchmark", _ServiceDoc(id=item.id, name=item.title, description=item.description or ""))
+        index_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        reloaded = SearchService(index_dir=index_dir)
+        reloaded.register_index("benchmark", _ServiceDoc, ["name", "description"])
+        reload_seconds = time.perf_counter() - started
+
+        return {
+            "items": len(items),
+            "index_items_per_second": round(len(items) / index_seconds, 1) if index_seconds else None,
+            "reload_seconds": round(reload_seconds, 4),
+            "queries": {
+                kind: _time_queries(lambda q: service.search("benchmark", q, limit=20), kind_queries)
+                for kind, kind_queries in queries.items()
+            },
+        }
+
+
+def run_size(size: int, query_count: int, seed: int, measure_memory: bool, load_threads: int, service_max_size: int) -> Dict[str, Any]:
+    """Runs all search scenarios against one synthetic corpus."""
+    generator = CorpusGenerator(size, seed=seed)
+    started = time.perf_counter()
+    items = generator.items()
+    generate_seconds = time.perf_counter() - started
+    queries = generator.queries(query_count)
+
+    started = time.perf_counter()
+    manager = SearchManager(searchable_managers=[_CorpusAsset(items)], build_timeout_seconds=None, query_cache_size=0)
+    build_seconds = time.perf_counter() - started
+
+    admin = _StaticAuthorization([feature_id for feature_id, *_ in FEATURE_MIX])
+    restricted = _StaticAuthorization(READABLE_FEATURES)
+    user = UserInfo(email="bench@example.com", username="bench", user="bench", ip=None, groups=["benchmark"])
+
+    result: Dict[str, Any] = {
+        "size": size,
+        "seed": seed,
+        "generate_seconds": round(generate_seconds, 4),
+        "build_seconds": round(build_seconds, 4),
+        "index_terms": manager._inverted_index.term_count,
+        "queries": {
+            kind: _time_queries(lambda q: manager.search(q, admin, user, limit=20), kind_queries)
+            for kind, kind_queries in queries.items()
+        },
+    }
+    result["queries"]["permission_filtered"] = _time_queries(
+        lambda q: manager.search(q, restricted, user, limit=20), queries["multi_term"]
+    )
+
+    cached = SearchManager(searchable_managers=[_CorpusAsset(items)], build_timeout_seconds=None)
+    for query in queries["multi_term"]:
+        cached.search(query, admin, user, limit=20)
+    result["queries"]["cached_repeat"] = _time_queries(lambda q: cached.search(q, admin, user, limit=20), queries["multi_term"])
+    del cached
+
+    if measure_memory:
+        result["memory"] = _measure_memory(items)
+    result["rebuild_under_load"] = _rebuild_under_load(manager, admin, user, queries["multi_term"], load_threads)
+    if size <= service_max_size:
+        result["search_service"] = _benchmark_search_service(items, queries)
+    return result
+
+
+def run_benchmark(
+    sizes: Sequence[int],
+    query_count: int = DEFAULT_QUERIES,
+    seed: int = DEFAULT_SEED,
+    measure_memory: bool = True,
+    load_threads: int = 4,
+    service_max_size: int = 100_000,
+) -> Dict[str, Any]:
+    """Runs the benchmark for every corpus size and returns the JSON-serializable report."""
+    return {
+        "benchmark": "search",
+        "environment": environment_info(),
+        "parameters": {
+            "queries_per_scenario": query_count,
+            "seed": seed,
+            "load_threads": load_threads,
+            "readable_features": list(READABLE_FEATURES),
+        },
+        "results": [
+            run_size(size, query_count, seed, measure_memory, load_threads, service_max_size) for size in sizes
+        ],
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark SearchManager and SearchService on synthetic corpora.")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Comma-separated corpus sizes, e.g. 10k,100k,1m (default {DEFAULT_SIZES})")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERIES, help="Queries per scenario")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--load-threads", type=int, default=4, help="Query threads running during the rebuild scenario")
+    parser.add_argument("--service-max-size", default="100k", help="Largest corpus also indexed through SearchService")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip tracemalloc memory measurement (slow on large corpora)")
+    parser.add_argument("--output", default="-", help="Report file; '-' writes to stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        sizes=[parse_size(size) for size in args.sizes.split(",") if size.strip()],
+        query_count=args.queries,
+        seed=args.seed,
+        measure_memory=not args.skip_memory,
+        load_threads=args.load_threads,
+        service_max_size=parse_size(args.service_max_size),
+    )
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
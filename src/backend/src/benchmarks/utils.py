@@ -0,0 +1,98 @@
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
+
+
+def parse_size(value: str) -> int:
+    """Parses corpus sizes such as "10k" or "1m" into integers."""
+    value = value.strip().lower()
+    multiplier = 1
+    if value.endswith("k"):
+        multiplier, value = 1_000, value[:-1]
+    elif value.endswith("m"):
+        multiplier, value = 1_000_000, value[:-1]
+    return int(float(value) * multiplier)
+
+
+def percentile(sorted_samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, math.ceil(fraction * len(sorted_samples)) - 1))
+    return sorted_samples[rank]
+
+
+def summarize_latencies(samples_seconds: Iterable[float]) -> Dict[str, Any]:
+    """Summarizes latency samples (in seconds) as milliseconds."""
+    samples = sorted(samples_seconds)
+    if not samples:
+        return {"count": 0}
+    to_ms = 1000.0
+    return {
+        "count": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * to_ms, 4),
+        "p50_ms": round(percentile(samples, 0.50) * to_ms, 4),
+        "p95_ms": round(percentile(samples, 0.95) * to_ms, 4),
+        "p99_ms": round(percentile(samples, 0.99) * to_ms, 4),
+        "max_ms": round(samples[-1] * to_ms, 4),
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    max_regression: float,
+    metric: str = "p50_ms",
+) -> Dict[str, Dict[str, Any]]:
+    """Compares a latency metric per scenario against a baseline report's scenarios.
+
+    A scenario regressed if its metric grew by more than max_regression (a
+    fraction of the baseline value). Scenarios missing from either side are skipped.
+    """
+    comparison = {}
+    for name, summary in current.items():
+        if name not in baseline or metric not in summary or metric not in baseline[name]:
+            continue
+        before, after = baseline[name][metric], summary[metric]
+        change = (after - before) / before if before else 0.0
+        comparison[name] = {
+            "baseline": before,
+            "current": after,
+            "change": round(change, 4),
+            "regressed": change > max_regression,
+        }
+    return comparison
+
+
+def environment_info() -> Dict[str, Any]:
+    """Metadata identifying where and on which revision a benchmark ran."""
+    try:
+        commit: Optional[str] = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5, check=True
+        ).stdout.strip()
+    except Exception:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    """Writes a report as JSON to the given file, or stdout when output is None or "-"."""
+    payload = json.dumps(report, indent=2, sort_keys=True)
+    if not output or output == "-":
+        print(payload)
+        return
+    with open(output, "w") as f:
+        f.write(payload + "\n")
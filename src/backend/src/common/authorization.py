@@ -7,6 +7,7 @@ from src.models.users import UserInfo
 from src.common.features import FeatureAccessLevel
 from src.common.logging import get_logger
 from src.common.database import get_db
+from src.common.db_routing import allow_replica_reads
 # Import dependencies for user info and managers (adjust paths if needed)
 # from src.routes.user_routes import get_user_details_from_sdk # REMOVE this import
 # Import dependencies needed for the moved function
@@ -98,35 +99,15 @@ async def get_user_team_role_overrides(user_identifier: str, user_groups: List[s
             logger.debug("Teams manager not available in app state")
             return None
 
-        # Get database session
-        db = next(get_db())
-        try:
-            # Get teams where user is a member
-            user_teams = teams_manager.get_teams_for_user(db, user_identifier)
-
-            # Collect all role overrides for this user across teams
-            role_overrides = []
-            for team in user_teams:
-                for member in team.members:
-                    if member.member_identifier == user_identifier and member.app_role_override:
-                        role_overrides.append(member.app_role_override)
-
-            # Also check group memberships
-            for team in user_teams:
-                for member in team.members:
-                    if member.member_identifier in user_groups and member.app_role_override:
-                        role_overrides.append(member.app_role_override)
-
-            if not role_overrides:
-                return None
-
-            # Return the highest role override (assuming role names have hierarchical order)
-            # For now, just return the first one found - in practice you'd need proper role hierarchy
-            logger.debug(f"Found team role overrides for user {user_identifier}: {role_overrides}")
-            return role_overrides[0]
-
-        finally:
-            db.close()
+        # Overrides are served from the in-memory membership index; it is loaded at
+        # startup and reloaded periodically to pick up other workers' changes
+        teams_manager.ensure_membership_index(lambda: next(get_db()))
+
+        # For now, just return the first one found - in practice you'd need proper role hierarchy
+        role_override = teams_manager.get_team_role_override(user_identifier, user_groups)
+        if role_override:
+            logger.debug(f"Found team role override for user {user_identifier}: {role_override}")
+        return role_override
     except Exception as e:
         logger.warning(f"Error checking team role overrides for user {user_identifier}: {e}")
         return None
@@ -141,13 +122,8 @@ async def check_user_project_access(user_identifier: str, user_groups: List[str]
             logger.debug("Projects manager not available in app state")
             return False
 
-        # Get database session
-        db = next(get_db())
-        try:
-            # Check if user has access to the project
-            return projects_manager.check_user_project_access(db, user_identifier, user_groups, project_id)
-        finally:
-            db.close()
+        # Accessible projects are cached per user; a session is only opened on a cache miss
+        return projects_manager.check_user_project_access(None, user_identifier, user_groups, project_id)
     except Exception as e:
         logger.warning(f"Error checking project access for user {user_identifier} to project {project_id}: {e}")
         return False
@@ -228,7 +204,7 @@ class PermissionChecker:
                 request
             )
 
-            effective_permissions = auth_manager.get_user_effective_permissions(
+            effective_permissions = auth_manager.get_user_permission_vector(
                 user_details.groups,
                 team_role_override
             )
@@ -250,6 +226,9 @@ class PermissionChecker:
                 )
 
             logger.debug(f"Permission granted for user '{user_details.user or user_details.email}' on feature '{self.feature_id}'")
+            if request.method in ("GET", "HEAD"):
+                # Reads of a permitted GET may be served by the read replica, if one is configured
+                allow_replica_reads()
             # If permission is granted, the dependency resolves successfully (returns None implicitly)
             return
 
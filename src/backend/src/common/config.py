@@ -75,12 +75,76 @@ class Settings(BaseSettings):
     # SQLAlchemy Echo Flag (controls SQL query logging)
     DB_ECHO: bool = Field(False, env='APP_DB_ECHO')
 
+    # Database connection pool settings
+    # Connections kept open per worker, plus the extra ones opened under bursts
+    DB_POOL_SIZE: int = Field(5, env='DB_POOL_SIZE')
+    DB_MAX_OVERFLOW: int = Field(10, env='DB_MAX_OVERFLOW')
+    # How long a request waits for a free connection before failing
+    DB_POOL_TIMEOUT_SECONDS: float = Field(30.0, env='DB_POOL_TIMEOUT_SECONDS')
+    # Connections older than this are replaced (keep below the server/proxy idle timeout)
+    DB_POOL_RECYCLE_SECONDS: int = Field(840, env='DB_POOL_RECYCLE_SECONDS')
+    DB_POOL_PRE_PING: bool = Field(True, env='DB_POOL_PRE_PING')
+
+    # Async database engine settings
+    # Second engine (asyncpg) serving AsyncDBSessionDep routes without a thread per request
+    DB_ASYNC_ENABLED: bool = Field(True, env='DB_ASYNC_ENABLED')
+    # The async engine has its own pool; timeout, recycle and pre-ping follow the settings above
+    DB_ASYNC_POOL_SIZE: int = Field(5, env='DB_ASYNC_POOL_SIZE')
+    DB_ASYNC_MAX_OVERFLOW: int = Field(10, env='DB_ASYNC_MAX_OVERFLOW')
+
+    # Read replica settings
+    # Optional Postgres standby serving permission-checked GET routes and search index builds (unset: primary only)
+    POSTGRES_REPLICA_HOST: Optional[str] = Field(None, env='POSTGRES_REPLICA_HOST')
+    POSTGRES_REPLICA_PORT: Optional[int] = Field(None, env='POSTGRES_REPLICA_PORT')  # Defaults to POSTGRES_PORT
+    # Reads go back to the primary while the replica lags further behind than this
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(10.0, env='DB_REPLICA_MAX_LAG_SECONDS')
+    # How long a replica lag measurement is reused
+    DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = Field(5.0, env='DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS')
+
+    # SQL instrumentation settings
+    # Record statement counts, DB time and repeated statements per request (adds X-DB-* response headers)
+    DB_QUERY_INSTRUMENTATION_ENABLED: bool = Field(False, env='DB_QUERY_INSTRUMENTATION_ENABLED')
+    # Executions of one statement shape within a request that flag it as a likely N+1 pattern
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(5, env='DB_N_PLUS_ONE_THRESHOLD')
+
     # Mock User Details (for local development when MOCK_USER_DETAILS is True or ENV is LOCAL*)
     MOCK_USER_DETAILS: bool = Field(False, env='MOCK_USER_DETAILS')
 
     # Databricks Serving Endpoint for LLM
     SERVING_ENDPOINT: Optional[str] = Field(None, env='SERVING_ENDPOINT')
 
+    # Search index settings
+    # Interval for the full search index rebuild that backs up incremental updates (0 disables it)
+    SEARCH_INDEX_REBUILD_INTERVAL_SECONDS: int = Field(3600, env='SEARCH_INDEX_REBUILD_INTERVAL_SECONDS')
+    # Per-manager deadline when (re)building the index; slower managers keep their previous items
+    SEARCH_INDEX_BUILD_TIMEOUT_SECONDS: float = Field(30.0, env='SEARCH_INDEX_BUILD_TIMEOUT_SECONDS')
+    SEARCH_INDEX_BUILD_MAX_WORKERS: int = Field(8, env='SEARCH_INDEX_BUILD_MAX_WORKERS')
+    # File for the persisted index snapshot used for fast cold start (unset disables snapshots)
+    SEARCH_INDEX_SNAPSHOT_PATH: Optional[str] = Field(None, env='SEARCH_INDEX_SNAPSHOT_PATH')
+    # Number of ranked query results kept in the search LRU cache (0 disables it)
+    SEARCH_QUERY_CACHE_SIZE: int = Field(256, env='SEARCH_QUERY_CACHE_SIZE')
+
+    # User lookup cache settings
+    # How long SDK user details (incl. groups) are reused before being fetched again
+    USER_CACHE_TTL_SECONDS: float = Field(300.0, env='USER_CACHE_TTL_SECONDS')
+    # How long an unknown email is remembered as not found (0 disables negative caching)
+    USER_CACHE_NEGATIVE_TTL_SECONDS: float = Field(60.0, env='USER_CACHE_NEGATIVE_TTL_SECONDS')
+    # Maximum number of cached users (0 disables the cache)
+    USER_CACHE_MAX_SIZE: int = Field(1024, env='USER_CACHE_MAX_SIZE')
+
+    # Role cache settings
+    # How long roles and the effective permissions derived from them are reused; bounds how long other workers' role changes take to apply
+    ROLES_CACHE_TTL_SECONDS: float = Field(60.0, env='ROLES_CACHE_TTL_SECONDS')
+
+    # Team membership index settings
+    # How often the team membership index behind role overrides is reloaded, picking up other workers' changes (0 disables it)
+    TEAM_MEMBERSHIP_REFRESH_SECONDS: float = Field(60.0, env='TEAM_MEMBERSHIP_REFRESH_SECONDS')
+
+    # Project access cache settings
+    # How long a user's accessible project ids are reused (assignment/membership changes invalidate earlier)
+    PROJECT_ACCESS_CACHE_TTL_SECONDS: float = Field(300.0, env='PROJECT_ACCESS_CACHE_TTL_SECONDS')
+    PROJECT_ACCESS_CACHE_MAX_SIZE: int = Field(4096, env='PROJECT_ACCESS_CACHE_MAX_SIZE')
+
     # Replace nested Config class with model_config dictionary
     model_config = SettingsConfigDict(
         env_file=str(DOTENV_FILE), 
@@ -1,13 +1,15 @@
+import asyncio
+import functools
 import os
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TypeVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar, Union
 
 from sqlalchemy import create_engine, text, event
 from sqlalchemy.orm import sessionmaker, Session as SQLAlchemySession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy import pool
 from sqlalchemy.engine import Connection, URL
 
 from alembic.config import Config as AlembicConfig
@@ -16,6 +18,8 @@ from alembic.runtime.migration import MigrationContext
 
 from .config import get_settings, Settings
 from .logging import get_logger
+from .db_metrics import InstrumentedQueuePool, PoolMetrics, attach_query_instrumentation
+from .db_routing import ReplicaLagMonitor, RoutingSession
 from src.common.workspace_client import get_workspace_client
 # Import SDK components
 from databricks.sdk.errors import NotFound, DatabricksError
@@ -62,6 +66,14 @@ except ImportError as e:
 # Singleton engine instance
 _engine = None
 _SessionLocal = None
+_pool_metrics: Optional[PoolMetrics] = None
+# Async engine (asyncpg) next to the sync one, for routes that must not block the event loop
+_async_engine: Optional[AsyncEngine] = None
+_AsyncSessionLocal: Optional[async_sessionmaker] = None
+# Optional read replica that RoutingSession sends allowed SELECTs to
+_replica_engine = None
+_replica_pool_metrics: Optional[PoolMetrics] = None
+_replica_monitor: Optional[ReplicaLagMonitor] = None
 # Public engine instance (will be assigned after creation)
 engine = None
 
@@ -231,8 +243,14 @@ class DatabaseManager:
 db_manager: Optional[DatabaseManager] = None
 
 
-def get_db_url(settings: Settings) -> str:
-    """Construct the PostgreSQL SQLAlchemy URL."""
+def get_db_url(settings: Settings, host: Optional[str] = None, port: Optional[int] = None) -> str:
+    """Construct the PostgreSQL SQLAlchemy URL.
+
+    Args:
+        settings: Application settings with the connection details.
+        host: Overrides POSTGRES_HOST, e.g. to connect to the read replica.
+        port: Overrides POSTGRES_PORT.
+    """
     if not all([settings.POSTGRES_HOST, settings.POSTGRES_USER, settings.POSTGRES_PASSWORD, settings.POSTGRES_DB]):
         raise ValueError("PostgreSQL connection details (Host, User, Password, DB) are missing in settings.")
 
@@ -247,8 +265,8 @@ def get_db_url(settings: Settings) -> str:
         drivername="postgresql+psycopg2",
         username=settings.POSTGRES_USER,
         password=settings.POSTGRES_PASSWORD,
-        host=settings.POSTGRES_HOST,
-        port=settings.POSTGRES_PORT,
+        host=host or settings.POSTGRES_HOST,
+        port=port or settings.POSTGRES_PORT,
         database=settings.POSTGRES_DB,
         query=query_params if query_params else None
     )
@@ -260,6 +278,97 @@ def get_db_url(settings: Settings) -> str:
     return url_str
 
 
+def get_async_db_url(settings: Settings) -> URL:
+    """Construct the PostgreSQL SQLAlchemy URL for the asyncpg driver.
+
+    asyncpg rejects libpq's ``options`` parameter, so unlike get_db_url the
+    schema is not part of the URL; init_db passes it as a server setting.
+    """
+    if not all([settings.POSTGRES_HOST, settings.POSTGRES_USER, settings.POSTGRES_PASSWORD, settings.POSTGRES_DB]):
+        raise ValueError("PostgreSQL connection details (Host, User, Password, DB) are missing in settings.")
+
+    return URL.create(
+        drivername="postgresql+asyncpg",
+        username=settings.POSTGRES_USER,
+        password=settings.POSTGRES_PASSWORD,
+        host=settings.POSTGRES_HOST,
+        port=settings.POSTGRES_PORT,
+        database=settings.POSTGRES_DB,
+    )
+
+
+def _init_async_engine(settings: Settings) -> None:
+    """Creates the async engine and session factory; leaves them unset if asyncpg is unavailable."""
+    global _async_engine, _AsyncSessionLocal
+
+    connect_args = {}
+    if settings.POSTGRES_DB_SCHEMA:
+        connect_args["server_settings"] = {"search_path": settings.POSTGRES_DB_SCHEMA}
+    try:
+        _async_engine = create_async_engine(get_async_db_url(settings),
+                                            connect_args=connect_args,
+                                            echo=settings.DB_ECHO,
+                                            pool_size=settings.DB_ASYNC_POOL_SIZE,
+                                            max_overflow=settings.DB_ASYNC_MAX_OVERFLOW,
+                                            pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                                            pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                                            pool_pre_ping=settings.DB_POOL_PRE_PING)
+    except ImportError as e:
+        logger.warning(f"Async database engine not created (asyncpg unavailable: {e}); async routes fall back to sync sessions.")
+        return
+    if settings.DB_QUERY_INSTRUMENTATION_ENABLED:
+        # Cursor events fire on the sync facade the async engine wraps
+        attach_query_instrumentation(_async_engine.sync_engine)
+    # expire_on_commit=False: attributes of committed objects cannot be lazily reloaded outside an await
+    _AsyncSessionLocal = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    logger.info(
+        f"Async database engine initialized (pool size={settings.DB_ASYNC_POOL_SIZE}, "
+        f"max_overflow={settings.DB_ASYNC_MAX_OVERFLOW})."
+    )
+
+
+def _set_search_path_on_connect(target_engine, target_schema: str) -> None:
+    """Explicitly enforces search_path at connection time, for environments where connection options are ignored."""
+    @event.listens_for(target_engine, "connect")
+    def set_search_path(dbapi_connection, connection_record):
+        try:
+            with dbapi_connection.cursor() as cursor:
+                cursor.execute(f'SET search_path TO "{target_schema}"')
+        except Exception as e:
+            # Log and continue; the app can still operate using default schema if necessary
+            logger.warning(f"Failed to set search_path to '{target_schema}': {e}")
+
+
+def _init_replica_engine(settings: Settings) -> None:
+    """Creates the read replica engine, its pool metrics and its lag monitor."""
+    global _replica_engine, _replica_pool_metrics, _replica_monitor
+
+    replica_url = get_db_url(settings, host=settings.POSTGRES_REPLICA_HOST, port=settings.POSTGRES_REPLICA_PORT)
+    _replica_engine = create_engine(replica_url,
+                                    echo=settings.DB_ECHO,
+                                    poolclass=InstrumentedQueuePool,
+                                    pool_size=settings.DB_POOL_SIZE,
+                                    max_overflow=settings.DB_MAX_OVERFLOW,
+                                    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                                    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                                    pool_pre_ping=settings.DB_POOL_PRE_PING)
+    _replica_pool_metrics = PoolMetrics()
+    _replica_pool_metrics.attach(_replica_engine)
+    if settings.DB_QUERY_INSTRUMENTATION_ENABLED:
+        attach_query_instrumentation(_replica_engine)
+    if settings.POSTGRES_DB_SCHEMA:
+        _set_search_path_on_connect(_replica_engine, settings.POSTGRES_DB_SCHEMA)
+    _replica_monitor = ReplicaLagMonitor.for_engine(
+        _replica_engine,
+        max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+        check_interval_seconds=settings.DB_REPLICA_LAG_CHECK_INTERVAL_SECONDS,
+    )
+    logger.info(
+        f"Read replica engine initialized (host={settings.POSTGRES_REPLICA_HOST}, "
+        f"max lag={settings.DB_REPLICA_MAX_LAG_SECONDS}s)."
+    )
+
+
 def ensure_catalog_schema_exists(settings: Settings):
     """Checks if the configured catalog and schema exist, creates them if not."""
     logger.info("Ensuring required catalog and schema exist...")
@@ -332,7 +441,8 @@ def get_current_db_revision(engine_connection: Connection, alembic_cfg: AlembicC
 
 def init_db() -> None:
     """Initializes the database connection, checks/creates catalog/schema, and runs migrations."""
-    global _engine, _SessionLocal, engine
+    global _engine, _SessionLocal, _pool_metrics, _async_engine, _AsyncSessionLocal, engine
+    global _replica_engine, _replica_pool_metrics, _replica_monitor
     settings = get_settings()
 
     if _engine is not None:
@@ -350,32 +460,42 @@ def init_db() -> None:
         logger.info("Connecting to database...")
         logger.info(f"> Database URL: {db_url}")
         logger.info(f"> Connect args: {connect_args}")
+        logger.info(
+            f"> Pool: size={settings.DB_POOL_SIZE}, max_overflow={settings.DB_MAX_OVERFLOW}, "
+            f"timeout={settings.DB_POOL_TIMEOUT_SECONDS}s, recycle={settings.DB_POOL_RECYCLE_SECONDS}s, "
+            f"pre_ping={settings.DB_POOL_PRE_PING}"
+        )
         _engine = create_engine(db_url,
                                 connect_args=connect_args, 
                                 echo=settings.DB_ECHO, 
-                                poolclass=pool.QueuePool, 
-                                pool_size=5, 
-                                max_overflow=10,
-                                pool_recycle=840,
-                                pool_pre_ping=True)
+                                poolclass=InstrumentedQueuePool, 
+                                pool_size=settings.DB_POOL_SIZE, 
+                                max_overflow=settings.DB_MAX_OVERFLOW,
+                                pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+                                pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+                                pool_pre_ping=settings.DB_POOL_PRE_PING)
         engine = _engine # Assign to public variable
+        _pool_metrics = PoolMetrics()
+        _pool_metrics.attach(_engine)
+        if settings.DB_QUERY_INSTRUMENTATION_ENABLED:
+            attach_query_instrumentation(_engine)
+            logger.info(f"Per-request SQL instrumentation enabled (N+1 threshold: {settings.DB_N_PLUS_ONE_THRESHOLD}).")
 
         # Explicitly enforce search_path at connection time to ensure correct schema usage in environments
         # where connection options may be ignored.
         if settings.POSTGRES_DB_SCHEMA:
-            target_schema = settings.POSTGRES_DB_SCHEMA
-
-            @event.listens_for(_engine, "connect")
-            def set_search_path(dbapi_connection, connection_record):
-                try:
-                    with dbapi_connection.cursor() as cursor:
-                        cursor.execute(f'SET search_path TO "{target_schema}"')
-                except Exception as e:
-                    # Log and continue; the app can still operate using default schema if necessary
-                    logger.warning(f"Failed to set search_path to '{target_schema}': {e}")
-
-        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+            _set_search_path_on_connect(_engine, settings.POSTGRES_DB_SCHEMA)
+
+        if settings.POSTGRES_REPLICA_HOST:
+            _init_replica_engine(settings)
+            # Writes stay on _engine; SELECTs may go to the replica (see db_routing.RoutingSession)
+            _SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=_engine,
+                                         replica_bind=_replica_engine, replica_monitor=_replica_monitor)
+        else:
+            _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
         logger.info("Database engine and session factory initialized.")
+        if settings.DB_ASYNC_ENABLED:
+            _init_async_engine(settings)
 
         # --- Alembic Migration Logic --- #
         alembic_cfg_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..' , 'alembic.ini'))
@@ -465,6 +585,12 @@ def init_db() -> None:
         logger.critical(f"Database initialization failed: {e}", exc_info=True)
         _engine = None
         _SessionLocal = None
+        _pool_metrics = None
+        _async_engine = None
+        _AsyncSessionLocal = None
+        _replica_engine = None
+        _replica_pool_metrics = None
+        _replica_monitor = None
         engine = None # Reset public engine on failure
         raise ConnectionError("Failed to initialize database connection or run migrations.") from e
 
@@ -515,6 +641,89 @@ def get_db_session():
     finally:
         session.close()
 
+@contextmanager
+def session_scope(
+    db: Optional[SQLAlchemySession] = None,
+    session_factory: Optional[Callable[[], SQLAlchemySession]] = None,
+) -> Iterator[SQLAlchemySession]:
+    """Yields the caller's session as is, or a short-lived one for a single unit of work.
+
+    Args:
+        db: Session owned by the caller (e.g. the request's); committing it is left to the caller.
+        session_factory: Factory for the short-lived session; defaults to the application's.
+            That session is committed on success, rolled back on error and always closed,
+            so its connection goes back to the pool and its identity map is discarded.
+    """
+    if db is not None:
+        yield db
+        return
+    session = (session_factory or get_session_factory())()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+def with_session(method):
+    """Decorates a manager method so its ``db`` keyword argument is always a usable session.
+
+    A ``db`` passed by the caller is used as is. Otherwise the manager's bound
+    ``_db`` is used if set (tests, scripts), else a short-lived session from
+    its ``_session_factory`` (see session_scope). Managers shared by concurrent
+    requests therefore never hold one session for their whole lifetime.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, db: Optional[SQLAlchemySession] = None, **kwargs):
+        bound = db if db is not None else getattr(self, '_db', None)
+        with session_scope(bound, getattr(self, '_session_factory', None)) as session:
+            return method(self, *args, db=session, **kwargs)
+    return wrapper
+
+# Session.info key holding the (on_commit, on_rollback) callbacks of the current transaction
+_AFTER_COMMIT_CALLBACKS = "after_commit_callbacks"
+
+def call_after_commit(
+    db: SQLAlchemySession,
+    on_commit: Callable[[], None],
+    on_rollback: Optional[Callable[[], None]] = None,
+) -> None:
+    """Defers in-memory side effects of a write until the session's transaction commits.
+
+    Caches and indexes derived from the database must not change while the
+    write can still roll back, nor before other sessions can see it.
+
+    Args:
+        db: Session holding the uncommitted write.
+        on_commit: Called once the outermost transaction has committed.
+        on_rollback: Called instead if the transaction ends without committing.
+    """
+    db.info.setdefault(_AFTER_COMMIT_CALLBACKS, []).append((on_commit, on_rollback))
+
+def _run_callbacks(callbacks) -> None:
+    for callback in callbacks:
+        if callback is None:
+            continue
+        try:
+            callback()
+        except Exception as e:
+            logger.error(f"Error in transaction end callback {callback!r}: {e}", exc_info=True)
+
+@event.listens_for(SQLAlchemySession, "after_commit")
+def _after_commit(session: SQLAlchemySession) -> None:
+    # Releasing a SAVEPOINT also fires after_commit; only the outer commit makes writes visible
+    if session.in_nested_transaction():
+        return
+    _run_callbacks([on_commit for on_commit, _ in session.info.pop(_AFTER_COMMIT_CALLBACKS, [])])
+
+@event.listens_for(SQLAlchemySession, "after_transaction_end")
+def _after_transaction_end(session: SQLAlchemySession, transaction) -> None:
+    # Callbacks still registered when the outer transaction ends belong to a rollback (or close)
+    if transaction.parent is None:
+        _run_callbacks([on_rollback for _, on_rollback in session.info.pop(_AFTER_COMMIT_CALLBACKS, [])])
+
 def get_engine():
     global _engine
     if _engine is None:
@@ -526,3 +735,36 @@ def get_session_factory():
     if _SessionLocal is None:
         raise RuntimeError("Database session factory not initialized.")
     return _SessionLocal
+
+async def execute_read(db: Union[AsyncSession, SQLAlchemySession], statement: Any) -> Any:
+    """Executes a read statement on an AsyncSession, or on a sync Session in a worker thread.
+
+    AsyncDBSessionDep yields a sync Session when the async engine is unavailable;
+    reads written against it through this helper work either way without
+    blocking the event loop.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.execute(statement)
+    return await asyncio.to_thread(db.execute, statement)
+
+def get_async_session_factory() -> Optional[async_sessionmaker]:
+    """Returns the async session factory, or None when the async engine is disabled or unavailable."""
+    return _AsyncSessionLocal
+
+async def dispose_async_engine() -> None:
+    """Closes the async engine's pooled connections; call on shutdown, on the serving event loop."""
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+def get_pool_metrics() -> Dict[str, Any]:
+    """Returns a snapshot of connection pool occupancy, checkout waits and invalidations.
+
+    With a read replica configured, its pool and last measured lag are under ``replica``.
+    """
+    global _pool_metrics
+    if _pool_metrics is None:
+        raise RuntimeError("Database engine not initialized.")
+    snapshot = _pool_metrics.snapshot()
+    if _replica_pool_metrics is not None and _replica_monitor is not None:
+        snapshot["replica"] = {**_replica_pool_metrics.snapshot(), **_replica_monitor.snapshot()}
+    return snapshot
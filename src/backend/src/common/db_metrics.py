@@ -0,0 +1,275 @@
+"""
+Connection pool and SQL statement instrumentation for the SQLAlchemy engine.
+
+``InstrumentedQueuePool`` times how long callers block waiting for a pooled
+connection, and ``PoolMetrics`` listens to pool events (connect, checkout,
+checkin, invalidate) so pool pressure can be read from a live snapshot
+instead of being inferred from slow requests.
+
+``attach_query_instrumentation`` adds cursor execute hooks that record
+statement counts, DB time and repeated statement shapes into the
+``QueryStats`` of the current request (see ``SQLInstrumentationMiddleware``),
+which is how query-per-item (N+1) patterns are spotted.
+"""
+
+import re
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event, exc, pool
+from sqlalchemy.engine import Engine
+
+from src.common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Number of most recent checkout waits kept for the percentile summary
+WAIT_SAMPLE_WINDOW = 2048
+# Checkouts that wait longer than this are logged as a sign the pool is undersized
+SLOW_CHECKOUT_WARNING_SECONDS = 1.0
+
+
+class InstrumentedQueuePool(pool.QueuePool):
+    """QueuePool that reports the time spent acquiring each connection to its PoolMetrics."""
+
+    _metrics: Optional["PoolMetrics"] = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            if self._metrics is not None:
+                self._metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        if self._metrics is not None:
+            self._metrics.record_wait(time.perf_counter() - started)
+        return connection
+
+    def recreate(self):
+        # dispose() swaps in a fresh pool; keep reporting to the same metrics
+        new_pool = super().recreate()
+        new_pool._metrics = self._metrics
+        return new_pool
+
+
+class PoolMetrics:
+    """Counters and checkout wait times for one engine's connection pool."""
+
+    def __init__(self, window: int = WAIT_SAMPLE_WINDOW):
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._waits: Deque[float] = deque(maxlen=window)
+        self._checkouts = 0
+        self._checkins = 0
+        self._connects = 0
+        self._invalidations = 0
+        self._soft_invalidations = 0
+        self._timeouts = 0
+        self._wait_count = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._peak_in_use = 0
+
+    def attach(self, engine: Engine) -> None:
+        """Registers pool event listeners on the engine.
+
+        Args:
+            engine: Engine whose pool should be observed. Checkout wait times
+                are only recorded when it uses InstrumentedQueuePool.
+        """
+        self._engine = engine
+        if isinstance(engine.pool, InstrumentedQueuePool):
+            engine.pool._metrics = self
+        else:
+            logger.info(f"Pool {type(engine.pool).__name__} is not instrumented; checkout waits will not be recorded.")
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "checkout", self._on_checkout)
+        event.listen(engine, "checkin", self._on_checkin)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "soft_invalidate", self._on_soft_invalidate)
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Records how long one caller blocked on connection checkout."""
+        with self._lock:
+            self._waits.append(seconds)
+            self._wait_count += 1
+            self._total_wait += seconds
+            self._max_wait = max(self._max_wait, seconds)
+            if timed_out:
+                self._timeouts += 1
+        if timed_out:
+            logger.warning(f"Timed out after {seconds:.3f}s waiting for a database connection; pool is exhausted.")
+        elif seconds >= SLOW_CHECKOUT_WARNING_SECONDS:
+            logger.warning(f"Waited {seconds:.3f}s for a database connection; consider raising DB_POOL_SIZE/DB_MAX_OVERFLOW.")
+
+    def _on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._connects += 1
+
+    def _on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        in_use = self._pool_stat("checkedout")
+        with self._lock:
+            self._checkouts += 1
+            if in_use is not None:
+                self._peak_in_use = max(self._peak_in_use, in_use)
+
+    def _on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self._checkins += 1
+
+    def _on_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self._invalidations += 1
+        logger.info(f"Database connection invalidated: {exception!r}")
+
+    def _on_soft_invalidate(self, dbapi_connection, connection_record, exception) -> None:
+        with self._lock:
+            self._soft_invalidations += 1
+
+    def _pool_stat(self, name: str) -> Optional[int]:
+        # QueuePool exposes size()/checkedin()/checkedout()/overflow(); other pool classes may not
+        if self._engine is None:
+            return None
+        method = getattr(self._engine.pool, name, None)
+        return method() if callable(method) else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns current pool occupancy together with the counters since startup."""
+        current_pool = self._engine.pool if self._engine is not None else None
+        occupancy = {
+            "pool_class": type(current_pool).__name__ if current_pool is not None else None,
+            "pool_size": self._pool_stat("size"),
+            "max_overflow": getattr(current_pool, "_max_overflow", None),
+            "timeout_seconds": self._pool_stat("timeout"),
+            "checked_in": self._pool_stat("checkedin"),
+            "in_use": self._pool_stat("checkedout"),
+            "overflow": self._pool_stat("overflow"),
+        }
+        with self._lock:
+            waits = sorted(self._waits)
+            counters = {
+                "peak_in_use": self._peak_in_use,
+                "connects": self._connects,
+                "checkouts": self._checkouts,
+                "checkins": self._checkins,
+                "invalidations": self._invalidations,
+                "soft_invalidations": self._soft_invalidations,
+                "checkout_timeouts": self._timeouts,
+                "checkout_wait": {
+                    "samples": len(waits),
+                    "mean_ms": round(self._total_wait / self._wait_count * 1000, 3) if self._wait_count else 0.0,
+                    "p50_ms": _percentile_ms(waits, 0.50),
+                    "p95_ms": _percentile_ms(waits, 0.95),
+                    "p99_ms": _percentile_ms(waits, 0.99),
+                    "max_ms": round(self._max_wait * 1000, 3),
+                },
+            }
+        return {**occupancy, **counters}
+
+
+def _percentile_ms(sorted_seconds, fraction: float) -> float:
+    """Nearest-rank percentile of already sorted samples, in milliseconds."""
+    if not sorted_seconds:
+        return 0.0
+    index = min(len(sorted_seconds) - 1, max(0, round(fraction * len(sorted_seconds)) - 1))
+    return round(sorted_seconds[index] * 1000, 3)
+
+
+# --- Per-request statement instrumentation --- #
+
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\?|\$\d+")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalizes a SQL statement so executions differing only in parameters compare equal.
+
+    Placeholders of any paramstyle become ``?`` and expanded IN lists collapse
+    to a single ``?``, so ``IN (?, ?, ?)`` and ``IN (?, ?)`` share a shape.
+    """
+    shape = _PLACEHOLDER.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("?", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    """Statements executed on behalf of one request (or any other scope)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statement_count = 0
+        self.total_seconds = 0.0
+        self._shapes: Counter = Counter()
+        self._shape_seconds: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        shape = statement_shape(statement)
+        with self._lock:
+            self.statement_count += 1
+            self.total_seconds += seconds
+            self._shapes[shape] += 1
+            self._shape_seconds[shape] += seconds
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int, float]]:
+        """Statement shapes executed at least threshold times, most frequent first.
+
+        Args:
+            threshold: Minimum executions of one shape to count as repeated.
+
+        Returns:
+            (shape, executions, total seconds) tuples.
+        """
+        with self._lock:
+            return [
+                (shape, count, self._shape_seconds[shape])
+                for shape, count in self._shapes.most_common()
+                if count >= threshold
+            ]
+
+
+_current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collects statements executed in the current context (and threads started from it via
+    run_in_threadpool, which copies the context) into a fresh QueryStats."""
+    stats = QueryStats()
+    token = _current_query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_query_stats.reset(token)
+
+
+# Attribute of the execution context holding the statement's start time. Kept on the
+# context rather than the connection so a statement that fails (no after_cursor_execute)
+# leaves nothing behind on the pooled connection.
+_START_TIME_ATTR = "_query_start_time"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if context is not None and _current_query_stats.get() is not None:
+        setattr(context, _START_TIME_ATTR, time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    stats = _current_query_stats.get()
+    start_time = getattr(context, _START_TIME_ATTR, None)
+    if stats is not None and start_time is not None:
+        stats.record(statement, time.perf_counter() - start_time)
+
+
+def attach_query_instrumentation(engine: Engine) -> None:
+    """Registers the cursor execute hooks feeding track_queries() on the engine.
+
+    Statements outside a track_queries() scope only cost a context variable lookup.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
@@ -0,0 +1,160 @@
+"""
+Read-replica routing for SQLAlchemy sessions.
+
+``RoutingSession`` sends SELECT statements to a replica engine while the
+current context allows replica reads (``replica_reads()``, or
+``PermissionChecker`` on GET requests) and ``ReplicaLagMonitor`` reports
+the replica within its staleness bound. Flushes, DML, locking reads, raw
+SQL and every statement of a session that has already written stay on the
+primary, so code using the session factory does not need to know whether
+a replica is configured.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from src.common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Seconds the standby is behind the primary; 0 when it has replayed all WAL it received
+# or is not in recovery at all. NULL (nothing replayed yet) counts as unknown.
+REPLICA_LAG_SQL = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Allows SELECTs of routing sessions used within the block to be served by the replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def allow_replica_reads() -> None:
+    """Allows replica reads for the rest of the current context.
+
+    Meant for request dependencies: each request runs in its own context, and
+    sync route handlers see the flag through the context copied into the threadpool.
+    """
+    _replica_reads.set(True)
+
+
+def replica_reads_allowed() -> bool:
+    """Returns True if the current context allows replica reads."""
+    return _replica_reads.get()
+
+
+class ReplicaLagMonitor:
+    """Measures replication lag at most once per interval and decides whether the replica is fresh enough."""
+
+    def __init__(
+        self,
+        probe: Callable[[], Optional[float]],
+        max_lag_seconds: float,
+        check_interval_seconds: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            probe: Returns the current lag in seconds, or None if it is unknown.
+            max_lag_seconds: Staleness bound; a replica further behind (or of unknown lag) is not used.
+            check_interval_seconds: How long a measurement is reused.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self._probe = probe
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._checked_at: Optional[float] = None
+        self._lag: Optional[float] = None
+        self._fresh = False
+
+    @classmethod
+    def for_engine(cls, engine: Engine, max_lag_seconds: float, check_interval_seconds: float = 5.0) -> "ReplicaLagMonitor":
+        """Creates a monitor that queries a Postgres standby for its replay lag."""
+        def probe() -> Optional[float]:
+            with engine.connect() as connection:
+                lag = connection.execute(REPLICA_LAG_SQL).scalar()
+            return None if lag is None else float(lag)
+        return cls(probe, max_lag_seconds, check_interval_seconds)
+
+    def is_fresh(self) -> bool:
+        """Returns True if the latest measured lag is within the staleness bound."""
+        now = self._clock()
+        with self._lock:
+            if self._checked_at is not None and now - self._checked_at < self.check_interval_seconds:
+                return self._fresh
+            # Claim this measurement; concurrent callers keep the previous verdict meanwhile
+            self._checked_at = now
+        try:
+            lag = self._probe()
+        except Exception as e:
+            logger.warning(f"Could not measure read replica lag, reading from the primary: {e}")
+            lag = None
+        fresh = lag is not None and lag <= self.max_lag_seconds
+        with self._lock:
+            if fresh != self._fresh:
+                if fresh:
+                    logger.info(f"Read replica is within {self.max_lag_seconds}s of the primary (lag: {lag:.3f}s); routing reads to it.")
+                else:
+                    logger.warning(f"Read replica lag {lag if lag is not None else 'unknown'}s exceeds {self.max_lag_seconds}s; routing reads to the primary.")
+            self._lag = lag
+            self._fresh = fresh
+        return fresh
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Returns the latest measurement without probing."""
+        with self._lock:
+            return {
+                "lag_seconds": self._lag,
+                "max_lag_seconds": self.max_lag_seconds,
+                "fresh": self._fresh,
+            }
+
+
+class RoutingSession(Session):
+    """Session bound to the primary that serves plain SELECTs from a replica when allowed."""
+
+    def __init__(
+        self,
+        *args: Any,
+        replica_bind: Optional[Engine] = None,
+        replica_monitor: Optional[ReplicaLagMonitor] = None,
+        **kwargs: Any,
+    ):
+        super().__init__(*args, **kwargs)
+        self.replica_bind = replica_bind
+        self.replica_monitor = replica_monitor
+        self._has_written = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._flushing or (clause is not None and getattr(clause, "is_dml", False)):
+            # Later reads of this session must see its own writes
+            self._has_written = True
+        elif self._reads_from_replica(clause):
+            return self.replica_bind
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+    def _reads_from_replica(self, clause: Any) -> bool:
+        if self.replica_bind is None or self._has_written or not _replica_reads.get():
+            return False
+        # Only SELECTs without FOR UPDATE/SHARE; text() and bare connection() calls stay on the primary
+        if not getattr(clause, "is_select", False) or getattr(clause, "_for_update_arg", None) is not None:
+            return False
+        return self.replica_monitor is None or self.replica_monitor.is_fresh()
@@ -1,6 +1,8 @@
-from typing import Optional, Annotated
+import asyncio
+from typing import Optional, Annotated, Union
 from fastapi import Request, HTTPException, status, Depends
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Import manager classes needed for Annotated types
 from src.controller.settings_manager import SettingsManager
@@ -20,7 +22,7 @@ from src.controller.search_manager import SearchManager
 from src.controller.tags_manager import TagsManager # Import TagsManager
 
 # Import base dependencies
-from src.common.database import get_session_factory # Import the factory function
+from src.common.database import get_session_factory, get_async_session_factory # Import the factory functions
 from src.common.config import Settings
 from src.models.users import UserInfo # Corrected import to UserInfo
 from src.common.features import FeatureAccessLevel
@@ -64,6 +66,42 @@ def get_db():
     finally:
         db.close()
 
+# Async Database Session Dependency Provider (Function)
+async def get_async_db():
+    """Yields an AsyncSession so queries await the database instead of blocking the event loop.
+
+    The session is committed on success and rolled back on error. When the
+    async engine is unavailable (DB_ASYNC_ENABLED=false, or asyncpg missing or
+    failing at startup) a sync Session is yielded instead; routes on this
+    dependency read through helpers such as database.execute_read that run
+    sync sessions in a worker thread.
+    """
+    async_session_factory = get_async_session_factory()
+    if async_session_factory is None:
+        try:
+            session_factory = get_session_factory()
+        except RuntimeError:
+            logger.critical("Database session factory not initialized!")
+            raise HTTPException(status_code=503, detail="Database session factory not available.")
+        db = session_factory()
+        try:
+            yield db
+            await asyncio.to_thread(db.commit)
+        except Exception:
+            await asyncio.to_thread(db.rollback)
+            raise
+        finally:
+            await asyncio.to_thread(db.close)
+        return
+
+    async with async_session_factory() as db:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
 # Settings Dependency Provider (Function)
 def get_settings(request: Request) -> Settings:
     # Assuming settings are loaded into app.state during startup
@@ -91,6 +129,8 @@ async def get_current_user(user_details: UserInfo = Depends(get_user_details_fro
 # Define ALL Annotated types first
 
 DBSessionDep = Annotated[Session, Depends(get_db)]
+# AsyncSession, or a sync Session when the async engine is unavailable (see get_async_db)
+AsyncDBSessionDep = Annotated[Union[AsyncSession, Session], Depends(get_async_db)]
 SettingsDep = Annotated[Settings, Depends(get_settings)]
 CurrentUserDep = Annotated[UserInfo, Depends(get_current_user)]
 WorkspaceClientDep = Annotated[WorkspaceClient, Depends(get_workspace_client)]
@@ -135,7 +175,7 @@ async def require_permission(
         )
 
     try:
-        effective_permissions = auth_manager.get_user_effective_permissions(user.groups)
+        effective_permissions = auth_manager.get_user_permission_vector(user.groups)
         has_required_permission = auth_manager.has_permission(
             effective_permissions,
             feature,
@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import List, Dict, Type
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Type
 
 class FeatureAccessLevel(str, Enum):
     NONE = "None"           # No access
@@ -120,4 +120,80 @@ def get_feature_config() -> Dict[str, Dict[str, str | List[FeatureAccessLevel]]]
 
 def get_all_access_levels() -> List[FeatureAccessLevel]:
     """Returns all possible access levels."""
-    return ALL_ACCESS_LEVELS 
\ No newline at end of file
+    return ALL_ACCESS_LEVELS 
+
+# --- Compiled permission vectors ---
+# Feature IDs interned to fixed positions, in APP_FEATURES order
+FEATURE_INDEX: Dict[str, int] = {feature_id: position for position, feature_id in enumerate(APP_FEATURES)}
+# Access level for each ACCESS_LEVEL_ORDER rank
+LEVELS_BY_RANK: List[FeatureAccessLevel] = sorted(ACCESS_LEVEL_ORDER, key=ACCESS_LEVEL_ORDER.get)
+
+
+class PermissionVector(Mapping[str, FeatureAccessLevel]):
+    """Immutable per-feature access levels packed as one rank byte per feature.
+
+    Positions follow FEATURE_INDEX, so merging roles is an element-wise max
+    and a permission check is a single indexed compare. As a read-only
+    Mapping it doubles as the Dict[str, FeatureAccessLevel] view used by
+    the rest of the API.
+    """
+    __slots__ = ("_ranks",)
+
+    def __init__(self, ranks: Optional[bytes] = None):
+        self._ranks = bytes(len(FEATURE_INDEX)) if ranks is None else bytes(ranks)
+
+    @classmethod
+    def from_levels(cls, levels: Mapping[str, FeatureAccessLevel]) -> "PermissionVector":
+        """Builds a vector from feature levels; unknown feature IDs are ignored."""
+        ranks = bytearray(len(FEATURE_INDEX))
+        for feature_id, level in levels.items():
+            position = FEATURE_INDEX.get(feature_id)
+            if position is not None:
+                ranks[position] = ACCESS_LEVEL_ORDER[FeatureAccessLevel(level)]
+        return cls(bytes(ranks))
+
+    @classmethod
+    def merge(cls, vectors: Iterable["PermissionVector"]) -> "PermissionVector":
+        """Returns the highest level per feature across vectors (NONE for no vectors)."""
+        ranks = bytes(len(FEATURE_INDEX))
+        for vector in vectors:
+            ranks = bytes(map(max, ranks, vector._ranks))
+        return cls(ranks)
+
+    def rank(self, feature_id: str) -> int:
+        """ACCESS_LEVEL_ORDER rank granted for a feature (0 for unknown features)."""
+        position = FEATURE_INDEX.get(feature_id)
+        return 0 if position is None else self._ranks[position]
+
+    def has_permission(self, feature_id: str, required_level: FeatureAccessLevel) -> bool:
+        """Checks whether the granted level for a feature meets the required level."""
+        return self.rank(feature_id) >= ACCESS_LEVEL_ORDER[required_level]
+
+    def to_dict(self) -> Dict[str, FeatureAccessLevel]:
+        """Returns a mutable copy mapping every feature ID to its level."""
+        return {feature_id: LEVELS_BY_RANK[rank] for feature_id, rank in zip(FEATURE_INDEX, self._ranks)}
+
+    def __getitem__(self, feature_id: str) -> FeatureAccessLevel:
+        position = FEATURE_INDEX.get(feature_id)
+        if position is None:
+            raise KeyError(feature_id)
+        return LEVELS_BY_RANK[self._ranks[position]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(FEATURE_INDEX)
+
+    def __len__(self) -> int:
+        return len(FEATURE_INDEX)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, PermissionVector):
+            return self._ranks == other._ranks
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._ranks)
+
+    def __repr__(self) -> str:
+        return f"PermissionVector({ {k: v.value for k, v in self.items() if v != FeatureAccessLevel.NONE} })"
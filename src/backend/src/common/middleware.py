@@ -5,6 +5,7 @@ from typing import Awaitable, Callable
 from fastapi import Request, Response, HTTPException, status
 from starlette.middleware.base import BaseHTTPMiddleware
 
+from src.common.db_metrics import track_queries
 from src.common.logging import get_logger
 
 logger = get_logger(__name__)
@@ -41,3 +42,37 @@ class ErrorHandlingMiddleware(BaseHTTPMiddleware):
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 media_type="text/plain"
             )
+
+class SQLInstrumentationMiddleware(BaseHTTPMiddleware):
+    """Middleware that reports the SQL statements each request executed.
+
+    Adds X-DB-Query-Count and X-DB-Time-Ms response headers. When one
+    statement shape runs at least n_plus_one_threshold times the request is
+    flagged as a likely N+1 pattern: X-DB-N-Plus-One carries the number of
+    such shapes and a warning names the worst one. Requires the engine hooks
+    from attach_query_instrumentation().
+    """
+
+    def __init__(self, app, n_plus_one_threshold: int = 5):
+        super().__init__(app)
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def dispatch(
+        self, request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        with track_queries() as stats:
+            response = await call_next(request)
+
+        db_time_ms = stats.total_seconds * 1000
+        response.headers["X-DB-Query-Count"] = str(stats.statement_count)
+        response.headers["X-DB-Time-Ms"] = f"{db_time_ms:.1f}"
+        repeated = stats.repeated_shapes(self.n_plus_one_threshold)
+        if repeated:
+            shape, count, seconds = repeated[0]
+            response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+            logger.warning(
+                f"Possible N+1 queries in {request.method} {request.url.path}: "
+                f"{stats.statement_count} statements ({db_time_ms:.1f}ms), {len(repeated)} shape(s) repeated "
+                f">= {self.n_plus_one_threshold}x; worst ran {count}x ({seconds * 1000:.1f}ms): {shape[:300]}"
+            )
+        return response
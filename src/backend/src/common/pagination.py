@@ -0,0 +1,163 @@
+"""
+Keyset (cursor) pagination.
+
+Instead of ``OFFSET n``, which makes the database read and discard every
+skipped row, a keyset page continues strictly after the sort key of the
+last row of the previous page. The position travels as an opaque cursor
+token, so page N costs the same index seek as page 1. Sort keys must be
+non-null and end in a unique column (usually the primary key) to make the
+order total.
+"""
+
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Generic, List, NamedTuple, Optional, Sequence, TypeVar
+from uuid import UUID
+
+from sqlalchemy import and_, or_, tuple_
+
+T = TypeVar("T")
+
+# Response header carrying the cursor of the next page on list routes that return a bare list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor token is malformed or was issued for a different ordering."""
+
+
+class KeysetKey(NamedTuple):
+    """One sort key of a keyset ordering: a mapped column and its direction."""
+    column: Any
+    descending: bool = False
+
+
+@dataclass
+class KeysetPage(Generic[T]):
+    """A page of rows and the cursor for the page after it (None on the last page)."""
+    items: List[T] = field(default_factory=list)
+    next_cursor: Optional[str] = None
+
+
+def _key_names(keys: Sequence[KeysetKey]) -> List[str]:
+    return [f"{key.column.key}{'-' if key.descending else '+'}" for key in keys]
+
+
+def _to_json(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _from_json(value: Any, column: Any) -> Any:
+    if value is None:
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is datetime:
+        return datetime.fromisoformat(value)
+    if python_type is date:
+        return date.fromisoformat(value)
+    if python_type is UUID:
+        return UUID(value)
+    return value
+
+
+def encode_cursor(keys: Sequence[KeysetKey], row: Any) -> str:
+    """Encodes the sort key values of a row as an opaque, URL-safe cursor token."""
+    payload = {
+        "k": _key_names(keys),
+        "v": [_to_json(getattr(row, key.column.key)) for key in keys],
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(keys: Sequence[KeysetKey], cursor: str) -> List[Any]:
+    """Decodes a cursor token into sort key values.
+
+    Args:
+        keys: The ordering the cursor must have been issued for.
+        cursor: Token produced by encode_cursor.
+
+    Returns:
+        One value per key, converted back to the column's Python type.
+
+    Raises:
+        InvalidCursorError: If the token is malformed or belongs to another ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        names, values = payload["k"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+    if names != _key_names(keys) or len(values) != len(keys):
+        raise InvalidCursorError("Pagination cursor does not match this listing's ordering.")
+    try:
+        return [_from_json(value, key.column) for value, key in zip(values, keys)]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Malformed pagination cursor.") from e
+
+
+def _after(keys: Sequence[KeysetKey], values: Sequence[Any]):
+    """Condition selecting rows strictly after the given key values in the keyset order."""
+    if all(key.descending == keys[0].descending for key in keys):
+        # Uniform direction: a row-value comparison the database can serve from one composite index
+        columns = tuple_(*[key.column for key in keys])
+        bound = tuple_(*values)
+        return columns < bound if keys[0].descending else columns > bound
+    # Mixed directions: (k1 > v1) OR (k1 = v1 AND k2 < v2) OR ...
+    clauses = []
+    for position, key in enumerate(keys):
+        equal_prefix = [keys[i].column == values[i] for i in range(position)]
+        beyond = key.column < values[position] if key.descending else key.column > values[position]
+        clauses.append(and_(*equal_prefix, beyond))
+    return or_(*clauses)
+
+
+def apply_keyset(query: Any, keys: Sequence[KeysetKey], *, limit: int, cursor: Optional[str] = None) -> Any:
+    """Orders a query by the keyset and restricts it to the page after the cursor.
+
+    Works for ORM ``Query`` objects and 2.0-style ``select()`` statements. One
+    row more than the limit is selected so build_page can tell whether
+    another page follows.
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded for these keys.
+    """
+    if cursor:
+        query = query.filter(_after(keys, decode_cursor(keys, cursor)))
+    order_by = [key.column.desc() if key.descending else key.column.asc() for key in keys]
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def build_page(rows: Sequence[T], keys: Sequence[KeysetKey], limit: int) -> KeysetPage[T]:
+    """Turns the rows fetched by an apply_keyset query into a page with its next cursor."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return KeysetPage(items=rows)
+    items = rows[:limit]
+    return KeysetPage(items=items, next_cursor=encode_cursor(keys, items[-1]))
+
+
+def keyset_paginate(query: Any, keys: Sequence[KeysetKey], *, limit: int, cursor: Optional[str] = None) -> KeysetPage:
+    """Fetches one keyset page of an ORM ``Query``.
+
+    Args:
+        query: Query with filters and loader options applied, but no ordering or limit.
+        keys: Sort keys, ending in a unique column.
+        limit: Maximum number of rows on the page.
+        cursor: next_cursor of the previous page, or None for the first page.
+
+    Returns:
+        The page of rows and the cursor of the following page.
+    """
+    return build_page(apply_keyset(query, keys, limit=limit, cursor=cursor).all(), keys, limit)
@@ -1,17 +1,23 @@
 import logging
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+from typing import Any, Dict, Generic, Iterator, List, Optional, Sequence, Type, TypeVar, Union
 
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, lazyload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select, func, String as SAString
+from sqlalchemy import insert, inspect as sa_inspect, select, func, String as SAString
+from sqlalchemy.dialects import postgresql, sqlite
 from uuid import UUID
 
 from src.common.database import Base
 from .logging import get_logger
+from .pagination import KeysetKey, KeysetPage, apply_keyset, build_page, keyset_paginate
 
 logger = get_logger(__name__)
 
+# Rows per INSERT statement in create_many/upsert_many
+DEFAULT_BULK_BATCH_SIZE = 500
+
 # Define TypeVars for generic repository
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -30,19 +36,34 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         """
         self.model = model
 
+    @property
+    def keyset_keys(self) -> Sequence[KeysetKey]:
+        """Sort keys used by get_page; override to page in a different (still total) order."""
+        return (KeysetKey(self.model.id),)
+
+    def _page_query(self, db: Session):
+        """Base query of get_page; override to add loader options or fixed filters."""
+        return db.query(self.model)
+
+    def _page_statement(self):
+        """Base statement of get_page_async; override to add eager loads (lazy loads fail on an AsyncSession)."""
+        return select(self.model)
+
+    def _normalize_id(self, id: Any) -> Any:
+        """Normalizes a UUID to string if the model primary key is a String column."""
+        try:
+            model_id_column = getattr(self.model, 'id').property.columns[0]
+            if isinstance(model_id_column.type, SAString) and isinstance(id, UUID):
+                return str(id)
+        except Exception:
+            # If any introspection fails, fall back to original id
+            pass
+        return id
+
     def get(self, db: Session, id: Any) -> Optional[ModelType]:
         logger.debug(f"Fetching {self.model.__name__} with id: {id}")
         try:
-            # Normalize UUID to string if model primary key is String
-            normalized_id = id
-            try:
-                model_id_column = getattr(self.model, 'id').property.columns[0]
-                if isinstance(model_id_column.type, SAString) and isinstance(id, UUID):
-                    normalized_id = str(id)
-            except Exception:
-                # If any introspection fails, fall back to original id
-                normalized_id = id
-
+            normalized_id = self._normalize_id(id)
             return db.query(self.model).filter(self.model.id == normalized_id).first()
         except SQLAlchemyError as e:
             logger.error(f"Database error fetching {self.model.__name__} by id {id}: {e}", exc_info=True)
@@ -60,6 +81,30 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.rollback()
             raise
 
+    def get_page(
+        self, db: Session, *, limit: int = 100, cursor: Optional[str] = None
+    ) -> KeysetPage[ModelType]:
+        """Fetches one page in keyset order, continuing after the given cursor.
+
+        Args:
+            db: Database session.
+            limit: Maximum number of rows on the page.
+            cursor: next_cursor of the previous page, or None for the first page.
+
+        Returns:
+            The page of rows and the cursor of the following page (None on the last page).
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or from another ordering.
+        """
+        logger.debug(f"Fetching page of {self.model.__name__} with limit: {limit}, cursor: {cursor}")
+        try:
+            return keyset_paginate(self._page_query(db), self.keyset_keys, limit=limit, cursor=cursor)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching page of {self.model.__name__}: {e}", exc_info=True)
+            db.rollback()
+            raise
+
     def create(self, db: Session, *, obj_in: CreateSchemaType) -> ModelType:
         logger.debug(f"Creating new {self.model.__name__}")
         obj_in_data = obj_in.dict()
@@ -77,6 +122,133 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
             db.rollback()
             raise
 
+    def _bulk_rows(self, objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """Converts schemas/dicts to column value dicts, rejecting keys that are not mapped columns."""
+        column_keys = {attr.key for attr in sa_inspect(self.model).column_attrs}
+        rows = [dict(obj) if isinstance(obj, dict) else obj.dict() for obj in objs_in]
+        unknown = {key for row in rows for key in row} - column_keys
+        if unknown:
+            raise ValueError(f"{self.model.__name__} has no columns {sorted(unknown)}; bulk writes only take flat column values.")
+        return rows
+
+    @staticmethod
+    def _batches(rows: List[Any], batch_size: int) -> Iterator[List[Any]]:
+        for start in range(0, len(rows), max(1, batch_size)):
+            yield rows[start:start + batch_size]
+
+    def create_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+    ) -> List[ModelType]:
+        """Inserts many rows with one INSERT ... RETURNING per batch instead of a flush per row.
+
+        Column defaults apply as in create(). Relationships are not cascaded, so
+        child rows need their own create_many call.
+
+        Args:
+            db: Database session.
+            objs_in: Schemas or dicts of column values.
+            batch_size: Maximum rows per statement.
+
+        Returns:
+            The inserted objects, in input order.
+        """
+        rows = self._bulk_rows(objs_in)
+        logger.debug(f"Bulk creating {len(rows)} {self.model.__name__} rows (batch size {batch_size})")
+        # The ORM starts a new statement whenever the set of non-None values changes between
+        # consecutive rows, so rows are batched per such set and the results put back in input order
+        groups: Dict[tuple, List[int]] = {}
+        for index, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(k for k, v in row.items() if v is not None)), []).append(index)
+        statement = insert(self.model).returning(self.model, sort_by_parameter_order=True).options(lazyload("*"))
+        created: List[Optional[ModelType]] = [None] * len(rows)
+        try:
+            for indexes in groups.values():
+                for batch in self._batches(indexes, batch_size):
+                    for index, obj in zip(batch, db.scalars(statement, [rows[i] for i in batch]).all()):
+                        created[index] = obj
+            logger.info(f"Successfully created {len(created)} {self.model.__name__} rows")
+            return created
+        except SQLAlchemyError as e:
+            logger.error(f"Database error bulk creating {self.model.__name__}: {e}", exc_info=True)
+            db.rollback()
+            raise
+
+    def upsert_many(
+        self,
+        db: Session,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        conflict_columns: Optional[Sequence[str]] = None,
+        update_columns: Optional[Sequence[str]] = None,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+    ) -> List[ModelType]:
+        """Inserts many rows, updating those that already exist, with INSERT ... ON CONFLICT DO UPDATE.
+
+        Args:
+            db: Database session.
+            objs_in: Schemas or dicts of column values.
+            conflict_columns: Columns of the unique constraint that identifies
+                existing rows. Defaults to the primary key.
+            update_columns: Columns overwritten on conflict. Defaults to the
+                columns given in each row, except the conflict columns. An
+                empty list inserts new rows only (existing ones are not returned).
+            batch_size: Maximum rows per statement.
+
+        Returns:
+            The inserted or updated objects, refreshed from the database.
+        """
+        rows = self._bulk_rows(objs_in)
+        if not rows:
+            return []
+        conflict_columns = list(conflict_columns or [column.key for column in sa_inspect(self.model).primary_key])
+
+        dialect = db.get_bind().dialect.name
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}.get(dialect)
+        logger.debug(f"Bulk upserting {len(rows)} {self.model.__name__} rows on {conflict_columns} ({dialect})")
+        try:
+            if dialect_insert is None:
+                # No ON CONFLICT support: fall back to one merge per row
+                logger.warning(f"Dialect '{dialect}' has no ON CONFLICT upsert; merging {self.model.__name__} rows one by one.")
+                merged = [db.merge(self.model(**row)) for row in rows]
+                db.flush()
+                return merged
+
+            # A multi-row VALUES clause takes its columns from the first row, so rows are grouped by key set
+            groups: Dict[tuple, List[Dict[str, Any]]] = {}
+            for row in rows:
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+
+            upserted: List[ModelType] = []
+            for keys, group in groups.items():
+                columns = update_columns if update_columns is not None else [key for key in keys if key not in conflict_columns]
+                upserted.extend(self._upsert_group(db, dialect_insert, group, conflict_columns, columns, batch_size))
+            logger.info(f"Successfully upserted {len(upserted)} {self.model.__name__} rows")
+            return upserted
+        except SQLAlchemyError as e:
+            logger.error(f"Database error bulk upserting {self.model.__name__}: {e}", exc_info=True)
+            db.rollback()
+            raise
+
+    def _upsert_group(self, db: Session, dialect_insert, rows, conflict_columns, update_columns, batch_size) -> List[ModelType]:
+        upserted: List[ModelType] = []
+        for batch in self._batches(rows, batch_size):
+            statement = dialect_insert(self.model).values(batch)
+            if update_columns:
+                statement = statement.on_conflict_do_update(
+                    index_elements=conflict_columns,
+                    set_={key: statement.excluded[key] for key in update_columns},
+                )
+            else:
+                statement = statement.on_conflict_do_nothing(index_elements=conflict_columns)
+            statement = statement.returning(self.model).options(lazyload("*"))
+            result = db.scalars(statement, execution_options={"populate_existing": True})
+            upserted.extend(result.all())
+        return upserted
+
     def update(
         self, db: Session, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
@@ -111,15 +283,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def remove(self, db: Session, *, id: Any) -> Optional[ModelType]:
         logger.debug(f"Deleting {self.model.__name__} with id: {id}")
         try:
-            # Normalize UUID to string if model primary key is String
-            normalized_id = id
-            try:
-                model_id_column = getattr(self.model, 'id').property.columns[0]
-                if isinstance(model_id_column.type, SAString) and isinstance(id, UUID):
-                    normalized_id = str(id)
-            except Exception:
-                normalized_id = id
-
+            normalized_id = self._normalize_id(id)
             obj = db.query(self.model).get(normalized_id)
             if obj:
                 db.delete(obj)
@@ -151,4 +315,110 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     def is_empty(self, db: Session) -> bool:
         """Checks if the table associated with the model is empty."""
-        return self.count(db) == 0 
\ No newline at end of file
+        return self.count(db) == 0 
+
+    # --- Async variants (AsyncSession) --- #
+    # Same semantics as the sync methods, for routes using AsyncDBSessionDep. Relationships
+    # are not lazily loadable on an AsyncSession; load them eagerly in the statement.
+
+    async def get_async(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
+        logger.debug(f"Fetching {self.model.__name__} with id: {id} (async)")
+        try:
+            statement = select(self.model).where(self.model.id == self._normalize_id(id))
+            return (await db.scalars(statement)).first()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching {self.model.__name__} by id {id}: {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def get_multi_async(
+        self, db: AsyncSession, *, skip: int = 0, limit: int = 100
+    ) -> List[ModelType]:
+        logger.debug(f"Fetching multiple {self.model.__name__} with skip: {skip}, limit: {limit} (async)")
+        try:
+            result = await db.scalars(select(self.model).offset(skip).limit(limit))
+            return list(result.all())
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching multiple {self.model.__name__}: {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def get_page_async(
+        self, db: AsyncSession, *, limit: int = 100, cursor: Optional[str] = None
+    ) -> KeysetPage[ModelType]:
+        """Async get_page: one page in keyset order, continuing after the given cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or from another ordering.
+        """
+        logger.debug(f"Fetching page of {self.model.__name__} with limit: {limit}, cursor: {cursor} (async)")
+        statement = apply_keyset(self._page_statement(), self.keyset_keys, limit=limit, cursor=cursor)
+        try:
+            result = await db.scalars(statement)
+            return build_page(result.all(), self.keyset_keys, limit)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching page of {self.model.__name__}: {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def create_async(self, db: AsyncSession, *, obj_in: CreateSchemaType) -> ModelType:
+        logger.debug(f"Creating new {self.model.__name__} (async)")
+        db_obj = self.model(**obj_in.dict())  # type: ignore
+        try:
+            db.add(db_obj)
+            await db.flush()
+            await db.refresh(db_obj)
+            logger.info(f"Successfully created {self.model.__name__} with id: {db_obj.id}")
+            return db_obj
+        except SQLAlchemyError as e:
+            logger.error(f"Database error creating {self.model.__name__}: {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def update_async(
+        self, db: AsyncSession, *, db_obj: ModelType, obj_in: Union[UpdateSchemaType, Dict[str, Any]]
+    ) -> ModelType:
+        logger.debug(f"Updating {self.model.__name__} with id: {db_obj.id} (async)")
+        update_data = dict(obj_in) if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        # Never allow primary key changes via generic update
+        update_data.pop('id', None)
+        try:
+            for field, value in update_data.items():
+                if hasattr(db_obj, field):
+                    setattr(db_obj, field, value)
+                else:
+                    logger.warning(f"Attempted to update non-existent field '{field}' on {self.model.__name__}")
+            db.add(db_obj)
+            await db.flush()
+            await db.refresh(db_obj)
+            logger.info(f"Successfully updated {self.model.__name__} with id: {db_obj.id}")
+            return db_obj
+        except SQLAlchemyError as e:
+            logger.error(f"Database error updating {self.model.__name__} (id: {db_obj.id}): {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def remove_async(self, db: AsyncSession, *, id: Any) -> Optional[ModelType]:
+        logger.debug(f"Deleting {self.model.__name__} with id: {id} (async)")
+        try:
+            obj = await db.get(self.model, self._normalize_id(id))
+            if obj is None:
+                logger.warning(f"Attempted to delete non-existent {self.model.__name__} with id: {id}")
+                return None
+            await db.delete(obj)
+            await db.flush()
+            logger.info(f"Successfully deleted {self.model.__name__} with id: {id}")
+            return obj
+        except SQLAlchemyError as e:
+            logger.error(f"Database error deleting {self.model.__name__} (id: {id}): {e}", exc_info=True)
+            await db.rollback()
+            raise
+
+    async def count_async(self, db: AsyncSession) -> int:
+        """Returns the total number of items in the table."""
+        try:
+            return (await db.execute(select(func.count()).select_from(self.model))).scalar_one()
+        except SQLAlchemyError as e:
+            logger.error(f"Database error counting {self.model.__name__}: {e}", exc_info=True)
+            await db.rollback()
+            raise
@@ -1,31 +1,64 @@
 import json
-from dataclasses import dataclass
+import os
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, TypeVar
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Type, TypeVar
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, so an index log must then have a single writer process
+    fcntl = None
 
 from .config import get_config_manager
 from .logging import get_logger
+from .search_ranking import BM25Ranker, tokenize
 
 logger = get_logger(__name__)
 
 T = TypeVar('T')
 
+# Compact a log once it holds this many superseded records (and they outnumber live ones)
+COMPACTION_MIN_DEAD_RECORDS = 1000
+
 @dataclass
 class SearchIndex:
-    """Represents a search index for a dataclass."""
+    """Represents a search index for a dataclass.
+
+    Items are persisted in an append-only log (one JSON record per line) and
+    served from memory: ``documents`` holds the latest version of each item
+    and ``ranker`` the relevance statistics used by search. Several worker
+    processes may append to the same log; each replays the records appended
+    since ``replayed_offset`` before answering a search (see
+    SearchService._catch_up) and compacts it as described in SearchService._compact.
+    """
     name: str
     model_class: Type[T]
     search_fields: List[str]
     index_file: Path
+    documents: Dict[Any, Dict[str, Any]] = field(default_factory=dict, repr=False)
+    ranker: Optional[BM25Ranker] = field(default=None, repr=False)
+    dead_records: int = 0
+    replayed_offset: int = 0
+    replayed_inode: Optional[int] = None
+    lock: threading.RLock = field(default_factory=threading.RLock, repr=False)
+    writer: Optional[BinaryIO] = field(default=None, repr=False)
+    compacting: bool = False
 
 class SearchService:
     """Service for indexing and searching dataclasses."""
 
-    def __init__(self) -> None:
-        """Initialize the search service."""
-        config = get_config_manager()
-        self.index_dir = config.data_dir / 'search'
+    def __init__(self, index_dir: Optional[Path] = None) -> None:
+        """Initialize the search service.
+
+        Args:
+            index_dir: Directory for index logs; defaults to <data_dir>/search
+        """
+        if index_dir is None:
+            index_dir = get_config_manager().data_dir / 'search'
+        self.index_dir = Path(index_dir)
         self.index_dir.mkdir(parents=True, exist_ok=True)
         self.indices: Dict[str, SearchIndex] = {}
 
@@ -36,28 +69,40 @@ class SearchService:
         search_fields: List[str]
     ) -> None:
         """Register a new search index.
-        
+
+        Existing items are loaded from the index log; later appends (by any
+        process) are replayed incrementally. An index file in the previous
+        whole-file JSON format is migrated to a log.
+
         Args:
             name: Name of the index
             model_class: Dataclass to index
             search_fields: List of fields to include in search
         """
-        index_file = self.index_dir / f"{name}.json"
-        self.indices[name] = SearchIndex(
+        index_file = self.index_dir / f"{name}.log"
+        index = SearchIndex(
             name=name,
             model_class=model_class,
             search_fields=search_fields,
-            index_file=index_file
+            index_file=index_file,
         )
-        logger.info(f"Registered search index {name}")
+        legacy_file = self.index_dir / f"{name}.json"
+        if not index_file.exists() and legacy_file.exists():
+            self._migrate_legacy_index(index, legacy_file)
+        self._load_index(index)
+        self.indices[name] = index
+        logger.info(f"Registered search index {name} with {len(index.documents)} items")
 
     def index_item(self, name: str, item: Any) -> None:
         """Index a single item.
-        
+
+        The item is appended to the index log and applied to the in-memory
+        index; superseded records are reclaimed by background compaction.
+
         Args:
             name: Name of the index
             item: Item to index
-            
+
         Raises:
             KeyError: If index not found
         """
@@ -65,7 +110,6 @@ class SearchService:
             raise KeyError(f"Index {name} not found")
 
         index = self.indices[name]
-        items = self._load_index(index)
 
         # Convert item to dict and extract search fields
         item_dict = {
@@ -75,17 +119,16 @@ class SearchService:
         item_dict['id'] = getattr(item, 'id', None)
         item_dict['_indexed_at'] = datetime.utcnow().isoformat()
 
-        # Update or append item
-        for i, existing in enumerate(items):
-            if existing['id'] == item_dict['id']:
-                items[i] = item_dict
-                break
-        else:
-            items.append(item_dict)
-
-        self._save_index(index, items)
+        with index.lock:
+            self._append_record(index, item_dict)
+            # Applies the record just appended, after any appended before it by other processes
+            self._catch_up(index)
+            needs_compaction = self._needs_compaction(index)
         logger.debug(f"Indexed item {item_dict['id']} in {name}")
 
+        if needs_compaction:
+            self._schedule_compaction(index)
+
     def search(
         self,
         name: str,
@@ -94,16 +137,16 @@ class SearchService:
         offset: int = 0
     ) -> List[Dict[str, Any]]:
         """Search for items in an index.
-        
+
         Args:
             name: Name of the index
             query: Search query
             limit: Maximum number of results
             offset: Number of results to skip
-            
+
         Returns:
             List of matching items
-            
+
         Raises:
             KeyError: If index not found
         """
@@ -111,56 +154,312 @@ class SearchService:
             raise KeyError(f"Index {name} not found")
 
         index = self.indices[name]
-        items = self._load_index(index)
 
-        # Simple prefix search on all search fields
-        query = query.lower()
-        matches = []
+        with index.lock:
+            # Items indexed by other worker processes since the last search
+            self._catch_up(index)
+            # Rank by BM25 over the search fields (prefix and typo-tolerant term matching);
+            # equally relevant items are returned most recently indexed first
+            if tokenize(query):
+                ranked = index.ranker.top_k(query, k=offset + limit)
+                return [dict(index.documents[json.loads(doc_key)]) for _, doc_key in ranked][offset:offset + limit]
 
-        for item in items:
-            for field in index.search_fields:
-                if field in item and isinstance(item[field], str):
-                    if item[field].lower().startswith(query):
-                        matches.append(item)
-                        break
+            # Queries without word characters fall back to plain prefix matching
+            query = query.lower()
+            matches = []
+
+            for item in index.documents.values():
+                for field_name in index.search_fields:
+                    if field_name in item and isinstance(item[field_name], str):
+                        if item[field_name].lower().startswith(query):
+                            matches.append(dict(item))
+                            break
 
         # Sort by most recently indexed
         matches.sort(key=lambda x: x['_indexed_at'], reverse=True)
 
         return matches[offset:offset + limit]
 
-    def _load_index(self, index: SearchIndex) -> List[Dict[str, Any]]:
-        """Load items from an index file.
-        
+    def compact(self, name: str) -> None:
+        """Rewrite an index log so it only holds the latest record per item.
+
+        Args:
+            name: Name of the index
+
+        Raises:
+            KeyError: If index not found
+        """
+        if name not in self.indices:
+            raise KeyError(f"Index {name} not found")
+        self._compact(self.indices[name])
+
+    def _doc_key(self, item_id: Any) -> str:
+        """Ranker document key for an item id (ids may be None or non-strings)."""
+        return json.dumps(item_id)
+
+    def _apply_record(self, index: SearchIndex, item_dict: Dict[str, Any]) -> None:
+        """Apply a log record to the in-memory index."""
+        item_id = item_dict.get('id')
+        if item_id in index.documents:
+            index.dead_records += 1
+        index.documents[item_id] = item_dict
+        index.ranker.add(
+            self._doc_key(item_id),
+            {field_name: item_dict.get(field_name) for field_name in index.search_fields if isinstance(item_dict.get(field_name), str)}
+        )
+
+    def _append_record(self, index: SearchIndex, item_dict: Dict[str, Any]) -> None:
+        """Append a record to the index log.
+
+        Appends hold a shared lock on the log, so a compaction (in any process)
+        can swap the log in between; the handle is reopened once the log file
+        has been replaced.
+
+        Args:
+            index: Search index
+            item_dict: Record to append
+        """
+        try:
+            with _file_lock(self._lock_path(index), exclusive=False):
+                if index.writer is not None and self._log_replaced(index):
+                    index.writer.close()
+                    index.writer = None
+                if index.writer is None:
+                    index.writer = open(index.index_file, 'ab')
+                index.writer.write(json.dumps(item_dict).encode('utf-8') + b"\n")
+                index.writer.flush()
+        except Exception as e:
+            logger.error(f"Error appending to index {index.name}: {e!s}")
+            raise
+
+    def _load_index(self, index: SearchIndex) -> None:
+        """Replay the index log into memory, dropping a torn record at its end.
+
+        Args:
+            index: Search index
+        """
+        if index.index_file.exists():
+            # Appends hold the shared lock, so an incomplete last record is not
+            # being written right now: it was torn by a crash and would corrupt
+            # the next record appended after it
+            with _file_lock(self._lock_path(index), exclusive=True):
+                size = index.index_file.stat().st_size
+                with open(index.index_file, 'rb') as f:
+                    f.seek(max(0, size - 1))
+                    torn = size > 0 and f.read(1) != b"\n"
+                if torn:
+                    with open(index.index_file, 'rb') as f:
+                        valid_end = f.read().rfind(b"\n") + 1
+                    logger.warning(f"Truncating torn tail of index {index.name} at offset {valid_end}")
+                    with open(index.index_file, 'r+b') as f:
+                        f.truncate(valid_end)
+        self._catch_up(index)
+
+    def _reset_index(self, index: SearchIndex, inode: Optional[int]) -> None:
+        """Empty the in-memory index before replaying a (new) log from its start."""
+        index.documents = {}
+        index.ranker = BM25Ranker({field_name: 1.0 for field_name in index.search_fields}, prefer_recent=True)
+        index.dead_records = 0
+        index.replayed_offset = 0
+        index.replayed_inode = inode
+
+    def _catch_up(self, index: SearchIndex) -> None:
+        """Apply the records appended to the index log since it was last replayed.
+
+        Only the new bytes are read; a log replaced by a compaction (in any
+        process) is replayed from its start. Must be called with index.lock held.
+
         Args:
             index: Search index
-            
-        Returns:
-            List of indexed items
         """
-        if not index.index_file.exists():
-            return []
+        try:
+            stat = os.stat(index.index_file)
+        except FileNotFoundError:
+            if index.ranker is None:
+                self._reset_index(index, None)
+            return
+        if stat.st_ino == index.replayed_inode and stat.st_size <= index.replayed_offset:
+            return
 
         try:
-            with open(index.index_file) as f:
-                return json.load(f)
+            with open(index.index_file, 'rb') as f:
+                inode = os.fstat(f.fileno()).st_ino
+                if inode != index.replayed_inode:
+                    self._reset_index(index, inode)
+                f.seek(index.replayed_offset)
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        # Only complete records; an append by another process may be half written
+        end = data.rfind(b"\n") + 1
+        offset = index.replayed_offset
+        for line in data[:end].splitlines(keepends=True):
+            try:
+                self._apply_record(index, json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.error(f"Skipping corrupt record in index {index.name} at offset {offset}: {e!s}")
+            offset += len(line)
+        index.replayed_offset += end
+
+    def _migrate_legacy_index(self, index: SearchIndex, legacy_file: Path) -> None:
+        """Convert a whole-file JSON index into an index log.
+
+        Args:
+            index: Search index
+            legacy_file: Index file in the previous JSON list format
+        """
+        try:
+            with open(legacy_file) as f:
+                items = json.load(f)
         except json.JSONDecodeError as e:
             logger.error(f"Error loading index {index.name}: {e!s}")
-            return []
+            return
+
+        # Oldest first, so replaying the log keeps the most recent version of an item
+        items.sort(key=lambda x: x.get('_indexed_at', ''))
+        self._write_log(index.index_file, items)
+        legacy_file.rename(legacy_file.with_suffix('.json.migrated'))
+        logger.info(f"Migrated index {index.name} ({len(items)} items) to an append-only log")
+
+    def _needs_compaction(self, index: SearchIndex) -> bool:
+        return (
+            not index.compacting
+            and index.dead_records >= COMPACTION_MIN_DEAD_RECORDS
+            and index.dead_records > len(index.documents)
+        )
+
+    def _schedule_compaction(self, index: SearchIndex) -> None:
+        """Compact an index log on a background thread."""
+        with index.lock:
+            if index.compacting:
+                return
+            index.compacting = True
+        threading.Thread(
+            target=self._compact,
+            args=(index,),
+            name=f"search-compaction-{index.name}",
+            daemon=True,
+        ).start()
+
+    def _lock_path(self, index: SearchIndex) -> Path:
+        """Lock file guarding appends to (shared) and swaps of (exclusive) an index log."""
+        return index.index_file.with_suffix('.lock')
+
+    def _log_replaced(self, index: SearchIndex) -> bool:
+        """Whether the index log was replaced (compacted) since the writer opened it."""
+        try:
+            return os.fstat(index.writer.fileno()).st_ino != os.stat(index.index_file).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _compact(self, index: SearchIndex) -> None:
+        """Rewrite an index log with only the latest record per item.
+
+        The log is shared by all worker processes, so it is compacted from the
+        file rather than from this process's memory, by one process at a time:
+
+        1. Without blocking appends or searches, the latest record per item
+           up to the current end of the log is written to a new file.
+        2. Under the exclusive log lock, records appended meanwhile (by any
+           process) are copied over and the new file replaces the log.
+           Writers notice the replaced file and reopen it on their next append;
+           every process replays the new log on its next search.
 
-    def _save_index(self, index: SearchIndex, items: List[Dict[str, Any]]) -> None:
-        """Save items to an index file.
-        
         Args:
             index: Search index
-            items: List of items to save
         """
         try:
-            with open(index.index_file, 'w') as f:
-                json.dump(items, f, indent=2)
+            with _file_lock(index.index_file.with_suffix('.compact.lock'), exclusive=True, blocking=False) as owner:
+                if not owner:
+                    logger.info(f"Index {index.name} is being compacted by another process. Skipping.")
+                    return
+                if not index.index_file.exists():
+                    return
+                with open(index.index_file, 'rb') as f:
+                    data = f.read()
+                # Only complete records; a concurrent append may be half written
+                end = data.rfind(b"\n") + 1
+                latest: Dict[str, Dict[str, Any]] = {}
+                for line in data[:end].splitlines():
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    latest[self._doc_key(record.get('id'))] = record
+                documents = sorted(latest.values(), key=lambda x: x.get('_indexed_at', ''))
+                tmp_file = self._write_tmp_log(index.index_file, documents)
+
+                with _file_lock(self._lock_path(index), exclusive=True):
+                    with open(index.index_file, 'rb') as f:
+                        f.seek(end)
+                        tail = f.read()
+                    with open(tmp_file, 'ab') as f:
+                        f.write(tail)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_file, index.index_file)
+                appended = tail.count(b"\n")
+            # Each process replays the new log (including this one) on its next search or append
+            logger.info(f"Compacted index {index.name}: kept {len(documents)} items, {appended} records appended meanwhile")
         except Exception as e:
-            logger.error(f"Error saving index {index.name}: {e!s}")
+            logger.error(f"Error compacting index {index.name}: {e!s}")
+        finally:
+            index.compacting = False
+
+    def _write_tmp_log(self, index_file: Path, items: List[Dict[str, Any]]) -> Path:
+        """Write items to a temporary file next to an index log.
+
+        Args:
+            index_file: Index log path
+            items: Records to write, in log order
+
+        Returns:
+            Path of the written (and fsynced) temporary file
+        """
+        tmp_file = index_file.with_suffix(index_file.suffix + '.tmp')
+        try:
+            with open(tmp_file, 'wb') as f:
+                for item in items:
+                    f.write(json.dumps(item).encode('utf-8') + b"\n")
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception as e:
+            logger.error(f"Error saving index {index_file.stem}: {e!s}")
             raise
+        return tmp_file
+
+    def _write_log(self, index_file: Path, items: List[Dict[str, Any]]) -> None:
+        """Atomically write items as a new index log.
+
+        Args:
+            index_file: Index log path
+            items: Records to write, in log order
+        """
+        os.replace(self._write_tmp_log(index_file, items), index_file)
+
+
+@contextmanager
+def _file_lock(path: Path, exclusive: bool, blocking: bool = True) -> Iterator[bool]:
+    """Holds an advisory lock on path (created if missing) across processes.
+
+    Yields:
+        False if a non-blocking attempt found the lock taken, else True.
+    """
+    if fcntl is None:
+        yield True
+        return
+    with open(path, 'a+b') as f:
+        flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+        try:
+            fcntl.flock(f.fileno(), flags if blocking else flags | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
 
 # Global search service instance
 search_service: Optional[SearchService] = None
@@ -172,10 +471,10 @@ def init_search_service() -> None:
 
 def get_search_service() -> SearchService:
     """Get the global search service instance.
-    
+
     Returns:
         Search service
-        
+
     Raises:
         RuntimeError: If search service is not initialized
     """
@@ -0,0 +1,333 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.common.search_interfaces import SearchIndexItem
+from src.common.search_ranking import DEFAULT_FIELD_BOOSTS, FUZZY_FALLBACK_MAX_MATCHES, BM25Ranker, CorpusStatistics, select_top, tokenize
+from src.common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Item fields with facet counts; "tags" is multi-valued
+FACET_FIELDS = ("type", "feature_id", "tags")
+DEFAULT_TOP_TAGS = 10
+
+
+def normalize_term(value: object) -> str:
+    """Normalizes a field value or query into its index form (case-insensitive)."""
+    return str(value).lower()
+
+
+def bitset_from_positions(positions: Iterable[int]) -> int:
+    """Builds an int bitset with the given bit positions set, in one pass."""
+    positions = list(positions)
+    if not positions:
+        return 0
+    buffer = bytearray(max(positions) // 8 + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _facet_values(item: SearchIndexItem, facet: str) -> Set[str]:
+    if facet == "tags":
+        return {str(tag) for tag in item.tags or [] if tag}
+    value = getattr(item, facet, None)
+    return {str(value)} if value else set()
+
+
+def _prefix_terms(item: SearchIndexItem) -> Set[str]:
+    """Normalized title, description and tags of an item, for whole-value prefix matching."""
+    terms: Set[str] = set()
+    if item.title:
+        terms.add(normalize_term(item.title))
+    if item.description:
+        terms.add(normalize_term(item.description))
+    for tag in item.tags or []:
+        tag_term = normalize_term(tag)
+        if tag_term:
+            terms.add(tag_term)
+    return terms
+
+
+class PartitionedSearchIndex:
+    """Search index split into one partition per feature_id.
+
+    Authorization in the global search is granted per feature, so a query can
+    first select the partitions the caller may read and then match only inside
+    those, instead of matching everything and filtering item by item.
+
+    Each partition holds its items and a BM25Ranker (postings, vocabulary,
+    trigram index), so ranking a query only expands terms and walks postings
+    of the readable partitions. The rankers share one CorpusStatistics, which
+    keeps IDF and length normalization corpus-wide and scores comparable
+    across features.
+
+    For facet counts every item is assigned a bit position, and each facet
+    value (type, feature_id, tag) keeps an int bitset of the items carrying
+    it. Counting a facet value for a result set is then a single AND plus a
+    popcount instead of a pass over the matching items.
+    """
+
+    def __init__(self, items: Iterable[SearchIndexItem] = ()):
+        self._lock = threading.RLock()
+        # Last occurrence of an id wins, as if the items were upserted in order
+        latest: Dict[str, SearchIndexItem] = {}
+        for item in items:
+            latest.pop(item.id, None)
+            latest[item.id] = item
+
+        grouped: Dict[str, List[SearchIndexItem]] = {}
+        for item in latest.values():
+            grouped.setdefault(item.feature_id, []).append(item)
+
+        # Items per partition, in index order (an upserted item moves to the end)
+        self._partitions: Dict[str, Dict[str, SearchIndexItem]] = {
+            feature_id: {item.id: item for item in feature_items} for feature_id, feature_items in grouped.items()
+        }
+        self._item_partitions: Dict[str, str] = {item_id: item.feature_id for item_id, item in latest.items()}
+        self._items_by_id: Dict[str, SearchIndexItem] = latest
+        self._corpus_stats = CorpusStatistics(DEFAULT_FIELD_BOOSTS)
+        self._rankers: Dict[str, BM25Ranker] = {}
+        for feature_id, feature_items in grouped.items():
+            self._ranker_for(feature_id).add_many((item.id, self._ranking_fields(item)) for item in feature_items)
+
+        self._bit_positions: Dict[str, int] = {item_id: position for position, item_id in enumerate(latest)}
+        self._next_bit_position = len(self._bit_positions)
+        facet_positions: Dict[str, Dict[str, List[int]]] = {facet: {} for facet in FACET_FIELDS}
+        for item in latest.values():
+            position = self._bit_positions[item.id]
+            for facet in FACET_FIELDS:
+                for value in _facet_values(item, facet):
+                    facet_positions[facet].setdefault(value, []).append(position)
+        self._facet_bitsets: Dict[str, Dict[str, int]] = {
+            facet: {value: bitset_from_positions(positions) for value, positions in values.items()}
+            for facet, values in facet_positions.items()
+        }
+
+    @staticmethod
+    def _ranking_fields(item: SearchIndexItem) -> Dict[str, object]:
+        return {'title': item.title, 'description': item.description, 'tags': item.tags or []}
+
+    def _ranker_for(self, feature_id: str) -> BM25Ranker:
+        ranker = self._rankers.get(feature_id)
+        if ranker is None:
+            ranker = self._rankers[feature_id] = BM25Ranker(stats=self._corpus_stats)
+        return ranker
+
+    def __len__(self) -> int:
+        return len(self._item_partitions)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._item_partitions
+
+    @property
+    def items(self) -> List[SearchIndexItem]:
+        """Live indexed items, grouped by partition."""
+        with self._lock:
+            return [item for partition in self._partitions.values() for item in partition.values()]
+
+    @property
+    def term_count(self) -> int:
+        """Number of distinct terms, counted per partition."""
+        return sum(ranker.vocabulary_size for ranker in list(self._rankers.values()))
+
+    @property
+    def partition_ids(self) -> List[str]:
+        """Feature ids that currently have a partition."""
+        return list(self._partitions)
+
+    def partition_sizes(self) -> Dict[str, int]:
+        return {feature_id: len(partition) for feature_id, partition in list(self._partitions.items())}
+
+    def _set_facet_bits(self, item: SearchIndexItem, enabled: bool) -> None:
+        position = self._bit_positions[item.id]
+        for facet in FACET_FIELDS:
+            bitsets = self._facet_bitsets[facet]
+            for value in _facet_values(item, facet):
+                if enabled:
+                    bitsets[value] = bitsets.get(value, 0) | (1 << position)
+                else:
+                    remaining = bitsets.get(value, 0) & ~(1 << position)
+                    if remaining:
+                        bitsets[value] = remaining
+                    else:
+                        bitsets.pop(value, None)
+
+    def upsert(self, item: SearchIndexItem) -> None:
+        """Adds an item to its feature partition, moving it if its feature_id changed."""
+        with self._lock:
+            previous_item = self._items_by_id.get(item.id)
+            if previous_item is not None:
+                self._set_facet_bits(previous_item, enabled=False)
+            elif item.id not in self._bit_positions:
+                self._bit_positions[item.id] = self._next_bit_position
+                self._next_bit_position += 1
+            previous_feature_id = self._item_partitions.get(item.id)
+            if previous_feature_id is not None and previous_feature_id != item.feature_id:
+                self._remove_from_partition(previous_feature_id, item.id)
+            partition = self._partitions.setdefault(item.feature_id, {})
+            partition.pop(item.id, None)
+            partition[item.id] = item
+            self._item_partitions[item.id] = item.feature_id
+            self._items_by_id[item.id] = item
+            self._ranker_for(item.feature_id).add(item.id, self._ranking_fields(item))
+            self._set_facet_bits(item, enabled=True)
+
+    def remove(self, item_id: str) -> bool:
+        """Removes the item with the given id. Returns False if it was not indexed."""
+        with self._lock:
+            feature_id = self._item_partitions.pop(item_id, None)
+            if feature_id is None:
+                return False
+            self._set_facet_bits(self._items_by_id.pop(item_id), enabled=False)
+            # Bit positions are not reused; a rebuild starts from a dense range again
+            del self._bit_positions[item_id]
+            self._remove_from_partition(feature_id, item_id)
+            return True
+
+    def _remove_from_partition(self, feature_id: str, item_id: str) -> None:
+        """Drops an item from a partition and its ranker."""
+        del self._partitions[feature_id][item_id]
+        self._rankers[feature_id].remove(item_id)
+
+    def prefix_search(self, query: str, feature_ids: Optional[Iterable[str]] = None) -> List[SearchIndexItem]:
+        """
+        Returns the items whose title, description or any tag starts with the
+        query (case-insensitive), restricted to the given feature partitions.
+
+        This is a scan over the partitions' items; search() only falls back to it
+        for queries without word characters, which the ranker cannot match.
+
+        Args:
+            query: The raw query string.
+            feature_ids: Partitions to search; None searches all of them.
+
+        Returns:
+            List of matching SearchIndexItems, grouped by partition.
+        """
+        prefix = normalize_term(query) if query else ""
+        if not prefix:
+            return []
+        with self._lock:
+            if feature_ids is None:
+                partitions = list(self._partitions.values())
+            else:
+                partitions = [self._partitions[f] for f in feature_ids if f in self._partitions]
+            return [
+                item for partition in partitions for item in partition.values()
+                if any(term.startswith(prefix) for term in _prefix_terms(item))
+            ]
+
+    def get(self, item_id: str) -> Optional[SearchIndexItem]:
+        return self._items_by_id.get(item_id)
+
+    def search(
+        self,
+        query: str,
+        feature_ids: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[SearchIndexItem]:
+        """
+        Relevance-ranked search restricted to the given feature partitions.
+
+        Items must match every query token and are scored with BM25 over
+        title, description and tags; the last token also matches as a prefix,
+        and typo-tolerant matching kicks in when few items match otherwise
+        (see BM25Ranker). Queries without any word characters fall back to
+        plain prefix matching.
+
+        Args:
+            query: The raw query string.
+            feature_ids: Partitions to search; None searches all of them.
+            limit: Maximum number of results; None returns all matches.
+
+        Returns:
+            List of matching SearchIndexItems, most relevant first.
+        """
+        with self._lock:
+            ranked_ids = self.rank(query, feature_ids=feature_ids, limit=limit)
+            return [self._items_by_id[item_id] for item_id in ranked_ids]
+
+    def search_with_facets(
+        self,
+        query: str,
+        feature_ids: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+        top_tags: int = DEFAULT_TOP_TAGS,
+    ) -> Tuple[List[SearchIndexItem], int, Dict[str, Dict[str, int]]]:
+        """
+        Like search(), additionally counting all matches per facet value.
+
+        Args:
+            query: The raw query string.
+            feature_ids: Partitions to search; None searches all of them.
+            limit: Maximum number of results; facets always cover all matches.
+            top_tags: Number of most frequent tags to report.
+
+        Returns:
+            Tuple of (results, total number of matches, facet counts).
+        """
+        with self._lock:
+            ranked_ids = self.rank(query, feature_ids=feature_ids)
+            results = [self._items_by_id[item_id] for item_id in ranked_ids[:limit]]
+            return results, len(ranked_ids), self.facet_counts(ranked_ids, top_tags=top_tags)
+
+    def rank(
+        self,
+        query: str,
+        feature_ids: Optional[Iterable[str]] = None,
+        limit: Optional[int] = None,
+    ) -> List[str]:
+        """
+        Ids of the items matching the query, most relevant first (see search()).
+
+        Only the rankers of the given partitions are consulted, so terms of
+        unreadable features are neither expanded nor scored. Fuzzy matches are
+        only looked for when exact and prefix matching find fewer than
+        FUZZY_FALLBACK_MAX_MATCHES items across those partitions. With a limit
+        only the top items are selected (via a heap); without one all matches
+        are returned.
+        """
+        allowed = None if feature_ids is None else set(feature_ids)
+        if not tokenize(query):
+            return [item.id for item in self.prefix_search(query, feature_ids=allowed)[:limit]]
+        with self._lock:
+            rankers = [
+                ranker for feature_id, ranker in self._rankers.items()
+                if allowed is None or feature_id in allowed
+            ]
+            scores: Dict[str, float] = {}
+            for ranker in rankers:
+                scores.update(ranker.score(query))
+            if len(scores) < FUZZY_FALLBACK_MAX_MATCHES:
+                for ranker in rankers:
+                    scores.update(ranker.score(query, fuzzy=True))
+            return [item_id for _, item_id in select_top(scores, self._corpus_stats.doc_sequences, k=limit)]
+
+    def facet_counts(self, item_ids: Iterable[str], top_tags: int = DEFAULT_TOP_TAGS) -> Dict[str, Dict[str, int]]:
+        """
+        Counts the given items per facet value.
+
+        Args:
+            item_ids: Ids of indexed items, e.g. all matches of a query.
+            top_tags: Number of most frequent tags to report.
+
+        Returns:
+            Mapping of each of FACET_FIELDS to {value: count}, largest first.
+        """
+        with self._lock:
+            matches = bitset_from_positions(
+                self._bit_positions[item_id] for item_id in item_ids if item_id in self._bit_positions
+            )
+            facets: Dict[str, Dict[str, int]] = {}
+            for facet in FACET_FIELDS:
+                counts = [
+                    (value, (bitset & matches).bit_count())
+                    for value, bitset in self._facet_bitsets[facet].items()
+                ]
+                counts = [(value, count) for value, count in counts if count]
+                counts.sort(key=lambda pair: (-pair[1], pair[0]))
+                if facet == "tags":
+                    counts = counts[:top_tags]
+                facets[facet] = dict(counts)
+        return facets
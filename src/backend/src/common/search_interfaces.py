@@ -1,6 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Protocol
 from pydantic import BaseModel, Field
+from sqlalchemy.orm import Session
+
+from src.common.database import call_after_commit
+from src.common.logging import get_logger
+
+logger = get_logger(__name__)
 
 class SearchIndexItem(BaseModel):
     """Standardized structure for items returned by searchable assets."""
@@ -19,9 +25,73 @@ class SearchIndexItem(BaseModel):
     class Config:
         pass # Removed frozen = True
 
+class SearchFacets(BaseModel):
+    """Number of matching items per facet value, largest first."""
+    type: Dict[str, int] = Field(default_factory=dict, description="Counts per asset type")
+    feature_id: Dict[str, int] = Field(default_factory=dict, description="Counts per feature")
+    tags: Dict[str, int] = Field(default_factory=dict, description="Counts for the most frequent tags")
+
+class SearchResults(BaseModel):
+    """Search results together with facet counts over all matches."""
+    items: List[SearchIndexItem] = Field(default_factory=list, description="Matching items, most relevant first")
+    total: int = Field(0, description="Number of matching items before applying the limit")
+    facets: SearchFacets = Field(default_factory=SearchFacets)
+    next_cursor: Optional[str] = Field(None, description="Cursor for the next page, if there are more results")
+
+class SearchIndexUpdater(Protocol):
+    """Receiver of incremental search index updates (implemented by SearchManager)."""
+
+    def upsert_item(self, item: SearchIndexItem, source: Optional["SearchableAsset"] = None) -> None: ...
+
+    def remove_item(self, item_id: str) -> None: ...
+
+
 class SearchableAsset(ABC):
     """Abstract Base Class for managers that provide searchable items."""
 
+    _search_index_updater: Optional[SearchIndexUpdater] = None
+
+    def set_search_index_updater(self, updater: Optional[SearchIndexUpdater]) -> None:
+        """Registers the index that should receive incremental updates from this manager."""
+        self._search_index_updater = updater
+
+    def _notify_search_upsert(self, item: Optional[SearchIndexItem], db: Optional[Session] = None) -> None:
+        """Pushes a created or changed item to the search index, if one is attached.
+
+        Args:
+            item: The item to index.
+            db: Session holding the uncommitted write, if any; the item is then
+                pushed once it commits, and never if it rolls back.
+        """
+        if item is None or self._search_index_updater is None:
+            return
+        if db is not None:
+            call_after_commit(db, lambda: self._notify_search_upsert(item))
+            return
+        try:
+            self._search_index_updater.upsert_item(item, source=self)
+        except Exception as e:
+            # Never fail the write path because of search; the periodic rebuild will catch up
+            logger.warning(f"Failed to update search index for item {item.id}: {e}")
+
+    def _notify_search_remove(self, item_id: str, db: Optional[Session] = None) -> None:
+        """Removes an item from the search index, if one is attached.
+
+        Args:
+            item_id: Search index id of the item.
+            db: Session holding the uncommitted delete, if any; the item is then
+                removed once it commits, and never if it rolls back.
+        """
+        if self._search_index_updater is None:
+            return
+        if db is not None:
+            call_after_commit(db, lambda: self._notify_search_remove(item_id))
+            return
+        try:
+            self._search_index_updater.remove_item(item_id)
+        except Exception as e:
+            logger.warning(f"Failed to remove item {item_id} from search index: {e}")
+
     @abstractmethod
     def get_search_index_items(self) -> List[SearchIndexItem]:
         """
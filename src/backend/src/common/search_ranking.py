@@ -0,0 +1,443 @@
+import heapq
+import math
+import re
+from bisect import bisect_left, insort
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, Union
+
+from src.common.logging import get_logger
+
+logger = get_logger(__name__)
+
+# BM25 saturation and length normalization parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Default per-field boosts for SearchIndexItems
+DEFAULT_FIELD_BOOSTS: Dict[str, float] = {
+    'title': 3.0,
+    'tags': 2.0,
+    'description': 1.0,
+}
+
+# Relative weight of a query token expanded to a longer term ("sal" -> "sales")
+PREFIX_MATCH_WEIGHT = 0.8
+# Relative weight per edit for fuzzy matches ("slaes" -> "sales" scores 0.5x)
+FUZZY_MATCH_WEIGHT = 0.5
+# Query tokens shorter than this are never fuzzy-matched
+FUZZY_MIN_TOKEN_LENGTH = 4
+# Query tokens at least this long tolerate two edits instead of one
+FUZZY_TWO_EDITS_MIN_TOKEN_LENGTH = 8
+# Fuzzy matches are only looked for when exact and prefix matching find fewer documents
+FUZZY_FALLBACK_MAX_MATCHES = 10
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+FieldValue = Union[str, Iterable[str], None]
+
+
+def tokenize(text: object) -> List[str]:
+    """Splits a value into lowercase word tokens."""
+    if text is None:
+        return []
+    return _TOKEN_PATTERN.findall(str(text).lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    """Returns the padded character trigrams of a token."""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_levenshtein(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Computes the Levenshtein distance between two strings, giving up early.
+
+    Args:
+        a: First string.
+        b: Second string.
+        max_distance: Largest distance of interest.
+
+    Returns:
+        The edit distance, or None if it exceeds max_distance.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    if a == b:
+        return 0
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        row_min = i
+        for j, char_b in enumerate(b, start=1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            row_min = min(row_min, current[j])
+        if row_min > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+def max_edits_for(token: str) -> int:
+    """Number of edits tolerated when fuzzy-matching a query token."""
+    if len(token) < FUZZY_MIN_TOKEN_LENGTH:
+        return 0
+    return 2 if len(token) >= FUZZY_TWO_EDITS_MIN_TOKEN_LENGTH else 1
+
+
+class CorpusStatistics:
+    """Document count, field lengths and document frequencies of one corpus.
+
+    Several BM25Rankers can share one instance, e.g. one ranker per
+    authorization partition: each keeps its own postings and vocabulary, so
+    a query only touches the partitions it searches, while IDF and length
+    normalization still reflect the whole corpus and scores stay comparable
+    across partitions.
+    """
+
+    def __init__(self, fields: Iterable[str]):
+        self.doc_count = 0
+        self.field_length_totals: Dict[str, int] = {field: 0 for field in fields}
+        self.doc_freqs: Counter = Counter()
+        # Insertion sequence per document, shared by all rankers and used to break
+        # score ties deterministically
+        self.doc_sequences: Dict[str, int] = {}
+        self.next_sequence = 0
+
+    def idf(self, term: str) -> float:
+        doc_freq = self.doc_freqs[term]
+        return math.log(1.0 + (self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5))
+
+    def avg_lengths(self) -> Dict[str, float]:
+        if not self.doc_count:
+            return {field: 0.0 for field in self.field_length_totals}
+        return {field: total / self.doc_count for field, total in self.field_length_totals.items()}
+
+
+def select_top(
+    scores: Mapping[str, float],
+    sequences: Mapping[str, int],
+    k: Optional[int] = None,
+    prefer_recent: bool = False,
+) -> List[Tuple[float, str]]:
+    """
+    Orders scored documents best first, keeping only the top k via a heap.
+
+    Args:
+        scores: Mapping of doc_id to score.
+        sequences: Insertion sequence per doc_id, used to break ties.
+        k: Maximum number of results; None returns all of them.
+        prefer_recent: Break ties in favour of later documents instead of earlier ones.
+
+    Returns:
+        List of (score, doc_id) tuples, best first.
+    """
+    if k is None:
+        # Two stable sorts on plain int and float keys are much cheaper than one on
+        # (score, sequence) tuples: order by sequence first, so that sorting by score
+        # keeps ties in that order
+        doc_ids = sorted(scores, key=sequences.__getitem__, reverse=prefer_recent)
+        doc_ids.sort(key=scores.__getitem__, reverse=True)
+        return [(scores[doc_id], doc_id) for doc_id in doc_ids]
+    tie_sign = 1 if prefer_recent else -1
+    top = heapq.nlargest(k, scores, key=lambda doc_id: (scores[doc_id], tie_sign * sequences[doc_id]))
+    return [(scores[doc_id], doc_id) for doc_id in top]
+
+
+class BM25Ranker:
+    """Incrementally maintained BM25F ranker with prefix and fuzzy term expansion.
+
+    Documents are added as a mapping of field name to text (or a list of
+    values, e.g. tags). Postings map each term to the documents containing it
+    and their per-field term frequencies; together with the field lengths and
+    document frequencies kept up to date on every add/remove, scoring a query
+    needs no pass over the corpus.
+
+    A document matches a query if it matches every query token (AND). Tokens
+    match exact vocabulary terms; the last token also matches longer terms it
+    is a prefix of, as it may still be being typed. Only when that finds fewer
+    than FUZZY_FALLBACK_MAX_MATCHES documents are longer tokens also expanded
+    to fuzzy candidates, which come from a trigram index and are verified with
+    a bounded edit distance. Only the documents in the intersection are scored.
+    """
+
+    def __init__(
+        self,
+        field_boosts: Optional[Mapping[str, float]] = None,
+        prefer_recent: bool = False,
+        stats: Optional[CorpusStatistics] = None,
+    ):
+        """
+        Args:
+            field_boosts: Field name to boost; defaults to DEFAULT_FIELD_BOOSTS.
+            prefer_recent: Break score ties in favour of the most recently added
+                document instead of the earliest one.
+            stats: Corpus statistics shared with other rankers over the same
+                corpus; by default the ranker keeps its own.
+        """
+        self.field_boosts: Dict[str, float] = dict(field_boosts or DEFAULT_FIELD_BOOSTS)
+        self.prefer_recent = prefer_recent
+        self.stats = stats if stats is not None else CorpusStatistics(self.field_boosts)
+        self._fields: Tuple[str, ...] = tuple(self.field_boosts)
+        self._boosts: Tuple[float, ...] = tuple(self.field_boosts.values())
+        # Term -> {doc_id: term frequency per field, in self._fields order}
+        self._postings: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        self._doc_terms: Dict[str, Tuple[str, ...]] = {}
+        self._doc_field_lengths: Dict[str, Tuple[int, ...]] = {}
+        # Term frequency tuples repeat a lot (mostly a single 1), so equal ones are shared
+        self._frequency_tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        # Field length tuples repeat a lot as well
+        self._length_tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+        self._vocabulary: List[str] = []
+        self._trigram_index: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    @property
+    def vocabulary_size(self) -> int:
+        return len(self._vocabulary)
+
+    def add(self, doc_id: str, fields: Mapping[str, FieldValue]) -> None:
+        """Adds a document, replacing any existing document with the same id."""
+        self.remove(doc_id)
+        for term in self._index_document(doc_id, fields):
+            insort(self._vocabulary, term)
+
+    def add_many(self, documents: Iterable[Tuple[str, Mapping[str, FieldValue]]]) -> None:
+        """Adds documents in bulk, sorting the vocabulary once instead of per new term."""
+        latest: Dict[str, Mapping[str, FieldValue]] = {}
+        for doc_id, fields in documents:
+            latest.pop(doc_id, None)
+            latest[doc_id] = fields
+        for doc_id in latest:
+            self.remove(doc_id)
+        new_terms: List[str] = []
+        for doc_id, fields in latest.items():
+            new_terms.extend(self._index_document(doc_id, fields))
+        if new_terms:
+            self._vocabulary = sorted(self._postings)
+
+    def _index_document(self, doc_id: str, fields: Mapping[str, FieldValue]) -> List[str]:
+        """Records a document's term statistics and returns the terms new to the vocabulary."""
+        field_counts: List[Counter] = []
+        field_lengths: List[int] = []
+        for field in self._fields:
+            value = fields.get(field)
+            if value is None:
+                tokens = []
+            elif isinstance(value, str):
+                tokens = tokenize(value)
+            else:
+                tokens = [token for part in value for token in tokenize(part)]
+            field_counts.append(Counter(tokens))
+            field_lengths.append(len(tokens))
+            self.stats.field_length_totals[field] += len(tokens)
+
+        terms = tuple({term for counts in field_counts for term in counts})
+        self._doc_terms[doc_id] = terms
+        lengths = tuple(field_lengths)
+        self._doc_field_lengths[doc_id] = self._length_tuples.setdefault(lengths, lengths)
+        self.stats.doc_sequences[doc_id] = self.stats.next_sequence
+        self.stats.next_sequence += 1
+        self.stats.doc_count += 1
+        new_terms = []
+        for term in terms:
+            self.stats.doc_freqs[term] += 1
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                new_terms.append(term)
+                for gram in trigrams(term):
+                    self._trigram_index.setdefault(gram, set()).add(term)
+            frequencies = tuple(counts.get(term, 0) for counts in field_counts)
+            postings[doc_id] = self._frequency_tuples.setdefault(frequencies, frequencies)
+        return new_terms
+
+    def remove(self, doc_id: str) -> bool:
+        """Removes a document. Returns False if it was not present."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        del self.stats.doc_sequences[doc_id]
+        self.stats.doc_count -= 1
+        for field, length in zip(self._fields, self._doc_field_lengths.pop(doc_id)):
+            self.stats.field_length_totals[field] -= length
+        for term in terms:
+            self.stats.doc_freqs[term] -= 1
+            if not self.stats.doc_freqs[term]:
+                del self.stats.doc_freqs[term]
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                position = bisect_left(self._vocabulary, term)
+                del self._vocabulary[position]
+                for gram in trigrams(term):
+                    grams = self._trigram_index[gram]
+                    grams.discard(term)
+                    if not grams:
+                        del self._trigram_index[gram]
+        return True
+
+    def _expand(self, token: str, prefix: bool, fuzzy: bool) -> Dict[str, float]:
+        """Maps a query token to the vocabulary terms it matches and their weights."""
+        expansions: Dict[str, float] = {}
+        if token in self._postings:
+            expansions[token] = 1.0
+
+        if prefix:
+            position = bisect_left(self._vocabulary, token)
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(token):
+                term = self._vocabulary[position]
+                if term != token:
+                    expansions[term] = PREFIX_MATCH_WEIGHT
+                position += 1
+
+        max_edits = max_edits_for(token) if fuzzy else 0
+        if max_edits:
+            query_grams = trigrams(token)
+            # q-gram lemma: each edit destroys at most three trigrams
+            min_shared = max(1, len(query_grams) - 3 * max_edits)
+            shared_counts: Counter = Counter()
+            for gram in query_grams:
+                shared_counts.update(self._trigram_index.get(gram, ()))
+            for term, shared in shared_counts.items():
+                if shared < min_shared or term in expansions:
+                    continue
+                distance = bounded_levenshtein(token, term, max_edits)
+                if distance is not None:
+                    expansions[term] = FUZZY_MATCH_WEIGHT ** distance
+        return expansions
+
+    def _matching_docs(self, expansions: Mapping[str, float]) -> Set[str]:
+        """Documents containing any of a token's expansions."""
+        matches: Set[str] = set()
+        for term in expansions:
+            matches.update(self._postings[term])
+        return matches
+
+    def score(self, query: str, fuzzy: bool = False) -> Dict[str, float]:
+        """
+        Scores the documents matching every query token.
+
+        Args:
+            query: The raw query string.
+            fuzzy: Also expand tokens to fuzzy (typo-tolerant) matches; see top_k()
+                for when that is worth its cost.
+
+        Returns:
+            Mapping of matching doc_id to its BM25 score.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or not self._doc_terms:
+            return {}
+        token_expansions = [
+            self._expand(token, prefix=position == len(tokens) - 1, fuzzy=fuzzy)
+            for position, token in enumerate(tokens)
+        ]
+        if not all(token_expansions):
+            return {}
+
+        # Intersect starting from the token with the fewest postings; later tokens only
+        # test membership for the remaining candidates. A single token needs no candidates,
+        # as its expansions' postings are exactly the matches.
+        token_expansions.sort(key=lambda expansions: sum(len(self._postings[term]) for term in expansions))
+        candidates: Optional[Set[str]] = None
+        if len(token_expansions) > 1:
+            candidates = self._matching_docs(token_expansions[0])
+            for expansions in token_expansions[1:]:
+                candidates &= self._matching_docs(expansions)
+                if not candidates:
+                    return {}
+
+        avg_lengths = self.stats.avg_lengths()
+        averages = tuple(avg_lengths[field] for field in self._fields)
+        # Every candidate matches every token, so each token scores the same documents
+        scores: Dict[str, float] = {}
+        for expansions in token_expansions:
+            token_scores = self._token_scores(expansions, candidates, averages)
+            if not scores:
+                scores = token_scores
+            else:
+                for doc_id, score in token_scores.items():
+                    scores[doc_id] += score
+        return scores
+
+    def _token_scores(
+        self,
+        expansions: Mapping[str, float],
+        candidates: Optional[Set[str]],
+        averages: Tuple[float, ...],
+    ) -> Dict[str, float]:
+        """Scores a query token for the candidates (or all its matches), taking its best-matching expansion per document."""
+        doc_field_lengths = self._doc_field_lengths
+        boosts = self._boosts
+        token_scores: Dict[str, float] = {}
+        # Largest postings first, so the later expansions have fewer documents to merge
+        for term in sorted(expansions, key=lambda term: len(self._postings[term]), reverse=True):
+            postings = self._postings[term]
+            scale = expansions[term] * self.stats.idf(term) * (BM25_K1 + 1.0)
+            if candidates is None:
+                docs = postings.items()
+            elif len(candidates) < len(postings):
+                docs = [(doc_id, postings[doc_id]) for doc_id in candidates if doc_id in postings]
+            else:
+                docs = [(doc_id, frequencies) for doc_id, frequencies in postings.items() if doc_id in candidates]
+            # Frequency and length tuples are shared between documents, so the score
+            # only needs computing once per distinct pair of them
+            pair_scores: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], float] = {}
+            term_scores: Dict[str, float] = {}
+            for doc_id, frequencies in docs:
+                pair = (frequencies, doc_field_lengths[doc_id])
+                score = pair_scores.get(pair)
+                if score is None:
+                    weighted_tf = 0.0
+                    for tf, boost, length, average in zip(frequencies, boosts, pair[1], averages):
+                        if tf:
+                            weighted_tf += boost * tf / (1.0 - BM25_B + BM25_B * (length / average if average else 1.0))
+                    score = pair_scores[pair] = scale * weighted_tf / (weighted_tf + BM25_K1)
+                term_scores[doc_id] = score
+            if not token_scores:
+                token_scores = term_scores
+            else:
+                for doc_id, score in term_scores.items():
+                    if score > token_scores.get(doc_id, 0.0):
+                        token_scores[doc_id] = score
+        return token_scores
+
+    def select(self, scores: Mapping[str, float], k: Optional[int] = None) -> List[Tuple[float, str]]:
+        """
+        Orders scored documents best first, keeping only the top k via a heap.
+
+        Args:
+            scores: Mapping of doc_id to score, as returned by score().
+            k: Maximum number of results; None returns all of them.
+
+        Returns:
+            List of (score, doc_id) tuples, best first. Ties follow insertion order.
+        """
+        return select_top(scores, self.stats.doc_sequences, k=k, prefer_recent=self.prefer_recent)
+
+    def top_k(self, query: str, k: Optional[int] = None) -> List[Tuple[float, str]]:
+        """
+        Scores the documents matching every query token and returns the best ones.
+
+        Fuzzy matches are only looked for when exact and prefix matching find fewer
+        than FUZZY_FALLBACK_MAX_MATCHES documents.
+
+        Args:
+            query: The raw query string.
+            k: Maximum number of results; None returns all matches.
+
+        Returns:
+            List of (score, doc_id) tuples, best first. Ties follow insertion order.
+        """
+        scores = self.score(query)
+        if len(scores) < FUZZY_FALLBACK_MAX_MATCHES:
+            scores = self.score(query, fuzzy=True)
+        return self.select(scores, k=k)
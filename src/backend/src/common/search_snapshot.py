@@ -0,0 +1,130 @@
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Iterable, List, Optional, Tuple, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, every process writes its own snapshots
+    fcntl = None
+
+from src.common.logging import get_logger
+from src.common.search_interfaces import SearchIndexItem
+
+logger = get_logger(__name__)
+
+SNAPSHOT_MAGIC = "UCSIDX"
+# Bump whenever the record layout or SearchIndexItem fields change incompatibly
+SNAPSHOT_FORMAT_VERSION = 2
+
+SnapshotEntry = Tuple[SearchIndexItem, Optional[str]]
+
+
+@dataclass
+class SearchIndexSnapshot:
+    """Contents of a snapshot written by write_snapshot."""
+    entries: List[SnapshotEntry]
+    created_at: float
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.created_at)
+
+
+def write_snapshot(path: Union[str, Path], entries: Iterable[SnapshotEntry]) -> int:
+    """
+    Atomically writes a search index snapshot.
+
+    The file holds a JSON header line (format version, creation time) followed
+    by one JSON record per item: the item and the name of the manager that owns it.
+
+    Args:
+        path: Destination file; parent directories are created as needed.
+        entries: (item, owner name) pairs to persist.
+
+    Returns:
+        Number of records written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    records = [json.dumps({"item": item.model_dump(), "owner": owner}, separators=(",", ":")) for item, owner in entries]
+    header = {"magic": SNAPSHOT_MAGIC, "version": SNAPSHOT_FORMAT_VERSION, "count": len(records), "created_at": time.time()}
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(header) + "\n")
+            for record in records:
+                f.write(record + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+    return len(records)
+
+
+def read_snapshot(path: Union[str, Path]) -> Optional[SearchIndexSnapshot]:
+    """
+    Loads a snapshot.
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The snapshot, or None if the file is missing, corrupt or written in
+        another format version.
+    """
+    if not Path(path).is_file():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            header = json.loads(f.readline())
+            if header.get("magic") != SNAPSHOT_MAGIC:
+                raise ValueError("not a search index snapshot")
+            if header.get("version") != SNAPSHOT_FORMAT_VERSION:
+                raise ValueError(f"unsupported snapshot format version {header.get('version')} (expected {SNAPSHOT_FORMAT_VERSION})")
+            entries: List[SnapshotEntry] = []
+            for line in f:
+                record = json.loads(line)
+                entries.append((SearchIndexItem(**record["item"]), record.get("owner")))
+        if len(entries) != header["count"]:
+            raise ValueError("snapshot is truncated")
+        snapshot = SearchIndexSnapshot(entries=entries, created_at=header["created_at"])
+        logger.info(f"Loaded search index snapshot {path} with {len(entries)} items (age {snapshot.age_seconds:.0f}s).")
+        return snapshot
+    except Exception as e:
+        logger.warning(f"Ignoring unusable search index snapshot {path}: {e}")
+        return None
+
+
+def claim_snapshot_writer(path: Union[str, Path]) -> Optional[BinaryIO]:
+    """
+    Makes the calling process the only writer of a snapshot, if no other process is.
+
+    Worker processes share the snapshot file, and one writer is enough. The
+    claim is an exclusive lock on ``<path>.lock`` that lasts until the returned
+    file is closed (at the latest when the process exits).
+
+    Args:
+        path: Snapshot file.
+
+    Returns:
+        The open lock file, or None if another process holds the claim.
+    """
+    lock_path = Path(f"{path}.lock")
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(lock_path, 'a+b')
+    if fcntl is not None:
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return None
+    return lock_file
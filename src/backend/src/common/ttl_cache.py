@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, Tuple, Type, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class _Entry(Generic[V]):
+    __slots__ = ("value", "error", "expires_at")
+
+    def __init__(self, value: Optional[V], error: Optional[BaseException], expires_at: float):
+        self.value = value
+        self.error = error
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """An in-progress load that concurrent callers for the same key wait on."""
+    __slots__ = ("done", "value", "error", "stale")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        # Set when the key is invalidated during the load; its result is then not cached
+        self.stale = False
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded, thread-safe LRU cache whose entries expire after a TTL.
+
+    Misses are loaded through ``get_or_load`` with single-flight semantics:
+    concurrent misses for the same key share one call of the loader. Loader
+    exceptions listed as negative are cached (for ``negative_ttl_seconds``)
+    and re-raised on later lookups; any other exception is passed to all
+    waiting callers but not cached. A load that was already running when its
+    key was invalidated (or the cache cleared) is not cached either, and
+    later lookups do not wait for it.
+    """
+
+    def __init__(
+        self,
+        max_size: int,
+        ttl_seconds: float,
+        negative_ttl_seconds: Optional[float] = None,
+        negative_exceptions: Tuple[Type[BaseException], ...] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_size: Maximum number of entries; least recently used entries are evicted first.
+                A value <= 0 disables caching (every lookup calls the loader, still single-flight).
+            ttl_seconds: Lifetime of a cached value.
+            negative_ttl_seconds: Lifetime of a cached negative result; defaults to ttl_seconds.
+                A value <= 0 disables negative caching.
+            negative_exceptions: Loader exception types that are cached as negative results.
+            clock: Monotonic time source (injectable for tests).
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = ttl_seconds if negative_ttl_seconds is None else negative_ttl_seconds
+        self.negative_exceptions = negative_exceptions
+        self._clock = clock
+        self._entries: "OrderedDict[K, _Entry[V]]" = OrderedDict()
+        self._inflight: Dict[K, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.load_errors = 0
+        self.evictions = 0
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        """
+        Returns the cached value for key, loading it on a miss.
+
+        Args:
+            key: Cache key.
+            loader: Called without arguments to produce the value on a miss.
+
+        Returns:
+            The cached or freshly loaded value.
+
+        Raises:
+            Whatever the loader raised; cached negative results re-raise the original exception.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > self._clock():
+                    self._entries.move_to_end(key)
+                    if entry.error is not None:
+                        self.negative_hits += 1
+                        # Drop the previous traceback so repeated raises don't keep growing it
+                        raise entry.error.with_traceback(None)
+                    self.hits += 1
+                    return entry.value
+                del self._entries[key]
+            self.misses += 1
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = loader()
+        except BaseException as e:
+            flight.error = e
+        finally:
+            with self._lock:
+                self.loads += 1
+                if flight.error is None:
+                    if not flight.stale:
+                        self._store(key, _Entry(flight.value, None, self._clock() + self.ttl_seconds))
+                elif isinstance(flight.error, self.negative_exceptions) and self.negative_ttl_seconds > 0:
+                    if not flight.stale:
+                        self._store(key, _Entry(None, flight.error, self._clock() + self.negative_ttl_seconds))
+                else:
+                    self.load_errors += 1
+                # A stale flight was already replaced (or dropped) by invalidate/clear
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.value
+
+    def _store(self, key: K, entry: _Entry[V]) -> None:
+        """Stores an entry and evicts the least recently used ones. Caller holds the lock."""
+        if self.max_size <= 0:
+            return
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: K) -> bool:
+        """Drops the entry for key and discards the result of a load in flight. Returns True if one was cached."""
+        with self._lock:
+            flight = self._inflight.pop(key, None)
+            if flight is not None:
+                flight.stale = True
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drops all entries and discards the results of loads in flight."""
+        with self._lock:
+            self._entries.clear()
+            for flight in self._inflight.values():
+                flight.stale = True
+            self._inflight.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.negative_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "negative_hits": self.negative_hits,
+                "misses": self.misses,
+                "loads": self.loads,
+                "load_errors": self.load_errors,
+                "evictions": self.evictions,
+                "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+            }
@@ -4,12 +4,14 @@ import os
 from datetime import datetime
 from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.common.config import Settings
 from src.common.logging import get_logger
+from src.common.pagination import InvalidCursorError
 from src.models.audit_log import AuditLogCreate, AuditLogRead
 from src.repositories.audit_log_repository import audit_log_repository
 from src.db_models.audit_log import AuditLogDb # Import the DB model
@@ -24,9 +26,10 @@ file_audit_logger.propagate = False
 class AuditManager:
     """Manages logging of user actions to file and database."""
 
-    def __init__(self, settings: Settings, db_session: Session):
+    def __init__(self, settings: Settings, db_session: Optional[Session] = None):
         self.settings = settings
-        self.db = db_session # Store session for potential direct use if needed, though repo is preferred
+        # Not used by the manager itself: every method takes the caller's session (or opens its own)
+        self.db = db_session
         self.repository = audit_log_repository
         self._configure_file_logger()
 
@@ -174,7 +177,7 @@ class AuditManager:
 
     async def get_audit_logs(
         self,
-        db: Session,
+        db: Union[AsyncSession, Session],
         skip: int = 0,
         limit: int = 100,
         start_time: Optional[datetime] = None,
@@ -212,4 +215,40 @@ class AuditManager:
             main_logger = get_logger(__name__)
             main_logger.error(f"Failed to retrieve audit logs from database: {e}", exc_info=True)
             # Return empty list or re-raise
-            return 0, [] 
\ No newline at end of file
+            return 0, []
+
+    async def get_audit_log_page(
+        self,
+        db: Union[AsyncSession, Session],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        username: Optional[str] = None,
+        feature: Optional[str] = None,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+    ) -> tuple[int, List[AuditLogRead], Optional[str]]:
+        """Retrieves one keyset page of audit logs (newest first) with the total count and next cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed.
+        """
+        filters = dict(
+            start_time=start_time,
+            end_time=end_time,
+            username=username,
+            feature=feature,
+            action=action,
+            success=success,
+        )
+        try:
+            total_count = await self.repository.get_multi_count(db, **filters)
+            page = await self.repository.get_page(db, limit=limit, cursor=cursor, **filters)
+            return total_count, [AuditLogRead.model_validate(log) for log in page.items], page.next_cursor
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            main_logger = get_logger(__name__)
+            main_logger.error(f"Failed to retrieve audit log page from database: {e}", exc_info=True)
+            return 0, [], None 
\ No newline at end of file
@@ -1,18 +1,104 @@
-import json
-from typing import Dict, List, Optional
-from collections import defaultdict
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, AbstractSet, Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy.orm import Session
 
 from src.controller.settings_manager import SettingsManager
 from src.models.settings import AppRole
-from src.common.features import FeatureAccessLevel, ACCESS_LEVEL_ORDER, get_feature_config
+from src.models.users import UserInfo
+from src.common.features import FeatureAccessLevel, ACCESS_LEVEL_ORDER, PermissionVector, get_feature_config
 from src.common.logging import get_logger
+from src.common.ttl_cache import TTLCache
+
+if TYPE_CHECKING:
+    from src.controller.projects_manager import ProjectsManager
 
 logger = get_logger(__name__)
 
+# Number of distinct (group set, team role override) combinations whose permissions are kept
+PERMISSION_CACHE_MAX_SIZE = 1024
+# Default lifetime of cached permissions; also bounded by SettingsManager's roles snapshot lifetime
+DEFAULT_PERMISSION_CACHE_TTL_SECONDS = 60.0
+
+PermissionKey = Tuple[int, FrozenSet[str], Optional[str]]
+T = TypeVar('T')
+
+
+@dataclass(frozen=True)
+class _RoleIndex:
+    """Immutable view of the role configuration used to resolve permissions.
+
+    Attributes:
+        version: SettingsManager.roles_version the index was built from.
+        group_roles: Group name -> names of the roles assigned to it.
+        role_permissions: Role name -> compiled permission vector.
+    """
+    version: int
+    group_roles: Mapping[str, Tuple[str, ...]]
+    role_permissions: Mapping[str, PermissionVector]
+
+    @classmethod
+    def build(cls, version: int, roles: List[AppRole]) -> "_RoleIndex":
+        feature_config = get_feature_config()
+        group_roles: Dict[str, List[str]] = {}
+        role_permissions: Dict[str, PermissionVector] = {}
+        for role in roles:
+            for feature_id in role.feature_permissions:
+                if feature_id not in feature_config:
+                    logger.warning(f"Role '{role.name}' contains permission for unknown feature ID '{feature_id}'. Skipping.")
+            role_permissions[role.name] = PermissionVector.from_levels(role.feature_permissions)
+            for group in set(role.assigned_groups or []):
+                group_roles.setdefault(group, []).append(role.name)
+        return cls(
+            version=version,
+            group_roles=MappingProxyType({group: tuple(names) for group, names in group_roles.items()}),
+            role_permissions=MappingProxyType(role_permissions),
+        )
+
+
 class AuthorizationManager:
-    def __init__(self, settings_manager: SettingsManager):
-        """Requires SettingsManager to access role configurations."""
+    def __init__(
+        self,
+        settings_manager: SettingsManager,
+        projects_manager: Optional['ProjectsManager'] = None,
+        permission_cache_ttl_seconds: float = DEFAULT_PERMISSION_CACHE_TTL_SECONDS,
+    ):
+        """Requires SettingsManager to access role configurations; ProjectsManager resolves project memberships.
+
+        Args:
+            settings_manager: Source of the role configuration and its version.
+            projects_manager: Resolves project memberships for project-scoped resources.
+            permission_cache_ttl_seconds: How long effective permissions are reused.
+        """
         self._settings_manager = settings_manager
+        self._projects_manager = projects_manager
+        self._role_index: Optional[_RoleIndex] = None
+        self._role_index_lock = threading.Lock()
+        # Effective permissions per (roles version, group set, team role override)
+        self._permissions_cache: TTLCache[PermissionKey, PermissionVector] = TTLCache(
+            max_size=PERMISSION_CACHE_MAX_SIZE, ttl_seconds=permission_cache_ttl_seconds
+        )
+
+    def _get_role_index(self) -> _RoleIndex:
+        """Returns the role index, rebuilding it if roles changed since it was built."""
+        version = self._settings_manager.roles_version
+        index = self._role_index
+        if index is not None and index.version == version:
+            return index
+        with self._role_index_lock:
+            index = self._role_index
+            if index is None or index.version != version:
+                logger.debug("Fetching all application roles from SettingsManager...")
+                all_roles = self._settings_manager.list_app_roles()
+                logger.debug(f"Fetched {len(all_roles)} roles total.")
+                index = _RoleIndex.build(version, all_roles)
+                # list_app_roles returns no roles on database errors, so don't pin an empty configuration
+                self._role_index = index if all_roles else None
+                # Entries for older versions can no longer be hit
+                self._permissions_cache.clear()
+            return index
 
     def get_user_effective_permissions(self, user_groups: Optional[List[str]], team_role_override: Optional[str] = None) -> Dict[str, FeatureAccessLevel]:
         """
@@ -27,101 +113,152 @@ class AuthorizationManager:
         Returns:
             A dictionary mapping feature IDs to the highest granted FeatureAccessLevel.
         """
-        if not user_groups:
-            user_groups = []
-            logger.warning("Received empty or None user_groups for permission calculation.") # Log if groups are empty
-        else:
-            logger.debug(f"Calculating effective permissions for user groups: {user_groups}") # Log received groups
+        return self.get_user_permission_vector(user_groups, team_role_override).to_dict()
 
-        user_group_set = set(user_groups)
-        effective_permissions: Dict[str, FeatureAccessLevel] = defaultdict(lambda: FeatureAccessLevel.NONE)
+    def get_user_permission_vector(self, user_groups: Optional[List[str]], team_role_override: Optional[str] = None) -> PermissionVector:
+        """
+        Same as get_user_effective_permissions, but returns the compiled (immutable) permission vector.
 
-        # Log before fetching roles
-        logger.debug("Fetching all application roles from SettingsManager...")
-        all_roles = self._settings_manager.list_app_roles() # Fetches roles from DB via SettingsManager
-        logger.debug(f"Fetched {len(all_roles)} roles total.")
+        Results are memoized per group set and override until the role configuration changes or they expire.
 
-        feature_config = get_feature_config()
+        Args:
+            user_groups: A list of group names the user belongs to.
+            team_role_override: Optional team role that overrides group-based permissions.
+
+        Returns:
+            The user's PermissionVector.
+        """
+        index = self._get_role_index()
+        groups = frozenset(user_groups or ())
+        return self._permissions_cache.get_or_load(
+            (index.version, groups, team_role_override or None),
+            lambda: self._compute_effective_permissions(index, groups, team_role_override),
+        )
+
+    def _compute_effective_permissions(self, index: _RoleIndex, user_groups: FrozenSet[str], team_role_override: Optional[str]) -> PermissionVector:
+        """Resolves effective permissions from the role index (uncached)."""
+        if not user_groups:
+            logger.warning("Received empty or None user_groups for permission calculation.") # Log if groups are empty
+        else:
+            logger.debug(f"Calculating effective permissions for user groups: {sorted(user_groups)}") # Log received groups
 
         # If team role override is provided, prioritize it
         if team_role_override:
             logger.debug(f"Processing team role override: {team_role_override}")
-            team_role = next((role for role in all_roles if role.name == team_role_override), None)
-            if team_role:
-                logger.debug(f"Found team role '{team_role_override}' in roles, applying as override")
-                for feature_id, assigned_level in team_role.feature_permissions.items():
-                    if feature_id in feature_config:
-                        effective_permissions[feature_id] = assigned_level
-                        logger.debug(f"Applied team role override for '{feature_id}': {assigned_level.value}")
-                    else:
-                        logger.warning(f"Team role '{team_role_override}' contains permission for unknown feature ID '{feature_id}'. Skipping.")
-
-                # Return team role permissions (team override takes full precedence)
-                for feature_id in feature_config:
-                    if feature_id not in effective_permissions:
-                        effective_permissions[feature_id] = FeatureAccessLevel.NONE
-
-                final_perms_str = {k: v.value for k, v in effective_permissions.items()}
-                logger.debug(f"Final permissions using team role override '{team_role_override}': {final_perms_str}")
-                return dict(effective_permissions)
-            else:
-                logger.warning(f"Team role override '{team_role_override}' not found in available roles. Falling back to group-based permissions.")
-
-        matching_roles = []
-        logger.debug("Identifying matching roles based on group intersection...")
-        for role in all_roles:
-            role_assigned_groups_set = set(role.assigned_groups or []) # Ensure it's a set, handle None
-            # Check for intersection
-            if user_group_set.intersection(role_assigned_groups_set):
-                matching_roles.append(role)
-                logger.debug(f"  MATCH FOUND: User group(s) {list(user_group_set.intersection(role_assigned_groups_set))} match role: '{role.name}' (Assigned: {role.assigned_groups})")
-            # else: 
-            #    logger.debug(f"  NO MATCH: User groups {list(user_group_set)} vs Role '{role.name}' groups {list(role_assigned_groups_set)}")
+            team_permissions = index.role_permissions.get(team_role_override)
+            if team_permissions is not None:
+                # Team override takes full precedence
+                logger.debug(f"Final permissions using team role override '{team_role_override}': {team_permissions!r}")
+                return team_permissions
+            logger.warning(f"Team role override '{team_role_override}' not found in available roles. Falling back to group-based permissions.")
 
+        matching_roles = sorted({name for group in user_groups for name in index.group_roles.get(group, ())})
         if not matching_roles:
-            logger.warning(f"No matching roles found for user groups: {user_groups}. Returning NONE access for all features.")
-            return {feat_id: FeatureAccessLevel.NONE for feat_id in feature_config}
-
-        logger.debug(f"Merging permissions from {len(matching_roles)} matching roles...")
-        # Merge permissions from matching roles
-        for role in matching_roles:
-            logger.debug(f"Processing permissions from role: '{role.name}'")
-            for feature_id, assigned_level in role.feature_permissions.items():
-                if feature_id not in feature_config:
-                    logger.warning(f"Role '{role.name}' contains permission for unknown feature ID '{feature_id}'. Skipping.")
-                    continue
-
-                current_effective_level = effective_permissions[feature_id]
-                # Compare levels using the defined order
-                if ACCESS_LEVEL_ORDER[assigned_level] > ACCESS_LEVEL_ORDER[current_effective_level]:
-                    effective_permissions[feature_id] = assigned_level
-                    logger.debug(f"  Updated effective permission for '{feature_id}' to '{assigned_level.value}' (was '{current_effective_level.value}') from role '{role.name}'")
-                # else:
-                #    logger.debug(f"  Keeping existing permission for '{feature_id}' ('{current_effective_level.value}') - Role '{role.name}' level ('{assigned_level.value}') is not higher.")
-
-        # Ensure all features have at least NONE permission defined
-        for feature_id in feature_config:
-            if feature_id not in effective_permissions:
-                effective_permissions[feature_id] = FeatureAccessLevel.NONE
-
-        # Log the final permissions
-        final_perms_str = {k: v.value for k, v in effective_permissions.items()}
-        logger.debug(f"Final calculated effective permissions: {final_perms_str}")
-        return dict(effective_permissions)
-
-    def has_permission(self, effective_permissions: Dict[str, FeatureAccessLevel], feature_id: str, required_level: FeatureAccessLevel) -> bool:
+            logger.warning(f"No matching roles found for user groups: {sorted(user_groups)}. Returning NONE access for all features.")
+            return PermissionVector()
+
+        logger.debug(f"Merging permissions from matching roles: {matching_roles}")
+        effective_permissions = PermissionVector.merge(index.role_permissions[name] for name in matching_roles)
+        logger.debug(f"Final calculated effective permissions: {effective_permissions!r}")
+        return effective_permissions
+
+    def has_permission(self, effective_permissions: Mapping[str, FeatureAccessLevel], feature_id: str, required_level: FeatureAccessLevel) -> bool:
         """
         Checks if the user's effective permissions meet the required level for a specific feature.
 
         Args:
-            effective_permissions: The user's calculated effective permissions.
+            effective_permissions: The user's calculated effective permissions (dict or PermissionVector).
             feature_id: The ID of the feature to check.
             required_level: The minimum FeatureAccessLevel required.
 
         Returns:
             True if the user has sufficient permission, False otherwise.
         """
+        if isinstance(effective_permissions, PermissionVector):
+            return effective_permissions.has_permission(feature_id, required_level)
         user_level = effective_permissions.get(feature_id, FeatureAccessLevel.NONE)
         has_perm = ACCESS_LEVEL_ORDER[user_level] >= ACCESS_LEVEL_ORDER[required_level]
         logger.debug(f"Permission check for feature '{feature_id}': Required='{required_level.value}', User has='{user_level.value}'. Granted: {has_perm}")
-        return has_perm 
\ No newline at end of file
+        return has_perm 
+
+    def get_access_mask(
+        self,
+        user: UserInfo,
+        resources: Sequence[Tuple[str, Optional[str]]],
+        required_level: FeatureAccessLevel = FeatureAccessLevel.READ_ONLY,
+        team_role_override: Optional[str] = None,
+        db: Optional[Session] = None,
+        accessible_project_ids: Optional[AbstractSet[str]] = None,
+    ) -> List[bool]:
+        """
+        Authorizes many resources at once, e.g. to filter a list endpoint's rows.
+
+        Effective permissions and the user's project memberships are resolved once;
+        each resource then costs a set lookup. A resource is allowed if the user has
+        required_level on its feature and, when it belongs to a project, is a member
+        of that project (through a team).
+
+        Args:
+            user: The user to authorize.
+            resources: (feature_id, project_id) pairs; project_id is None for unscoped resources.
+            required_level: The minimum FeatureAccessLevel required.
+            team_role_override: Optional team role that overrides group-based permissions.
+            db: Session used to look up project memberships (only if a resource has a project_id).
+            accessible_project_ids: Already resolved project memberships; skips the lookup.
+
+        Returns:
+            One boolean per resource, in input order.
+        """
+        permissions = self.get_user_permission_vector(user.groups, team_role_override)
+        allowed_features = {
+            feature_id for feature_id in {feature_id for feature_id, _ in resources}
+            if permissions.has_permission(feature_id, required_level)
+        }
+        if accessible_project_ids is None and any(project_id for _, project_id in resources):
+            accessible_project_ids = self._get_user_project_ids(user, db)
+        accessible_project_ids = accessible_project_ids or frozenset()
+
+        return [
+            feature_id in allowed_features and (not project_id or project_id in accessible_project_ids)
+            for feature_id, project_id in resources
+        ]
+
+    def filter_accessible(
+        self,
+        user: UserInfo,
+        rows: Sequence[T],
+        feature_id: str,
+        db: Optional[Session] = None,
+        required_level: FeatureAccessLevel = FeatureAccessLevel.READ_ONLY,
+    ) -> List[T]:
+        """
+        Keeps the rows of a feature the user may access, using get_access_mask.
+
+        Args:
+            user: The user to authorize.
+            rows: Rows of the feature; a row's ``project_id`` attribute (if set) scopes it to a project.
+            feature_id: The feature the rows belong to.
+            db: Session used to look up project memberships.
+            required_level: The minimum FeatureAccessLevel required.
+
+        Returns:
+            The accessible rows, in input order.
+        """
+        mask = self.get_access_mask(
+            user,
+            [(feature_id, getattr(row, 'project_id', None)) for row in rows],
+            required_level=required_level,
+            db=db,
+        )
+        return [row for row, allowed in zip(rows, mask) if allowed]
+
+    def _get_user_project_ids(self, user: UserInfo, db: Optional[Session]) -> AbstractSet[str]:
+        """Resolves the user's project memberships; fails closed (no projects) if they can't be looked up."""
+        if self._projects_manager is None or db is None:
+            logger.warning("Cannot resolve project memberships without ProjectsManager and a database session. Denying project-scoped resources.")
+            return frozenset()
+        try:
+            return self._projects_manager.get_user_project_ids(db, user.email, user.groups or [])
+        except Exception as e:
+            logger.error(f"Error resolving project memberships for user {user.email}: {e}", exc_info=True)
+            return frozenset()
@@ -109,6 +109,7 @@ class BusinessGlossariesManager(SearchableAsset):
                     if hasattr(term, key):
                         setattr(term, key, value)
                 term.updated = datetime.utcnow()
+                self._notify_search_upsert(self._build_search_index_item(term))
                 return term
         return None
 
@@ -117,6 +118,7 @@ class BusinessGlossariesManager(SearchableAsset):
         for glossary in self._glossaries.values():
             if term_id in glossary.terms:
                 del glossary.terms[term_id]
+                self._notify_search_remove(f"term::{term_id}")
                 return True
         return False
 
@@ -180,6 +182,7 @@ class BusinessGlossariesManager(SearchableAsset):
                 return
 
         # Clear existing data
+        previous_term_ids = [term.id for term in self.list_terms()]
         self._glossaries.clear()
         self._domains.clear()
 
@@ -255,6 +258,11 @@ class BusinessGlossariesManager(SearchableAsset):
 
             self._glossaries[glossary.id] = glossary
 
+        for term_id in previous_term_ids:
+            self._notify_search_remove(f"term::{term_id}")
+        for term in self.list_terms():
+            self._notify_search_upsert(self._build_search_index_item(term))
+
         return True
 
     def create_glossary(self, name: str, description: str, scope: str, org_unit: str,
@@ -338,7 +346,11 @@ class BusinessGlossariesManager(SearchableAsset):
 
     def delete_glossary(self, glossary_id: str) -> bool:
         """Delete a glossary"""
-        return bool(self._glossaries.pop(glossary_id, None))
+        glossary = self._glossaries.pop(glossary_id, None)
+        if glossary:
+            for term_id in glossary.terms:
+                self._notify_search_remove(f"term::{term_id}")
+        return bool(glossary)
 
     def save_to_yaml(self, file_path: str) -> bool:
         """Save glossaries to YAML file"""
@@ -398,6 +410,7 @@ class BusinessGlossariesManager(SearchableAsset):
         """Add a term to a glossary"""
         term.source_glossary_id = glossary.id
         glossary.terms[term.id] = term
+        self._notify_search_upsert(self._build_search_index_item(term))
 
     def get_term_from_glossary(self, glossary: BusinessGlossary, term_id: str) -> Optional[GlossaryTerm]:
         """Get a term from a glossary"""
@@ -412,11 +425,15 @@ class BusinessGlossariesManager(SearchableAsset):
             if hasattr(term, key):
                 setattr(term, key, value)
         term.updated_at = datetime.utcnow()
+        self._notify_search_upsert(self._build_search_index_item(term))
         return term
 
     def delete_term_from_glossary(self, glossary: BusinessGlossary, term_id: str) -> bool:
         """Delete a term from a glossary"""
-        return bool(glossary.terms.pop(term_id, None))
+        deleted = bool(glossary.terms.pop(term_id, None))
+        if deleted:
+            self._notify_search_remove(f"term::{term_id}")
+        return deleted
 
     def get_counts(self):
         domain_count = len(self._domains)
@@ -429,6 +446,26 @@ class BusinessGlossariesManager(SearchableAsset):
         }
 
     # --- Implementation of SearchableAsset --- 
+    def _build_search_index_item(self, term: GlossaryTerm) -> Optional[SearchIndexItem]:
+        """Maps a glossary term to its SearchIndexItem, or None if it cannot be indexed."""
+        if not term.id or not term.name:
+            logger.warning(f"Skipping term due to missing id or name: {term}")
+            return None
+
+        return SearchIndexItem(
+            id=f"term::{term.id}",
+            type="glossary-term",
+            feature_id="business-glossary",
+            title=term.name,
+            description=term.definition or "",
+            # Adjust link format based on frontend routing
+            link=f"/business-glossaries?termId={term.id}", 
+            tags=term.tags or []
+            # Add other fields if needed (e.g., domain, owner)
+            # domain=term.domain,
+            # owner=term.owner,
+        )
+
     def get_search_index_items(self) -> List[SearchIndexItem]:
         """Fetches glossary terms and maps them to SearchIndexItem format."""
         logger.info("Fetching glossary terms for search indexing...")
@@ -438,25 +475,9 @@ class BusinessGlossariesManager(SearchableAsset):
             terms = self.list_terms()
             
             for term in terms:
-                if not term.id or not term.name:
-                    logger.warning(f"Skipping term due to missing id or name: {term}")
-                    continue
-                    
-                items.append(
-                    SearchIndexItem(
-                        id=f"term::{term.id}",
-                        type="glossary-term",
-                        feature_id="business-glossary",
-                        title=term.name,
-                        description=term.definition or "",
-                        # Adjust link format based on frontend routing
-                        link=f"/business-glossaries?termId={term.id}", 
-                        tags=term.tags or []
-                        # Add other fields if needed (e.g., domain, owner)
-                        # domain=term.domain,
-                        # owner=term.owner,
-                    )
-                )
+                item = self._build_search_index_item(term)
+                if item:
+                    items.append(item)
             logger.info(f"Prepared {len(items)} glossary terms for search index.")
             return items
         except Exception as e:
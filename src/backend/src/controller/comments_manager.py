@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import TYPE_CHECKING, List, Optional
 import json
 
 from sqlalchemy.orm import Session
@@ -7,6 +7,10 @@ from src.common.logging import get_logger
 from src.models.comments import Comment, CommentCreate, CommentUpdate, CommentListResponse
 from src.repositories.comments_repository import comments_repo, CommentsRepository
 from src.db_models.comments import CommentStatus
+from src.models.users import UserInfo
+
+if TYPE_CHECKING:
+    from src.controller.authorization_manager import AuthorizationManager
 
 logger = get_logger(__name__)
 
@@ -71,9 +75,16 @@ class CommentsManager:
         entity_id: str,
         user_groups: Optional[List[str]] = None,
         user_email: Optional[str] = None,
-        include_deleted: bool = False
+        include_deleted: bool = False,
+        auth_manager: Optional['AuthorizationManager'] = None,
+        user: Optional[UserInfo] = None,
+        feature_id: Optional[str] = None,
     ) -> CommentListResponse:
-        """List comments for an entity, filtered by user's group membership."""
+        """List comments for an entity, filtered by user's group membership.
+
+        With auth_manager, user and feature_id, comments of projects the user is
+        not a member of are left out as well.
+        """
         logger.debug(f"Listing comments for {entity_type}:{entity_id}, user_groups: {user_groups}")
         
         # Get all comments (for total count)
@@ -105,6 +116,8 @@ class CommentsManager:
                         visible_comments.append(c)
             except Exception:
                 pass
+        if auth_manager is not None and user is not None and feature_id:
+            visible_comments = auth_manager.filter_accessible(user, visible_comments, feature_id, db=db)
         visible_count = len(visible_comments)
         
         # Convert to API models
@@ -29,131 +29,143 @@ class ComplianceManager:
     def load_from_yaml(self, db: Session, yaml_path: str) -> None:
         with open(yaml_path) as f:
             data = yaml.safe_load(f) or []
-            for raw in data:
-                model = CompliancePolicy(**{k: v for k, v in raw.items() if k not in {'examples', 'sample_runs'}})
-                # Upsert by id
-                existing = db.get(CompliancePolicyDb, str(model.id))
-                if existing:
-                    existing.name = model.name
-                    existing.description = model.description
-                    existing.rule = model.rule
-                    existing.category = model.category
-                    existing.severity = model.severity
-                    existing.is_active = model.is_active
-                    existing.updated_at = datetime.utcnow()
-                    policy_db = existing
-                else:
-                    policy_db = CompliancePolicyDb(
-                        id=str(model.id),
-                        name=model.name,
-                        description=model.description,
-                        rule=model.rule,
-                        category=model.category,
-                        severity=model.severity,
-                        is_active=model.is_active,
-                    )
-                    db.add(policy_db)
-                db.flush()
 
-                # Optional: seed sample runs and results
-                sample_runs = raw.get('sample_runs') or []
-                if isinstance(sample_runs, list) and sample_runs:
-                    for rdef in sample_runs:
-                        try:
-                            run_id = str(rdef.get('id') or uuid.uuid4())
-                            # Avoid duplicate seeding if run already exists
-                            if db.get(ComplianceRunDb, run_id):
-                                continue
-                            # Parse timestamps
-                            def _parse_dt(val):
-                                if not val:
-                                    return None
-                                try:
-                                    return datetime.fromisoformat(val.replace('Z', '+00:00'))
-                                except Exception:
-                                    return datetime.utcnow()
-                            results_defs = rdef.get('results') or []
-                            success_count = rdef.get('success_count')
-                            failure_count = rdef.get('failure_count')
-                            score = rdef.get('score')
-                            if success_count is None or failure_count is None:
-                                # compute from results
-                                s = sum(1 for it in results_defs if bool(it.get('passed')))
-                                f = sum(1 for it in results_defs if not bool(it.get('passed')))
-                                success_count = s
-                                failure_count = f
-                            if score is None:
-                                total = max(1, (success_count or 0) + (failure_count or 0))
-                                score = round(100.0 * (float(success_count) / float(total)), 2)
-                            run_db = ComplianceRunDb(
-                                id=run_id,
-                                policy_id=policy_db.id,
-                                status=str(rdef.get('status') or 'succeeded'),
-                                started_at=_parse_dt(rdef.get('started_at')) or datetime.utcnow(),
-                                finished_at=_parse_dt(rdef.get('finished_at')),
-                                success_count=int(success_count or 0),
-                                failure_count=int(failure_count or 0),
-                                score=float(score or 0.0),
-                                error_message=rdef.get('error_message'),
-                            )
-                            db.add(run_db)
-                            db.flush()
-                            # Seed results
-                            for resdef in results_defs:
-                                res_db = ComplianceResultDb(
-                                    id=str(resdef.get('id') or uuid.uuid4()),
-                                    run_id=run_db.id,
-                                    object_type=str(resdef.get('object_type') or 'object'),
-                                    object_id=str(resdef.get('object_id') or resdef.get('object_name') or 'unknown'),
-                                    object_name=resdef.get('object_name'),
-                                    passed=bool(resdef.get('passed', False)),
-                                    message=resdef.get('message'),
-                                    details_json=(resdef.get('details_json')),
-                                )
-                                db.add(res_db)
-                        except Exception:
-                            logger.exception("Failed seeding sample compliance run from YAML for policy %s", policy_db.id)
-                db.flush()
+        # Upsert all policies by id in one statement batch (later duplicates win)
+        now = datetime.utcnow()
+        policies: Dict[str, Dict] = {}
+        entries: List[Tuple[str, Dict]] = []
+        for raw in data:
+            model = CompliancePolicy(**{k: v for k, v in raw.items() if k not in {'examples', 'sample_runs'}})
+            entries.append((str(model.id), raw))
+            policies[str(model.id)] = {
+                'id': str(model.id),
+                'name': model.name,
+                'description': model.description,
+                'rule': model.rule,
+                'category': model.category,
+                'severity': model.severity,
+                'is_active': model.is_active,
+                'updated_at': now,
+            }
+        compliance_policy_repo.upsert_many(db, objs_in=list(policies.values()))
+
+        def _parse_dt(val):
+            if not val:
+                return None
+            try:
+                return datetime.fromisoformat(val.replace('Z', '+00:00'))
+            except Exception:
+                return datetime.utcnow()
 
-                # Optional: generate historical daily runs (no per-object results)
-                history_seed = raw.get('history_seed') or {}
+        # Optional: seed sample runs and results, skipping runs that already exist
+        sample_run_ids = {
+            str(rdef['id'])
+            for _, raw in entries for rdef in (raw.get('sample_runs') or []) if isinstance(rdef, dict) and rdef.get('id')
+        }
+        existing_run_ids = set()
+        if sample_run_ids:
+            existing_run_ids = {
+                run_id for (run_id,) in db.query(ComplianceRunDb.id).filter(ComplianceRunDb.id.in_(sample_run_ids))
+            }
+        run_rows: List[Dict] = []
+        result_rows: List[Dict] = []
+        for policy_id, raw in entries:
+            sample_runs = raw.get('sample_runs') or []
+            if not isinstance(sample_runs, list):
+                continue
+            for rdef in sample_runs:
                 try:
-                    days = int(history_seed.get('days', 0) or 0)
+                    run_id = str(rdef.get('id') or uuid.uuid4())
+                    if run_id in existing_run_ids:
+                        continue
+                    existing_run_ids.add(run_id)
+                    results_defs = rdef.get('results') or []
+                    success_count = rdef.get('success_count')
+                    failure_count = rdef.get('failure_count')
+                    score = rdef.get('score')
+                    if success_count is None or failure_count is None:
+                        # compute from results
+                        success_count = sum(1 for it in results_defs if bool(it.get('passed')))
+                        failure_count = sum(1 for it in results_defs if not bool(it.get('passed')))
+                    if score is None:
+                        total = max(1, (success_count or 0) + (failure_count or 0))
+                        score = round(100.0 * (float(success_count) / float(total)), 2)
+                    run_results = [
+                        {
+                            'id': str(resdef.get('id') or uuid.uuid4()),
+                            'run_id': run_id,
+                            'object_type': str(resdef.get('object_type') or 'object'),
+                            'object_id': str(resdef.get('object_id') or resdef.get('object_name') or 'unknown'),
+                            'object_name': resdef.get('object_name'),
+                            'passed': bool(resdef.get('passed', False)),
+                            'message': resdef.get('message'),
+                            'details_json': resdef.get('details_json'),
+                        }
+                        for resdef in results_defs
+                    ]
+                    run_rows.append({
+                        'id': run_id,
+                        'policy_id': policy_id,
+                        'status': str(rdef.get('status') or 'succeeded'),
+                        'started_at': _parse_dt(rdef.get('started_at')) or datetime.utcnow(),
+                        'finished_at': _parse_dt(rdef.get('finished_at')),
+                        'success_count': int(success_count or 0),
+                        'failure_count': int(failure_count or 0),
+                        'score': float(score or 0.0),
+                        'error_message': rdef.get('error_message'),
+                    })
+                    result_rows.extend(run_results)
                 except Exception:
-                    days = 0
-                if days > 0:
-                    base_score = float(history_seed.get('base_score', 85.0))
-                    variance = float(history_seed.get('variance', 6.0))
-                    total_checks = int(history_seed.get('total_checks', 40))
-                    # Build set of existing date keys to avoid duplicates
-                    existing_runs = db.query(ComplianceRunDb).filter(ComplianceRunDb.policy_id == policy_db.id).all()
-                    existing_dates = { (r.started_at.date().isoformat() if r.started_at else None) for r in existing_runs }
-                    today = datetime.utcnow().date()
-                    for i in range(days-1, -1, -1):
-                        d = today - timedelta(days=i)
-                        key = d.isoformat()
-                        if key in existing_dates:
-                            continue
-                        # Slight deterministic variation by day
-                        wave = ((hash(key) % 7) - 3)  # -3..+3
-                        score = base_score + (variance * wave / 3.0)
-                        score = max(75.0, min(100.0, score))
-                        success_count = int(round(total_checks * (score / 100.0)))
-                        failure_count = max(0, total_checks - success_count)
-                        dt = datetime(d.year, d.month, d.day, 9, 0, 0)
-                        run_db = ComplianceRunDb(
-                            id=str(uuid.uuid4()),
-                            policy_id=policy_db.id,
-                            status='succeeded',
-                            started_at=dt,
-                            finished_at=dt + timedelta(minutes=1),
-                            success_count=success_count,
-                            failure_count=failure_count,
-                            score=round(score, 2),
-                        )
-                        db.add(run_db)
-                    db.flush()
-            db.commit()
+                    logger.exception("Failed seeding sample compliance run from YAML for policy %s", policy_id)
+
+        # Optional: generate historical daily runs (no per-object results), one per day not yet covered
+        existing_dates: Dict[str, set] = {}
+        for policy_id, started_at in db.query(ComplianceRunDb.policy_id, ComplianceRunDb.started_at).filter(
+            ComplianceRunDb.policy_id.in_(list(policies))
+        ):
+            existing_dates.setdefault(policy_id, set()).add(started_at.date().isoformat() if started_at else None)
+        for row in run_rows:
+            existing_dates.setdefault(row['policy_id'], set()).add(row['started_at'].date().isoformat())
+        today = datetime.utcnow().date()
+        for policy_id, raw in entries:
+            history_seed = raw.get('history_seed') or {}
+            try:
+                days = int(history_seed.get('days', 0) or 0)
+            except Exception:
+                days = 0
+            if days <= 0:
+                continue
+            base_score = float(history_seed.get('base_score', 85.0))
+            variance = float(history_seed.get('variance', 6.0))
+            total_checks = int(history_seed.get('total_checks', 40))
+            policy_dates = existing_dates.setdefault(policy_id, set())
+            for i in range(days-1, -1, -1):
+                d = today - timedelta(days=i)
+                key = d.isoformat()
+                if key in policy_dates:
+                    continue
+                policy_dates.add(key)
+                # Slight deterministic variation by day
+                wave = ((hash(key) % 7) - 3)  # -3..+3
+                score = base_score + (variance * wave / 3.0)
+                score = max(75.0, min(100.0, score))
+                success_count = int(round(total_checks * (score / 100.0)))
+                failure_count = max(0, total_checks - success_count)
+                dt = datetime(d.year, d.month, d.day, 9, 0, 0)
+                run_rows.append({
+                    'id': str(uuid.uuid4()),
+                    'policy_id': policy_id,
+                    'status': 'succeeded',
+                    'started_at': dt,
+                    'finished_at': dt + timedelta(minutes=1),
+                    'success_count': success_count,
+                    'failure_count': failure_count,
+                    'score': round(score, 2),
+                })
+
+        compliance_run_repo.create_many(db, objs_in=run_rows)
+        compliance_result_repo.create_many(db, objs_in=result_rows)
+        db.commit()
 
     def list_policies(self, db: Session) -> List[CompliancePolicyDb]:
         return compliance_policy_repo.list_all(db)
@@ -1,7 +1,7 @@
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 
 from pydantic import ValidationError, parse_obj_as
 from sqlalchemy.orm import Session
@@ -41,6 +41,7 @@ from src.common.search_interfaces import SearchableAsset, SearchIndexItem
 # Import the registry decorator
 from src.common.search_registry import searchable_asset
 
+from src.common.database import with_session
 from src.common.logging import get_logger
 from src.common.config import Settings, get_settings # Added Settings and get_settings
 
@@ -48,16 +49,20 @@ logger = get_logger(__name__)
 
 @searchable_asset # Register this manager with the search system
 class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
-    def __init__(self, db: Session, ws_client: WorkspaceClient, notifications_manager: NotificationsManager):
+    def __init__(self, db: Optional[Session], ws_client: WorkspaceClient, notifications_manager: NotificationsManager,
+                 session_factory: Optional[Callable[[], Session]] = None):
         """
         Initializes the DataAssetReviewManager.
 
         Args:
-            db: SQLAlchemy Session for database operations.
+            db: SQLAlchemy Session bound for the manager's lifetime (tests, scripts), or None
+                to use the caller's session (``db=`` keyword) or a short-lived one per call.
             ws_client: Databricks WorkspaceClient for SDK operations.
             notifications_manager: Manager for creating notifications.
+            session_factory: Factory for per-call sessions; defaults to the application's.
         """
         self._db = db
+        self._session_factory = session_factory
         self._ws_client = ws_client
         self._repo = data_asset_review_repo
         self._notifications_manager = notifications_manager
@@ -122,7 +127,8 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected SDK error determining asset type for {fqn}: {e}. Defaulting to TABLE.", exc_info=True)
             return AssetType.TABLE
 
-    def create_review_request(self, request_data: DataAssetReviewRequestCreate) -> DataAssetReviewRequestApi:
+    @with_session
+    def create_review_request(self, request_data: DataAssetReviewRequestCreate, db: Optional[Session] = None) -> DataAssetReviewRequestApi:
         """Creates a new data asset review request."""
         try:
             request_id = str(uuid.uuid4())
@@ -162,7 +168,7 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             )
 
             # Use the repository to create the request and its assets in DB
-            created_db_obj = self._repo.create_with_assets(db=self._db, obj_in=full_request)
+            created_db_obj = self._repo.create_with_assets(db=db, obj_in=full_request)
 
             # Convert DB object back to API model for response
             created_api_obj = DataAssetReviewRequestApi.from_orm(created_db_obj)
@@ -178,12 +184,13 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
                      type=NotificationType.INFO, # Use NotificationType enum
                      link=f"/data-asset-reviews/{created_api_obj.id}" # Link to the review details page
                  )
-                 self._notifications_manager.create_notification(notification)
+                 self._notifications_manager.create_notification(notification, db=db)
                  logger.info(f"Notification created for reviewer {created_api_obj.reviewer_email} for request {created_api_obj.id}")
             except Exception as notify_err:
                  # Log error but don't fail the request creation
                  logger.error(f"Failed to create notification for review request {created_api_obj.id}: {notify_err}", exc_info=True)
 
+            self._notify_search_upsert(self._build_search_index_item(created_api_obj), db=db)
             return created_api_obj
 
         except SQLAlchemyError as e:
@@ -199,10 +206,11 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error creating review request: {e}")
             raise
 
-    def get_review_request(self, request_id: str) -> Optional[DataAssetReviewRequestApi]:
+    @with_session
+    def get_review_request(self, request_id: str, db: Optional[Session] = None) -> Optional[DataAssetReviewRequestApi]:
         """Gets a review request by its ID."""
         try:
-            request_db = self._repo.get(db=self._db, id=request_id)
+            request_db = self._repo.get(db=db, id=request_id)
             if request_db:
                 return DataAssetReviewRequestApi.from_orm(request_db)
             return None
@@ -216,10 +224,11 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error getting review request {request_id}: {e}")
             raise
 
-    def list_review_requests(self, skip: int = 0, limit: int = 100) -> List[DataAssetReviewRequestApi]:
+    @with_session
+    def list_review_requests(self, skip: int = 0, limit: int = 100, db: Optional[Session] = None) -> List[DataAssetReviewRequestApi]:
         """Lists all review requests."""
         try:
-            requests_db = self._repo.get_multi(db=self._db, skip=skip, limit=limit)
+            requests_db = self._repo.get_multi(db=db, skip=skip, limit=limit)
             # Use parse_obj_as for lists
             return parse_obj_as(List[DataAssetReviewRequestApi], requests_db)
         except SQLAlchemyError as e:
@@ -232,15 +241,16 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error listing review requests: {e}")
             raise
 
-    def update_review_request_status(self, request_id: str, update_data: DataAssetReviewRequestUpdateStatus) -> Optional[DataAssetReviewRequestApi]:
+    @with_session
+    def update_review_request_status(self, request_id: str, update_data: DataAssetReviewRequestUpdateStatus, db: Optional[Session] = None) -> Optional[DataAssetReviewRequestApi]:
         """Updates the overall status of a review request."""
         try:
-            db_obj = self._repo.get(db=self._db, id=request_id)
+            db_obj = self._repo.get(db=db, id=request_id)
             if not db_obj:
                 logger.warning(f"Attempted to update status for non-existent review request: {request_id}")
                 return None
             
-            updated_db_obj = self._repo.update_request_status(db=self._db, db_obj=db_obj, status=update_data.status, notes=update_data.notes)
+            updated_db_obj = self._repo.update_request_status(db=db, db_obj=db_obj, status=update_data.status, notes=update_data.notes)
             
             # --- Add Notification for Requester on final status --- #
             final_statuses = [ReviewRequestStatus.APPROVED, ReviewRequestStatus.NEEDS_REVIEW, ReviewRequestStatus.DENIED]
@@ -258,13 +268,15 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
                          type=notification_type, # Use NotificationType enum
                          link=f"/data-asset-reviews/{updated_db_obj.id}"
                      )
-                     self._notifications_manager.create_notification(notification)
+                     self._notifications_manager.create_notification(notification, db=db)
                      logger.info(f"Notification created for requester {updated_db_obj.requester_email} for request {updated_db_obj.id} status update.")
                 except Exception as notify_err:
                     logger.error(f"Failed to create status update notification for request {updated_db_obj.id}: {notify_err}", exc_info=True)
             # --- End Notification --- #
             
-            return DataAssetReviewRequestApi.from_orm(updated_db_obj)
+            updated_api_obj = DataAssetReviewRequestApi.from_orm(updated_db_obj)
+            self._notify_search_upsert(self._build_search_index_item(updated_api_obj), db=db)
+            return updated_api_obj
         except SQLAlchemyError as e:
              logger.error(f"Database error updating status for request {request_id}: {e}")
              raise
@@ -275,18 +287,24 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error updating status for request {request_id}: {e}")
             raise
 
-    def update_reviewed_asset_status(self, request_id: str, asset_id: str, update_data: ReviewedAssetUpdate) -> Optional[ReviewedAssetApi]:
+    @with_session
+    def update_reviewed_asset_status(self, request_id: str, asset_id: str, update_data: ReviewedAssetUpdate, db: Optional[Session] = None) -> Optional[ReviewedAssetApi]:
         """Updates the status and comments of a specific asset within a review."""
         try:
-            db_asset_obj = self._repo.get_asset(db=self._db, request_id=request_id, asset_id=asset_id)
+            db_asset_obj = self._repo.get_asset(db=db, request_id=request_id, asset_id=asset_id)
             if not db_asset_obj:
                 logger.warning(f"Attempted to update non-existent asset {asset_id} in request {request_id}")
                 return None
             
-            updated_db_asset_obj = self._repo.update_asset_status(db=self._db, db_asset_obj=db_asset_obj, status=update_data.status, comments=update_data.comments)
+            updated_db_asset_obj = self._repo.update_asset_status(db=db, db_asset_obj=db_asset_obj, status=update_data.status, comments=update_data.comments)
             
             # TODO: Check if all assets are reviewed and potentially update overall request status?
             
+            # Asset statuses are part of the request's search tags, so refresh the request entry
+            updated_request = self.get_review_request(request_id, db=db)
+            if updated_request:
+                self._notify_search_upsert(self._build_search_index_item(updated_request), db=db)
+
             return ReviewedAssetApi.from_orm(updated_db_asset_obj)
         except SQLAlchemyError as e:
              logger.error(f"Database error updating asset {asset_id} status in request {request_id}: {e}")
@@ -298,10 +316,13 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error updating asset {asset_id} status: {e}")
             raise
 
-    def delete_review_request(self, request_id: str) -> bool:
+    @with_session
+    def delete_review_request(self, request_id: str, db: Optional[Session] = None) -> bool:
         """Deletes a review request and its associated assets."""
         try:
-            deleted_obj = self._repo.remove(db=self._db, id=request_id)
+            deleted_obj = self._repo.remove(db=db, id=request_id)
+            if deleted_obj is not None:
+                self._notify_search_remove(f"review::{request_id}", db=db)
             return deleted_obj is not None
         except SQLAlchemyError as e:
             logger.error(f"Database error deleting review request {request_id}: {e}")
@@ -310,10 +331,11 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             logger.error(f"Unexpected error deleting review request {request_id}: {e}")
             raise
     
-    def get_reviewed_asset(self, request_id: str, asset_id: str) -> Optional[ReviewedAssetApi]:
+    @with_session
+    def get_reviewed_asset(self, request_id: str, asset_id: str, db: Optional[Session] = None) -> Optional[ReviewedAssetApi]:
         """Gets a specific reviewed asset by its ID and its parent request ID."""
         try:
-            asset_db = self._repo.get_asset(db=self._db, request_id=request_id, asset_id=asset_id)
+            asset_db = self._repo.get_asset(db=db, request_id=request_id, asset_id=asset_id)
             if asset_db:
                 return ReviewedAssetApi.from_orm(asset_db)
             return None
@@ -665,6 +687,35 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             return False
 
     # --- Implementation of SearchableAsset ---
+    def _build_search_index_item(self, review: DataAssetReviewRequestApi) -> Optional[SearchIndexItem]:
+        """Maps a review request to its SearchIndexItem, or None if it cannot be indexed."""
+        if not review.id:
+            logger.warning(f"Skipping review due to missing id: {review}")
+            return None
+
+        # Create a descriptive title and potentially tags
+        title = f"Review Request by {review.requester_email} for {review.reviewer_email}"
+        if review.assets:
+            title += f" ({len(review.assets)} assets)"
+
+        tags = [review.status.value] # Start with the overall status
+        tags.append(f"reviewer:{review.reviewer_email}")
+        tags.append(f"requester:{review.requester_email}")
+        if review.assets:
+            tags.extend([asset.status.value for asset in review.assets]) # Add individual asset statuses
+            tags.extend([asset.asset_fqn for asset in review.assets]) # Add asset FQNs as tags
+            tags.extend([asset.asset_type.value for asset in review.assets]) # Add asset types
+
+        return SearchIndexItem(
+            id=f"review::{review.id}",
+            type="data-asset-review",
+            feature_id="data-asset-reviews",
+            title=title,
+            description=review.notes or f"Review request {review.id}",
+            link=f"/data-asset-reviews/{review.id}",
+            tags=list(set(tags)) # Remove duplicate tags
+        )
+
     def get_search_index_items(self) -> List[SearchIndexItem]:
         """Fetches data asset review requests and maps them to SearchIndexItem format."""
         logger.info("Fetching data asset review requests for search indexing...")
@@ -674,36 +725,11 @@ class DataAssetReviewManager(SearchableAsset): # Inherit from SearchableAsset
             reviews_api = self.list_review_requests(limit=10000) # Fetch Pydantic models
 
             for review in reviews_api:
-                if not review.id:
-                    logger.warning(f"Skipping review due to missing id: {review}")
-                    continue
-
-                # Create a descriptive title and potentially tags
-                title = f"Review Request by {review.requester_email} for {review.reviewer_email}"
-                if review.assets:
-                    title += f" ({len(review.assets)} assets)"
-
-                tags = [review.status.value] # Start with the overall status
-                tags.append(f"reviewer:{review.reviewer_email}")
-                tags.append(f"requester:{review.requester_email}")
-                if review.assets:
-                    tags.extend([asset.status.value for asset in review.assets]) # Add individual asset statuses
-                    tags.extend([asset.asset_fqn for asset in review.assets]) # Add asset FQNs as tags
-                    tags.extend([asset.asset_type.value for asset in review.assets]) # Add asset types
-
-                items.append(
-                    SearchIndexItem(
-                        id=f"review::{review.id}",
-                        type="data-asset-review",
-                        feature_id="data-asset-reviews",
-                        title=title,
-                        description=review.notes or f"Review request {review.id}",
-                        link=f"/data-asset-reviews/{review.id}",
-                        tags=list(set(tags)) # Remove duplicate tags
-                    )
-                )
+                item = self._build_search_index_item(review)
+                if item:
+                    items.append(item)
             logger.info(f"Prepared {len(items)} data asset reviews for search index.")
             return items
         except Exception as e:
             logger.error(f"Error fetching or mapping data asset reviews for search: {e}", exc_info=True)
-            return [] # Return empty list on error 
\ No newline at end of file
+            return [] # Return empty list on error
@@ -77,6 +77,7 @@ class DataContractsManager(SearchableAsset):
         )
 
         self._contracts[contract.id] = contract
+        self._notify_search_upsert(self._build_search_index_item(contract))
         return contract
 
     def get_contract(self, contract_id: str) -> Optional[DataContract]:
@@ -114,12 +115,14 @@ class DataContractsManager(SearchableAsset):
             contract.status = status
 
         contract.updated_at = datetime.utcnow()
+        self._notify_search_upsert(self._build_search_index_item(contract))
         return contract
 
     def delete_contract(self, contract_id: str) -> bool:
         """Delete a contract"""
         if contract_id in self._contracts:
             del self._contracts[contract_id]
+            self._notify_search_remove(f"contract::{contract_id}")
             return True
         return False
 
@@ -154,6 +157,7 @@ class DataContractsManager(SearchableAsset):
         if not data or 'contracts' not in data:
             raise ValueError("Invalid YAML file format: missing 'contracts' key")
 
+        previous_contract_ids = list(self._contracts)
         self._contracts.clear()
         for c in data['contracts']:
             contract = DataContract(
@@ -170,6 +174,12 @@ class DataContractsManager(SearchableAsset):
             )
             self._contracts[contract.id] = contract
 
+        for contract_id in previous_contract_ids:
+            if contract_id not in self._contracts:
+                self._notify_search_remove(f"contract::{contract_id}")
+        for contract in self._contracts.values():
+            self._notify_search_upsert(self._build_search_index_item(contract))
+
     def validate_schema(self, schema: DatasetSchema) -> List[str]:
         errors = []
         column_names = set()
@@ -423,6 +433,26 @@ class DataContractsManager(SearchableAsset):
         }
 
     # --- Implementation of SearchableAsset --- 
+    def _build_search_index_item(self, contract: DataContract) -> Optional[SearchIndexItem]:
+        """Maps a data contract to its SearchIndexItem, or None if it cannot be indexed."""
+        # Adapt field access based on DataContract model structure
+        if not contract.id or not contract.name:
+            logger.warning(f"Skipping contract due to missing id or name: {contract}")
+            return None
+
+        # Assuming DataContract has .tags attribute (add if missing)
+        tags = getattr(contract, 'tags', []) 
+
+        return SearchIndexItem(
+            id=f"contract::{contract.id}",
+            type="data-contract",
+            feature_id="data-contracts",
+            title=contract.name,
+            description=contract.description or "",
+            link=f"/data-contracts/{contract.id}",
+            tags=tags
+        )
+
     def get_search_index_items(self) -> List[SearchIndexItem]:
         """Fetches data contracts and maps them to SearchIndexItem format."""
         logger.info("Fetching data contracts for search indexing...")
@@ -432,25 +462,9 @@ class DataContractsManager(SearchableAsset):
             contracts = self.list_contracts()
             
             for contract in contracts:
-                # Adapt field access based on DataContract model structure
-                if not contract.id or not contract.name:
-                    logger.warning(f"Skipping contract due to missing id or name: {contract}")
-                    continue
-                
-                # Assuming DataContract has .tags attribute (add if missing)
-                tags = getattr(contract, 'tags', []) 
-                    
-                items.append(
-                    SearchIndexItem(
-                        id=f"contract::{contract.id}",
-                        type="data-contract",
-                        feature_id="data-contracts",
-                        title=contract.name,
-                        description=contract.description or "",
-                        link=f"/data-contracts/{contract.id}",
-                        tags=tags
-                    )
-                )
+                item = self._build_search_index_item(contract)
+                if item:
+                    items.append(item)
             logger.info(f"Prepared {len(items)} data contracts for search index.")
             return items
         except Exception as e:
@@ -2,7 +2,7 @@ import asyncio
 import logging
 import uuid
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Any, Tuple
 
 import yaml
 from pydantic import ValidationError, parse_obj_as, BaseModel
@@ -40,25 +40,32 @@ from src.common.logging import get_logger
 logger = get_logger(__name__)
 
 # Import necessary components for creating a session
-from src.common.database import get_session_factory
+from src.common.database import get_session_factory, with_session
 
 # Import config to get data path - Removed get_settings as it's not needed for path
 # from src.common.config import get_settings 
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from src.controller.authorization_manager import AuthorizationManager
+
 # Inherit from SearchableAsset
 @searchable_asset
 class DataProductsManager(SearchableAsset):
-    def __init__(self, db: Session, ws_client: Optional[WorkspaceClient] = None, notifications_manager: Optional[NotificationsManager] = None):
+    def __init__(self, db: Optional[Session] = None, ws_client: Optional[WorkspaceClient] = None, notifications_manager: Optional[NotificationsManager] = None,
+                 session_factory: Optional[Callable[[], Session]] = None):
         """
         Initializes the DataProductsManager.
 
         Args:
-            db: SQLAlchemy Session for database operations.
+            db: SQLAlchemy Session bound for the manager's lifetime (tests, scripts), or None
+                to use the caller's session (``db=`` keyword) or a short-lived one per call.
             ws_client: Optional Databricks WorkspaceClient for SDK operations.
             notifications_manager: Optional NotificationsManager instance.
+            session_factory: Factory for per-call sessions; defaults to the application's.
         """
         self._db = db
+        self._session_factory = session_factory
         self._ws_client = ws_client
         self._repo = data_product_repo
         self._notifications_manager = notifications_manager
@@ -75,7 +82,8 @@ class DataProductsManager(SearchableAsset):
         """Get all available data product statuses"""
         return [s.value for s in DataProductStatus]
 
-    def create_product(self, product_data: Dict[str, Any]) -> DataProductApi:
+    @with_session
+    def create_product(self, product_data: Dict[str, Any], db: Optional[Session] = None) -> DataProductApi:
         """Validates input data and creates a new data product via the repository."""
         logger.debug(f"Manager attempting to create product from data: {product_data}")
         try:
@@ -101,10 +109,12 @@ class DataProductsManager(SearchableAsset):
 
             # Now pass the validated Pydantic model to the repository
             # The repository's create method expects the Pydantic model (DataProductCreate alias)
-            created_db_obj = self._repo.create(db=self._db, obj_in=product_api_model)
+            created_db_obj = self._repo.create(db=db, obj_in=product_api_model)
 
             # Return the validated API model from the ORM object
-            return DataProductApi.from_orm(created_db_obj)
+            created_product = DataProductApi.from_orm(created_db_obj)
+            self._notify_search_upsert(self._build_search_index_item(created_product), db=db)
+            return created_product
 
         except SQLAlchemyError as e:
             logger.error(f"Database error creating data product: {e}")
@@ -116,10 +126,11 @@ class DataProductsManager(SearchableAsset):
             logger.error(f"Validation error mapping DB object to API model: {e}")
             raise ValueError(f"Internal data mapping error: {e}")
 
-    def get_product(self, product_id: str) -> Optional[DataProductApi]:
+    @with_session
+    def get_product(self, product_id: str, db: Optional[Session] = None) -> Optional[DataProductApi]:
         """Get a data product by ID using the repository."""
         try:
-            product_db = self._repo.get(db=self._db, id=product_id)
+            product_db = self._repo.get(db=db, id=product_id)
             if product_db:
                 product_api = DataProductApi.from_orm(product_db)
                 return product_api
@@ -134,10 +145,11 @@ class DataProductsManager(SearchableAsset):
             logger.error(f"Unexpected error getting product {product_id}: {e}")
             raise
 
-    def list_products(self, skip: int = 0, limit: int = 100) -> List[DataProductApi]:
+    @with_session
+    def list_products(self, skip: int = 0, limit: int = 100, db: Optional[Session] = None) -> List[DataProductApi]:
         """List data products using the repository."""
         try:
-            products_db = self._repo.get_multi(db=self._db, skip=skip, limit=limit)
+            products_db = self._repo.get_multi(db=db, skip=skip, limit=limit)
             return parse_obj_as(List[DataProductApi], products_db)
         except SQLAlchemyError as e:
             logger.error(f"Database error listing products: {e}")
@@ -149,11 +161,39 @@ class DataProductsManager(SearchableAsset):
             logger.error(f"Unexpected error listing products: {e}")
             raise
 
-    def update_product(self, product_id: str, product_data_dict: Dict[str, Any]) -> Optional[DataProductApi]:
+    @with_session
+    def list_products_page(
+        self,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        auth_manager: Optional['AuthorizationManager'] = None,
+        user: Optional[UserInfo] = None,
+        db: Optional[Session] = None,
+    ) -> Tuple[List[DataProductApi], Optional[str]]:
+        """List one keyset page of data products (ordered by id) and the cursor of the next page.
+
+        With auth_manager and user, products of projects the user is not a member of
+        are left out, so a page may hold fewer than limit products.
+        """
+        try:
+            page = self._repo.get_page(db=db, limit=limit, cursor=cursor)
+            items = page.items
+            if auth_manager is not None and user is not None:
+                items = auth_manager.filter_accessible(user, items, 'data-products', db=db)
+            return parse_obj_as(List[DataProductApi], items), page.next_cursor
+        except SQLAlchemyError as e:
+            logger.error(f"Database error listing products page: {e}")
+            raise
+        except ValidationError as e:
+             logger.error(f"Validation error mapping page of DB objects to API models: {e}")
+             raise ValueError(f"Internal data mapping error during list: {e}")
+
+    @with_session
+    def update_product(self, product_id: str, product_data_dict: Dict[str, Any], db: Optional[Session] = None) -> Optional[DataProductApi]:
         """Update an existing data product. Expects a dictionary for product_data_dict."""
         logger.debug(f"Manager attempting to update product ID {product_id} with dict data.")
         try:
-            db_obj = self._repo.get(db=self._db, id=product_id)
+            db_obj = self._repo.get(db=db, id=product_id)
             if not db_obj:
                 logger.warning(f"Attempted to update non-existent product: {product_id}")
                 return None
@@ -180,9 +220,11 @@ class DataProductsManager(SearchableAsset):
                 raise ValueError(f"Invalid data for product update: {e.errors()}") from e
 
             # Pass the validated Pydantic model to the repository's update method
-            updated_db_obj = self._repo.update(db=self._db, db_obj=db_obj, obj_in=product_update_model)
+            updated_db_obj = self._repo.update(db=db, db_obj=db_obj, obj_in=product_update_model)
             
-            return DataProductApi.from_orm(updated_db_obj)
+            updated_product = DataProductApi.from_orm(updated_db_obj)
+            self._notify_search_upsert(self._build_search_index_item(updated_product), db=db)
+            return updated_product
             
         except SQLAlchemyError as e:
             logger.error(f"Database error updating data product {product_id}: {e}")
@@ -197,10 +239,13 @@ class DataProductsManager(SearchableAsset):
             logger.error(f"Unexpected error updating data product {product_id}: {e}")
             raise
 
-    def delete_product(self, product_id: str) -> bool:
+    @with_session
+    def delete_product(self, product_id: str, db: Optional[Session] = None) -> bool:
         """Delete a data product using the repository."""
         try:
-            deleted_obj = self._repo.remove(db=self._db, id=product_id)
+            deleted_obj = self._repo.remove(db=db, id=product_id)
+            if deleted_obj is not None:
+                self._notify_search_remove(f"product::{product_id}", db=db)
             return deleted_obj is not None
         except SQLAlchemyError as e:
             logger.error(f"Database error deleting product {product_id}: {e}")
@@ -209,10 +254,11 @@ class DataProductsManager(SearchableAsset):
             logger.error(f"Unexpected error deleting product {product_id}: {e}")
             raise
 
-    def create_new_version(self, original_product_id: str, new_version: str) -> DataProductApi:
+    @with_session
+    def create_new_version(self, original_product_id: str, new_version: str, db: Optional[Session] = None) -> DataProductApi:
         """Creates a new version of a data product based on an existing one."""
         logger.info(f"Creating new version '{new_version}' based on product ID: {original_product_id}")
-        original_product = self.get_product(original_product_id) # Fetches the API model
+        original_product = self.get_product(original_product_id, db=db) # Fetches the API model
         if not original_product:
             raise ValueError(f"Original data product with ID {original_product_id} not found.")
 
@@ -238,10 +284,12 @@ class DataProductsManager(SearchableAsset):
             new_product_api_model = DataProductApi(**new_product_data)
             
             # Create the new product in the database
-            created_db_obj = self._repo.create(db=self._db, obj_in=new_product_api_model)
+            created_db_obj = self._repo.create(db=db, obj_in=new_product_api_model)
             
             logger.info(f"Successfully created new version {new_version} (ID: {created_db_obj.id}) from {original_product_id}")
-            return DataProductApi.from_orm(created_db_obj)
+            created_product = DataProductApi.from_orm(created_db_obj)
+            self._notify_search_upsert(self._build_search_index_item(created_product), db=db)
+            return created_product
         
         except ValidationError as e:
             logger.error(f"Validation error creating new version data: {e}")
@@ -465,10 +513,11 @@ class DataProductsManager(SearchableAsset):
     # --- Reinstate Helper methods for distinct values --- 
     # These now delegate to the repository which handles DB interaction.
 
-    def get_distinct_owners(self) -> List[str]:
+    @with_session
+    def get_distinct_owners(self, db: Optional[Session] = None) -> List[str]:
         """Get all distinct data product owners."""
         try:
-            return self._repo.get_distinct_owners(db=self._db)
+            return self._repo.get_distinct_owners(db=db)
         except Exception as e:
             logger.error(f"Error getting distinct owners from repository: {e}", exc_info=True)
             # Depending on desired behavior, re-raise or return empty list
@@ -481,24 +530,48 @@ class DataProductsManager(SearchableAsset):
         logger.warning("get_distinct_domains called - not implemented in repository yet.")
         return [] # Placeholder until implemented in repo
 
-    def get_distinct_statuses(self) -> List[str]:
+    @with_session
+    def get_distinct_statuses(self, db: Optional[Session] = None) -> List[str]:
         """Get all distinct data product statuses from info and output ports."""
         try:
-            return self._repo.get_distinct_statuses(db=self._db)
+            return self._repo.get_distinct_statuses(db=db)
         except Exception as e:
             logger.error(f"Error getting distinct statuses from repository: {e}", exc_info=True)
             return []
 
-    def get_distinct_product_types(self) -> List[str]:
+    @with_session
+    def get_distinct_product_types(self, db: Optional[Session] = None) -> List[str]:
         """Get all distinct data product types."""
         try:
             # Call the new repository method
-            return self._repo.get_distinct_product_types(db=self._db)
+            return self._repo.get_distinct_product_types(db=db)
         except Exception as e:
             logger.error(f"Error getting distinct product types from repository: {e}", exc_info=True)
             return []
 
     # --- Implementation of SearchableAsset --- 
+    def _build_search_index_item(self, product: DataProductApi) -> Optional[SearchIndexItem]:
+        """Maps a data product to its SearchIndexItem, or None if it cannot be indexed."""
+        if not product.id or not product.info or not product.info.title:
+             logger.warning(f"Skipping product due to missing id or info.title: {product}")
+             return None
+
+        return SearchIndexItem(
+            id=f"product::{product.id}",
+            version=product.version, # Add version
+            product_type=product.productType if product.productType else None, 
+            type="data-product", # Keep type for frontend icon/rendering
+            feature_id="data-products", # <-- Add this
+            title=product.info.title,
+            description=product.info.description or "",
+            link=f"/data-products/{product.id}",
+            tags=product.tags or []
+            # Add other fields like owner, status, domain if desired
+            # owner=product.info.owner,
+            # status=product.info.status,
+            # domain=product.info.domain
+        )
+
     def get_search_index_items(self) -> List[SearchIndexItem]:
         """Fetches data products and maps them to SearchIndexItem format."""
         logger.info("Fetching data products for search indexing...")
@@ -509,27 +582,9 @@ class DataProductsManager(SearchableAsset):
             products_api = self.list_products(limit=10000) # Fetch Pydantic models
             
             for product in products_api:
-                if not product.id or not product.info or not product.info.title:
-                     logger.warning(f"Skipping product due to missing id or info.title: {product}")
-                     continue
-                     
-                items.append(
-                    SearchIndexItem(
-                        id=f"product::{product.id}",
-                        version=product.version, # Add version
-                        product_type=product.productType if product.productType else None, 
-                        type="data-product", # Keep type for frontend icon/rendering
-                        feature_id="data-products", # <-- Add this
-                        title=product.info.title,
-                        description=product.info.description or "",
-                        link=f"/data-products/{product.id}",
-                        tags=product.tags or []
-                        # Add other fields like owner, status, domain if desired
-                        # owner=product.info.owner,
-                        # status=product.info.status,
-                        # domain=product.info.domain
-                    )
-                )
+                item = self._build_search_index_item(product)
+                if item:
+                    items.append(item)
             logger.info(f"Prepared {len(items)} data products for search index.")
             return items
         except Exception as e:
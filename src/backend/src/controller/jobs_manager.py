@@ -1,6 +1,6 @@
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 import json
 import configparser
 import time
@@ -12,14 +12,18 @@ from databricks.sdk.service import jobs
 from databricks.sdk.service.jobs import RunState, RunResultState
 from sqlalchemy.orm import Session
 
+from src.common.database import session_scope
 from src.common.logging import get_logger
 
 logger = get_logger(__name__)
 
 
 class JobsManager:
-    def __init__(self, db: Session, ws_client: WorkspaceClient, *, workflows_root: Optional[Path] = None, notifications_manager=None):
+    def __init__(self, db: Optional[Session], ws_client: WorkspaceClient, *, workflows_root: Optional[Path] = None, notifications_manager=None,
+                 session_factory: Optional[Callable[[], Session]] = None):
+        # db is only bound in tests/scripts; otherwise each notification write gets its own session
         self._db = db
+        self._session_factory = session_factory
         self._client = ws_client
         self._workflows_root = workflows_root or Path(__file__).parent.parent / "workflows"
         self._notifications_manager = notifications_manager
@@ -257,7 +261,8 @@ class JobsManager:
         )
         
         # Create notification via notifications manager
-        self._notifications_manager.create_notification(notification, db=self._db)
+        with session_scope(self._db, self._session_factory) as db:
+            self._notifications_manager.create_notification(notification, db=db)
         return notification.id
 
     def _monitor_job_progress(self, run_id: int, job_name: str, notification_id: str):
@@ -336,7 +341,8 @@ class JobsManager:
                 updated_at=datetime.utcnow()
             )
             
-            self._notifications_manager.update_notification(notification_id, update, db=self._db)
+            with session_scope(self._db, self._session_factory) as db:
+                self._notifications_manager.update_notification(notification_id, update, db=db)
             
         except Exception as e:
             logger.error(f"Failed to update notification {notification_id}: {e}")
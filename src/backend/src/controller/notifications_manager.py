@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Union
 import json
 
 import yaml
 from sqlalchemy.orm import Session # Import Session for type hinting
+from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import ValidationError # Import for error handling
 
 from src.models.notifications import Notification, NotificationType # Import the enum too
@@ -138,7 +140,34 @@ class NotificationsManager:
         
         # Fetch all notifications from the repository
         all_notifications_db = self._repo.get_multi(db=db, limit=1000) # Adjust limit if needed
-        
+        return self._filter_for_user(all_notifications_db, user_info, self._list_roles() if user_info else [])
+
+    async def get_notifications_async(
+        self, db: Union[AsyncSession, Session], user_info: Optional[UserInfo] = None
+    ) -> List[Notification]:
+        """Same as get_notifications without blocking the event loop.
+
+        Reads through an AsyncSession, or through a sync Session (AsyncDBSessionDep
+        fallback) in a worker thread. Roles are listed in a worker thread as well,
+        since a role snapshot miss opens a sync session.
+        """
+        if isinstance(db, AsyncSession):
+            all_notifications_db = await self._repo.get_multi_async(db=db, limit=1000)
+        else:
+            all_notifications_db = await asyncio.to_thread(self._repo.get_multi, db=db, limit=1000)
+        roles = await asyncio.to_thread(self._list_roles) if user_info else []
+        return self._filter_for_user(all_notifications_db, user_info, roles)
+
+    def _list_roles(self) -> List['AppRole']:
+        """Lists role definitions for recipient matching; empty if they cannot be retrieved."""
+        try:
+            return self._settings_manager.list_app_roles()
+        except Exception as e:
+            logger.error(f"Failed to retrieve roles for notification filtering: {e}")
+            return [] # Continue with empty roles if they fail
+
+    def _filter_for_user(self, all_notifications_db, user_info: Optional[UserInfo], all_roles: List['AppRole']) -> List[Notification]:
+        """Converts DB notifications to API models and keeps those addressed to the user, newest first."""
         # Convert DB models to Pydantic models (handling potential errors)
         all_notifications_api: List[Notification] = [] 
         for db_obj in all_notifications_db:
@@ -156,13 +185,8 @@ class NotificationsManager:
         user_groups = set(user_info.groups or [])
         user_email = user_info.email
 
-        # Pre-fetch all role definitions for efficient lookup
-        try:
-            all_roles = self._settings_manager.list_app_roles() # Assuming this uses DB and returns List[AppRole]
-            role_map: Dict[str, 'AppRole'] = {role.name: role for role in all_roles} # Use AppRole type
-        except Exception as e:
-            logger.error(f"Failed to retrieve roles for notification filtering: {e}")
-            role_map = {} # Continue with empty map if roles fail
+        # Index the role definitions for efficient lookup
+        role_map: Dict[str, 'AppRole'] = {role.name: role for role in all_roles} # Use AppRole type
 
         filtered_notifications = []
         for n in all_notifications_api:
@@ -1,6 +1,6 @@
 import logging
 import json
-from typing import List, Optional
+from typing import FrozenSet, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -15,18 +15,56 @@ from src.models.projects import (
     ProjectTeamAssignment
 )
 from src.db_models.projects import ProjectDb
+from src.common.database import call_after_commit, get_db_session
 from src.common.logging import get_logger
 from src.common.errors import ConflictError, NotFoundError
+from src.common.ttl_cache import TTLCache
 
 logger = get_logger(__name__)
 
+DEFAULT_PROJECT_ACCESS_CACHE_TTL_SECONDS = 300.0
+DEFAULT_PROJECT_ACCESS_CACHE_MAX_SIZE = 4096
+
+ProjectAccessKey = Tuple[str, FrozenSet[str]]
+
 
 class ProjectsManager:
-    def __init__(self):
+    def __init__(
+        self,
+        access_cache_ttl_seconds: float = DEFAULT_PROJECT_ACCESS_CACHE_TTL_SECONDS,
+        access_cache_max_size: int = DEFAULT_PROJECT_ACCESS_CACHE_MAX_SIZE,
+    ):
         self.project_repo = project_repo
         self.team_repo = team_repo
+        self.configure_access_cache(access_cache_ttl_seconds, access_cache_max_size)
         logger.debug("ProjectsManager initialized.")
 
+    def configure_access_cache(self, ttl_seconds: float, max_size: int) -> None:
+        """(Re)creates the cache of accessible project ids per (user, group set).
+
+        Args:
+            ttl_seconds: How long a user's accessible projects are reused.
+            max_size: Maximum number of cached users (0 disables the cache).
+        """
+        self._access_cache: TTLCache[ProjectAccessKey, FrozenSet[str]] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_seconds
+        )
+
+    def invalidate_access_cache(self) -> None:
+        """Drops all cached project access, e.g. after team assignments or memberships change."""
+        self._access_cache.clear()
+
+    def _invalidate_access_cache_after_commit(self, db: Session) -> None:
+        """Drops cached project access once db commits a team assignment change.
+
+        It is dropped on rollback too, since lookups through db may have cached
+        the uncommitted assignments.
+        """
+        call_after_commit(db, self.invalidate_access_cache, self.invalidate_access_cache)
+
+    def get_access_cache_stats(self) -> dict:
+        return self._access_cache.stats()
+
     def _serialize_list_fields(self, data: dict) -> dict:
         """Helper to serialize list fields to JSON strings for database storage."""
         if 'tags' in data and isinstance(data['tags'], list):
@@ -106,6 +144,14 @@ class ProjectsManager:
         db_projects = self.project_repo.get_multi_with_teams(db, skip=skip, limit=limit)
         return [self._convert_db_to_read_model(project) for project in db_projects]
 
+    def get_projects_page(
+        self, db: Session, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[ProjectRead], Optional[str]]:
+        """Gets one keyset page of projects ordered by name, with the cursor of the next page."""
+        logger.debug(f"Fetching projects page with limit={limit}, cursor={cursor}")
+        page = self.project_repo.get_page_with_teams(db, limit=limit, cursor=cursor)
+        return [self._convert_db_to_read_model(project) for project in page.items], page.next_cursor
+
     def get_projects_summary(self, db: Session) -> List[ProjectSummary]:
         """Gets a summary list of projects for dropdowns/selection."""
         logger.debug("Fetching projects summary")
@@ -178,6 +224,7 @@ class ProjectsManager:
 
         try:
             self.project_repo.remove(db=db, id=project_id)
+            self._invalidate_access_cache_after_commit(db)
             logger.info(f"Successfully deleted project '{read_model.name}' (id: {project_id})")
             return read_model
         except Exception as e:
@@ -204,6 +251,7 @@ class ProjectsManager:
             success = self.project_repo.assign_team(db, project_id=project_id, team_id=team_id, assigned_by=assigned_by)
             if not success:
                 raise ConflictError(f"Team '{db_team.name}' is already assigned to project '{db_project.name}'.")
+            self._invalidate_access_cache_after_commit(db)
 
             logger.info(f"Successfully assigned team '{db_team.name}' to project '{db_project.name}'")
             return True
@@ -221,6 +269,7 @@ class ProjectsManager:
         try:
             success = self.project_repo.remove_team(db, project_id=project_id, team_id=team_id)
             if success:
+                self._invalidate_access_cache_after_commit(db)
                 logger.info(f"Successfully removed team from project")
             else:
                 logger.warning(f"Team {team_id} was not assigned to project {project_id}")
@@ -242,12 +291,32 @@ class ProjectsManager:
         db_teams = self.project_repo.get_team_assignments(db, project_id)
         return [{"id": team.id, "name": team.name, "title": team.title} for team in db_teams]
 
-    def check_user_project_access(self, db: Session, user_identifier: str, user_groups: List[str], project_id: str) -> bool:
+    def check_user_project_access(self, db: Optional[Session], user_identifier: str, user_groups: List[str], project_id: str) -> bool:
         """Checks if a user has access to a specific project."""
         logger.debug(f"Checking project access for user {user_identifier} to project {project_id}")
 
-        user_projects = self.project_repo.get_projects_for_user(db, user_identifier, user_groups)
-        return any(project.id == project_id for project in user_projects)
+        return project_id in self.get_user_project_ids(db, user_identifier, user_groups)
+
+    def get_user_project_ids(self, db: Optional[Session], user_identifier: str, user_groups: List[str]) -> FrozenSet[str]:
+        """
+        Returns the IDs of all projects a user has access to through team membership.
+
+        Results are cached per user and group set until they expire or team
+        assignments/memberships change.
+
+        Args:
+            db: Session for the lookup on a cache miss; if None, a short-lived
+                session is opened only when the database has to be queried.
+            user_identifier: The user's email.
+            user_groups: The user's group names.
+        """
+        def load() -> FrozenSet[str]:
+            if db is not None:
+                return frozenset(self.project_repo.get_project_ids_for_user(db, user_identifier, user_groups))
+            with get_db_session() as session:
+                return frozenset(self.project_repo.get_project_ids_for_user(session, user_identifier, user_groups))
+
+        return self._access_cache.get_or_load((user_identifier, frozenset(user_groups or ())), load)
 
 
 # Singleton instance
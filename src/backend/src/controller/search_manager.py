@@ -1,9 +1,21 @@
 from __future__ import annotations # Ensure forward references work
+import base64
+import hashlib
+import json
 import logging
-from typing import Any, Dict, List, Optional, Iterable, TYPE_CHECKING
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Iterable, Set, Tuple, Union, TYPE_CHECKING
 
 # Import Search Interfaces
-from src.common.search_interfaces import SearchableAsset, SearchIndexItem
+from src.common.search_interfaces import SearchableAsset, SearchFacets, SearchIndexItem, SearchResults
+from src.common.search_index import DEFAULT_TOP_TAGS, PartitionedSearchIndex, normalize_term
+from src.common.db_routing import replica_reads
+from src.common.pagination import InvalidCursorError
+from src.common.search_snapshot import claim_snapshot_writer, read_snapshot, write_snapshot
 # Import Permission Checker and Feature Access Level
 if TYPE_CHECKING:
     from src.common.authorization import PermissionChecker
@@ -16,84 +28,493 @@ from src.common.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Defaults used when no explicit build settings are passed
+DEFAULT_BUILD_TIMEOUT_SECONDS = 30.0
+DEFAULT_BUILD_MAX_WORKERS = 8
+DEFAULT_QUERY_CACHE_SIZE = 256
+
 class SearchManager:
     def __init__(
         self,
-        searchable_managers: Iterable[SearchableAsset]
+        searchable_managers: Iterable[SearchableAsset],
+        build_timeout_seconds: Optional[float] = DEFAULT_BUILD_TIMEOUT_SECONDS,
+        build_max_workers: int = DEFAULT_BUILD_MAX_WORKERS,
+        snapshot_path: Optional[Union[str, Path]] = None,
+        query_cache_size: int = DEFAULT_QUERY_CACHE_SIZE,
     ):
-        """Initialize search manager with a collection of pre-instantiated searchable asset managers."""
+        """
+        Initialize search manager with a collection of pre-instantiated searchable asset managers.
+
+        Args:
+            searchable_managers: Managers providing the items to index.
+            build_timeout_seconds: Deadline for each manager during build_index, measured from
+                the start of the build. None waits indefinitely.
+            build_max_workers: Upper bound on threads used to fetch items concurrently.
+            snapshot_path: Optional on-disk snapshot of the index, shared by all worker processes.
+                When a valid snapshot exists, search is served from it right away while the
+                index is rebuilt from the managers in the background, so startup does not wait
+                for them. Completed builds refresh the snapshot, but only in the one process
+                that claimed it (see claim_snapshot_writer).
+            query_cache_size: Number of ranked result lists kept in the LRU query cache (0 disables it).
+        """
         self.searchable_managers = list(searchable_managers)
-        self.index: List[SearchIndexItem] = []
-        
-        logger.info(f"SearchManager initialized with {len(self.searchable_managers)} managers.")
-        
-        self.build_index() # Build index after receiving managers
+        self.build_timeout_seconds = build_timeout_seconds
+        self.build_max_workers = max(1, build_max_workers)
+        # Which manager (by id()) contributed each indexed item, so a manager that
+        # times out during a rebuild can keep its previous slice of the index
+        self._item_owners: Dict[str, int] = {}
+        # Managers whose fetch from an earlier, timed-out build is still running
+        self._inflight_managers: Set[int] = set()
+        self._inflight_lock = threading.Lock()
+        self.last_build_stats: Dict[str, Dict[str, Any]] = {}
+        self._inverted_index = PartitionedSearchIndex()
+        # Serializes full rebuilds; deltas arriving during a rebuild are journaled and replayed
+        self._build_lock = threading.Lock()
+        self._delta_lock = threading.Lock()
+        self._pending_deltas: Optional[List[Tuple[str, Any]]] = None
+        self._rebuild_stop_event: Optional[threading.Event] = None
+        self._rebuild_thread: Optional[threading.Thread] = None
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._snapshot_writer = None  # Lock file held while this process is the snapshot writer
+        self._snapshot_writer_claimed = False
+        self._catch_up_thread: Optional[threading.Thread] = None
+        # Bumped on every index change; cached query results are only valid for one generation
+        self._generation = 0
+        self.query_cache_size = max(0, query_cache_size)
+        self._query_cache: "OrderedDict[Tuple[str, Tuple[str, ...]], List[str]]" = OrderedDict()
+        self._query_cache_generation = 0
+        self._query_cache_lock = threading.Lock()
+        self.query_cache_hits = 0
+        self.query_cache_misses = 0
 
-    def build_index(self):
-        """Builds or rebuilds the search index by querying searchable managers."""
-        logger.info(f"Building search index from {len(self.searchable_managers)} managers...")
-        new_index: List[SearchIndexItem] = [] # Build into a new list
+        logger.info(f"SearchManager initialized with {len(self.searchable_managers)} managers.")
 
+        # Let managers push incremental updates on create/update/delete
         for manager in self.searchable_managers:
-            manager_name = manager.__class__.__name__
+            if isinstance(manager, SearchableAsset):
+                manager.set_search_index_updater(self)
+
+        if self._restore_snapshot():
+            # Serve from the snapshot immediately and catch up with the managers in the background;
+            # assets deleted or renamed since the snapshot was written disappear once it completes
+            self._catch_up_thread = threading.Thread(target=self._catch_up, name="search-index-catch-up", daemon=True)
+            self._catch_up_thread.start()
+        else:
+            self.build_index() # Build index after receiving managers
+
+    def _restore_snapshot(self) -> bool:
+        """Loads the index from the snapshot file, if configured and valid. Returns whether it was restored."""
+        if not self.snapshot_path:
+            return False
+        snapshot = read_snapshot(self.snapshot_path)
+        if snapshot is None:
+            return False
+        entries = snapshot.entries
+        owner_ids = self._owner_ids_by_name()
+        items = [item for item, _ in entries]
+        with self._delta_lock:
+            restored_index = PartitionedSearchIndex(items)
+            # Deltas pushed while loading win over the snapshot
+            restored_owners = {item.id: owner_ids[owner] for item, owner in entries if owner in owner_ids}
+            for item in self._inverted_index.items:
+                restored_index.upsert(item)
+            restored_owners.update(self._item_owners)
+            self._inverted_index = restored_index
+            self._item_owners = restored_owners
+            self._generation += 1
+        logger.info(f"Search index restored from snapshot with {len(restored_index)} items (age {snapshot.age_seconds:.0f}s).")
+        return True
+
+    def _catch_up(self) -> None:
+        try:
+            self.build_index()
+        except Exception as e:
+            logger.error(f"Background search index catch-up after snapshot restore failed: {e}", exc_info=True)
+
+    def _owner_ids_by_name(self) -> Dict[str, int]:
+        """Maps manager class names to their id(); ambiguous names are left out."""
+        names = [manager.__class__.__name__ for manager in self.searchable_managers]
+        return {
+            manager.__class__.__name__: id(manager) for manager in self.searchable_managers
+            if names.count(manager.__class__.__name__) == 1
+        }
+
+    def _save_snapshot(self) -> None:
+        """Writes the current index to the snapshot file, if this process is its writer. Failures are logged, not raised."""
+        if not self.snapshot_path:
+            return
+        if not self._snapshot_writer_claimed:
+            self._snapshot_writer_claimed = True
             try:
-                # Ensure managers populate the new feature_id field
-                items = manager.get_search_index_items()
-                for item in items:
-                    if not hasattr(item, 'feature_id') or not item.feature_id:
-                         logger.warning(f"Search item {item.id} from {manager_name} is missing feature_id. Skipping.")
-                         continue
-                    new_index.append(item)
-            except Exception as e:
-                logger.error(f"Failed to get search items from {manager_name}: {e}", exc_info=True)
-        
-        # Atomically replace the index
-        self.index = new_index
-        logger.info(f"Search index build complete. Total items: {len(self.index)}")
-
-    def search(self, query: str, auth_manager: AuthorizationManager, user: UserInfo) -> List[SearchIndexItem]:
+                self._snapshot_writer = claim_snapshot_writer(self.snapshot_path)
+            except OSError as e:
+                logger.warning(f"Could not claim search index snapshot {self.snapshot_path}: {e}")
+            if self._snapshot_writer is None:
+                logger.info(f"Search index snapshot {self.snapshot_path} is written by another process.")
+        if self._snapshot_writer is None:
+            return
+        owner_names = {owner_id: name for name, owner_id in self._owner_ids_by_name().items()}
+        try:
+            with self._delta_lock:
+                items = self._inverted_index.items
+                owners = dict(self._item_owners)
+            written = write_snapshot(self.snapshot_path, ((item, owner_names.get(owners.get(item.id))) for item in items))
+            logger.info(f"Wrote search index snapshot {self.snapshot_path} with {written} items.")
+        except Exception as e:
+            logger.warning(f"Failed to write search index snapshot {self.snapshot_path}: {e}")
+
+    @property
+    def index(self) -> List[SearchIndexItem]:
+        """All currently indexed items, grouped by feature partition."""
+        return self._inverted_index.items
+
+    def build_index(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Builds or rebuilds the search index by querying searchable managers concurrently.
+
+        Each manager gets until build_timeout_seconds after the start of the build. A manager
+        that times out or fails keeps the items it previously contributed instead of
+        disappearing from search.
+
+        Returns:
+            Per-manager build statistics (status, item count, seconds), also kept in last_build_stats.
+        """
+        with self._build_lock:
+            build_started = time.perf_counter()
+            logger.info(f"Building search index from {len(self.searchable_managers)} managers...")
+            with self._delta_lock:
+                self._pending_deltas = []
+            new_index: List[SearchIndexItem] = [] # Build into a new list
+            new_owners: Dict[str, int] = {}
+            stats: Dict[str, Dict[str, Any]] = {}
+
+            try:
+                results = self._collect_manager_items()
+                current_items = None
+                for manager in self.searchable_managers:
+                    manager_name = manager.__class__.__name__
+                    status, items, seconds = results.get(id(manager), ("timeout", None, None))
+                    if status != "ok":
+                        if current_items is None:
+                            current_items = self._inverted_index.items
+                        items = [item for item in current_items if self._item_owners.get(item.id) == id(manager)]
+                        logger.warning(f"Search items from {manager_name} unavailable ({status}); keeping {len(items)} previously indexed items.")
+                    else:
+                        # Ensure managers populate the new feature_id field
+                        valid_items = []
+                        for item in items:
+                            if not hasattr(item, 'feature_id') or not item.feature_id:
+                                 logger.warning(f"Search item {item.id} from {manager_name} is missing feature_id. Skipping.")
+                                 continue
+                            valid_items.append(item)
+                        items = valid_items
+                    new_index.extend(items)
+                    new_owners.update((item.id, id(manager)) for item in items)
+                    stats_key = manager_name if manager_name not in stats else f"{manager_name}#{len(stats)}"
+                    stats[stats_key] = {
+                        "status": status,
+                        "items": len(items),
+                        "seconds": round(seconds, 3) if seconds is not None else None,
+                    }
+
+                # Build the inverted index before swapping so queries never see a partial index
+                inverted_index = PartitionedSearchIndex(new_index)
+            except Exception:
+                with self._delta_lock:
+                    self._pending_deltas = None
+                raise
+
+            with self._delta_lock:
+                # Replay deltas that raced with the rebuild, then atomically replace the index
+                for operation, payload, owner in self._pending_deltas or []:
+                    if operation == "upsert":
+                        inverted_index.upsert(payload)
+                        if owner is not None:
+                            new_owners[payload.id] = owner
+                    else:
+                        inverted_index.remove(payload)
+                        new_owners.pop(payload, None)
+                self._pending_deltas = None
+                self._inverted_index = inverted_index
+                self._item_owners = new_owners
+                self._generation += 1
+            self.last_build_stats = stats
+            logger.info(
+                f"Search index build complete in {time.perf_counter() - build_started:.2f}s. "
+                f"Total items: {len(inverted_index)}, distinct terms: {inverted_index.term_count}, "
+                f"partitions: {inverted_index.partition_sizes()}, managers: {stats}"
+            )
+            self._save_snapshot()
+            return stats
+
+    def _collect_manager_items(self) -> Dict[int, Tuple[str, Optional[List[SearchIndexItem]], Optional[float]]]:
+        """
+        Fetches items from all managers on a thread pool, bounded by the build deadline.
+
+        Managers sharing a SQLAlchemy session (their ``_db``) are fetched one after another
+        in the same worker, since a session must not be used from several threads at once.
+        Managers still busy from an earlier timed-out build are not queried again.
+
+        Returns:
+            Mapping of id(manager) to (status, items, seconds) for managers that finished or
+            were skipped; status is "ok", "error" or "busy". Missing managers timed out.
+        """
+        results: Dict[int, Tuple[str, Optional[List[SearchIndexItem]], Optional[float]]] = {}
+        results_lock = threading.Lock()
+        groups: Dict[int, List[SearchableAsset]] = {}
+        for manager in self.searchable_managers:
+            with self._inflight_lock:
+                if id(manager) in self._inflight_managers:
+                    logger.warning(f"{manager.__class__.__name__} is still fetching search items from a previous build. Skipping.")
+                    results[id(manager)] = ("busy", None, None)
+                    continue
+            session = getattr(manager, '_db', None)
+            groups.setdefault(id(session) if session is not None else id(manager), []).append(manager)
+        if not groups:
+            return results
+
+        def _fetch(group: List[SearchableAsset]) -> None:
+            for manager in group:
+                with self._inflight_lock:
+                    self._inflight_managers.add(id(manager))
+                started = time.perf_counter()
+                try:
+                    # Index builds read whole tables; let the read replica serve them when configured
+                    with replica_reads():
+                        outcome = ("ok", list(manager.get_search_index_items()))
+                except Exception as e:
+                    logger.error(f"Failed to get search items from {manager.__class__.__name__}: {e}", exc_info=True)
+                    outcome = ("error", None)
+                finally:
+                    with self._inflight_lock:
+                        self._inflight_managers.discard(id(manager))
+                with results_lock:
+                    results[id(manager)] = (outcome[0], outcome[1], time.perf_counter() - started)
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.build_max_workers, len(groups)),
+            thread_name_prefix="search-index-build",
+        )
+        try:
+            futures = [executor.submit(_fetch, group) for group in groups.values()]
+            _, not_done = wait(futures, timeout=self.build_timeout_seconds)
+            if not_done:
+                logger.warning(f"Search index build deadline of {self.build_timeout_seconds}s reached with {len(not_done)} manager group(s) unfinished.")
+        finally:
+            # Do not block on stragglers; their late results are discarded
+            executor.shutdown(wait=False, cancel_futures=True)
+        with results_lock:
+            return dict(results)
+
+    def upsert_item(self, item: SearchIndexItem, source: Optional[SearchableAsset] = None) -> None:
+        """Adds or replaces a single item in the index without a full rebuild."""
+        if not getattr(item, 'feature_id', None):
+            logger.warning(f"Search item {item.id} is missing feature_id. Skipping incremental update.")
+            return
+        owner = id(source) if source is not None else None
+        with self._delta_lock:
+            if self._pending_deltas is not None:
+                self._pending_deltas.append(("upsert", item, owner))
+            self._inverted_index.upsert(item)
+            if owner is not None:
+                self._item_owners[item.id] = owner
+            self._generation += 1
+        logger.debug(f"Search index upserted item {item.id}")
+
+    def remove_item(self, item_id: str) -> None:
+        """Removes a single item from the index without a full rebuild."""
+        with self._delta_lock:
+            if self._pending_deltas is not None:
+                self._pending_deltas.append(("remove", item_id, None))
+            removed = self._inverted_index.remove(item_id)
+            self._item_owners.pop(item_id, None)
+            if removed:
+                self._generation += 1
+        logger.debug(f"Search index remove for item {item_id} (was indexed: {removed})")
+
+    def start_periodic_rebuild(self, interval_seconds: int) -> None:
+        """
+        Starts a background thread that fully rebuilds the index every interval_seconds,
+        as a consistency fallback for missed incremental updates. A non-positive interval disables it.
+        """
+        if interval_seconds <= 0:
+            logger.info("Periodic search index rebuild disabled.")
+            return
+        if self._rebuild_thread and self._rebuild_thread.is_alive():
+            logger.debug("Periodic search index rebuild already running.")
+            return
+
+        stop_event = threading.Event()
+
+        def _run():
+            while not stop_event.wait(interval_seconds):
+                try:
+                    self.build_index()
+                except Exception as e:
+                    logger.error(f"Periodic search index rebuild failed: {e}", exc_info=True)
+
+        self._rebuild_stop_event = stop_event
+        self._rebuild_thread = threading.Thread(target=_run, name="search-index-rebuild", daemon=True)
+        self._rebuild_thread.start()
+        logger.info(f"Periodic search index rebuild scheduled every {interval_seconds}s.")
+
+    def stop_periodic_rebuild(self) -> None:
+        """Stops the periodic rebuild thread, if running."""
+        if self._rebuild_stop_event:
+            self._rebuild_stop_event.set()
+        self._rebuild_stop_event = None
+        self._rebuild_thread = None
+
+    def search(
+        self,
+        query: str,
+        auth_manager: AuthorizationManager,
+        user: UserInfo,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> List[SearchIndexItem]:
         """
-        Performs a case-insensitive prefix search on title, description, tags,
+        Performs a relevance-ranked, typo-tolerant search on title, description, tags,
         filtered by user permissions for the associated feature using AuthorizationManager.
+
+        Permissions are resolved once per query to the set of readable features, and
+        only the index partitions of those features are searched. Results are ordered
+        by BM25 score; limit caps the result count when given. See search_page() for
+        pagination.
+        """
+        return self.search_page(query, auth_manager, user, limit=limit, cursor=cursor)[0]
+
+    def search_page(
+        self,
+        query: str,
+        auth_manager: AuthorizationManager,
+        user: UserInfo,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[SearchIndexItem], Optional[str]]:
         """
+        Returns one page of search() results and the cursor of the next page.
+
+        Ranked results are cached per (query, readable features) until the index changes,
+        so repeated queries and further pages do not recompute the ranking.
+
+        Args:
+            query: The search query.
+            auth_manager: Used to resolve the user's readable features.
+            user: The user searching.
+            limit: Page size; None returns all remaining results.
+            cursor: Cursor returned with the previous page, or None for the first page.
+
+        Returns:
+            Tuple of (items, next_cursor); next_cursor is None on the last page.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed or belongs to a different query.
+        """
+        offset = _decode_cursor(cursor, query) if cursor else 0
+        ranked_ids = self._ranked_ids(query, auth_manager, user)
+        items, next_cursor = self._page(query, ranked_ids, offset, limit)
+        logger.info(f"Search for '{query}' returned {len(items)} of {len(ranked_ids)} results (offset {offset}) for user {user.username}.")
+        return items, next_cursor
+
+    def search_with_facets(
+        self,
+        query: str,
+        auth_manager: AuthorizationManager,
+        user: UserInfo,
+        limit: Optional[int] = None,
+        top_tags: int = DEFAULT_TOP_TAGS,
+        cursor: Optional[str] = None,
+    ) -> SearchResults:
+        """
+        Same as search_page(), but also returns the total match count and facet counts
+        (type, feature_id, top tags) over all matches the user may read.
+        """
+        offset = _decode_cursor(cursor, query) if cursor else 0
+        ranked_ids = self._ranked_ids(query, auth_manager, user)
+        items, next_cursor = self._page(query, ranked_ids, offset, limit)
+        facets = self._inverted_index.facet_counts(ranked_ids, top_tags=top_tags)
+        logger.info(f"Faceted search for '{query}' matched {len(ranked_ids)} items for user {user.username}.")
+        return SearchResults(items=items, total=len(ranked_ids), facets=SearchFacets(**facets), next_cursor=next_cursor)
+
+    def _page(
+        self, query: str, ranked_ids: List[str], offset: int, limit: Optional[int]
+    ) -> Tuple[List[SearchIndexItem], Optional[str]]:
+        end = len(ranked_ids) if limit is None else offset + limit
+        index = self._inverted_index
+        items = [item for item in (index.get(item_id) for item_id in ranked_ids[offset:end]) if item is not None]
+        next_cursor = _encode_cursor(query, end) if end < len(ranked_ids) else None
+        return items, next_cursor
+
+    def _ranked_ids(self, query: str, auth_manager: AuthorizationManager, user: UserInfo) -> List[str]:
+        """All result ids for the query that the user may read, served from the query cache when possible."""
         if not query:
             return []
 
-        query_lower = query.lower()
-        potential_results = []
-        for item in self.index:
-            match = False
-            # Check title
-            if item.title and item.title.lower().startswith(query_lower):
-                 match = True
-            # Check description (if not already matched)
-            elif item.description and item.description.lower().startswith(query_lower):
-                 match = True
-            # Check tags (if not already matched)
-            elif item.tags:
-                for tag in item.tags:
-                     if str(tag).lower().startswith(query_lower):
-                         match = True
-                         break # Found a matching tag
-            
-            if match:
-                potential_results.append(item)
-
-        # Filter based on permissions using AuthorizationManager
         if not user.groups:
              logger.warning(f"User {user.username} has no groups, returning empty search results.")
              return []
-             
-        filtered_results = []
+
         try:
-             effective_permissions = auth_manager.get_user_effective_permissions(user.groups)
-             for item in potential_results:
-                 if auth_manager.has_permission(effective_permissions, item.feature_id, FeatureAccessLevel.READ_ONLY):
-                     filtered_results.append(item)
+             readable_features = self._readable_features(auth_manager, user)
         except Exception as e:
             logger.error(f"Error checking permissions during search for user {user.username}: {e}", exc_info=True)
             # Return empty list or raise? Returning empty for now.
             return []
 
-        logger.info(f"Prefix search for '{query}' returned {len(filtered_results)} results after permission filtering for user {user.username}.")
-        return filtered_results 
+        generation = self._generation
+        # Users with the same readable features see the same results, so they share cache entries
+        cache_key = (normalize_term(query), tuple(sorted(readable_features)))
+        with self._query_cache_lock:
+            if self._query_cache_generation != generation:
+                self._query_cache.clear()
+                self._query_cache_generation = generation
+            ranked_ids = self._query_cache.get(cache_key)
+            if ranked_ids is not None:
+                self._query_cache.move_to_end(cache_key)
+                self.query_cache_hits += 1
+                return ranked_ids
+            self.query_cache_misses += 1
+
+        ranked_ids = self._inverted_index.rank(query, feature_ids=readable_features)
+
+        if self.query_cache_size > 0:
+            with self._query_cache_lock:
+                # Results computed against an index that changed meanwhile are not cached
+                if self._query_cache_generation == generation == self._generation:
+                    self._query_cache[cache_key] = ranked_ids
+                    if len(self._query_cache) > self.query_cache_size:
+                        self._query_cache.popitem(last=False)
+        return ranked_ids
+
+    def _readable_features(self, auth_manager: AuthorizationManager, user: UserInfo) -> List[str]:
+        """Returns the indexed feature ids the user has at least read access to."""
+        effective_permissions = auth_manager.get_user_effective_permissions(user.groups)
+        return [
+            feature_id for feature_id in self._inverted_index.partition_ids
+            if auth_manager.has_permission(effective_permissions, feature_id, FeatureAccessLevel.READ_ONLY)
+        ]
+
+
+def _query_fingerprint(query: str) -> str:
+    return hashlib.sha1(normalize_term(query).encode("utf-8")).hexdigest()[:12]
+
+
+def _encode_cursor(query: str, offset: int) -> str:
+    """Encodes an opaque cursor pointing at the given offset of a query's results."""
+    payload = json.dumps({"o": offset, "q": _query_fingerprint(query)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, query: str) -> int:
+    """Returns the offset stored in a cursor. Raises InvalidCursorError for invalid or foreign cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(payload["o"])
+        fingerprint = payload["q"]
+    except Exception as e:
+        raise InvalidCursorError("Invalid search cursor") from e
+    if offset < 0 or fingerprint != _query_fingerprint(query):
+        raise InvalidCursorError("Search cursor does not belong to this query")
+    return offset
@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import Callable, List, Optional, Dict, Any
 from pathlib import Path
 from rdflib import Graph, ConjunctiveGraph, Dataset
 from rdflib.namespace import RDF, RDFS, SKOS
@@ -21,6 +21,7 @@ from src.models.ontology import (
     ConceptSearchResult
 )
 from src.repositories.semantic_models_repository import semantic_models_repo
+from src.common.database import with_session
 from src.common.logging import get_logger
 
 
@@ -28,8 +29,10 @@ logger = get_logger(__name__)
 
 
 class SemanticModelsManager:
-    def __init__(self, db: Session, data_dir: Optional[Path] = None):
+    def __init__(self, db: Optional[Session] = None, data_dir: Optional[Path] = None, session_factory: Optional[Callable[[], Session]] = None):
+        # db is only bound in tests/scripts; otherwise methods use the caller's session or a short-lived one
         self._db = db
+        self._session_factory = session_factory
         self._data_dir = data_dir or Path(__file__).parent.parent / "data"
         # Use ConjunctiveGraph to support named graphs/contexts
         self._graph = ConjunctiveGraph()
@@ -40,38 +43,43 @@ class SemanticModelsManager:
         except Exception as e:
             logger.error(f"Failed to rebuild graph during initialization: {e}")
 
-    def list(self) -> List[SemanticModel]:
-        items = semantic_models_repo.get_multi(self._db)
+    @with_session
+    def list(self, db: Optional[Session] = None) -> List[SemanticModel]:
+        items = semantic_models_repo.get_multi(db)
         return [self._to_api(m) for m in items]
 
-    def get(self, model_id: str) -> Optional[SemanticModel]:
-        m = semantic_models_repo.get(self._db, id=model_id)
+    @with_session
+    def get(self, model_id: str, db: Optional[Session] = None) -> Optional[SemanticModel]:
+        m = semantic_models_repo.get(db, id=model_id)
         return self._to_api(m) if m else None
 
-    def create(self, data: SemanticModelCreate, created_by: Optional[str]) -> SemanticModel:
-        db_obj = semantic_models_repo.create(self._db, obj_in=data)
+    @with_session
+    def create(self, data: SemanticModelCreate, created_by: Optional[str], db: Optional[Session] = None) -> SemanticModel:
+        db_obj = semantic_models_repo.create(db, obj_in=data)
         if created_by:
             db_obj.created_by = created_by
             db_obj.updated_by = created_by
-            self._db.add(db_obj)
-        self._db.flush()
-        self._db.refresh(db_obj)
+            db.add(db_obj)
+        db.flush()
+        db.refresh(db_obj)
         return self._to_api(db_obj)
 
-    def update(self, model_id: str, update: SemanticModelUpdate, updated_by: Optional[str]) -> Optional[SemanticModel]:
-        db_obj = semantic_models_repo.get(self._db, id=model_id)
+    @with_session
+    def update(self, model_id: str, update: SemanticModelUpdate, updated_by: Optional[str], db: Optional[Session] = None) -> Optional[SemanticModel]:
+        db_obj = semantic_models_repo.get(db, id=model_id)
         if not db_obj:
             return None
-        updated = semantic_models_repo.update(self._db, db_obj=db_obj, obj_in=update)
+        updated = semantic_models_repo.update(db, db_obj=db_obj, obj_in=update)
         if updated_by:
             updated.updated_by = updated_by
-            self._db.add(updated)
-        self._db.flush()
-        self._db.refresh(updated)
+            db.add(updated)
+        db.flush()
+        db.refresh(updated)
         return self._to_api(updated)
 
-    def replace_content(self, model_id: str, content_text: str, original_filename: Optional[str], content_type: Optional[str], size_bytes: Optional[int], updated_by: Optional[str]) -> Optional[SemanticModel]:
-        db_obj = semantic_models_repo.get(self._db, id=model_id)
+    @with_session
+    def replace_content(self, model_id: str, content_text: str, original_filename: Optional[str], content_type: Optional[str], size_bytes: Optional[int], updated_by: Optional[str], db: Optional[Session] = None) -> Optional[SemanticModel]:
+        db_obj = semantic_models_repo.get(db, id=model_id)
         if not db_obj:
             return None
         db_obj.content_text = content_text
@@ -83,17 +91,19 @@ class SemanticModelsManager:
             db_obj.size_bytes = str(size_bytes)
         if updated_by:
             db_obj.updated_by = updated_by
-        self._db.add(db_obj)
-        self._db.flush()
-        self._db.refresh(db_obj)
+        db.add(db_obj)
+        db.flush()
+        db.refresh(db_obj)
         return self._to_api(db_obj)
 
-    def delete(self, model_id: str) -> bool:
-        obj = semantic_models_repo.remove(self._db, id=model_id)
+    @with_session
+    def delete(self, model_id: str, db: Optional[Session] = None) -> bool:
+        obj = semantic_models_repo.remove(db, id=model_id)
         return obj is not None
 
-    def preview(self, model_id: str, max_chars: int = 2000) -> Optional[SemanticModelPreview]:
-        db_obj = semantic_models_repo.get(self._db, id=model_id)
+    @with_session
+    def preview(self, model_id: str, max_chars: int = 2000, db: Optional[Session] = None) -> Optional[SemanticModelPreview]:
+        db_obj = semantic_models_repo.get(db, id=model_id)
         if not db_obj:
             return None
         return SemanticModelPreview(
@@ -142,7 +152,7 @@ class SemanticModelsManager:
                     logger.warning(f"Skipping semantic model file {f}: {e}")
                     continue
 
-                existing = semantic_models_repo.get_by_name(self._db, name=f.name)
+                existing = semantic_models_repo.get_by_name(db, name=f.name)
                 if existing:
                     logger.debug(f"Semantic model already exists, skipping: {f.name}")
                     continue
@@ -157,7 +167,7 @@ class SemanticModelsManager:
                     size_bytes=len(content.encode("utf-8")),
                     enabled=True,
                 )
-                self.create(create, created_by="system@startup")
+                self.create(create, created_by="system@startup", db=db)
             db.commit()
             logger.info("Semantic models initial data loaded (if any).")
             # Build the in-memory graph from enabled models after initial load
@@ -191,12 +201,13 @@ class SemanticModelsManager:
         except Exception as e:
             logger.warning(f"Failed to load database glossaries into graph: {e}")
 
-    def rebuild_graph_from_enabled(self) -> None:
+    @with_session
+    def rebuild_graph_from_enabled(self, db: Optional[Session] = None) -> None:
         logger.info("Starting to rebuild graph from enabled models and taxonomies")
         self._graph = ConjunctiveGraph()
         
         # Load database-backed semantic models into named graphs
-        items = semantic_models_repo.get_multi(self._db)
+        items = semantic_models_repo.get_multi(db)
         for it in items:
             if not it.enabled:
                 continue
@@ -210,7 +221,7 @@ class SemanticModelsManager:
         
         # Load application entities (data domains, data products, data contracts) into a named graph
         try:
-            self._load_app_entities_into_graph()
+            self._load_app_entities_into_graph(db)
         except Exception as e:
             logger.warning(f"Failed to load application entities into graph: {e}")
 
@@ -264,7 +275,7 @@ class SemanticModelsManager:
         # Add rdfs:seeAlso links from entity-semantic links
         try:
             from src.repositories.semantic_links_repository import entity_semantic_links_repo
-            links = entity_semantic_links_repo.list_all(self._db)
+            links = entity_semantic_links_repo.list_all(db)
             context_name = "urn:semantic-links"
             context = self._graph.get_context(context_name)
             for link in links:
@@ -587,7 +598,7 @@ class SemanticModelsManager:
 
     # --- App Entities & Incremental Link Updates ---
 
-    def _load_app_entities_into_graph(self) -> None:
+    def _load_app_entities_into_graph(self, db: Session) -> None:
         """Load core application entities into the RDF graph with labels/types.
 
         Adds triples into the 'urn:app-entities' named graph so they persist across rebuilds.
@@ -599,7 +610,7 @@ class SemanticModelsManager:
 
         # Data Domains: table data_domains(id, name)
         try:
-            rows = self._db.execute(sql_text("SELECT id, name FROM data_domains")).fetchall()
+            rows = db.execute(sql_text("SELECT id, name FROM data_domains")).fetchall()
             for r in rows:
                 subj = URIRef(f"urn:ucapp:data_domain:{r[0]}")
                 context.add((subj, RDF.type, URIRef("urn:ucapp:entity-type:data_domain")))
@@ -610,7 +621,7 @@ class SemanticModelsManager:
 
         # Data Products: resolve id and title from data_product_info
         try:
-            rows = self._db.execute(sql_text("SELECT data_product_id, title FROM data_product_info")).fetchall()
+            rows = db.execute(sql_text("SELECT data_product_id, title FROM data_product_info")).fetchall()
             for r in rows:
                 subj = URIRef(f"urn:ucapp:data_product:{r[0]}")
                 context.add((subj, RDF.type, URIRef("urn:ucapp:entity-type:data_product")))
@@ -621,7 +632,7 @@ class SemanticModelsManager:
 
         # Data Contracts: table data_contracts(id, name)
         try:
-            rows = self._db.execute(sql_text("SELECT id, name FROM data_contracts")).fetchall()
+            rows = db.execute(sql_text("SELECT id, name FROM data_contracts")).fetchall()
             for r in rows:
                 subj = URIRef(f"urn:ucapp:data_contract:{r[0]}")
                 context.add((subj, RDF.type, URIRef("urn:ucapp:entity-type:data_contract")))
@@ -1,7 +1,9 @@
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 import json
+import threading
+import time
 import uuid
 
 from databricks.sdk import WorkspaceClient
@@ -11,6 +13,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import func
 
 from src.common.config import Settings
+from src.common.database import call_after_commit, session_scope, with_session
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from src.controller.notifications_manager import NotificationsManager
@@ -89,20 +92,47 @@ DEFAULT_ROLE_PERMISSIONS = {
 }
 
 class SettingsManager:
-    def __init__(self, db: Session, settings: Settings, workspace_client: Optional[WorkspaceClient] = None):
-        """Inject database session, settings, and optional workspace client."""
+    def __init__(
+        self,
+        db: Optional[Session],
+        settings: Settings,
+        workspace_client: Optional[WorkspaceClient] = None,
+        session_factory: Optional[Callable[[], Session]] = None,
+    ):
+        """Inject settings, an optional workspace client and how to get database sessions.
+
+        Args:
+            db: Session bound for the manager's lifetime (tests, scripts), or None
+                to use the caller's session or a short-lived one per call.
+            settings: Application settings.
+            workspace_client: Optional Databricks workspace client.
+            session_factory: Factory for per-call sessions; defaults to the application's.
+        """
         self._db = db
+        self._session_factory = session_factory
         self._settings = settings # Store settings
         self._client = workspace_client
         # Available jobs derive from workflows on disk
         self._available_jobs: List[str] = []
         self._installations: Dict[str, WorkflowInstallation] = {}
         self.app_role_repo = app_role_repo
+        # Bumped whenever roles change so caches derived from them (e.g. effective permissions) are rebuilt
+        self._roles_version = 0
+        # Copy-on-write snapshot of all roles, shared by readers and replaced (never mutated) when roles change
+        self._roles_snapshot: Optional[Tuple[AppRole, ...]] = None
+        # Role writes of other worker processes only show once the snapshot expires
+        self.roles_cache_ttl_seconds = settings.ROLES_CACHE_TTL_SECONDS
+        self._roles_snapshot_expires_at = 0.0
+        self._roles_snapshot_lock = threading.Lock()
+        # Role writes not yet committed or rolled back; no snapshot is published while any are open
+        self._pending_role_writes = 0
+        # Guards the version and pending count; separate from the snapshot lock, which is held across a DB read
+        self._roles_version_lock = threading.Lock()
         self._notifications_manager: Optional['NotificationsManager'] = None
         # Initialize available jobs from workflow directory
         try:
             from src.controller.jobs_manager import JobsManager
-            self._jobs = JobsManager(db=self._db, ws_client=self._client, notifications_manager=self._notifications_manager)
+            self._jobs = JobsManager(db=self._db, ws_client=self._client, notifications_manager=self._notifications_manager, session_factory=self._session_factory)
             self._available_jobs = [w["id"] for w in self._jobs.list_available_workflows()]
         except Exception:
             self._jobs = None
@@ -111,10 +141,11 @@ class SettingsManager:
     def set_notifications_manager(self, notifications_manager: 'NotificationsManager') -> None:
         self._notifications_manager = notifications_manager
 
-    def ensure_default_roles_exist(self):
+    @with_session
+    def ensure_default_roles_exist(self, db: Optional[Session] = None):
         """Checks if default roles exist and creates them if necessary."""
         try:
-            existing_roles_count = self.get_app_roles_count()
+            existing_roles_count = self.get_app_roles_count(db=db)
             if existing_roles_count > 0:
                 logger.info(f"Found {existing_roles_count} existing roles. Skipping default role creation.")
                 return
@@ -193,7 +224,7 @@ class SettingsManager:
 
                 try:
                     role_create_model = AppRoleCreate(**role_data)
-                    self.create_app_role(role=role_create_model) # Use self.create_app_role
+                    self.create_app_role(role=role_create_model, db=db) # Use self.create_app_role
                     logger.info(f"Successfully created default role: {role_name}")
                 except Exception as e:
                     # Log the specific role data that failed validation/creation
@@ -207,7 +238,7 @@ class SettingsManager:
 
         except SQLAlchemyError as e:
             logger.error(f"Database error during default role check/creation: {e}", exc_info=True)
-            self._db.rollback() # Rollback on DB error
+            db.rollback() # Rollback on DB error
             raise RuntimeError("Failed during default role creation due to database error.")
         except Exception as e:
             logger.error(f"Unexpected error during default role check/creation: {e}", exc_info=True)
@@ -319,15 +350,16 @@ class SettingsManager:
 
     # --- RBAC Methods --- 
 
-    def get_app_roles_count(self) -> int:
+    @with_session
+    def get_app_roles_count(self, db: Optional[Session] = None) -> int:
         """Returns the total number of application roles."""
         try:
-            count = self.app_role_repo.get_roles_count(db=self._db)
+            count = self.app_role_repo.get_roles_count(db=db)
             logger.debug(f"Found {count} application roles in the database.")
             return count
         except SQLAlchemyError as e:
             logger.error(f"Database error while counting roles: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise RuntimeError("Failed to count application roles due to database error.")
 
     def set_notifications_manager(self, notifications_manager: 'NotificationsManager'):
@@ -341,7 +373,8 @@ class SettingsManager:
                 self._jobs = JobsManager(
                     db=self._db, 
                     ws_client=self._client, 
-                    notifications_manager=self._notifications_manager
+                    notifications_manager=self._notifications_manager,
+                    session_factory=self._session_factory,
                 )
                 self._available_jobs = [w["id"] for w in self._jobs.list_available_workflows()]
             except Exception as e:
@@ -385,6 +418,51 @@ class SettingsManager:
             # updated_at=role_db.updated_at  # Uncomment if needed
         )
 
+    @property
+    def roles_version(self) -> int:
+        """Version of the role configuration.
+
+        Changes whenever a role creation, update or deletion commits in this
+        process, and whenever the roles snapshot expires, so that role changes
+        committed by other processes reach the caches derived from the roles.
+        """
+        self._expire_roles_snapshot()
+        return self._roles_version
+
+    def _expire_roles_snapshot(self) -> None:
+        snapshot = self._roles_snapshot
+        if snapshot is None or time.monotonic() < self._roles_snapshot_expires_at:
+            return
+        with self._roles_version_lock:
+            if self._roles_snapshot is snapshot:
+                self._roles_version += 1
+                self._roles_snapshot = None
+
+    def _bump_roles_version(self) -> None:
+        with self._roles_version_lock:
+            self._roles_version += 1
+            self._roles_snapshot = None
+
+    def _roles_changed(self, db: Session) -> None:
+        """Bumps the roles version once the write in db commits.
+
+        Snapshots are rebuilt from committed rows, so dropping the snapshot any
+        earlier would let a concurrent read republish the old roles under the
+        new version.
+        """
+        with self._roles_version_lock:
+            self._pending_role_writes += 1
+
+        def write_ended() -> None:
+            with self._roles_version_lock:
+                self._pending_role_writes -= 1
+
+        def committed() -> None:
+            write_ended()
+            self._bump_roles_version()
+
+        call_after_commit(db, committed, on_rollback=write_ended)
+
     def get_features_with_access_levels(self) -> Dict[str, Dict[str, str | List[str]]]:
         """Returns a dictionary of features and their allowed access levels."""
         features_config = get_feature_config()
@@ -398,74 +476,107 @@ class SettingsManager:
             for feature_id, config in features_config.items()
         }
 
-    def list_app_roles(self) -> List[AppRole]:
-        """Lists all configured application roles from the database."""
-        try:
-            roles_db = self.app_role_repo.get_all_roles(db=self._db)
-
-            # Backfill default home_sections for roles missing configuration
-            updated_any = False
-            for role_db in roles_db:
-                try:
-                    hs_raw = json.loads(getattr(role_db, 'home_sections', '[]') or '[]')
-                except Exception:
-                    hs_raw = []
-                if not hs_raw:
-                    default_sections: List[HomeSection]
-                    name = (role_db.name or '').strip()
-                    if name == 'Admin':
-                        default_sections = [HomeSection.REQUIRED_ACTIONS, HomeSection.DATA_CURATION, HomeSection.DISCOVERY]
-                    elif name in ('Data Steward', 'Security Officer', 'Data Governance Officer'):
-                        default_sections = [HomeSection.REQUIRED_ACTIONS, HomeSection.DISCOVERY]
-                    elif name == 'Data Producer':
-                        default_sections = [HomeSection.DATA_CURATION, HomeSection.DISCOVERY]
-                    else:  # Data Consumer or others
-                        default_sections = [HomeSection.DISCOVERY]
-                    # Persist backfill
-                    self.app_role_repo.update(db=self._db, db_obj=role_db, obj_in={'home_sections': default_sections})
-                    updated_any = True
-
-            if updated_any:
-                # Flush once after backfill
-                try:
-                    self._db.flush()
-                except Exception:
-                    pass
+    @with_session
+    def backfill_role_home_sections(self, db: Optional[Session] = None) -> int:
+        """Assigns default home_sections to roles that have none configured.
 
-            return [self._map_db_to_api(role_db) for role_db in roles_db]
-        except SQLAlchemyError as e:
-            logger.error(f"Database error listing roles: {e}", exc_info=True)
-            self._db.rollback()
-            return [] # Return empty list on error
+        Runs once at startup so that reading roles never writes to the database.
 
-    def get_app_role(self, role_id: str) -> Optional[AppRole]:
+        Returns:
+            Number of roles updated.
+        """
+        updated = 0
+        for role_db in self.app_role_repo.get_all_roles(db=db):
+            try:
+                hs_raw = json.loads(getattr(role_db, 'home_sections', '[]') or '[]')
+            except Exception:
+                hs_raw = []
+            if hs_raw:
+                continue
+            default_sections: List[HomeSection]
+            name = (role_db.name or '').strip()
+            if name == 'Admin':
+                default_sections = [HomeSection.REQUIRED_ACTIONS, HomeSection.DATA_CURATION, HomeSection.DISCOVERY]
+            elif name in ('Data Steward', 'Security Officer', 'Data Governance Officer'):
+                default_sections = [HomeSection.REQUIRED_ACTIONS, HomeSection.DISCOVERY]
+            elif name == 'Data Producer':
+                default_sections = [HomeSection.DATA_CURATION, HomeSection.DISCOVERY]
+            else:  # Data Consumer or others
+                default_sections = [HomeSection.DISCOVERY]
+            self.app_role_repo.update(db=db, db_obj=role_db, obj_in={'home_sections': default_sections})
+            updated += 1
+
+        if updated:
+            db.flush()
+            self._roles_changed(db)
+            logger.info(f"Backfilled default home sections for {updated} roles.")
+        return updated
+
+    def list_app_roles(self, db: Optional[Session] = None) -> List[AppRole]:
+        """Lists all configured application roles.
+
+        Roles are served from an in-memory snapshot that is rebuilt from the
+        database after roles change or roles_cache_ttl_seconds have passed. The
+        returned AppRole objects are shared between callers and must not be modified.
+        """
+        self._expire_roles_snapshot()
+        snapshot = self._roles_snapshot
+        if snapshot is not None:
+            return list(snapshot)
+        with self._roles_snapshot_lock:
+            if self._roles_snapshot is not None:
+                return list(self._roles_snapshot)
+            version = self._roles_version
+            # Only a snapshot miss needs a session
+            bound = db if db is not None else self._db
+            try:
+                with session_scope(bound, self._session_factory) as session:
+                    roles_db = self.app_role_repo.get_all_roles(db=session)
+                    snapshot = tuple(self._map_db_to_api(role_db) for role_db in roles_db)
+            except SQLAlchemyError as e:
+                logger.error(f"Database error listing roles: {e}", exc_info=True)
+                if bound is not None:
+                    bound.rollback()
+                return [] # Return empty list on error
+            # Don't publish a snapshot if roles changed while it was being built,
+            # or while a role write may still commit (or was read uncommitted from db)
+            with self._roles_version_lock:
+                if version == self._roles_version and not self._pending_role_writes:
+                    self._roles_snapshot_expires_at = time.monotonic() + self.roles_cache_ttl_seconds
+                    self._roles_snapshot = snapshot
+            return list(snapshot)
+
+    @with_session
+    def get_app_role(self, role_id: str, db: Optional[Session] = None) -> Optional[AppRole]:
         """Retrieves a specific application role by ID."""
         try:
-            role_db = self.app_role_repo.get(db=self._db, id=role_id)
+            role_db = self.app_role_repo.get(db=db, id=role_id)
             if role_db:
                 return self._map_db_to_api(role_db)
             return None
         except SQLAlchemyError as e:
             logger.error(f"Database error getting role {role_id}: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             return None
 
-    def get_app_role_by_name(self, role_name: str) -> Optional[AppRole]:
+    @with_session
+    def get_app_role_by_name(self, role_name: str, db: Optional[Session] = None) -> Optional[AppRole]:
         """Retrieves a specific application role by name."""
         try:
-            role_db = self.app_role_repo.get_by_name(db=self._db, name=role_name)
+            role_db = self.app_role_repo.get_by_name(db=db, name=role_name)
             if role_db:
                 return self._map_db_to_api(role_db)
             return None
         except SQLAlchemyError as e:
             logger.error(f"Database error getting role by name '{role_name}': {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             return None
 
-    def create_app_role(self, role: AppRoleCreate) -> AppRole:
+    @with_session
+    def create_app_role(self, role: AppRoleCreate, db: Optional[Session] = None) -> AppRole:
         """Creates a new application role."""
         # Validate name uniqueness
-        existing_role = self.get_app_role_by_name(role_name=role.name)
+        existing_role = self.get_app_role_by_name(role_name=role.name, db=db)
         if existing_role:
             logger.warning(f"Attempted to create role with duplicate name: {role.name}")
             raise ValueError(f"Role with name '{role.name}' already exists.")
@@ -475,19 +586,20 @@ class SettingsManager:
 
         try:
             # Pass the Pydantic model directly to the repository
-            role_db = self.app_role_repo.create(db=self._db, obj_in=role)
+            role_db = self.app_role_repo.create(db=db, obj_in=role)
             # Commit is handled by the request lifecycle or calling function
-            # self._db.commit() # Remove commit from manager method
-            # self._db.refresh(role_db) # Refresh is handled in repo
+            # db.commit() # Remove commit from manager method
+            # db.refresh(role_db) # Refresh is handled in repo
+            self._roles_changed(db)
             logger.info(f"Successfully created role '{role.name}' with ID {role_db.id}")
             return self._map_db_to_api(role_db)
         except SQLAlchemyError as e:
             logger.error(f"Database error creating role '{role.name}': {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise RuntimeError("Failed to create application role due to database error.")
         except Exception as e:
             logger.error(f"Unexpected error creating role '{role.name}': {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise
 
     def _validate_permissions(self, permissions: Dict[str, FeatureAccessLevel]):
@@ -504,16 +616,17 @@ class SettingsManager:
                     f"Allowed levels are: {allowed_str}"
                 )
 
-    def update_app_role(self, role_id: str, role_update: AppRoleUpdate) -> Optional[AppRole]:
+    @with_session
+    def update_app_role(self, role_id: str, role_update: AppRoleUpdate, db: Optional[Session] = None) -> Optional[AppRole]:
         """Updates an existing application role."""
         try:
-            role_db = self.app_role_repo.get(db=self._db, id=role_id)
+            role_db = self.app_role_repo.get(db=db, id=role_id)
             if not role_db:
                 return None
 
             # Validate name uniqueness if name is being changed
             if role_update.name is not None and role_update.name != role_db.name:
-                existing_role = self.get_app_role_by_name(role_name=role_update.name)
+                existing_role = self.get_app_role_by_name(role_name=role_update.name, db=db)
                 if existing_role and str(existing_role.id) != role_id:
                     logger.warning(f"Attempted to update role {role_id} with duplicate name: {role_update.name}")
                     raise ValueError(f"Role with name '{role_update.name}' already exists.")
@@ -523,27 +636,29 @@ class SettingsManager:
                 self._validate_permissions(role_update.feature_permissions)
 
             # Pass the Pydantic model (AppRoleUpdate) directly to the repository update method
-            updated_role_db = self.app_role_repo.update(db=self._db, db_obj=role_db, obj_in=role_update)
+            updated_role_db = self.app_role_repo.update(db=db, db_obj=role_db, obj_in=role_update)
+            self._roles_changed(db)
             # Commit handled by request lifecycle
             logger.info(f"Successfully updated role (ID: {role_id})")
             return self._map_db_to_api(updated_role_db)
         except SQLAlchemyError as e:
             logger.error(f"Database error updating role {role_id}: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise RuntimeError(f"Failed to update role {role_id} due to database error.")
         except ValueError as e: # Catch validation errors
              logger.warning(f"Validation error updating role {role_id}: {e}")
-             self._db.rollback()
+             db.rollback()
              raise # Re-raise validation errors
         except Exception as e:
             logger.error(f"Unexpected error updating role {role_id}: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise
 
-    def delete_app_role(self, role_id: str) -> bool:
+    @with_session
+    def delete_app_role(self, role_id: str, db: Optional[Session] = None) -> bool:
         """Deletes an application role by ID."""
         try:
-            role_db = self.app_role_repo.get(db=self._db, id=role_id)
+            role_db = self.app_role_repo.get(db=db, id=role_id)
             if not role_db:
                 logger.warning(f"Attempted to delete non-existent role with ID: {role_id}")
                 return False
@@ -553,18 +668,19 @@ class SettingsManager:
             #    logger.warning("Attempted to delete the default Admin role.")
             #    raise ValueError("Cannot delete the default Admin role.")
 
-            self.app_role_repo.remove(db=self._db, id=role_id)
+            self.app_role_repo.remove(db=db, id=role_id)
+            self._roles_changed(db)
             # Commit handled by request lifecycle
-            # self._db.commit()
+            # db.commit()
             logger.info(f"Successfully deleted role with ID: {role_id}")
             return True
         except SQLAlchemyError as e:
             logger.error(f"Database error deleting role {role_id}: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise RuntimeError(f"Failed to delete role {role_id} due to database error.")
         except Exception as e:
             logger.error(f"Unexpected error deleting role {role_id}: {e}", exc_info=True)
-            self._db.rollback()
+            db.rollback()
             raise
 
     # --- Methods related to workflows and jobs remain unchanged --- 
@@ -1,10 +1,11 @@
-from typing import List, Optional, Union
+from typing import List, Optional, Tuple, Union
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from src.common.logging import get_logger
+from src.common.database import get_session_factory
 from src.repositories.tags_repository import (
     tag_namespace_repo, tag_repo, tag_namespace_permission_repo, entity_tag_repo,
     TagNamespaceRepository, TagRepository, TagNamespacePermissionRepository, EntityTagAssociationRepository
@@ -73,6 +74,9 @@ class TagsManager(SearchableAsset):
         updated_db_namespace = self._namespace_repo.update(db, db_obj=db_namespace, obj_in=namespace_in, user_email=user_email)
         db.commit()
         db.refresh(updated_db_namespace)
+        # A rename changes the fully qualified name of every tag in the namespace
+        for tag_db_obj in self._tag_repo.get_multi_with_filters(db, namespace_id=namespace_id, limit=10000):
+            self._notify_search_upsert(self._build_search_index_item(tag_db_obj))
         return TagNamespace.from_orm(updated_db_namespace)
 
     def delete_namespace(self, db: Session, *, namespace_id: UUID) -> bool:
@@ -86,9 +90,12 @@ class TagsManager(SearchableAsset):
         # if tags_in_namespace:
         #     raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Namespace not empty. Delete tags first.")
         
+        tag_ids = [tag_db_obj.id for tag_db_obj in self._tag_repo.get_multi_with_filters(db, namespace_id=namespace_id, limit=10000)]
         deleted_count = self._namespace_repo.remove(db, id=namespace_id)
         if deleted_count:
             db.commit()
+            for tag_id in tag_ids:
+                self._notify_search_remove(f"tag::{tag_id}")
             return True
         return False
 
@@ -183,6 +190,7 @@ class TagsManager(SearchableAsset):
         db.refresh(db_tag)
         # Eager load namespace for the response model
         db.refresh(db_tag, attribute_names=['namespace'])
+        self._notify_search_upsert(self._build_search_index_item(db_tag))
         return Tag.from_orm(db_tag)
 
     def get_tag(self, db: Session, *, tag_id: UUID) -> Optional[Tag]:
@@ -211,6 +219,25 @@ class TagsManager(SearchableAsset):
         )
         return [Tag.from_orm(tag) for tag in db_tags]
 
+    def list_tags_page(
+        self, db: Session, *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        namespace_id: Optional[UUID] = None,
+        namespace_name: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        status: Optional[TagStatus] = None,
+        parent_id: Optional[UUID] = None,
+        is_root: Optional[bool] = None
+    ) -> Tuple[List[Tag], Optional[str]]:
+        page = self._tag_repo.get_page_with_filters(
+            db, limit=limit, cursor=cursor,
+            namespace_id=namespace_id, namespace_name=namespace_name,
+            name_contains=name_contains, status=status,
+            parent_id=parent_id, is_root=is_root
+        )
+        return [Tag.from_orm(tag) for tag in page.items], page.next_cursor
+
     def update_tag(self, db: Session, *, tag_id: UUID, tag_in: TagUpdate, user_email: Optional[str]) -> Optional[Tag]:
         db_tag = self._tag_repo.get(db, id=tag_id)
         if not db_tag:
@@ -238,6 +265,7 @@ class TagsManager(SearchableAsset):
         db.commit()
         db.refresh(updated_db_tag)
         db.refresh(updated_db_tag, attribute_names=['namespace']) # Ensure namespace is loaded for FQN
+        self._notify_search_upsert(self._build_search_index_item(updated_db_tag))
         return Tag.from_orm(updated_db_tag)
 
     def delete_tag(self, db: Session, *, tag_id: UUID) -> bool:
@@ -255,6 +283,7 @@ class TagsManager(SearchableAsset):
         deleted_count = self._tag_repo.remove(db, id=tag_id)
         if deleted_count:
             db.commit()
+            self._notify_search_remove(f"tag::{tag_id}")
             return True
         return False
 
@@ -312,7 +341,29 @@ class TagsManager(SearchableAsset):
         return False
 
     # --- SearchableAsset Implementation ---
-    def get_search_index_items(self, db: Session) -> List[SearchIndexItem]:
+    def _build_search_index_item(self, tag_db_obj: TagDb) -> Optional[SearchIndexItem]:
+        """Maps a tag (with its namespace loaded) to its SearchIndexItem, or None if it cannot be indexed."""
+        if not tag_db_obj.id or not tag_db_obj.name or not tag_db_obj.namespace:
+             logger.warning(f"Skipping tag for search indexing due to missing id, name, or namespace: {tag_db_obj}")
+             return None
+
+        tag_api_model = Tag.from_orm(tag_db_obj) # Use Pydantic model for FQN
+        return SearchIndexItem(
+            id=f"tag::{tag_api_model.id}",
+            type="tag",
+            feature_id="tags", # Or "settings.tags" if managed under settings UI
+            title=tag_api_model.fully_qualified_name,
+            description=tag_api_model.description or f"Tag: {tag_api_model.name} in namespace {tag_api_model.namespace_name}",
+            link=f"/settings/tags?tagId={tag_api_model.id}", # Placeholder link, adjust to actual UI path
+            tags=[tag_api_model.name, tag_api_model.namespace_name or DEFAULT_NAMESPACE_NAME, f"status:{tag_api_model.status.value}"]
+        )
+
+    def get_search_index_items(self, db: Optional[Session] = None) -> List[SearchIndexItem]:
+        if db is None:
+            # Called from SearchManager.build_index, which has no request session
+            with get_session_factory()() as own_db:
+                return self.get_search_index_items(own_db)
+
         logger.info("TagsManager: Fetching tags for search indexing...")
         items = []
         try:
@@ -320,24 +371,11 @@ class TagsManager(SearchableAsset):
             db_tags = self._tag_repo.get_multi_with_filters(db, limit=10000) # Adjust limit as needed
             
             for tag_db_obj in db_tags:
-                if not tag_db_obj.id or not tag_db_obj.name or not tag_db_obj.namespace:
-                     logger.warning(f"Skipping tag for search indexing due to missing id, name, or namespace: {tag_db_obj}")
-                     continue
-                
-                tag_api_model = Tag.from_orm(tag_db_obj) # Use Pydantic model for FQN
-                items.append(
-                    SearchIndexItem(
-                        id=f"tag::{tag_api_model.id}",
-                        type="tag",
-                        feature_id="tags", # Or "settings.tags" if managed under settings UI
-                        title=tag_api_model.fully_qualified_name,
-                        description=tag_api_model.description or f"Tag: {tag_api_model.name} in namespace {tag_api_model.namespace_name}",
-                        link=f"/settings/tags?tagId={tag_api_model.id}", # Placeholder link, adjust to actual UI path
-                        tags=[tag_api_model.name, tag_api_model.namespace_name or DEFAULT_NAMESPACE_NAME, f"status:{tag_api_model.status.value}"]
-                    )
-                )
+                item = self._build_search_index_item(tag_db_obj)
+                if item:
+                    items.append(item)
             logger.info(f"TagsManager: Prepared {len(items)} tags for search index.")
             return items
         except Exception as e:
             logger.error(f"TagsManager: Error fetching or mapping tags for search: {e}", exc_info=True)
-            return [] 
\ No newline at end of file
+            return []
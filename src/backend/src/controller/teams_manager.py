@@ -1,6 +1,9 @@
 import logging
 import json
-from typing import List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
@@ -15,18 +18,190 @@ from src.models.teams import (
     TeamMemberRead
 )
 from src.db_models.teams import TeamDb, TeamMemberDb
+from src.common.database import call_after_commit
 from src.common.logging import get_logger
 from src.common.errors import ConflictError, NotFoundError
 
 logger = get_logger(__name__)
 
+# Default for how long the membership index is served before it is reloaded
+DEFAULT_MEMBERSHIP_REFRESH_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class TeamMembership:
+    """A member's entry in one team, as kept in the membership index."""
+    team_id: str
+    team_name: str
+    app_role_override: Optional[str]
+
 
 class TeamsManager:
     def __init__(self):
         self.team_repo = team_repo
         self.team_member_repo = team_member_repo
+        # member_identifier (user email or group name) -> memberships ordered by team name.
+        # None until refresh_membership_index has run.
+        self._membership_index: Optional[Dict[str, Tuple[TeamMembership, ...]]] = None
+        self._membership_lock = threading.Lock()
+        # Changes committed by other worker processes only arrive through a reload
+        self.membership_refresh_seconds = DEFAULT_MEMBERSHIP_REFRESH_SECONDS
+        self._membership_loaded_at: Optional[float] = None
+        self._membership_changes = 0  # Committed changes applied to the index
+        self._membership_refresh_lock = threading.Lock()
+        # Called after team memberships change (e.g. to invalidate project access caches)
+        self._membership_listeners: List[Callable[[], None]] = []
         logger.debug("TeamsManager initialized.")
 
+    def configure_membership_refresh(self, refresh_seconds: float) -> None:
+        """Sets how long the membership index is served before it is reloaded from the database (0 disables reloads)."""
+        self.membership_refresh_seconds = refresh_seconds
+
+    def add_membership_listener(self, listener: Callable[[], None]) -> None:
+        """Registers a callback invoked whenever team memberships change."""
+        if listener not in self._membership_listeners:
+            self._membership_listeners.append(listener)
+
+    def _notify_membership_changed(self) -> None:
+        for listener in self._membership_listeners:
+            try:
+                listener()
+            except Exception as e:
+                logger.error(f"Team membership listener failed: {e}", exc_info=True)
+
+    # Membership index (serves team role overrides without database access)
+    @property
+    def membership_index_loaded(self) -> bool:
+        return self._membership_index is not None
+
+    @property
+    def membership_index_stale(self) -> bool:
+        """True if the index was never loaded or is older than the refresh interval (if one is set)."""
+        loaded_at = self._membership_loaded_at
+        if loaded_at is None:
+            return True
+        return self.membership_refresh_seconds > 0 and time.monotonic() - loaded_at >= self.membership_refresh_seconds
+
+    def ensure_membership_index(self, open_session: Callable[[], Session]) -> None:
+        """
+        Reloads the membership index if it is stale.
+
+        Only one caller reloads at a time; while an index is loaded, the others
+        keep using it instead of waiting.
+
+        Args:
+            open_session: Returns a new database session; it is closed afterwards.
+        """
+        if not self.membership_index_stale:
+            return
+        if not self._membership_refresh_lock.acquire(blocking=not self.membership_index_loaded):
+            return
+        try:
+            if self.membership_index_stale:
+                db = open_session()
+                try:
+                    self.refresh_membership_index(db)
+                finally:
+                    db.close()
+        finally:
+            self._membership_refresh_lock.release()
+
+    def refresh_membership_index(self, db: Session) -> None:
+        """Rebuilds the member -> team memberships index from the database."""
+        changes_before = self._membership_changes
+        refreshed_at = time.monotonic()
+        index: Dict[str, List[TeamMembership]] = {}
+        teams = db.query(TeamDb).all()
+        for team in teams:
+            for member in team.members or []:
+                index.setdefault(member.member_identifier, []).append(
+                    TeamMembership(team.id, team.name, member.app_role_override)
+                )
+        with self._membership_lock:
+            self._membership_index = {
+                identifier: tuple(sorted(memberships, key=lambda m: m.team_name))
+                for identifier, memberships in index.items()
+            }
+            # A change committed while loading may be missing from what was read; reload again next time
+            self._membership_loaded_at = refreshed_at if self._membership_changes == changes_before else None
+        logger.info(f"Team membership index loaded: {len(index)} members across {len(teams)} teams.")
+
+    def _update_memberships(self, db: Session, member_identifier: str, team_id: str, membership: Optional[TeamMembership]) -> None:
+        """Replaces (or with None removes) a member's entry for one team in the index once db commits."""
+        def apply() -> None:
+            self._apply_memberships(member_identifier, team_id, membership)
+            self._notify_membership_changed()
+        call_after_commit(db, apply)
+
+    def _update_team_memberships(self, db: Session, team_id: str, team_name: Optional[str]) -> None:
+        """Renames (or with None drops) all index entries of a team once db commits."""
+        def apply() -> None:
+            self._apply_team_memberships(team_id, team_name)
+            if team_name is None:
+                self._notify_membership_changed()
+        call_after_commit(db, apply)
+
+    def _apply_memberships(self, member_identifier: str, team_id: str, membership: Optional[TeamMembership]) -> None:
+        with self._membership_lock:
+            self._membership_changes += 1
+            if self._membership_index is None:
+                return
+            memberships = [m for m in self._membership_index.get(member_identifier, ()) if m.team_id != team_id]
+            if membership is not None:
+                memberships.append(membership)
+            if memberships:
+                self._membership_index[member_identifier] = tuple(sorted(memberships, key=lambda m: m.team_name))
+            else:
+                self._membership_index.pop(member_identifier, None)
+
+    def _apply_team_memberships(self, team_id: str, team_name: Optional[str]) -> None:
+        with self._membership_lock:
+            self._membership_changes += 1
+            if self._membership_index is None:
+                return
+            for identifier, memberships in list(self._membership_index.items()):
+                if not any(m.team_id == team_id for m in memberships):
+                    continue
+                updated = [
+                    m if m.team_id != team_id else TeamMembership(team_id, team_name, m.app_role_override)
+                    for m in memberships
+                    if m.team_id != team_id or team_name is not None
+                ]
+                if updated:
+                    self._membership_index[identifier] = tuple(sorted(updated, key=lambda m: m.team_name))
+                else:
+                    del self._membership_index[identifier]
+
+    def get_team_role_override(self, user_identifier: str, user_groups: Iterable[str]) -> Optional[str]:
+        """
+        Returns the team role override for a user from the in-memory membership index.
+
+        Overrides assigned to the user directly come first, then overrides of the
+        user's groups in teams the user is a member of, each ordered by team name.
+
+        Args:
+            user_identifier: The user's email.
+            user_groups: The user's group names.
+
+        Returns:
+            The first applicable app role override, or None.
+        """
+        index = self._membership_index or {}
+        direct = index.get(user_identifier, ())
+        for membership in direct:
+            if membership.app_role_override:
+                return membership.app_role_override
+        if not direct:
+            return None
+        user_team_ids = {membership.team_id for membership in direct}
+        group_overrides = sorted(
+            (membership.team_name, membership.app_role_override)
+            for group in set(user_groups or ())
+            for membership in index.get(group, ())
+            if membership.app_role_override and membership.team_id in user_team_ids
+        )
+        return group_overrides[0][1] if group_overrides else None
+
     def _serialize_list_fields(self, data: dict) -> dict:
         """Helper to serialize list fields to JSON strings for database storage."""
         if 'tags' in data and isinstance(data['tags'], list):
@@ -98,6 +273,14 @@ class TeamsManager:
         db_teams = self.team_repo.get_multi_with_members(db, skip=skip, limit=limit, domain_id=domain_id)
         return [self._convert_db_to_read_model(team) for team in db_teams]
 
+    def get_teams_page(
+        self, db: Session, limit: int = 100, cursor: Optional[str] = None, domain_id: Optional[str] = None
+    ) -> Tuple[List[TeamRead], Optional[str]]:
+        """Gets one keyset page of teams ordered by name, with the cursor of the next page."""
+        logger.debug(f"Fetching teams page with limit={limit}, cursor={cursor}, domain_id={domain_id}")
+        page = self.team_repo.get_page_with_members(db, limit=limit, cursor=cursor, domain_id=domain_id)
+        return [self._convert_db_to_read_model(team) for team in page.items], page.next_cursor
+
     def get_teams_summary(self, db: Session, domain_id: Optional[str] = None) -> List[TeamSummary]:
         """Gets a summary list of teams for dropdowns/selection."""
         logger.debug(f"Fetching teams summary for domain_id={domain_id}")
@@ -141,6 +324,7 @@ class TeamsManager:
             updated_db_team = self.team_repo.update(db=db, db_obj=db_team, obj_in=update_data)
             db.flush()
             db.refresh(updated_db_team)
+            self._update_team_memberships(db, team_id, updated_db_team.name)
             logger.info(f"Successfully updated team '{updated_db_team.name}' (id: {team_id})")
             return self._convert_db_to_read_model(updated_db_team)
         except IntegrityError as e:
@@ -166,6 +350,7 @@ class TeamsManager:
 
         try:
             self.team_repo.remove(db=db, id=team_id)
+            self._update_team_memberships(db, team_id, None)
             logger.info(f"Successfully deleted team '{read_model.name}' (id: {team_id})")
             return read_model
         except Exception as e:
@@ -200,6 +385,10 @@ class TeamsManager:
             db.add(db_member)
             db.flush()
             db.refresh(db_member)
+            self._update_memberships(
+                db, db_member.member_identifier, team_id,
+                TeamMembership(team_id, db_team.name, db_member.app_role_override)
+            )
             logger.info(f"Successfully added member '{member_in.member_identifier}' to team '{db_team.name}'")
             return TeamMemberRead.model_validate(db_member)
         except Exception as e:
@@ -221,6 +410,10 @@ class TeamsManager:
             updated_db_member = self.team_member_repo.update(db=db, db_obj=db_member, obj_in=update_data)
             db.flush()
             db.refresh(updated_db_member)
+            self._update_memberships(
+                db, updated_db_member.member_identifier, team_id,
+                TeamMembership(team_id, updated_db_member.team.name, updated_db_member.app_role_override)
+            )
             logger.info(f"Successfully updated team member '{updated_db_member.member_identifier}'")
             return TeamMemberRead.model_validate(updated_db_member)
         except Exception as e:
@@ -237,6 +430,7 @@ class TeamsManager:
                 db, team_id=team_id, member_identifier=member_identifier
             )
             if removed_member:
+                self._update_memberships(db, member_identifier, team_id, None)
                 logger.info(f"Successfully removed member '{member_identifier}' from team")
                 return True
             else:
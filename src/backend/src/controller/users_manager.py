@@ -1,5 +1,5 @@
 import logging
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 from databricks.sdk import WorkspaceClient
 from databricks.sdk.service.iam import User as DatabricksUser
@@ -7,26 +7,50 @@ from databricks.sdk.errors import DatabricksError, NotFound
 
 from src.models.users import UserInfo
 from src.common.logging import get_logger
+from src.common.ttl_cache import TTLCache
 
 logger = get_logger(__name__)
 
+DEFAULT_USER_CACHE_TTL_SECONDS = 300.0
+DEFAULT_USER_CACHE_NEGATIVE_TTL_SECONDS = 60.0
+DEFAULT_USER_CACHE_MAX_SIZE = 1024
+
 class UsersManager:
-    def __init__(self, ws_client: Optional[WorkspaceClient] = None):
+    def __init__(
+        self,
+        ws_client: Optional[WorkspaceClient] = None,
+        cache_ttl_seconds: float = DEFAULT_USER_CACHE_TTL_SECONDS,
+        negative_cache_ttl_seconds: float = DEFAULT_USER_CACHE_NEGATIVE_TTL_SECONDS,
+        cache_max_size: int = DEFAULT_USER_CACHE_MAX_SIZE,
+    ):
         """
         Initializes the UsersManager.
 
         Args:
             ws_client: Optional Databricks WorkspaceClient for SDK operations.
+            cache_ttl_seconds: How long looked-up user details are reused.
+            negative_cache_ttl_seconds: How long an email that was not found is remembered (0 disables).
+            cache_max_size: Maximum number of cached users (0 disables the cache).
         """
         self._ws_client = ws_client
         if not self._ws_client:
              logger.warning("WorkspaceClient was not provided to UsersManager. SDK operations will fail.")
+        # Keyed by lower-cased email; concurrent misses for one email share a single SDK call
+        self._user_cache: TTLCache[str, UserInfo] = TTLCache(
+            max_size=cache_max_size,
+            ttl_seconds=cache_ttl_seconds,
+            negative_ttl_seconds=negative_cache_ttl_seconds,
+            negative_exceptions=(NotFound,),
+        )
 
     def get_user_details_by_email(self, user_email: str, real_ip: Optional[str]) -> UserInfo:
         """
         Looks up a user by email using the Databricks SDK and maps the result
         to the UserInfo model, including group memberships.
 
+        Results (including "not found") are cached for a limited time, so
+        repeated requests by the same user don't each call the SDK.
+
         Args:
             user_email: The email address of the user to look up.
             real_ip: The real IP address from request headers (optional).
@@ -43,6 +67,38 @@ class UsersManager:
             logger.error("Cannot get user details: WorkspaceClient is not configured.")
             raise ValueError("WorkspaceClient is not configured in UsersManager.")
 
+        user_info = self._user_cache.get_or_load(
+            user_email.lower(), lambda: self._fetch_user_details(user_email)
+        )
+        # The cached object is shared; hand out a copy carrying this request's IP
+        return user_info.model_copy(update={"ip": real_ip}, deep=True)
+
+    def invalidate_user(self, user_email: str) -> None:
+        """Drops cached details for a user, e.g. after a group membership change."""
+        self._user_cache.invalidate(user_email.lower())
+
+    def clear_user_cache(self) -> None:
+        """Drops all cached user details."""
+        self._user_cache.clear()
+
+    def get_cache_stats(self) -> Dict[str, float]:
+        """Returns hit/miss counters and the size of the user details cache."""
+        return self._user_cache.stats()
+
+    def _fetch_user_details(self, user_email: str) -> UserInfo:
+        """
+        Fetches user details from the Databricks SDK (uncached).
+
+        Args:
+            user_email: The email address of the user to look up.
+
+        Returns:
+            A UserInfo object without an IP address.
+
+        Raises:
+            NotFound: If the user is not found.
+            RuntimeError: For other Databricks SDK errors or unexpected errors.
+        """
         logger.info(f"UsersManager: Attempting to find user details via SDK for email: {user_email}")
         try:
             # Use users.list as users.get requires the Databricks user ID
@@ -78,7 +134,7 @@ class UsersManager:
                 email=(databricks_user.emails[0].value if databricks_user.emails else databricks_user.user_name),
                 username=databricks_user.user_name,
                 user=databricks_user.display_name, 
-                ip=real_ip, # Pass through the IP from the request
+                ip=None, # Set per request by get_user_details_by_email
                 groups=group_names # Add the extracted group names
             )
             return user_info_response
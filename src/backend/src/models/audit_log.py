@@ -33,4 +33,5 @@ class AuditLogRead(AuditLogInDB):
 # Model for paginated response
 class PaginatedAuditLogResponse(BaseModel):
     total: int
-    items: list[AuditLogRead] 
\ No newline at end of file
+    items: list[AuditLogRead]
+    next_cursor: Optional[str] = None # Pass back as `cursor` to fetch the next page 
\ No newline at end of file
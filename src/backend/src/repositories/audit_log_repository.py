@@ -1,31 +1,35 @@
 from datetime import datetime
-from typing import List, Optional, Sequence
+from typing import List, Optional, Sequence, Union
 
 from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from src.common.database import execute_read
+from src.common.pagination import KeysetKey, KeysetPage, apply_keyset, build_page
 from src.common.repository import CRUDBase
 from src.models.audit_log import AuditLogCreate  # Pydantic model for creation
 from src.db_models.audit_log import AuditLogDb # Corrected import
 
 class AuditLogRepository(CRUDBase[AuditLogDb, AuditLogCreate, AuditLogCreate]):
-    
-    async def get_multi(
+    """Audit log reads are awaited on the AsyncDBSessionDep session (async, or sync in a worker thread); writes use the inherited sync create()."""
+
+    @property
+    def keyset_keys(self):
+        # Newest first; the id breaks ties between entries logged in the same instant
+        return (KeysetKey(self.model.timestamp, descending=True), KeysetKey(self.model.id, descending=True))
+
+    def _apply_filters(
         self,
-        db: Session,
+        statement,
         *,
-        skip: int = 0,
-        limit: int = 100,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         username: Optional[str] = None,
         feature: Optional[str] = None,
         action: Optional[str] = None,
         success: Optional[bool] = None,
-    ) -> Sequence[AuditLogDb]:
-        """Retrieve multiple audit logs with filtering and pagination."""
-        statement = select(self.model).order_by(self.model.timestamp.desc())
-
+    ):
         if start_time:
             statement = statement.where(self.model.timestamp >= start_time)
         if end_time:
@@ -38,15 +42,59 @@ class AuditLogRepository(CRUDBase[AuditLogDb, AuditLogCreate, AuditLogCreate]):
             statement = statement.where(self.model.action == action)
         if success is not None:
             statement = statement.where(self.model.success == success)
+        return statement
+    
+    async def get_multi(
+        self,
+        db: Union[AsyncSession, Session],
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        username: Optional[str] = None,
+        feature: Optional[str] = None,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+    ) -> Sequence[AuditLogDb]:
+        """Retrieve multiple audit logs with filtering and pagination."""
+        statement = select(self.model).order_by(self.model.timestamp.desc())
+        statement = self._apply_filters(
+            statement, start_time=start_time, end_time=end_time, username=username,
+            feature=feature, action=action, success=success,
+        )
 
         statement = statement.offset(skip).limit(limit)
         
-        result = await db.execute(statement)
+        result = await execute_read(db, statement)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: Union[AsyncSession, Session],
+        *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        username: Optional[str] = None,
+        feature: Optional[str] = None,
+        action: Optional[str] = None,
+        success: Optional[bool] = None,
+    ) -> KeysetPage[AuditLogDb]:
+        """Retrieve one keyset page of audit logs, newest first, continuing after the cursor."""
+        statement = self._apply_filters(
+            select(self.model), start_time=start_time, end_time=end_time, username=username,
+            feature=feature, action=action, success=success,
+        )
+        statement = apply_keyset(statement, self.keyset_keys, limit=limit, cursor=cursor)
+
+        result = await execute_read(db, statement)
+        return build_page(result.scalars().all(), self.keyset_keys, limit)
+
     async def get_multi_count(
         self,
-        db: Session,
+        db: Union[AsyncSession, Session],
         *,
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
@@ -57,21 +105,12 @@ class AuditLogRepository(CRUDBase[AuditLogDb, AuditLogCreate, AuditLogCreate]):
     ) -> int:
         """Count audit logs with filtering."""
         statement = select(func.count()).select_from(self.model)
+        statement = self._apply_filters(
+            statement, start_time=start_time, end_time=end_time, username=username,
+            feature=feature, action=action, success=success,
+        )
 
-        if start_time:
-            statement = statement.where(self.model.timestamp >= start_time)
-        if end_time:
-            statement = statement.where(self.model.timestamp <= end_time)
-        if username:
-            statement = statement.where(self.model.username == username)
-        if feature:
-            statement = statement.where(self.model.feature == feature)
-        if action:
-            statement = statement.where(self.model.action == action)
-        if success is not None:
-            statement = statement.where(self.model.success == success)
-
-        result = await db.execute(statement)
+        result = await execute_read(db, statement)
         return result.scalar_one()
 
 
@@ -230,6 +230,22 @@ class DataProductRepository(CRUDBase[DataProductDb, DataProductCreate, DataProdu
             logger.error(f"Database error fetching multiple normalized DataProducts: {e}", exc_info=True)
             db.rollback()
             raise
+
+    def _page_query(self, db: Session):
+        # Same eager loads as get_multi so get_page results map to the API model without lazy loads
+        return db.query(self.model).options(
+            selectinload(self.model.info),
+            selectinload(self.model.inputPorts),
+            selectinload(self.model.outputPorts),
+        )
+
+    def _page_statement(self):
+        # Async pages cannot lazy load, so the relationships come with the page
+        return select(self.model).options(
+            selectinload(self.model.info),
+            selectinload(self.model.inputPorts),
+            selectinload(self.model.outputPorts),
+        )
             
     # --- Distinct Value Queries (Update for Normalized Schema) --- 
     def get_distinct_product_types(self, db: Session) -> List[str]:
@@ -1,3 +1,4 @@
+from src.common.pagination import KeysetKey, KeysetPage, keyset_paginate
 from src.common.repository import CRUDBase
 from src.db_models.projects import ProjectDb, project_team_association
 from src.db_models.teams import TeamDb
@@ -6,7 +7,7 @@ from src.common.logging import get_logger
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy import and_, delete, or_
-from typing import List, Optional
+from typing import List, Optional, Set
 
 logger = get_logger(__name__)
 
@@ -16,6 +17,10 @@ class ProjectRepository(CRUDBase[ProjectDb, ProjectCreate, ProjectUpdate]):
         super().__init__(ProjectDb)
         logger.info("ProjectRepository initialized.")
 
+    @property
+    def keyset_keys(self):
+        return (KeysetKey(self.model.name), KeysetKey(self.model.id))
+
     def get_with_teams(self, db: Session, id: str) -> Optional[ProjectDb]:
         """Gets a single project by ID, eager loading teams."""
         logger.debug(f"Fetching {self.model.__name__} with teams for id: {id}")
@@ -50,6 +55,19 @@ class ProjectRepository(CRUDBase[ProjectDb, ProjectCreate, ProjectUpdate]):
             db.rollback()
             raise
 
+    def get_page_with_teams(
+        self, db: Session, *, limit: int = 100, cursor: Optional[str] = None
+    ) -> KeysetPage[ProjectDb]:
+        """Gets one keyset page of projects ordered by name, eager loading teams."""
+        logger.debug(f"Fetching page of {self.model.__name__} with teams, limit={limit}, cursor={cursor}")
+        try:
+            query = db.query(self.model).options(selectinload(self.model.teams))
+            return keyset_paginate(query, self.keyset_keys, limit=limit, cursor=cursor)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching page of {self.model.__name__} with teams: {e}", exc_info=True)
+            db.rollback()
+            raise
+
     def get_by_name(self, db: Session, *, name: str) -> Optional[ProjectDb]:
         """Gets a project by name."""
         logger.debug(f"Fetching {self.model.__name__} with name: {name}")
@@ -95,6 +113,26 @@ class ProjectRepository(CRUDBase[ProjectDb, ProjectCreate, ProjectUpdate]):
             db.rollback()
             raise
 
+    def get_project_ids_for_user(self, db: Session, user_identifier: str, user_groups: List[str]) -> Set[str]:
+        """Gets the IDs of all projects a user has access to through team membership (ids only, one query)."""
+        logger.debug(f"Fetching project ids for user: {user_identifier}")
+        try:
+            from src.db_models.teams import TeamMemberDb
+
+            members = [user_identifier, *(user_groups or [])]
+            rows = (
+                db.query(project_team_association.c.project_id)
+                .join(TeamMemberDb, TeamMemberDb.team_id == project_team_association.c.team_id)
+                .filter(TeamMemberDb.member_identifier.in_(members))
+                .distinct()
+                .all()
+            )
+            return {row[0] for row in rows}
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching project ids for user {user_identifier}: {e}", exc_info=True)
+            db.rollback()
+            raise
+
     def assign_team(self, db: Session, *, project_id: str, team_id: str, assigned_by: str) -> bool:
         """Assigns a team to a project."""
         logger.debug(f"Assigning team {team_id} to project {project_id}")
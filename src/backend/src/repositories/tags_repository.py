@@ -5,6 +5,7 @@ import json # For converting possible_values to JSON string for DB
 from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy import select, func, delete, update
 
+from src.common.pagination import KeysetKey, KeysetPage, keyset_paginate
 from src.common.repository import CRUDBase
 from src.db_models.tags import TagDb, TagNamespaceDb, TagNamespacePermissionDb, EntityTagAssociationDb
 from src.models.tags import (
@@ -50,6 +51,10 @@ class TagNamespaceRepository(CRUDBase[TagNamespaceDb, TagNamespaceCreate, TagNam
 
 
 class TagRepository(CRUDBase[TagDb, TagCreate, TagUpdate]):
+    @property
+    def keyset_keys(self):
+        return (KeysetKey(TagDb.name), KeysetKey(TagDb.id))
+
     def get_by_fully_qualified_name(self, db: Session, *, fqn: str) -> Optional[TagDb]:
         parts = fqn.split(TAG_NAMESPACE_SEPARATOR, 1)
         if len(parts) == 2:
@@ -125,16 +130,15 @@ class TagRepository(CRUDBase[TagDb, TagCreate, TagUpdate]):
             )
             return self.create_with_namespace(db, obj_in=tag_create_model, namespace_id=ns_id_to_use, user_email=user_email)
 
-    def get_multi_with_filters(
-        self, db: Session, *, 
-        skip: int = 0, limit: int = 100, 
+    def _filtered_query(
+        self, db: Session, *,
         namespace_id: Optional[UUID] = None,
         namespace_name: Optional[str] = None,
         name_contains: Optional[str] = None,
         status: Optional[TagStatus] = None,
         parent_id: Optional[UUID] = None,
-        is_root: Optional[bool] = None # True to fetch only root tags (parent_id is None)
-    ) -> List[TagDb]:
+        is_root: Optional[bool] = None
+    ):
         query = db.query(TagDb).options(selectinload(TagDb.namespace), selectinload(TagDb.parent), selectinload(TagDb.children))
 
         if namespace_id:
@@ -152,8 +156,41 @@ class TagRepository(CRUDBase[TagDb, TagCreate, TagUpdate]):
                 query = query.filter(TagDb.parent_id.is_(None))
             else:
                  query = query.filter(TagDb.parent_id.isnot(None))
-                 
+        return query
+
+    def get_multi_with_filters(
+        self, db: Session, *, 
+        skip: int = 0, limit: int = 100, 
+        namespace_id: Optional[UUID] = None,
+        namespace_name: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        status: Optional[TagStatus] = None,
+        parent_id: Optional[UUID] = None,
+        is_root: Optional[bool] = None # True to fetch only root tags (parent_id is None)
+    ) -> List[TagDb]:
+        query = self._filtered_query(
+            db, namespace_id=namespace_id, namespace_name=namespace_name, name_contains=name_contains,
+            status=status, parent_id=parent_id, is_root=is_root
+        )
         return query.order_by(TagDb.name).offset(skip).limit(limit).all()
+
+    def get_page_with_filters(
+        self, db: Session, *,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        namespace_id: Optional[UUID] = None,
+        namespace_name: Optional[str] = None,
+        name_contains: Optional[str] = None,
+        status: Optional[TagStatus] = None,
+        parent_id: Optional[UUID] = None,
+        is_root: Optional[bool] = None
+    ) -> KeysetPage[TagDb]:
+        """Keyset page of get_multi_with_filters, ordered by tag name."""
+        query = self._filtered_query(
+            db, namespace_id=namespace_id, namespace_name=namespace_name, name_contains=name_contains,
+            status=status, parent_id=parent_id, is_root=is_root
+        )
+        return keyset_paginate(query, self.keyset_keys, limit=limit, cursor=cursor)
     
     def get(self, db: Session, id: Any) -> Optional[TagDb]:
         return db.query(self.model).options(
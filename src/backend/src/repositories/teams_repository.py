@@ -1,3 +1,4 @@
+from src.common.pagination import KeysetKey, KeysetPage, keyset_paginate
 from src.common.repository import CRUDBase
 from src.db_models.teams import TeamDb, TeamMemberDb
 from src.models.teams import TeamCreate, TeamUpdate, TeamMemberCreate, TeamMemberUpdate
@@ -14,6 +15,10 @@ class TeamRepository(CRUDBase[TeamDb, TeamCreate, TeamUpdate]):
         super().__init__(TeamDb)
         logger.info("TeamRepository initialized.")
 
+    @property
+    def keyset_keys(self):
+        return (KeysetKey(self.model.name), KeysetKey(self.model.id))
+
     def get_with_members(self, db: Session, id: str) -> Optional[TeamDb]:
         """Gets a single team by ID, eager loading members."""
         logger.debug(f"Fetching {self.model.__name__} with members for id: {id}")
@@ -50,6 +55,21 @@ class TeamRepository(CRUDBase[TeamDb, TeamCreate, TeamUpdate]):
             db.rollback()
             raise
 
+    def get_page_with_members(
+        self, db: Session, *, limit: int = 100, cursor: Optional[str] = None, domain_id: Optional[str] = None
+    ) -> KeysetPage[TeamDb]:
+        """Gets one keyset page of teams ordered by name, eager loading members. Optionally filter by domain."""
+        logger.debug(f"Fetching page of {self.model.__name__} with members, limit={limit}, cursor={cursor}, domain_id={domain_id}")
+        try:
+            query = db.query(self.model).options(selectinload(self.model.members))
+            if domain_id is not None:
+                query = query.filter(self.model.domain_id == domain_id)
+            return keyset_paginate(query, self.keyset_keys, limit=limit, cursor=cursor)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error fetching page of {self.model.__name__} with members: {e}", exc_info=True)
+            db.rollback()
+            raise
+
     def get_by_name(self, db: Session, *, name: str) -> Optional[TeamDb]:
         """Gets a team by name."""
         logger.debug(f"Fetching {self.model.__name__} with name: {name}")
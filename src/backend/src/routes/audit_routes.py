@@ -1,10 +1,11 @@
 from datetime import datetime
 from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 
-from src.common.dependencies import DBSessionDep, AuditManagerDep, require_permission
+from src.common.dependencies import AsyncDBSessionDep, AuditManagerDep, require_permission
 from src.common.features import FeatureAccessLevel
+from src.common.pagination import InvalidCursorError
 from src.models.audit_log import PaginatedAuditLogResponse
 
 router = APIRouter(prefix="/api", tags=["Audit Trail"]) 
@@ -16,10 +17,11 @@ router = APIRouter(prefix="/api", tags=["Audit Trail"])
     dependencies=[Depends(lambda: require_permission(feature='audit', level=FeatureAccessLevel.READ_ONLY))]
 )
 async def get_audit_trail(
-    db: DBSessionDep,
+    db: AsyncDBSessionDep,
     audit_manager: AuditManagerDep,
     skip: int = Query(0, ge=0, description="Number of records to skip for pagination"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page (keyset pagination; not combinable with skip)"),
     start_time: Optional[datetime] = Query(None, description="Filter logs from this time (ISO 8601)"),
     end_time: Optional[datetime] = Query(None, description="Filter logs up to this time (ISO 8601)"),
     username: Optional[str] = Query(None, description="Filter logs by username"),
@@ -27,11 +29,14 @@ async def get_audit_trail(
     action: Optional[str] = Query(None, description="Filter logs by action type (e.g., CREATE, UPDATE, DELETE)"),
     success: Optional[bool] = Query(None, description="Filter logs by success status"),
 ):
-    """Retrieve audit log entries with optional filtering and pagination."""
-    total, logs = await audit_manager.get_audit_logs(
-        db=db,
-        skip=skip,
-        limit=limit,
+    """Retrieve audit log entries with optional filtering and pagination.
+
+    Without skip, pages are keyset-paginated (newest first) and next_cursor
+    points at the following page; skip keeps the offset behaviour.
+    """
+    if cursor and skip:
+        raise HTTPException(status_code=400, detail="Use either skip or cursor, not both.")
+    filters = dict(
         start_time=start_time,
         end_time=end_time,
         username=username,
@@ -39,7 +44,14 @@ async def get_audit_trail(
         action=action,
         success=success,
     )
-    return PaginatedAuditLogResponse(total=total, items=logs)
+    if skip:
+        total, logs = await audit_manager.get_audit_logs(db=db, skip=skip, limit=limit, **filters)
+        return PaginatedAuditLogResponse(total=total, items=logs)
+    try:
+        total, logs, next_cursor = await audit_manager.get_audit_log_page(db=db, limit=limit, cursor=cursor, **filters)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return PaginatedAuditLogResponse(total=total, items=logs, next_cursor=next_cursor)
 
 # --- Register Routes --- #
 def register_routes(app: APIRouter):
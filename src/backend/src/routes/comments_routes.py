@@ -3,7 +3,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
-from src.common.dependencies import DBSessionDep, CurrentUserDep
+from src.common.dependencies import DBSessionDep, CurrentUserDep, AuthorizationManagerDep
 from src.common.features import FeatureAccessLevel
 from src.common.authorization import PermissionChecker, get_user_groups
 from src.common.logging import get_logger
@@ -53,6 +53,7 @@ async def list_comments(
     entity_id: str,
     db: DBSessionDep,
     current_user: CurrentUserDep,
+    auth_manager: AuthorizationManagerDep,
     include_deleted: bool = Query(False, description="Include soft-deleted comments (admin only)"),
     manager: CommentsManager = Depends(get_comments_manager),
     _: bool = Depends(PermissionChecker(FEATURE_ID, FeatureAccessLevel.READ_ONLY)),
@@ -74,7 +75,10 @@ async def list_comments(
             entity_type=entity_type,
             entity_id=entity_id,
             user_groups=user_groups,
-            include_deleted=include_deleted
+            include_deleted=include_deleted,
+            auth_manager=auth_manager,
+            user=current_user,
+            feature_id=FEATURE_ID,
         )
     except HTTPException:
         raise
@@ -89,6 +93,7 @@ async def get_entity_timeline(
     entity_id: str,
     db: DBSessionDep,
     current_user: CurrentUserDep,
+    auth_manager: AuthorizationManagerDep,
     include_deleted: bool = Query(False, description="Include soft-deleted comments (admin only)"),
     filter_type: str = Query("all", description="Filter type: 'all', 'comments', 'changes'"),
     limit: int = Query(100, ge=1, le=1000, description="Max number of entries"),
@@ -113,7 +118,10 @@ async def get_entity_timeline(
                 entity_type=entity_type,
                 entity_id=entity_id,
                 user_groups=user_groups,
-                include_deleted=include_deleted
+                include_deleted=include_deleted,
+                auth_manager=auth_manager,
+                user=current_user,
+                feature_id=FEATURE_ID,
             )
             
             # Convert comments to timeline format
@@ -15,6 +15,7 @@ from src.common.dependencies import (
     AuditManagerDep,
     CurrentUserDep,
     AuditCurrentUserDep,
+    AuthorizationManagerDep,
 )
 from src.common.audit_logging import _extract_details_default
 from src.repositories.data_contracts_repository import data_contract_repo
@@ -73,6 +74,8 @@ def get_data_contracts_manager(request: Request) -> DataContractsManager:
 @router.get('/data-contracts', response_model=list[DataContractRead])
 async def get_contracts(
     db: DBSessionDep,
+    current_user: CurrentUserDep,
+    auth_manager: AuthorizationManagerDep,
     domain_id: Optional[str] = None,
     _: bool = Depends(PermissionChecker('data-contracts', FeatureAccessLevel.READ_ONLY))
 ):
@@ -85,6 +88,9 @@ async def get_contracts(
             # Get all contracts
             contracts = data_contract_repo.get_multi(db)
 
+        # Leave out contracts of projects the user is not a member of
+        contracts = auth_manager.filter_accessible(current_user, contracts, 'data-contracts', db=db)
+
         return [
             DataContractRead(
                 id=c.id,
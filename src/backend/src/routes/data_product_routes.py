@@ -4,7 +4,7 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 import yaml
-from fastapi import APIRouter, HTTPException, UploadFile, File, Body, Depends, Request, BackgroundTasks
+from fastapi import APIRouter, HTTPException, UploadFile, File, Body, Depends, Request, BackgroundTasks, Query, Response
 from pydantic import ValidationError
 import uuid
 from sqlalchemy.orm import Session
@@ -21,11 +21,13 @@ from src.common.dependencies import (
     CurrentUserDep, 
     DBSessionDep, 
     AuditManagerDep,
-    AuditCurrentUserDep
+    AuditCurrentUserDep,
+    AuthorizationManagerDep
 )
 from src.common.audit_logging import _extract_details_default
 
 from src.common.logging import get_logger
+from src.common.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from src.controller.change_log_manager import change_log_manager
 from src.models.notifications import NotificationType
 from src.common.dependencies import NotificationsManagerDep, CurrentUserDep, DBSessionDep
@@ -251,14 +253,26 @@ async def upload_data_products(
 
 @router.get('/data-products', response_model=Any)
 async def get_data_products(
+    response: Response,
+    current_user: CurrentUserDep,
+    auth_manager: AuthorizationManagerDep,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of data products to return"),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
     manager: DataProductsManager = Depends(get_data_products_manager),
     _: bool = Depends(PermissionChecker(DATA_PRODUCTS_FEATURE_ID, FeatureAccessLevel.READ_ONLY))
 ):
     try:
         logger.info("Retrieving all data products via get_data_products route...")
-        products = manager.list_products()
+        # Leaves out products of projects the user is not a member of
+        products, next_cursor = manager.list_products_page(
+            limit=limit, cursor=cursor, auth_manager=auth_manager, user=current_user
+        )
         logger.info(f"Retrieved {len(products)} data products")
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
         return [p.model_dump() for p in products]
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         error_msg = f"Error retrieving data products: {e!s}"
         logger.exception(error_msg)
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 from src.models.users import UserInfo
 from src.controller.notifications_manager import NotificationNotFoundError, NotificationsManager
 from src.models.notifications import Notification
-from src.common.dependencies import NotificationsManagerDep, DBSessionDep, CurrentUserDep
+from src.common.dependencies import NotificationsManagerDep, DBSessionDep, AsyncDBSessionDep, CurrentUserDep
 
 # Configure logging
 from src.common.logging import get_logger
@@ -20,14 +20,14 @@ router = APIRouter(prefix="/api", tags=["notifications"])
 
 @router.get('/notifications', response_model=List[Notification])
 async def get_notifications(
-    db: DBSessionDep,
+    db: AsyncDBSessionDep,
     user_info: CurrentUserDep,
     manager: NotificationsManagerDep
 ):
     """Get notifications filtered for the current user."""
     try:
         logger.debug(f"Retrieving notifications for user: {user_info.email} with groups: {user_info.groups}")
-        notifications = manager.get_notifications(db=db, user_info=user_info)
+        notifications = await manager.get_notifications_async(db=db, user_info=user_info)
         logger.debug(f"Number of notifications retrieved: {len(notifications)}")
         return notifications
     except Exception as e:
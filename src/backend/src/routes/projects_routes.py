@@ -1,7 +1,7 @@
 import logging
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 
 from src.models.projects import (
     ProjectCreate,
@@ -23,6 +23,7 @@ from src.common.dependencies import (
 )
 from src.models.users import UserInfo
 from src.common.errors import NotFoundError, ConflictError
+from src.common.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from src.common.logging import get_logger
 
 logger = get_logger(__name__)
@@ -73,14 +74,29 @@ def create_project(
 )
 def get_all_projects(
     db: DBSessionDep,
+    response: Response,
     manager = Depends(get_projects_manager),
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page")
 ):
-    """Lists all projects."""
-    logger.debug(f"Fetching projects (skip={skip}, limit={limit})")
+    """Lists all projects.
+
+    Without skip the listing is keyset-paginated: the next page's cursor is
+    returned in the X-Next-Cursor header. skip keeps the offset behaviour.
+    """
+    logger.debug(f"Fetching projects (skip={skip}, limit={limit}, cursor={cursor})")
+    if cursor and skip:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or cursor, not both.")
     try:
-        return manager.get_all_projects(db=db, skip=skip, limit=limit)
+        if skip:
+            return manager.get_all_projects(db=db, skip=skip, limit=limit)
+        projects, next_cursor = manager.get_projects_page(db=db, limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return projects
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.exception(f"Failed to fetch projects: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch projects")
@@ -1,7 +1,7 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 # Remove Session and WorkspaceClient imports if no longer needed directly
 # from sqlalchemy.sdk import Session 
 # from databricks.sdk import WorkspaceClient 
@@ -16,7 +16,8 @@ from src.controller.search_manager import SearchManager
 # from src.controller.data_contracts_manager import DataContractsManager
 
 # Import the search interfaces
-from src.common.search_interfaces import SearchableAsset, SearchIndexItem
+from src.common.search_interfaces import SearchableAsset, SearchIndexItem, SearchResults
+from src.common.pagination import InvalidCursorError
 # Import dependencies for db and ws_client (Not needed directly here anymore)
 # from src.common.database import get_db
 # from src.common.workspace_client import get_workspace_client_dependency
@@ -51,21 +52,36 @@ async def get_search_manager(
     return search_manager
 
 # --- Routes ---
-@router.get("/search", response_model=List[SearchIndexItem])
+@router.get("/search", response_model=Union[List[SearchIndexItem], SearchResults])
 async def search_items(
     search_term: str,
+    response: Response,
     # Reorder parameters: non-defaults first
     auth_manager: AuthorizationManagerDep,
     current_user: CurrentUserDep,
-    manager: SearchManager = Depends(get_search_manager) 
-) -> List[SearchIndexItem]:
-    """Search across indexed items, filtered by user permissions."""
+    manager: SearchManager = Depends(get_search_manager),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of results (page size), most relevant first"),
+    cursor: Optional[str] = Query(None, description="Cursor of the next page, from X-Next-Cursor or next_cursor"),
+    facets: bool = Query(False, description="Return {items, total, facets, next_cursor} with counts per type, feature and top tags")
+) -> Union[List[SearchIndexItem], SearchResults]:
+    """
+    Search across indexed items, ranked by relevance and filtered by user permissions.
+
+    When more results remain after a limited page, the cursor for the next page is
+    returned in the X-Next-Cursor header (or next_cursor with facets=true).
+    """
     if not search_term:
         raise HTTPException(status_code=400, detail="Query parameter (search_term) is required")
     try:
+        if facets:
+            return manager.search_with_facets(search_term, auth_manager, current_user, limit=limit, cursor=cursor)
         # Pass auth_manager and current_user to the search method
-        results = manager.search(search_term, auth_manager, current_user)
+        results, next_cursor = manager.search_page(search_term, auth_manager, current_user, limit=limit, cursor=cursor)
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return results
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.exception(f"Error during search for query '{search_term}': {e}")
         raise HTTPException(status_code=500, detail="Search failed")
@@ -77,8 +93,8 @@ async def rebuild_search_index(
     """Triggers a rebuild of the search index."""
     try:
         # In a real app, this might be a background task
-        manager.build_index()
-        return {"message": "Search index rebuild initiated."}
+        build_stats = manager.build_index()
+        return {"message": "Search index rebuild initiated.", "managers": build_stats}
     except Exception as e:
         logger.exception(f"Error during index rebuild: {e}")
         raise HTTPException(status_code=500, detail="Index rebuild failed")
@@ -199,7 +199,7 @@ async def upload_model(
 
         from src.models.semantic_models import SemanticModelCreate
 
-        created = manager.create(SemanticModelCreate(**create_data), created_by=current_user.username if current_user else None)
+        created = manager.create(SemanticModelCreate(**create_data), created_by=current_user.username if current_user else None, db=db)
         db.commit()
         manager.on_models_changed()
         return created
@@ -218,7 +218,7 @@ async def update_model(
     payload: SemanticModelUpdate = Body(...),
     manager: SemanticModelsManager = Depends(get_semantic_models_manager),
 ):
-    updated = manager.update(model_id, payload, updated_by=current_user.username if current_user else None)
+    updated = manager.update(model_id, payload, updated_by=current_user.username if current_user else None, db=db)
     if not updated:
         raise HTTPException(status_code=404, detail="Semantic model not found")
     db.commit()
@@ -245,6 +245,7 @@ async def replace_model_content(
             content_type=file.content_type,
             size_bytes=len(contents),
             updated_by=current_user.username if current_user else None,
+            db=db,
         )
         if not updated:
             raise HTTPException(status_code=404, detail="Semantic model not found")
@@ -264,7 +265,7 @@ async def delete_model(
     db: DBSessionDep,
     manager: SemanticModelsManager = Depends(get_semantic_models_manager),
 ):
-    deleted = manager.delete(model_id)
+    deleted = manager.delete(model_id, db=db)
     if not deleted:
         raise HTTPException(status_code=404, detail="Semantic model not found")
     db.commit()
@@ -4,13 +4,15 @@ import uuid
 from datetime import datetime
 
 from databricks.sdk import WorkspaceClient
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Body
 from sqlalchemy.orm import Session
 
 from ..common.workspace_client import get_workspace_client
 from ..controller.settings_manager import SettingsManager
 from ..models.settings import AppRole, AppRoleCreate
-from ..common.database import get_db
+from ..common.database import get_db, get_pool_metrics
+from ..common.authorization import PermissionChecker
+from ..common.features import FeatureAccessLevel
 from ..common.dependencies import get_settings_manager, get_notifications_manager
 from ..models.settings import HandleRoleRequest
 from ..models.notifications import Notification, NotificationType
@@ -103,13 +105,14 @@ async def list_roles(manager: SettingsManager = Depends(get_settings_manager)):
 
 @router.post("/settings/roles", response_model=AppRole, status_code=status.HTTP_201_CREATED)
 async def create_role(
+    request: Request,
     role_data: AppRoleCreate = Body(..., embed=False),
     manager: SettingsManager = Depends(get_settings_manager),
     db: Session = Depends(get_db)
 ):
     """Create a new application role."""
     try:
-        created_role = manager.create_app_role(db=db, role_data=role_data)
+        created_role = manager.create_app_role(role_data, db=db)
         
         # --- Add created ID to request.state for audit logging --- 
         if created_role and hasattr(created_role, 'id'):
@@ -267,6 +270,16 @@ async def handle_role_request_decision(
         db.rollback() # Rollback on any exception during this block
         raise HTTPException(status_code=500, detail="Failed to send decision notification due to an internal error.")
 
+# --- Database Pool Metrics ---
+
+@router.get("/settings/database/pool", dependencies=[Depends(PermissionChecker(SETTINGS_FEATURE_ID, FeatureAccessLevel.ADMIN))])
+async def get_database_pool_metrics() -> Dict[str, Any]:
+    """Returns connection pool occupancy, checkout wait times and invalidation counts."""
+    try:
+        return get_pool_metrics()
+    except RuntimeError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
 # --- Registration --- 
 
 def register_routes(app):
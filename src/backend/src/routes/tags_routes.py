@@ -1,10 +1,11 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Body, Request, Response
 from sqlalchemy.orm import Session
 
 from src.common.logging import get_logger
+from src.common.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from src.common.dependencies import DBSessionDep, CurrentUserDep, get_tags_manager
 from src.controller.tags_manager import TagsManager
 from src.models.users import UserInfo # For CurrentUserDep
@@ -91,9 +92,11 @@ async def create_tag(
 @router.get("/tags", response_model=List[Tag])
 async def list_tags(
     db: DBSessionDep,
+    response: Response,
     manager: TagsManager = Depends(get_tags_manager),
     skip: int = 0,
     limit: int = Query(default=100, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
     namespace_id: Optional[UUID] = Query(None, description="Filter by namespace ID"),
     namespace_name: Optional[str] = Query(None, description="Filter by namespace name"),
     name_contains: Optional[str] = Query(None, description="Filter by tag name containing string (case-insensitive)"),
@@ -101,8 +104,19 @@ async def list_tags(
     parent_id: Optional[UUID] = Query(None, description="Filter by parent tag ID"),
     is_root: Optional[bool] = Query(None, description="Filter for root tags (parent_id is null) or non-root tags")
 ):
-    return manager.list_tags(db, skip=skip, limit=limit, namespace_id=namespace_id, namespace_name=namespace_name,
-                             name_contains=name_contains, status=status, parent_id=parent_id, is_root=is_root)
+    if cursor and skip:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or cursor, not both.")
+    if skip:
+        return manager.list_tags(db, skip=skip, limit=limit, namespace_id=namespace_id, namespace_name=namespace_name,
+                                 name_contains=name_contains, status=status, parent_id=parent_id, is_root=is_root)
+    try:
+        tags, next_cursor = manager.list_tags_page(db, limit=limit, cursor=cursor, namespace_id=namespace_id, namespace_name=namespace_name,
+                                                   name_contains=name_contains, status=status, parent_id=parent_id, is_root=is_root)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return tags
 
 @router.get("/tags/{tag_id}", response_model=Tag)
 async def get_tag(
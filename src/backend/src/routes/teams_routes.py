@@ -1,7 +1,7 @@
 import logging
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 
 from src.models.teams import (
     TeamCreate,
@@ -23,6 +23,7 @@ from src.common.dependencies import (
 )
 from src.models.users import UserInfo
 from src.common.errors import NotFoundError, ConflictError
+from src.common.pagination import NEXT_CURSOR_HEADER, InvalidCursorError
 from src.common.logging import get_logger
 
 logger = get_logger(__name__)
@@ -73,15 +74,30 @@ def create_team(
 )
 def get_all_teams(
     db: DBSessionDep,
+    response: Response,
     manager = Depends(get_teams_manager),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description=f"Cursor from the {NEXT_CURSOR_HEADER} header of the previous page"),
     domain_id: Optional[str] = Query(None, description="Filter teams by domain ID")
 ):
-    """Lists all teams, optionally filtered by domain."""
-    logger.debug(f"Fetching teams (skip={skip}, limit={limit}, domain_id={domain_id})")
+    """Lists all teams, optionally filtered by domain.
+
+    Without skip the listing is keyset-paginated: the next page's cursor is
+    returned in the X-Next-Cursor header. skip keeps the offset behaviour.
+    """
+    logger.debug(f"Fetching teams (skip={skip}, limit={limit}, cursor={cursor}, domain_id={domain_id})")
+    if cursor and skip:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Use either skip or cursor, not both.")
     try:
-        return manager.get_all_teams(db=db, skip=skip, limit=limit, domain_id=domain_id)
+        if skip:
+            return manager.get_all_teams(db=db, skip=skip, limit=limit, domain_id=domain_id)
+        teams, next_cursor = manager.get_teams_page(db=db, limit=limit, cursor=cursor, domain_id=domain_id)
+        if next_cursor:
+            response.headers[NEXT_CURSOR_HEADER] = next_cursor
+        return teams
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.exception(f"Failed to fetch teams: {e}")
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to fetch teams")
@@ -18,7 +18,9 @@ from src.common.dependencies import get_settings_manager, get_notifications_mana
 from src.controller.settings_manager import SettingsManager
 from src.controller.notifications_manager import NotificationsManager
 from src.common.features import FeatureAccessLevel
-from src.common.authorization import get_user_details_from_sdk
+from src.common.authorization import PermissionChecker, get_user_details_from_sdk
+from src.common.manager_dependencies import get_users_manager
+from src.controller.users_manager import UsersManager
 from sqlalchemy.orm import Session # Import Session
 
 logger = get_logger(__name__)
@@ -172,6 +174,14 @@ async def request_role_access(
         db.rollback() # Rollback the transaction on error
         raise HTTPException(status_code=500, detail="Failed to process role access request due to an internal error.")
 
+# --- User Lookup Cache Metrics ---
+@router.get("/user/cache-stats", dependencies=[Depends(PermissionChecker('settings', FeatureAccessLevel.ADMIN))])
+async def get_user_cache_stats(
+    users_manager: UsersManager = Depends(get_users_manager)
+) -> Dict[str, float]:
+    """Returns hit/miss counters of the SDK user details cache."""
+    return users_manager.get_cache_stats()
+
 # Register routes function simply includes the module-level router
 def register_routes(app):
     """Register user routes with the FastAPI app."""
@@ -0,0 +1,89 @@
+"""
+Route-level tests for list endpoints that leave out rows of projects the user
+is not a member of (AuthorizationManager.filter_accessible).
+"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.common.authorization import get_user_details_from_sdk
+from src.common.dependencies import get_db
+from src.common.features import FeatureAccessLevel
+from src.controller.authorization_manager import AuthorizationManager
+from src.controller.data_products_manager import DataProductsManager
+from src.db_models.data_contracts import DataContractDb
+from src.db_models.data_products import DataProductDb, InfoDb
+from src.models.settings import AppRole
+from src.models.users import UserInfo
+from src.routes import data_contracts_routes, data_product_routes
+
+
+USER = UserInfo(email="jane@example.com", username="jane", user="Jane", ip=None, groups=["analysts"])
+
+
+@pytest.fixture
+def projects_manager():
+    projects_manager = MagicMock()
+    projects_manager.get_user_project_ids.return_value = frozenset({"p1"})
+    return projects_manager
+
+
+@pytest.fixture
+def client(db_session, projects_manager):
+    settings_manager = MagicMock()
+    settings_manager.roles_version = 0
+    settings_manager.list_app_roles.return_value = [
+        AppRole(
+            id=uuid.uuid4(),
+            name="Consumer",
+            assigned_groups=["analysts"],
+            feature_permissions={
+                "data-products": FeatureAccessLevel.READ_ONLY,
+                "data-contracts": FeatureAccessLevel.READ_ONLY,
+            },
+        ),
+    ]
+
+    app = FastAPI()
+    app.include_router(data_product_routes.router)
+    app.include_router(data_contracts_routes.router)
+    app.state.authorization_manager = AuthorizationManager(settings_manager, projects_manager=projects_manager)
+    app.state.data_products_manager = DataProductsManager(db=db_session)
+    app.dependency_overrides[get_user_details_from_sdk] = lambda: USER
+    app.dependency_overrides[get_db] = lambda: db_session
+    with TestClient(app) as client:
+        yield client
+
+
+def _add_product(db_session, title, project_id):
+    product = DataProductDb(id=str(uuid.uuid4()), product_type="source", project_id=project_id)
+    product.info = InfoDb(title=title, owner="owner@example.com")
+    db_session.add(product)
+
+
+def test_product_list_leaves_out_other_projects(client, db_session, projects_manager):
+    for title, project_id in [("shared", None), ("mine", "p1"), ("theirs", "p2")]:
+        _add_product(db_session, title, project_id)
+    db_session.flush()
+
+    response = client.get("/api/data-products")
+
+    assert response.status_code == 200
+    assert sorted(p["info"]["title"] for p in response.json()) == ["mine", "shared"]
+    # Memberships are resolved once per request, not per row
+    projects_manager.get_user_project_ids.assert_called_once()
+
+
+def test_contract_list_leaves_out_other_projects(client, db_session):
+    for name, project_id in [("shared", None), ("mine", "p1"), ("theirs", "p2")]:
+        db_session.add(DataContractDb(name=name, version="1.0.0", project_id=project_id))
+    db_session.flush()
+
+    response = client.get("/api/data-contracts")
+
+    assert response.status_code == 200
+    assert sorted(c["name"] for c in response.json()) == ["mine", "shared"]
@@ -0,0 +1,106 @@
+"""
+Unit tests for the AsyncSession path: async CRUDBase variants, the async
+audit log reads and the AsyncDBSessionDep provider, including its sync fallback.
+"""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.common.database import Base
+from src.common.dependencies import get_async_db
+from src.controller.audit_manager import AuditManager
+from src.db_models.audit_log import AuditLogDb
+from src.models.audit_log import AuditLogCreate
+from src.repositories.audit_log_repository import audit_log_repository
+
+
+def _run_with_audit_table(scenario):
+    """Runs an async scenario against a fresh in-memory aiosqlite database with the audit table."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import StaticPool
+
+    async def main():
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        try:
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.create_all, tables=[AuditLogDb.__table__])
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                await scenario(db)
+        finally:
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+def test_async_crud_round_trip():
+    async def scenario(db):
+        entry = await audit_log_repository.create_async(db, obj_in=AuditLogCreate(
+            username="jane", ip_address=None, feature="teams", action="CREATE", success=True, details={},
+        ))
+        await db.commit()
+
+        assert (await audit_log_repository.get_async(db, entry.id)).username == "jane"
+        updated = await audit_log_repository.update_async(db, db_obj=entry, obj_in={"action": "UPDATE"})
+        assert updated.action == "UPDATE"
+        assert await audit_log_repository.count_async(db) == 1
+
+        await audit_log_repository.remove_async(db, id=entry.id)
+        assert await audit_log_repository.get_async(db, entry.id) is None
+        assert await audit_log_repository.remove_async(db, id=entry.id) is None
+
+    _run_with_audit_table(scenario)
+
+
+def test_audit_reads_await_an_async_session():
+    async def scenario(db):
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        db.add_all([
+            AuditLogDb(username="jane" if n % 2 else "bob", feature="teams", action="READ", success=True,
+                       timestamp=start + timedelta(minutes=n))
+            for n in range(5)
+        ])
+        await db.commit()
+
+        assert await audit_log_repository.get_multi_count(db, username="jane") == 2
+        first = await audit_log_repository.get_page(db, limit=3)
+        second = await audit_log_repository.get_page(db, limit=3, cursor=first.next_cursor)
+        timestamps = [log.timestamp for log in first.items + second.items]
+        assert len(timestamps) == 5 and timestamps == sorted(timestamps, reverse=True)
+        assert second.next_cursor is None
+        assert len(await audit_log_repository.get_multi(db, skip=1, limit=10)) == 4
+
+    _run_with_audit_table(scenario)
+
+
+def test_without_async_engine_reads_fall_back_to_a_sync_session(tmp_path, test_settings):
+    engine = create_engine(f"sqlite:///{tmp_path / 'audit.db'}")
+    Base.metadata.create_all(engine, tables=[AuditLogDb.__table__])
+    with engine.begin() as connection:
+        connection.execute(AuditLogDb.__table__.insert(), [
+            {"id": uuid.uuid4(), "username": f"user-{n}", "feature": "teams", "action": "READ", "success": True,
+             "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=n)}
+            for n in range(3)
+        ])
+
+    async def read_audit_page():
+        provider = get_async_db()
+        db = await provider.__anext__()
+        assert isinstance(db, Session)
+        total, logs, next_cursor = await AuditManager(settings=test_settings).get_audit_log_page(db=db, limit=2)
+        with pytest.raises(StopAsyncIteration):
+            await provider.__anext__()
+        return total, logs, next_cursor
+
+    with patch("src.common.dependencies.get_async_session_factory", return_value=None), \
+            patch("src.common.dependencies.get_session_factory", return_value=sessionmaker(bind=engine)):
+        total, logs, next_cursor = asyncio.run(read_audit_page())
+    assert total == 3
+    assert [log.username for log in logs] == ["user-2", "user-1"] and next_cursor is not None
+    engine.dispose()
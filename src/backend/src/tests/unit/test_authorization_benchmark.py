@@ -0,0 +1,34 @@
+"""
+Smoke test for the authorization benchmark, run on a tiny estate.
+"""
+
+import json
+
+from src.benchmarks.authorization_benchmark import run_benchmark
+from src.benchmarks.utils import compare_to_baseline
+
+
+def test_benchmark_report_covers_cold_and_warm_paths():
+    report = run_benchmark(roles=5, groups=20, teams=4, projects=4, users=5, calls=5)
+
+    report = json.loads(json.dumps(report))
+    scenarios = report["scenarios"]
+    assert set(scenarios) == {
+        f"{name}_{state}"
+        for name in ("effective_permissions", "team_override", "project_access", "permission_checker")
+        for state in ("cold", "warm")
+    }
+    assert all(result["count"] == 5 for result in scenarios.values())
+    # The checker scenarios time real grants, not only denials
+    assert report["permission_checks"]["granted"] > 0
+
+
+def test_baseline_comparison_flags_regressions():
+    baseline = {"fast": {"p50_ms": 1.0}, "slow": {"p50_ms": 1.0}}
+    current = {"fast": {"p50_ms": 1.2}, "slow": {"p50_ms": 1.3}, "new": {"p50_ms": 5.0}}
+
+    comparison = compare_to_baseline(current, baseline, max_regression=0.25)
+
+    assert not comparison["fast"]["regressed"]
+    assert comparison["slow"]["regressed"]
+    assert "new" not in comparison
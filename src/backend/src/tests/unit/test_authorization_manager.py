@@ -0,0 +1,105 @@
+"""
+Unit tests for AuthorizationManager permission resolution and memoization.
+"""
+
+import uuid
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.common.features import FeatureAccessLevel, PermissionVector
+from src.controller.authorization_manager import AuthorizationManager
+from src.models.settings import AppRole
+from src.models.users import UserInfo
+
+
+def make_role(name, groups, permissions):
+    return AppRole(id=uuid.uuid4(), name=name, assigned_groups=groups, feature_permissions=permissions)
+
+
+@pytest.fixture
+def settings_manager():
+    settings_manager = MagicMock()
+    settings_manager.roles_version = 0
+    settings_manager.list_app_roles.return_value = [
+        make_role("Admin", ["admins"], {"data-products": FeatureAccessLevel.ADMIN, "settings": FeatureAccessLevel.ADMIN}),
+        make_role("Consumer", ["analysts", "users"], {"data-products": FeatureAccessLevel.READ_ONLY}),
+        make_role("Producer", ["engineers"], {"data-products": FeatureAccessLevel.READ_WRITE, "data-contracts": FeatureAccessLevel.READ_WRITE}),
+    ]
+    return settings_manager
+
+
+def test_permission_vector_merges_and_checks_by_rank():
+    producer = PermissionVector.from_levels({"data-products": FeatureAccessLevel.READ_WRITE, "unknown": FeatureAccessLevel.ADMIN})
+    steward = PermissionVector.from_levels({"data-products": FeatureAccessLevel.FILTERED, "settings": FeatureAccessLevel.ADMIN})
+
+    merged = PermissionVector.merge([producer, steward])
+
+    assert merged["data-products"] == FeatureAccessLevel.READ_WRITE
+    assert merged.has_permission("settings", FeatureAccessLevel.ADMIN)
+    assert not merged.has_permission("teams", FeatureAccessLevel.READ_ONLY)
+    assert not merged.has_permission("unknown", FeatureAccessLevel.READ_ONLY)
+    assert merged.get("unknown") is None
+    assert merged == merged.to_dict() and len(merged.to_dict()) == len(merged)
+
+
+def test_permissions_merge_matching_roles(settings_manager):
+    manager = AuthorizationManager(settings_manager)
+
+    permissions = manager.get_user_effective_permissions(["analysts", "engineers"])
+
+    assert permissions["data-products"] == FeatureAccessLevel.READ_WRITE
+    assert permissions["data-contracts"] == FeatureAccessLevel.READ_WRITE
+    assert permissions["settings"] == FeatureAccessLevel.NONE
+    assert set(manager.get_user_effective_permissions(None).values()) == {FeatureAccessLevel.NONE}
+
+
+def test_team_role_override_takes_precedence(settings_manager):
+    manager = AuthorizationManager(settings_manager)
+
+    assert manager.get_user_effective_permissions(["admins"], "Consumer")["settings"] == FeatureAccessLevel.NONE
+    # Unknown overrides fall back to group-based permissions
+    assert manager.get_user_effective_permissions(["admins"], "Missing")["settings"] == FeatureAccessLevel.ADMIN
+    vector = manager.get_user_permission_vector(["admins"], "Consumer")
+    assert manager.has_permission(vector, "data-products", FeatureAccessLevel.READ_ONLY)
+    assert not manager.has_permission(vector, "settings", FeatureAccessLevel.READ_ONLY)
+
+
+def test_results_are_memoized_until_roles_change(settings_manager):
+    manager = AuthorizationManager(settings_manager)
+
+    first = manager.get_user_effective_permissions(["users", "analysts"])
+    first["data-products"] = FeatureAccessLevel.ADMIN  # Callers get a private copy
+    second = manager.get_user_effective_permissions(["analysts", "users"])
+
+    assert second["data-products"] == FeatureAccessLevel.READ_ONLY
+    assert settings_manager.list_app_roles.call_count == 1
+    assert manager._permissions_cache.stats()["hits"] == 1
+
+    settings_manager.list_app_roles.return_value = [
+        make_role("Consumer", ["analysts"], {"data-products": FeatureAccessLevel.READ_WRITE}),
+    ]
+    settings_manager.roles_version = 1
+
+    assert manager.get_user_effective_permissions(["analysts"])["data-products"] == FeatureAccessLevel.READ_WRITE
+    assert settings_manager.list_app_roles.call_count == 2
+
+
+def test_access_mask_resolves_permissions_and_projects_once(settings_manager):
+    projects_manager = MagicMock()
+    projects_manager.get_user_project_ids.return_value = {"p1"}
+    manager = AuthorizationManager(settings_manager, projects_manager=projects_manager)
+    user = UserInfo(email="jane@example.com", username="jane", user="Jane", ip=None, groups=["analysts"])
+    db = MagicMock()
+
+    mask = manager.get_access_mask(user, [
+        ("data-products", None),
+        ("data-products", "p1"),
+        ("data-products", "p2"),
+        ("data-contracts", None),
+    ] * 1000, db=db)
+
+    assert mask[:4] == [True, True, False, False] and len(mask) == 4000
+    projects_manager.get_user_project_ids.assert_called_once_with(db, "jane@example.com", ["analysts"])
+    # Project-scoped resources are denied when memberships can't be resolved
+    assert manager.get_access_mask(user, [("data-products", "p1")]) == [False]
@@ -0,0 +1,60 @@
+"""
+Unit tests for the CRUDBase bulk insert/upsert primitives and the compliance
+YAML loader built on them.
+"""
+
+from pathlib import Path
+
+import pytest
+from sqlalchemy import event
+
+from src.controller.compliance_manager import ComplianceManager
+from src.db_models.compliance import CompliancePolicyDb, ComplianceRunDb
+from src.repositories.compliance_repository import compliance_policy_repo
+
+COMPLIANCE_YAML = Path(__file__).parents[2] / "data" / "compliance.yaml"
+
+
+@pytest.fixture
+def statements(db_session):
+    executed = []
+    listener = lambda conn, cursor, statement, *args: executed.append(statement)
+    event.listen(db_session.get_bind(), "before_cursor_execute", listener)
+    yield executed
+    event.remove(db_session.get_bind(), "before_cursor_execute", listener)
+
+
+def test_create_many_batches_rows(db_session, statements):
+    rows = [{"id": f"p{n}", "name": f"Policy {n}", "rule": "true", "severity": "high" if n % 2 else None} for n in range(5)]
+
+    created = compliance_policy_repo.create_many(db_session, objs_in=rows, batch_size=2)
+
+    assert [policy.id for policy in created] == ["p0", "p1", "p2", "p3", "p4"]
+    assert created[1].severity == "high" and created[0].is_active is True
+    assert len([s for s in statements if s.startswith("INSERT")]) == 3
+    with pytest.raises(ValueError):
+        compliance_policy_repo.create_many(db_session, objs_in=[{"id": "x", "name": "X", "rule": "true", "runs": []}])
+
+
+def test_upsert_many_updates_only_given_columns(db_session):
+    compliance_policy_repo.create_many(db_session, objs_in=[{"id": "p1", "name": "Old", "rule": "a", "category": "keep"}])
+
+    upserted = compliance_policy_repo.upsert_many(db_session, objs_in=[
+        {"id": "p1", "name": "New", "rule": "b"},
+        {"id": "p2", "name": "Added", "rule": "c", "category": "fresh"},
+    ])
+
+    assert {policy.id: (policy.name, policy.category) for policy in upserted} == {"p1": ("New", "keep"), "p2": ("Added", "fresh")}
+    assert db_session.query(CompliancePolicyDb).count() == 2
+
+
+def test_compliance_yaml_loads_in_a_handful_of_statements(db_session, statements):
+    manager = ComplianceManager()
+
+    manager.load_from_yaml(db_session, str(COMPLIANCE_YAML))
+    policies, runs = db_session.query(CompliancePolicyDb).count(), db_session.query(ComplianceRunDb).count()
+    assert policies > 0 and runs > 0
+    assert len(statements) < 15
+
+    manager.load_from_yaml(db_session, str(COMPLIANCE_YAML))
+    assert (db_session.query(CompliancePolicyDb).count(), db_session.query(ComplianceRunDb).count()) == (policies, runs)
@@ -0,0 +1,108 @@
+"""
+Unit tests for connection pool instrumentation.
+"""
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, exc, text
+
+from src.common.db_metrics import (
+    InstrumentedQueuePool,
+    PoolMetrics,
+    attach_query_instrumentation,
+    statement_shape,
+    track_queries,
+)
+from src.common.middleware import SQLInstrumentationMiddleware
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    yield engine
+    engine.dispose()
+
+
+def test_snapshot_tracks_occupancy_and_timeouts(engine):
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        assert metrics.snapshot()["in_use"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    snapshot = metrics.snapshot()
+    assert (snapshot["pool_size"], snapshot["in_use"], snapshot["checked_in"]) == (1, 0, 1)
+    assert (snapshot["checkouts"], snapshot["checkins"], snapshot["peak_in_use"]) == (1, 1, 1)
+    assert snapshot["checkout_timeouts"] == 1
+    assert snapshot["checkout_wait"]["samples"] == 2 and snapshot["checkout_wait"]["max_ms"] >= 50
+
+
+def test_invalidations_are_counted_across_pool_recreation(engine):
+    metrics = PoolMetrics()
+    metrics.attach(engine)
+
+    with engine.connect() as connection:
+        connection.invalidate()
+    engine.dispose()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["invalidations"] == 1
+    assert snapshot["connects"] == 2 and snapshot["checkout_wait"]["samples"] == 2
+
+
+def test_middleware_flags_repeated_statements():
+    engine = create_engine("sqlite://")
+    attach_query_instrumentation(engine)
+    app = FastAPI()
+    app.add_middleware(SQLInstrumentationMiddleware, n_plus_one_threshold=5)
+
+    @app.get("/items")
+    def list_items(count: int):
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1 WHERE 1 IN (:a, :b)"), {"a": 1, "b": 2})
+            for n in range(count):
+                connection.execute(text("SELECT :n"), {"n": n})
+        return {}
+
+    client = TestClient(app)
+    flagged = client.get("/items", params={"count": 5})
+    clean = client.get("/items", params={"count": 4})
+
+    assert flagged.headers["X-DB-Query-Count"] == "6"
+    assert flagged.headers["X-DB-N-Plus-One"] == "1"
+    assert clean.headers["X-DB-Query-Count"] == "5"
+    assert "X-DB-N-Plus-One" not in clean.headers
+
+
+def test_statement_shapes_ignore_parameters():
+    with track_queries() as stats:
+        stats.record("SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s)", 0.001)
+        stats.record("SELECT *\n  FROM t WHERE id IN (%(id_1_1)s)", 0.002)
+
+    assert statement_shape("SELECT * FROM t WHERE a = ? AND b IN (?, ?)") == "SELECT * FROM t WHERE a = ? AND b IN (?)"
+    assert stats.repeated_shapes(2) == [("SELECT * FROM t WHERE id IN (?)", 2, 0.003)]
+
+
+def test_failed_statements_do_not_skew_later_timings(engine):
+    attach_query_instrumentation(engine)
+
+    with engine.connect() as connection:
+        with track_queries() as stats:
+            with pytest.raises(exc.OperationalError):
+                connection.execute(text("SELECT * FROM missing_table"))
+        assert connection.info == {}
+
+        time.sleep(0.05)
+        with track_queries() as stats:
+            connection.execute(text("SELECT 1"))
+
+    # Timed from its own start, not from the failed statement's
+    assert stats.statement_count == 1 and stats.total_seconds < 0.05
@@ -0,0 +1,101 @@
+"""
+Unit tests for read-replica routing: RoutingSession, ReplicaLagMonitor and
+the replica_reads scope, with two SQLite engines standing in for primary and replica.
+"""
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, event, select
+from sqlalchemy.orm import declarative_base, sessionmaker
+
+from src.common.db_routing import ReplicaLagMonitor, RoutingSession, replica_reads
+
+RoutingBase = declarative_base()
+
+
+class Item(RoutingBase):
+    __tablename__ = "routing_items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String)
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Primary and replica engines that record which one ran each statement."""
+    executed = []
+    created = {}
+    for name in ("primary", "replica"):
+        engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+        RoutingBase.metadata.create_all(engine)
+        with engine.begin() as connection:
+            connection.execute(Item.__table__.insert(), [{"id": 1, "name": name}])
+        event.listen(engine, "before_cursor_execute",
+                     lambda conn, cursor, statement, *args, name=name: executed.append((name, statement.split()[0])))
+        created[name] = engine
+    yield created["primary"], created["replica"], executed
+    for engine in created.values():
+        engine.dispose()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _factory(primary, replica, lag=0.0):
+    monitor = ReplicaLagMonitor(lambda: lag, max_lag_seconds=5.0)
+    return sessionmaker(class_=RoutingSession, bind=primary, replica_bind=replica, replica_monitor=monitor)
+
+
+def test_selects_use_the_replica_only_inside_a_replica_reads_scope(engines):
+    primary, replica, executed = engines
+    with _factory(primary, replica)() as db:
+        assert db.scalar(select(Item.name)) == "primary"
+    with replica_reads(), _factory(primary, replica)() as db:
+        assert db.get(Item, 1).name == "replica"
+        # Locking reads need the primary
+        assert db.scalar(select(Item.name).with_for_update()) == "primary"
+    assert [name for name, _ in executed] == ["primary", "replica", "primary"]
+
+
+def test_writes_pin_the_session_to_the_primary(engines):
+    primary, replica, executed = engines
+    with replica_reads(), _factory(primary, replica)() as db:
+        db.add(Item(id=2, name="new"))
+        db.flush()
+        # Read-your-writes: the replica has not seen the insert
+        assert db.get(Item, 2, populate_existing=True).name == "new"
+        assert db.scalar(select(Item.name).where(Item.id == 1)) == "primary"
+        db.commit()
+    assert {name for name, _ in executed} == {"primary"}
+
+
+def test_a_lagging_replica_is_not_read_from(engines):
+    primary, replica, executed = engines
+    with replica_reads(), _factory(primary, replica, lag=30.0)() as db:
+        assert db.scalar(select(Item.name)) == "primary"
+    assert [name for name, _ in executed] == ["primary"]
+
+
+def test_lag_monitor_reuses_measurements_and_treats_failures_as_stale():
+    clock = FakeClock()
+    lags = [1.0, None, RuntimeError("replica down")]
+    probes = []
+
+    def probe():
+        probes.append(clock.now)
+        lag = lags.pop(0)
+        if isinstance(lag, Exception):
+            raise lag
+        return lag
+
+    monitor = ReplicaLagMonitor(probe, max_lag_seconds=5.0, check_interval_seconds=10.0, clock=clock)
+    assert monitor.is_fresh() and monitor.is_fresh()
+    clock.now = 10.0
+    assert not monitor.is_fresh()  # Unknown lag
+    clock.now = 20.0
+    assert not monitor.is_fresh()  # Probe failed
+    assert probes == [0.0, 10.0, 20.0]
+    assert monitor.snapshot() == {"lag_seconds": None, "max_lag_seconds": 5.0, "fresh": False}
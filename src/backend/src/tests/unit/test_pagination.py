@@ -0,0 +1,52 @@
+"""
+Unit tests for keyset (cursor) pagination.
+"""
+
+import pytest
+
+from src.common.pagination import InvalidCursorError, KeysetKey, keyset_paginate
+from src.db_models.teams import TeamDb
+from src.repositories.teams_repository import TeamRepository
+
+
+@pytest.fixture
+def teams(db_session):
+    for n, (name, creator) in enumerate([("delta", "bob"), ("alpha", "ann"), ("charlie", "bob"), ("echo", "ann"), ("bravo", "cid")]):
+        db_session.add(TeamDb(id=f"team-{n}", name=name, created_by=creator, updated_by=creator))
+    db_session.flush()
+    return TeamRepository()
+
+
+def collect_pages(fetch):
+    pages, cursor = [], None
+    while True:
+        page = fetch(cursor)
+        pages.append([team.id for team in page.items])
+        if page.next_cursor is None:
+            return pages
+        cursor = page.next_cursor
+
+
+def test_pages_cover_every_row_once_in_order(teams, db_session):
+    pages = collect_pages(lambda cursor: teams.get_page_with_members(db_session, limit=2, cursor=cursor))
+
+    assert pages == [["team-1", "team-4"], ["team-2", "team-0"], ["team-3"]]
+
+
+def test_mixed_directions_with_duplicate_keys(teams, db_session):
+    # Duplicate creators make the id tiebreaker matter
+    keys = (KeysetKey(TeamDb.created_by, descending=True), KeysetKey(TeamDb.id))
+    query = db_session.query(TeamDb).filter(TeamDb.name != "bravo")
+
+    pages = collect_pages(lambda cursor: keyset_paginate(query, keys, limit=1, cursor=cursor))
+
+    assert pages == [["team-0"], ["team-2"], ["team-1"], ["team-3"]]
+
+
+def test_cursors_are_tied_to_their_ordering(teams, db_session):
+    cursor = teams.get_page_with_members(db_session, limit=1).next_cursor
+
+    with pytest.raises(InvalidCursorError):
+        keyset_paginate(db_session.query(TeamDb), (KeysetKey(TeamDb.id),), limit=1, cursor=cursor)
+    with pytest.raises(InvalidCursorError):
+        teams.get_page_with_members(db_session, limit=1, cursor="not-a-cursor")
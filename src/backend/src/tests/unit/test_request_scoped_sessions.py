@@ -0,0 +1,92 @@
+"""
+Unit tests for per-call sessions in managers shared across requests
+(session_scope/with_session) instead of one session held since startup.
+"""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.common.database import Base
+from src.common.features import FeatureAccessLevel
+from src.controller.settings_manager import SettingsManager
+from src.db_models.settings import AppRoleDb
+from src.models.settings import AppRoleCreate, AppRoleUpdate
+
+
+@pytest.fixture
+def engine(tmp_path):
+    # A file database so connections really come from (and return to) a QueuePool
+    engine = create_engine(f"sqlite:///{tmp_path / 'roles.db'}")
+    Base.metadata.create_all(engine, tables=[AppRoleDb.__table__])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def opened_sessions(engine):
+    sessions = []
+    factory = sessionmaker(bind=engine, autoflush=False)
+
+    def session_factory():
+        sessions.append(factory())
+        return sessions[-1]
+
+    session_factory.sessions = sessions
+    return session_factory
+
+
+def _role(name):
+    return AppRoleCreate(name=name, assigned_groups=[name], feature_permissions={"data-products": FeatureAccessLevel.READ_ONLY})
+
+
+def test_calls_without_a_session_use_and_release_their_own(engine, opened_sessions, test_settings):
+    manager = SettingsManager(db=None, settings=test_settings, session_factory=opened_sessions)
+    role_ids = [manager.create_app_role(_role(f"role-{n}")).id for n in range(20)]
+    for role_id in role_ids:
+        assert manager.get_app_role(str(role_id)) is not None
+
+    # Each call committed and closed its session: nothing is retained between calls
+    assert len(opened_sessions.sessions) == 40
+    assert all(len(session.identity_map) == 0 for session in opened_sessions.sessions)
+    assert engine.pool.checkedout() == 0
+    # Writes were committed by their own short-lived sessions
+    assert len(manager.list_app_roles()) == 20
+
+
+def test_callers_session_is_used_and_left_to_the_caller(engine, opened_sessions, test_settings):
+    manager = SettingsManager(db=None, settings=test_settings, session_factory=opened_sessions)
+    request_db = sessionmaker(bind=engine)()
+    try:
+        role = manager.create_app_role(_role("steward"), db=request_db)
+        assert manager.get_app_role(str(role.id), db=request_db).name == "steward"
+        assert opened_sessions.sessions == []
+        # Not committed by the manager: rolling back the request discards the role
+        request_db.rollback()
+        assert manager.get_app_role(str(role.id)) is None
+    finally:
+        request_db.close()
+
+
+def test_role_writes_reach_the_snapshot_only_when_committed(engine, opened_sessions, test_settings):
+    manager = SettingsManager(db=None, settings=test_settings, session_factory=opened_sessions)
+    role = manager.create_app_role(_role("steward"))
+    assert manager.list_app_roles()[0].assigned_groups == ["steward"]
+    version = manager.roles_version
+
+    request_db = sessionmaker(bind=engine)()
+    try:
+        manager.update_app_role(str(role.id), AppRoleUpdate(assigned_groups=["stewards"]), db=request_db)
+        # A read before the commit must not republish the old roles under a new version
+        assert manager.list_app_roles()[0].assigned_groups == ["steward"]
+        assert manager.roles_version == version
+        request_db.commit()
+        assert manager.roles_version == version + 1
+        assert manager.list_app_roles()[0].assigned_groups == ["stewards"]
+
+        manager.update_app_role(str(role.id), AppRoleUpdate(assigned_groups=["nobody"]), db=request_db)
+        request_db.rollback()
+        assert manager.roles_version == version + 1
+        assert manager.list_app_roles()[0].assigned_groups == ["stewards"]
+    finally:
+        request_db.close()
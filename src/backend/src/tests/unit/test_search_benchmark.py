@@ -0,0 +1,31 @@
+"""
+Smoke test for the search benchmark, run on a tiny corpus.
+"""
+
+import json
+
+from src.benchmarks.search_benchmark import CorpusGenerator, run_benchmark
+from src.benchmarks.utils import parse_size, summarize_latencies
+
+
+def test_parse_size_and_latency_summary():
+    assert [parse_size(s) for s in ("10k", "100K", "1m", "250")] == [10_000, 100_000, 1_000_000, 250]
+    summary = summarize_latencies([0.001 * n for n in range(1, 101)])
+    assert (summary["p50_ms"], summary["p99_ms"], summary["count"]) == (50.0, 99.0, 100)
+
+
+def test_corpus_is_deterministic():
+    first, second = CorpusGenerator(50, seed=7).items(), CorpusGenerator(50, seed=7).items()
+    assert first == second
+    assert len({item.id for item in first}) == 50
+
+
+def test_benchmark_report_is_machine_readable():
+    report = run_benchmark(sizes=[300], query_count=5, measure_memory=False, load_threads=1, service_max_size=300)
+
+    result = json.loads(json.dumps(report))["results"][0]
+    assert result["size"] == 300
+    assert set(result["queries"]) == {"prefix", "multi_term", "typo", "permission_filtered", "cached_repeat"}
+    assert result["queries"]["prefix"]["count"] == 5
+    assert result["rebuild_under_load"]["errors"] == 0
+    assert result["search_service"]["items"] == 300
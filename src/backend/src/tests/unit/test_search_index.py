@@ -0,0 +1,457 @@
+"""
+Unit tests for the in-memory inverted search index used by SearchManager.
+"""
+
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from src.common.features import FeatureAccessLevel
+from src.common.pagination import InvalidCursorError
+from src.common.search_index import PartitionedSearchIndex
+from src.common.search_interfaces import SearchableAsset, SearchIndexItem
+from src.common.search_ranking import BM25Ranker
+from src.common.search_snapshot import read_snapshot, write_snapshot
+from src.controller.search_manager import SearchManager
+from src.models.users import UserInfo
+
+
+def make_item(item_id: str, title: str, description: str = "", tags=None, feature_id: str = "data-products") -> SearchIndexItem:
+    return SearchIndexItem(
+        id=item_id,
+        type="data-product",
+        title=title,
+        description=description,
+        link=f"/items/{item_id}",
+        tags=tags or [],
+        feature_id=feature_id,
+    )
+
+
+def naive_prefix_search(items, query):
+    """Reference implementation of the original linear-scan prefix semantics."""
+    query_lower = query.lower()
+    results = []
+    for item in items:
+        if item.title and item.title.lower().startswith(query_lower):
+            results.append(item)
+        elif item.description and item.description.lower().startswith(query_lower):
+            results.append(item)
+        elif any(str(tag).lower().startswith(query_lower) for tag in item.tags or []):
+            results.append(item)
+    return results
+
+
+class TestPrefixSearch:
+    """Test suite for PartitionedSearchIndex.prefix_search."""
+
+    @pytest.fixture
+    def items(self):
+        return [
+            make_item("product::1", "Sales Report", "Monthly sales figures", ["finance", "Gold"]),
+            make_item("product::2", "Customer 360", "Unified customer view", ["crm"]),
+            make_item("contract::1", "sales contract", "", ["Finance-Team"], feature_id="data-contracts"),
+            make_item("term::1", "Revenue", "Sales minus returns", [], feature_id="business-glossary"),
+        ]
+
+    def test_prefix_matches_title_description_and_tags(self, items):
+        index = PartitionedSearchIndex(items)
+
+        assert [i.id for i in index.prefix_search("sales")] == ["product::1", "contract::1", "term::1"]
+        assert [i.id for i in index.prefix_search("FIN")] == ["product::1", "contract::1"]
+        assert [i.id for i in index.prefix_search("unified")] == ["product::2"]
+
+    def test_prefix_applies_to_whole_field_value(self, items):
+        index = PartitionedSearchIndex(items)
+
+        # "report" only appears mid-title, which never matched under prefix semantics
+        assert index.prefix_search("report") == []
+
+    def test_item_matching_several_fields_is_returned_once(self, items):
+        index = PartitionedSearchIndex(items)
+
+        results = index.prefix_search("s")
+        assert len(results) == len({i.id for i in results})
+
+    def test_empty_query_and_empty_index(self, items):
+        assert PartitionedSearchIndex(items).prefix_search("") == []
+        assert PartitionedSearchIndex().prefix_search("sales") == []
+
+    @pytest.mark.parametrize("query", ["s", "sa", "Sales R", "c", "customer 3", "gold", "x", "revenue"])
+    def test_matches_linear_scan(self, items, query):
+        index = PartitionedSearchIndex(items)
+
+        assert index.prefix_search(query) == naive_prefix_search(items, query)
+
+    def test_upsert_replaces_existing_item(self, items):
+        index = PartitionedSearchIndex(items)
+
+        index.upsert(make_item("product::1", "Churn Model", "", ["ml"]))
+
+        assert index.prefix_search("sales report") == []
+        assert [i.id for i in index.prefix_search("churn")] == ["product::1"]
+        assert len(index) == len(items)
+
+    def test_upsert_adds_new_item_and_terms(self, items):
+        index = PartitionedSearchIndex(items)
+        term_count = index.term_count
+
+        index.upsert(make_item("product::3", "Inventory", "", ["ops"]))
+
+        assert [i.id for i in index.prefix_search("inv")] == ["product::3"]
+        assert index.term_count == term_count + 2
+
+    def test_remove_drops_item_and_orphaned_terms(self, items):
+        index = PartitionedSearchIndex(items)
+
+        assert index.remove("product::2") is True
+        assert index.remove("product::2") is False
+        assert index.prefix_search("customer") == []
+        assert index.prefix_search("crm") == []
+        assert "product::2" not in index
+        assert len(index) == len(items) - 1
+
+
+class TestPartitionedSearchIndex:
+    """Test suite for PartitionedSearchIndex."""
+
+    @pytest.fixture
+    def items(self):
+        return [
+            make_item("product::1", "Sales Report", "", ["finance"]),
+            make_item("contract::1", "Sales Contract", "", [], feature_id="data-contracts"),
+            make_item("term::1", "Sales Tax", "", [], feature_id="business-glossary"),
+        ]
+
+    def test_search_is_restricted_to_requested_partitions(self, items):
+        index = PartitionedSearchIndex(items)
+
+        assert sorted(index.partition_ids) == ["business-glossary", "data-contracts", "data-products"]
+        assert [i.id for i in index.prefix_search("sales", feature_ids=["data-contracts", "unknown"])] == ["contract::1"]
+        assert index.prefix_search("sales", feature_ids=[]) == []
+        assert len(index.prefix_search("sales")) == 3
+
+    def test_upsert_moves_item_between_partitions(self, items):
+        index = PartitionedSearchIndex(items)
+
+        index.upsert(make_item("product::1", "Sales Report", feature_id="data-contracts"))
+
+        assert index.prefix_search("sales", feature_ids=["data-products"]) == []
+        assert [i.id for i in index.prefix_search("sales", feature_ids=["data-contracts"])] == ["contract::1", "product::1"]
+        assert len(index) == 3
+        assert index.remove("product::1") is True
+        assert "product::1" not in index
+
+    def test_ranking_touches_only_readable_partitions_with_corpus_wide_scores(self, items, monkeypatch):
+        index = PartitionedSearchIndex(items + [make_item("product::2", "Sales Forecast", "", ["finance", "ml"])])
+        global_ranker = BM25Ranker()
+        global_ranker.add_many((item.id, PartitionedSearchIndex._ranking_fields(item)) for item in index.items)
+
+        def unreadable(*args, **kwargs):
+            raise AssertionError("unreadable partition was scored")
+        monkeypatch.setattr(index._rankers["business-glossary"], "score", unreadable)
+        monkeypatch.setattr(index._rankers["data-contracts"], "score", unreadable)
+
+        expected = {
+            item_id: score for item_id, score in global_ranker.score("sales fin").items()
+            if item_id.startswith("product::")
+        }
+        assert index._rankers["data-products"].score("sales fin") == expected
+        assert index.rank("sales fin", feature_ids=["data-products"]) == [
+            item_id for _, item_id in global_ranker.select(expected)
+        ]
+
+
+    def test_facet_counts_cover_all_matches(self, items):
+        index = PartitionedSearchIndex(items + [make_item("product::2", "Sales Forecast", "", ["finance", "ml"])])
+
+        results, total, facets = index.search_with_facets("sales", limit=1, top_tags=1)
+
+        assert len(results) == 1 and total == 4
+        assert facets["feature_id"] == {"data-products": 2, "business-glossary": 1, "data-contracts": 1}
+        assert facets["type"] == {"data-product": 4}
+        assert facets["tags"] == {"finance": 2}
+
+        index.upsert(make_item("product::2", "Sales Forecast", "", ["ml"]))
+        index.remove("term::1")
+        _, total, facets = index.search_with_facets("sales", feature_ids=["data-products", "business-glossary"])
+        assert total == 2
+        assert facets["feature_id"] == {"data-products": 2}
+        assert facets["tags"] == {"finance": 1, "ml": 1}
+
+
+class TestSearchManagerPermissionFiltering:
+    """Test suite for permission filtering in SearchManager.search."""
+
+    class StaticAsset(SearchableAsset):
+        def __init__(self, items):
+            self.items = items
+
+        def get_search_index_items(self):
+            return list(self.items)
+
+    def test_only_readable_partitions_are_searched(self):
+        asset = self.StaticAsset([
+            make_item("product::1", "Sales Report"),
+            make_item("contract::1", "Sales Contract", feature_id="data-contracts"),
+        ])
+        search_manager = SearchManager(searchable_managers=[asset])
+        auth_manager = MagicMock()
+        auth_manager.get_user_effective_permissions.return_value = {"data-products": FeatureAccessLevel.READ_ONLY}
+        auth_manager.has_permission.side_effect = lambda permissions, feature_id, level: feature_id in permissions
+        user = UserInfo(email="a@example.com", username="alice", user="alice", ip=None, groups=["analysts"])
+
+        results = search_manager.search("sales", auth_manager, user)
+
+        assert [i.id for i in results] == ["product::1"]
+        auth_manager.get_user_effective_permissions.assert_called_once_with(["analysts"])
+        # One check per feature partition, independent of the number of matches
+        assert auth_manager.has_permission.call_count == 2
+
+
+class TestSearchManagerPaginationAndCache:
+    """Test suite for cursor pagination and the query cache in SearchManager."""
+
+    @pytest.fixture
+    def search_manager(self):
+        asset = TestSearchManagerPermissionFiltering.StaticAsset(
+            [make_item(f"product::{n}", f"Sales Report {n}") for n in range(5)]
+        )
+        return SearchManager(searchable_managers=[asset])
+
+    @pytest.fixture
+    def auth_manager(self):
+        auth_manager = MagicMock()
+        auth_manager.get_user_effective_permissions.return_value = {"data-products": FeatureAccessLevel.READ_ONLY}
+        auth_manager.has_permission.side_effect = lambda permissions, feature_id, level: feature_id in permissions
+        return auth_manager
+
+    @pytest.fixture
+    def user(self):
+        return UserInfo(email="a@example.com", username="alice", user="alice", ip=None, groups=["analysts"])
+
+    def test_cursor_pages_through_all_results(self, search_manager, auth_manager, user):
+        seen, cursor = [], None
+        while True:
+            items, cursor = search_manager.search_page("sales", auth_manager, user, limit=2, cursor=cursor)
+            seen.extend(i.id for i in items)
+            if cursor is None:
+                break
+
+        assert sorted(seen) == [f"product::{n}" for n in range(5)]
+        assert len(seen) == 5
+        # Only the first page computed a ranking
+        assert (search_manager.query_cache_misses, search_manager.query_cache_hits) == (1, 2)
+
+    def test_cursor_is_bound_to_query(self, search_manager, auth_manager, user):
+        _, cursor = search_manager.search_page("sales", auth_manager, user, limit=2)
+
+        with pytest.raises(InvalidCursorError):
+            search_manager.search_page("report", auth_manager, user, limit=2, cursor=cursor)
+        with pytest.raises(InvalidCursorError):
+            search_manager.search_page("sales", auth_manager, user, cursor="not-a-cursor")
+
+    def test_index_changes_invalidate_cache(self, search_manager, auth_manager, user):
+        search_manager.search("sales", auth_manager, user)
+        search_manager.upsert_item(make_item("product::9", "Sales Extra"))
+
+        results = search_manager.search("SALES", auth_manager, user)
+
+        assert "product::9" in [i.id for i in results]
+        assert search_manager.query_cache_misses == 2
+
+
+class TestSearchManagerIncrementalUpdates:
+    """Test suite for SearchManager delta updates."""
+
+    class FakeAsset(SearchableAsset):
+        def __init__(self, items):
+            self.items = list(items)
+
+        def get_search_index_items(self):
+            return list(self.items)
+
+        def create(self, item):
+            self.items.append(item)
+            self._notify_search_upsert(item)
+
+        def delete(self, item_id):
+            self.items = [i for i in self.items if i.id != item_id]
+            self._notify_search_remove(item_id)
+
+    @pytest.fixture
+    def asset(self):
+        return self.FakeAsset([make_item("product::1", "Sales Report")])
+
+    def test_manager_deltas_are_searchable_without_rebuild(self, asset):
+        search_manager = SearchManager(searchable_managers=[asset])
+
+        asset.create(make_item("product::2", "Sales Forecast"))
+        assert [i.id for i in search_manager._inverted_index.prefix_search("sales")] == ["product::1", "product::2"]
+
+        asset.delete("product::1")
+        assert [i.id for i in search_manager.index] == ["product::2"]
+
+    def test_deltas_of_database_writes_wait_for_commit(self, asset):
+        search_manager = SearchManager(searchable_managers=[asset])
+        engine = create_engine("sqlite://")
+        with Session(engine) as db:
+            db.execute(text("SELECT 1"))
+            asset._notify_search_upsert(make_item("product::2", "Sales Forecast"), db=db)
+            asset._notify_search_remove("product::1", db=db)
+            assert sorted(i.id for i in search_manager.index) == ["product::1"]
+            db.commit()
+            assert [i.id for i in search_manager.index] == ["product::2"]
+
+            db.execute(text("SELECT 1"))
+            asset._notify_search_upsert(make_item("product::3", "Sales Plan"), db=db)
+            db.rollback()
+        assert [i.id for i in search_manager.index] == ["product::2"]
+
+    def test_items_without_feature_id_are_ignored(self, asset):
+        search_manager = SearchManager(searchable_managers=[asset])
+
+        search_manager.upsert_item(make_item("product::3", "Orphan", feature_id=""))
+
+        assert "product::3" not in search_manager._inverted_index
+
+    def test_deltas_during_rebuild_are_replayed(self, asset):
+        search_manager = SearchManager(searchable_managers=[asset])
+        original_get_items = asset.get_search_index_items
+
+        def get_items_with_concurrent_write():
+            items = original_get_items()
+            # Simulate a write landing after the snapshot was taken
+            search_manager.upsert_item(make_item("product::9", "Late Arrival"))
+            return items
+
+        asset.get_search_index_items = get_items_with_concurrent_write
+        search_manager.build_index()
+
+        assert [i.id for i in search_manager.index] == ["product::1", "product::9"]
+
+
+class TestSearchManagerParallelBuild:
+    """Test suite for the concurrent, deadline-bounded SearchManager.build_index."""
+
+    class BlockingAsset(SearchableAsset):
+        def __init__(self, items):
+            self.items = list(items)
+            self.release = threading.Event()
+            self.release.set()
+
+        def get_search_index_items(self):
+            self.release.wait(5)
+            return list(self.items)
+
+        def create(self, item):
+            self.items.append(item)
+            self._notify_search_upsert(item)
+
+    class SlowAsset(BlockingAsset):
+        pass
+
+    class FastAsset(BlockingAsset):
+        pass
+
+    def test_timed_out_manager_keeps_previous_slice(self):
+        slow = self.SlowAsset([make_item("contract::1", "Slow Contract", feature_id="data-contracts")])
+        fast = self.FastAsset([make_item("product::1", "Fast Product")])
+        search_manager = SearchManager(searchable_managers=[slow, fast], build_timeout_seconds=0.2)
+        slow.create(make_item("contract::2", "Pushed Contract", feature_id="data-contracts"))
+
+        slow.release.clear()
+        fast.items = [make_item("product::2", "Fresh Product")]
+        try:
+            stats = search_manager.build_index()
+        finally:
+            slow.release.set()
+
+        assert stats["SlowAsset"]["status"] == "timeout"
+        assert stats["FastAsset"] == {"status": "ok", "items": 1, "seconds": stats["FastAsset"]["seconds"]}
+        assert sorted(i.id for i in search_manager.index) == ["contract::1", "contract::2", "product::2"]
+
+    def test_managers_are_fetched_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+
+        class RendezvousAsset(SearchableAsset):
+            def __init__(self, item):
+                self.item = item
+
+            def get_search_index_items(self):
+                # Only completes if both managers run at the same time
+                barrier.wait()
+                return [self.item]
+
+        search_manager = SearchManager(searchable_managers=[
+            RendezvousAsset(make_item("product::1", "One")),
+            RendezvousAsset(make_item("product::2", "Two")),
+        ])
+
+        assert sorted(i.id for i in search_manager.index) == ["product::1", "product::2"]
+
+
+class TestSearchIndexSnapshot:
+    """Test suite for persisted search index snapshots."""
+
+    def test_roundtrip_and_version_check(self, tmp_path, monkeypatch):
+        path = tmp_path / "search" / "index.snap"
+        items = [make_item("product::1", "Sales Report", "Monthly", ["finance"]), make_item("term::1", "Revenue", feature_id="business-glossary")]
+
+        assert write_snapshot(path, [(items[0], "DataProductsManager"), (items[1], None)]) == 2
+        snapshot = read_snapshot(path)
+        assert snapshot.entries == [(items[0], "DataProductsManager"), (items[1], None)]
+        assert snapshot.age_seconds < 60
+
+        lines = path.read_text().splitlines()
+        path.write_text("\n".join(lines[:-1]) + "\n")
+        assert read_snapshot(path) is None  # Truncated
+        write_snapshot(path, [(items[0], None)])
+        monkeypatch.setattr("src.common.search_snapshot.SNAPSHOT_FORMAT_VERSION", 3)
+        assert read_snapshot(path) is None
+        assert read_snapshot(tmp_path / "missing.snap") is None
+
+    def test_search_manager_serves_snapshot_while_catching_up(self, tmp_path):
+        path = tmp_path / "index.snap"
+        asset = TestSearchManagerParallelBuild.SlowAsset([make_item("product::1", "Sales Report")])
+        SearchManager(searchable_managers=[asset], snapshot_path=path)
+        assert read_snapshot(path).entries == [(make_item("product::1", "Sales Report"), "SlowAsset")]
+
+        asset.release.clear()
+        asset.items = [make_item("product::2", "Sales Forecast")]
+        search_manager = SearchManager(searchable_managers=[asset], snapshot_path=path)
+        # Served from the snapshot while the managers are still being queried
+        assert [i.id for i in search_manager.index] == ["product::1"]
+
+        asset.release.set()
+        search_manager._catch_up_thread.join(5)
+        assert [i.id for i in search_manager.index] == ["product::2"]
+        assert [item.id for item, _ in read_snapshot(path).entries] == ["product::2"]
+
+    def test_fresh_snapshot_is_still_caught_up(self, tmp_path):
+        path = tmp_path / "index.snap"
+        write_snapshot(path, [(make_item("product::1", "Sales Report"), "SlowAsset")])
+        # product::1 was deleted after the snapshot was written
+        asset = TestSearchManagerParallelBuild.SlowAsset([make_item("product::2", "Sales Forecast")])
+
+        search_manager = SearchManager(searchable_managers=[asset], snapshot_path=path)
+        search_manager._catch_up_thread.join(5)
+
+        assert [i.id for i in search_manager.index] == ["product::2"]
+
+    def test_only_one_process_writes_the_snapshot(self, tmp_path):
+        path = tmp_path / "index.snap"
+        writer_asset = TestSearchManagerParallelBuild.SlowAsset([make_item("product::1", "Sales Report")])
+        writer = SearchManager(searchable_managers=[writer_asset], snapshot_path=path)
+        # Lock files are per open file, so a second manager stands in for another worker process
+        other = SearchManager(searchable_managers=[TestSearchManagerParallelBuild.SlowAsset([make_item("product::2", "Other")])])
+        other.snapshot_path = path
+        other.build_index()
+        assert [item.id for item, _ in read_snapshot(path).entries] == ["product::1"]
+
+        writer_asset.items.append(make_item("product::3", "Sales Forecast"))
+        writer.build_index()
+        assert [item.id for item, _ in read_snapshot(path).entries] == ["product::1", "product::3"]
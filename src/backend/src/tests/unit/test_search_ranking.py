@@ -0,0 +1,102 @@
+"""
+Unit tests for BM25 relevance ranking and fuzzy term matching.
+"""
+
+import pytest
+
+from src.common.search_index import PartitionedSearchIndex
+from src.common.search_ranking import BM25Ranker, bounded_levenshtein, tokenize
+from src.common.search_interfaces import SearchIndexItem
+
+
+def make_item(item_id: str, title: str, description: str = "", tags=None, feature_id: str = "data-products") -> SearchIndexItem:
+    return SearchIndexItem(
+        id=item_id,
+        type="data-product",
+        title=title,
+        description=description,
+        link=f"/items/{item_id}",
+        tags=tags or [],
+        feature_id=feature_id,
+    )
+
+
+@pytest.mark.parametrize("a,b,max_distance,expected", [
+    ("sales", "sales", 1, 0),
+    ("slaes", "sales", 2, 2),
+    ("saless", "sales", 1, 1),
+    ("revenue", "sales", 2, None),
+    ("customer", "custmer", 1, 1),
+    ("customer", "costumer", 1, None),
+])
+def test_bounded_levenshtein(a, b, max_distance, expected):
+    assert bounded_levenshtein(a, b, max_distance) == expected
+
+
+def test_tokenize_splits_on_non_word_characters():
+    assert tokenize("Customer-360 (Gold)") == ["customer", "360", "gold"]
+    assert tokenize(None) == []
+
+
+class TestBM25Ranker:
+    """Test suite for BM25Ranker."""
+
+    @pytest.fixture
+    def ranker(self):
+        ranker = BM25Ranker()
+        ranker.add_many([
+            ("desc", {"title": "Quarterly numbers", "description": "Includes customer churn", "tags": []}),
+            ("title", {"title": "Customer Churn", "description": "", "tags": []}),
+            ("tag", {"title": "Retention", "description": "", "tags": ["churn"]}),
+            ("other", {"title": "Inventory", "description": "Stock levels", "tags": ["ops"]}),
+        ])
+        return ranker
+
+    def test_field_boosts_order_results(self, ranker):
+        assert [doc_id for _, doc_id in ranker.top_k("churn")] == ["title", "tag", "desc"]
+
+    def test_prefix_and_typo_matches(self, ranker):
+        assert [doc_id for _, doc_id in ranker.top_k("inven")] == ["other"]
+        assert [doc_id for _, doc_id in ranker.top_k("inventroy")] == ["other"]
+        # Short tokens are not fuzzy-matched
+        assert ranker.top_k("ops") and ranker.top_k("opz") == []
+
+    def test_exact_match_outranks_fuzzy_match(self):
+        ranker = BM25Ranker()
+        ranker.add("fuzzy", {"title": "Costumer"})
+        ranker.add("exact", {"title": "Customer"})
+
+        assert [doc_id for _, doc_id in ranker.top_k("customer")] == ["exact", "fuzzy"]
+
+    def test_top_k_limit(self, ranker):
+        assert [doc_id for _, doc_id in ranker.top_k("churn", k=1)] == ["title"]
+
+    def test_documents_must_match_every_token(self, ranker):
+        assert [doc_id for _, doc_id in ranker.top_k("churn customer")] == ["title", "desc"]
+        # Only the last token is matched as a prefix
+        assert ranker.score("cust churn") == {}
+        assert set(ranker.score("churn cust")) == {"title", "desc"}
+
+    def test_remove_updates_statistics(self, ranker):
+        vocabulary_size = ranker.vocabulary_size
+
+        assert ranker.remove("other") is True
+        assert ranker.remove("other") is False
+        assert ranker.top_k("inventory") == []
+        assert ranker.vocabulary_size == vocabulary_size - 4
+        assert len(ranker) == 3
+
+
+def test_partitioned_index_ranks_within_readable_features():
+    index = PartitionedSearchIndex([
+        make_item("product::1", "Weekly Report", "Sales by region"),
+        make_item("product::2", "Sales Overview", "", ["sales"]),
+        make_item("contract::1", "Sales Contract", feature_id="data-contracts"),
+    ])
+
+    assert [i.id for i in index.search("sales")][:2] == ["product::2", "contract::1"]
+    assert [i.id for i in index.search("sales", feature_ids=["data-products"], limit=1)] == ["product::2"]
+    assert [i.id for i in index.search("sales overveiw")] == ["product::2"]
+
+    index.remove("product::2")
+    assert [i.id for i in index.search("sales", feature_ids=["data-products"])] == ["product::1"]
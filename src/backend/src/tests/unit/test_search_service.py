@@ -0,0 +1,141 @@
+"""
+Unit tests for the log-backed SearchService.
+"""
+
+import json
+import threading
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import pytest
+
+from src.common.search import SearchService
+
+
+@dataclass
+class Doc:
+    id: str
+    name: str
+    description: str = ""
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.common.search.get_config_manager", lambda: SimpleNamespace(data_dir=tmp_path))
+
+    def create():
+        search_service = SearchService()
+        search_service.register_index("docs", Doc, ["name", "description"])
+        return search_service
+
+    return create
+
+
+def test_index_and_search_from_memory(service):
+    search_service = service()
+    search_service.index_item("docs", Doc("1", "Sales Report", "monthly"))
+    search_service.index_item("docs", Doc("2", "Customer View"))
+    search_service.index_item("docs", Doc("1", "Sales Forecast"))
+
+    index = search_service.indices["docs"]
+    index.index_file.unlink()  # Queries must not depend on reading the log
+    results = search_service.search("docs", "sales")
+
+    assert [(r["id"], r["name"]) for r in results] == [("1", "Sales Forecast")]
+    assert index.dead_records == 1
+
+
+def test_log_is_replayed_on_register(service):
+    search_service = service()
+    for n in range(3):
+        search_service.index_item("docs", Doc("1", f"Report v{n}"))
+    search_service.index_item("docs", Doc("2", "Report Archive"))
+
+    reloaded = service()
+
+    assert [r["name"] for r in reloaded.search("docs", "report")] == ["Report Archive", "Report v2"]
+    assert len(reloaded.indices["docs"].index_file.read_text().splitlines()) == 4
+
+
+def test_compaction_drops_superseded_records(service, monkeypatch):
+    monkeypatch.setattr("src.common.search.COMPACTION_MIN_DEAD_RECORDS", 2)
+    search_service = service()
+    index = search_service.indices["docs"]
+    monkeypatch.setattr(search_service, "_schedule_compaction", search_service._compact)
+
+    for n in range(4):
+        search_service.index_item("docs", Doc("1", f"Report v{n}"))
+
+    # Compacted automatically after the third write, then one more record was appended
+    records = [json.loads(line) for line in index.index_file.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["Report v2", "Report v3"]
+
+    search_service.compact("docs")
+    records = [json.loads(line) for line in index.index_file.read_text().splitlines()]
+    assert [r["name"] for r in records] == ["Report v3"]
+    assert service().search("docs", "report")[0]["name"] == "Report v3"
+
+
+def test_compaction_keeps_concurrent_appends_from_other_workers(service, monkeypatch):
+    worker_a, worker_b = service(), service()
+    for n in range(3):
+        worker_a.index_item("docs", Doc("1", f"Report v{n}"))
+    worker_b.index_item("docs", Doc("2", "Report Archive"))
+
+    write_tmp_log = worker_a._write_tmp_log
+
+    def write_while_appending(index_file, items):
+        # Neither this process's index nor the log are locked while the new log is written
+        appender = threading.Thread(target=worker_a.index_item, args=("docs", Doc("3", "Report Draft")))
+        appender.start()
+        appender.join(timeout=5)
+        assert not appender.is_alive()
+        worker_b.index_item("docs", Doc("2", "Report Archive v2"))
+        return write_tmp_log(index_file, items)
+
+    monkeypatch.setattr(worker_a, "_write_tmp_log", write_while_appending)
+    worker_a.compact("docs")
+    # Worker B's handle pointed at the replaced log; its next append must land in the new one
+    worker_b.index_item("docs", Doc("4", "Report Final"))
+
+    records = [json.loads(line) for line in worker_a.indices["docs"].index_file.read_text().splitlines()]
+    assert [(r["id"], r["name"]) for r in records] == [
+        ("1", "Report v2"), ("2", "Report Archive"), ("3", "Report Draft"), ("2", "Report Archive v2"), ("4", "Report Final"),
+    ]
+    assert sorted(r["name"] for r in service().search("docs", "report")) == [
+        "Report Archive v2", "Report Draft", "Report Final", "Report v2",
+    ]
+
+
+def test_searches_see_items_indexed_by_other_workers(service):
+    worker_a, worker_b = service(), service()
+    worker_a.index_item("docs", Doc("1", "Sales Report"))
+    assert [r["name"] for r in worker_b.search("docs", "sales")] == ["Sales Report"]
+
+    index_b = worker_b.indices["docs"]
+    replayed = index_b.replayed_offset
+    worker_a.index_item("docs", Doc("1", "Sales Forecast"))
+    worker_a.index_item("docs", Doc("2", "Sales Targets"))
+    assert sorted(r["name"] for r in worker_b.search("docs", "sales")) == ["Sales Forecast", "Sales Targets"]
+    # Only the new records were read
+    assert index_b.replayed_offset == index_b.index_file.stat().st_size > replayed
+
+    # A log replaced by another worker's compaction is replayed from its start
+    worker_a.compact("docs")
+    worker_a.index_item("docs", Doc("3", "Sales Archive"))
+    assert sorted(r["name"] for r in worker_b.search("docs", "sales")) == ["Sales Archive", "Sales Forecast", "Sales Targets"]
+    assert index_b.dead_records == 0
+
+
+def test_legacy_json_index_is_migrated(service, tmp_path):
+    legacy = tmp_path / "search" / "docs.json"
+    legacy.parent.mkdir(parents=True)
+    legacy.write_text(json.dumps([
+        {"id": "1", "name": "Old Name", "_indexed_at": "2024-01-01T00:00:00"},
+        {"id": "2", "name": "Other", "_indexed_at": "2024-01-02T00:00:00"},
+    ]))
+
+    search_service = service()
+
+    assert not legacy.exists()
+    assert [r["id"] for r in search_service.search("docs", "o")] == ["2", "1"]
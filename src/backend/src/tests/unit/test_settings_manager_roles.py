@@ -0,0 +1,63 @@
+"""
+Unit tests for the SettingsManager role snapshot and home section backfill.
+"""
+
+import json
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.common.features import FeatureAccessLevel
+from src.controller.settings_manager import SettingsManager
+from src.db_models.settings import AppRoleDb
+from src.models.settings import AppRoleCreate, AppRoleUpdate, HomeSection
+
+
+@pytest.fixture
+def manager(db_session, test_settings):
+    manager = SettingsManager(db=db_session, settings=test_settings)
+    manager.create_app_role(AppRoleCreate(
+        name="Data Producer",
+        assigned_groups=["engineers"],
+        feature_permissions={"data-products": FeatureAccessLevel.READ_WRITE},
+    ))
+    db_session.commit()
+    return manager
+
+
+def test_roles_are_served_from_snapshot_until_changed(manager):
+    first = manager.list_app_roles()
+    with patch.object(manager.app_role_repo, "get_all_roles", wraps=manager.app_role_repo.get_all_roles) as get_all_roles:
+        assert manager.list_app_roles() == first
+        get_all_roles.assert_not_called()
+
+        role = first[0]
+        manager.update_app_role(str(role.id), AppRoleUpdate(assigned_groups=["engineers", "analysts"]))
+        manager._db.commit()
+        assert manager.list_app_roles()[0].assigned_groups == ["engineers", "analysts"]
+        assert get_all_roles.call_count == 1
+
+
+def test_role_changes_of_other_workers_apply_once_the_snapshot_expires(manager, db_session, test_settings):
+    manager.roles_cache_ttl_seconds = 0.05
+    role = manager.list_app_roles()[0]
+    version = manager.roles_version
+    other_worker = SettingsManager(db=db_session, settings=test_settings)
+    other_worker.update_app_role(str(role.id), AppRoleUpdate(assigned_groups=["analysts"]))
+    db_session.commit()
+
+    assert manager.list_app_roles()[0].assigned_groups == ["engineers"]
+    time.sleep(0.06)
+    assert manager.roles_version == version + 1
+    assert manager.list_app_roles()[0].assigned_groups == ["analysts"]
+
+
+def test_home_sections_are_backfilled_once(manager, db_session):
+    db_session.query(AppRoleDb).update({AppRoleDb.home_sections: "[]"})
+
+    assert manager.backfill_role_home_sections() == 1
+    assert manager.backfill_role_home_sections() == 0
+    db_session.commit()
+    assert manager.list_app_roles()[0].home_sections == [HomeSection.DATA_CURATION, HomeSection.DISCOVERY]
+    assert json.loads(db_session.query(AppRoleDb).one().home_sections) == ["DATA_CURATION", "DISCOVERY"]
@@ -0,0 +1,104 @@
+"""
+Unit tests for the TeamsManager membership index behind team role overrides
+and the project access cache it invalidates.
+"""
+
+import time
+
+import pytest
+from sqlalchemy.orm import Session
+
+from src.controller.projects_manager import ProjectsManager
+from src.controller.teams_manager import TeamsManager
+from src.models.projects import ProjectCreate
+from src.models.teams import TeamCreate, TeamMemberCreate, TeamMemberUpdate
+
+
+@pytest.fixture
+def manager(db_session):
+    manager = TeamsManager()
+    alpha = manager.create_team(db_session, TeamCreate(name="alpha"), current_user_id="admin")
+    beta = manager.create_team(db_session, TeamCreate(name="beta"), current_user_id="admin")
+    manager.add_team_member(db_session, beta.id, TeamMemberCreate(member_type="user", member_identifier="jane@example.com"), "admin")
+    manager.add_team_member(db_session, beta.id, TeamMemberCreate(member_type="group", member_identifier="stewards", app_role_override="Data Steward"), "admin")
+    manager.add_team_member(db_session, alpha.id, TeamMemberCreate(member_type="group", member_identifier="admins", app_role_override="Admin"), "admin")
+    db_session.commit()
+    manager.refresh_membership_index(db_session)
+    manager.teams = {"alpha": alpha.id, "beta": beta.id}
+    return manager
+
+
+def test_group_overrides_apply_in_the_users_teams(manager):
+    assert manager.get_team_role_override("jane@example.com", ["stewards", "admins"]) == "Data Steward"
+    # Group overrides only count in teams the user belongs to
+    assert manager.get_team_role_override("bob@example.com", ["admins"]) is None
+
+
+def test_member_changes_update_the_index(manager, db_session):
+    beta = manager.teams["beta"]
+    member = next(m for m in manager.get_team_members(db_session, beta) if m.member_identifier == "jane@example.com")
+
+    manager.update_team_member(db_session, beta, member.id, TeamMemberUpdate(app_role_override="Data Producer"), "admin")
+    # Applied once the write is committed
+    assert manager.get_team_role_override("jane@example.com", ["stewards"]) == "Data Steward"
+    db_session.commit()
+    assert manager.get_team_role_override("jane@example.com", ["stewards"]) == "Data Producer"
+
+    manager.remove_team_member(db_session, beta, "jane@example.com")
+    db_session.commit()
+    assert manager.get_team_role_override("jane@example.com", ["stewards"]) is None
+
+    manager.delete_team(db_session, beta)
+    db_session.commit()
+    assert manager.get_team_role_override("stewards", []) is None
+
+
+def test_rolled_back_changes_never_reach_the_index(manager, db_session):
+    # A session of its own, rolling back to a savepoint of the test transaction
+    with Session(bind=db_session.get_bind(), join_transaction_mode="create_savepoint") as db:
+        manager.add_team_member(db, manager.teams["alpha"], TeamMemberCreate(member_type="user", member_identifier="bob@example.com", app_role_override="Admin"), "admin")
+        db.rollback()
+        db.commit()
+
+    assert manager.get_team_role_override("bob@example.com", []) is None
+
+
+def test_stale_index_is_reloaded_with_other_workers_changes(manager, db_session):
+    other_worker = TeamsManager()
+    other_worker.add_team_member(db_session, manager.teams["alpha"], TeamMemberCreate(member_type="user", member_identifier="bob@example.com", app_role_override="Admin"), "admin")
+    db_session.commit()
+    sessions = []
+
+    def open_session():
+        sessions.append(db_session)
+        return db_session
+
+    manager.ensure_membership_index(open_session)
+    assert not sessions and manager.get_team_role_override("bob@example.com", []) is None
+
+    manager.configure_membership_refresh(0.001)
+    time.sleep(0.01)
+    manager.ensure_membership_index(open_session)
+    assert len(sessions) == 1 and manager.get_team_role_override("bob@example.com", []) == "Admin"
+
+
+def test_membership_changes_invalidate_project_access(manager, db_session):
+    projects = ProjectsManager()
+    manager.add_membership_listener(projects.invalidate_access_cache)
+    project = projects.create_project(db_session, ProjectCreate(name="p1"), "admin")
+    projects.assign_team_to_project(db_session, project.id, manager.teams["alpha"], "admin")
+    db_session.commit()
+
+    assert not projects.check_user_project_access(db_session, "bob@example.com", [], project.id)
+    assert not projects.check_user_project_access(db_session, "bob@example.com", [], project.id)
+    assert projects.get_access_cache_stats()["hits"] == 1
+
+    manager.add_team_member(db_session, manager.teams["alpha"], TeamMemberCreate(member_type="user", member_identifier="bob@example.com"), "admin")
+    db_session.commit()
+    assert projects.check_user_project_access(db_session, "bob@example.com", [], project.id)
+
+    projects.remove_team_from_project(db_session, project.id, manager.teams["alpha"])
+    # Cached access is dropped once the removal commits
+    assert projects.check_user_project_access(db_session, "bob@example.com", [], project.id)
+    db_session.commit()
+    assert not projects.check_user_project_access(db_session, "bob@example.com", [], project.id)
@@ -0,0 +1,142 @@
+"""
+Unit tests for the TTL/single-flight cache behind UsersManager user lookups.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+from databricks.sdk.errors import NotFound
+
+from src.common.ttl_cache import TTLCache
+from src.controller.users_manager import UsersManager
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=5, clock=clock)
+    loader = MagicMock(side_effect=["v1", "v2"])
+
+    assert cache.get_or_load("k", loader) == "v1"
+    clock.now = 4.9
+    assert cache.get_or_load("k", loader) == "v1"
+    clock.now = 5.0
+    assert cache.get_or_load("k", loader) == "v2"
+    assert loader.call_count == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_negative_results_are_cached_for_their_own_ttl():
+    clock = FakeClock()
+    cache = TTLCache(max_size=10, ttl_seconds=60, negative_ttl_seconds=1, negative_exceptions=(KeyError,), clock=clock)
+    loader = MagicMock(side_effect=[KeyError("missing"), "found"])
+
+    for _ in range(3):
+        with pytest.raises(KeyError):
+            cache.get_or_load("k", loader)
+    clock.now = 1.0
+    assert cache.get_or_load("k", loader) == "found"
+    assert loader.call_count == 2
+    assert cache.stats()["negative_hits"] == 2
+
+
+def test_other_errors_are_not_cached():
+    cache = TTLCache(max_size=10, ttl_seconds=60, negative_exceptions=(KeyError,))
+    loader = MagicMock(side_effect=[RuntimeError("boom"), "ok"])
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("k", loader)
+    assert cache.get_or_load("k", loader) == "ok"
+    assert cache.stats()["load_errors"] == 1
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = TTLCache(max_size=2, ttl_seconds=60)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("c", lambda: 3)
+
+    assert cache.invalidate("b") is False
+    assert cache.invalidate("a") is True
+    assert cache.stats()["evictions"] == 1
+
+
+def test_concurrent_misses_share_one_load():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    release = threading.Event()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_load("k", loader))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["misses"] < 8 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == ["value"] * 8
+    assert len(calls) == 1
+
+
+def test_loads_started_before_a_clear_are_not_cached():
+    cache = TTLCache(max_size=10, ttl_seconds=60)
+    started, release = threading.Event(), threading.Event()
+
+    def stale_loader():
+        started.set()
+        release.wait(5)
+        return "before change"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(cache.get_or_load("k", stale_loader)))
+    thread.start()
+    started.wait(5)
+    cache.clear()
+    # Lookups after the clear load afresh instead of joining the earlier load
+    assert cache.get_or_load("k", lambda: "after change") == "after change"
+    release.set()
+    thread.join(5)
+
+    assert results == ["before change"]
+    assert cache.get_or_load("k", lambda: "reloaded") == "after change"
+
+
+def test_users_manager_caches_lookups_per_email():
+    ws_client = MagicMock()
+    ws_client.users.list.side_effect = lambda filter: iter([
+        SimpleNamespace(user_name="jane@example.com", display_name="Jane", emails=[], groups=[SimpleNamespace(display="admins")]),
+    ])
+    manager = UsersManager(ws_client=ws_client)
+
+    first = manager.get_user_details_by_email("jane@example.com", real_ip="10.0.0.1")
+    second = manager.get_user_details_by_email("Jane@Example.com", real_ip="10.0.0.2")
+
+    assert ws_client.users.list.call_count == 1
+    assert (first.ip, second.ip) == ("10.0.0.1", "10.0.0.2")
+    assert second.groups == ["admins"]
+
+    ws_client.users.list.side_effect = lambda filter: iter([])
+    for _ in range(2):
+        with pytest.raises(NotFound):
+            manager.get_user_details_by_email("nobody@example.com", real_ip=None)
+    assert ws_client.users.list.call_count == 2
+    assert manager.get_cache_stats()["negative_hits"] == 1
@@ -31,6 +31,8 @@ from src.controller.data_domains_manager import DataDomainManager # Import new m
 from src.controller.tags_manager import TagsManager # Import TagsManager
 from src.controller.semantic_models_manager import SemanticModelsManager
 from src.controller.semantic_links_manager import SemanticLinksManager
+from src.controller.teams_manager import teams_manager
+from src.controller.projects_manager import projects_manager
 from src.models.semantic_links import EntitySemanticLinkCreate
 from src.controller.compliance_manager import ComplianceManager
 
@@ -129,15 +131,32 @@ def initialize_managers(app: FastAPI):
         app.state.settings = settings
         logger.info(f"Stored global settings object on app.state.settings: {type(app.state.settings)}")
 
+        # Managers are shared by concurrent requests, so they get the session factory rather than
+        # db_session: each call uses the request's session or opens a short-lived one of its own.
+        # db_session only serves the startup work below.
         # Instantiate SettingsManager first, passing settings
-        app.state.settings_manager = SettingsManager(db=db_session, settings=settings, workspace_client=ws_client)
+        app.state.settings_manager = SettingsManager(db=None, settings=settings, workspace_client=ws_client, session_factory=session_factory)
 
         # Instantiate other managers, passing the settings_manager instance if needed
-        audit_manager = AuditManager(settings=settings, db_session=db_session)
-        app.state.users_manager = UsersManager(ws_client=ws_client)
+        audit_manager = AuditManager(settings=settings)
+        app.state.users_manager = UsersManager(
+            ws_client=ws_client,
+            cache_ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+            negative_cache_ttl_seconds=settings.USER_CACHE_NEGATIVE_TTL_SECONDS,
+            cache_max_size=settings.USER_CACHE_MAX_SIZE,
+        )
         app.state.audit_manager = audit_manager
+        projects_manager.configure_access_cache(
+            ttl_seconds=settings.PROJECT_ACCESS_CACHE_TTL_SECONDS,
+            max_size=settings.PROJECT_ACCESS_CACHE_MAX_SIZE,
+        )
+        teams_manager.configure_membership_refresh(settings.TEAM_MEMBERSHIP_REFRESH_SECONDS)
+        teams_manager.add_membership_listener(projects_manager.invalidate_access_cache)
+        app.state.projects_manager = projects_manager
         app.state.authorization_manager = AuthorizationManager(
-            settings_manager=app.state.settings_manager 
+            settings_manager=app.state.settings_manager,
+            projects_manager=projects_manager,
+            permission_cache_ttl_seconds=settings.ROLES_CACHE_TTL_SECONDS,
         )
         app.state.notifications_manager = NotificationsManager(settings_manager=app.state.settings_manager)
         # Back-reference for progress notifications
@@ -147,18 +166,27 @@ def initialize_managers(app: FastAPI):
 
         # Feature Managers
         app.state.data_asset_review_manager = DataAssetReviewManager(
-            db=db_session, 
+            db=None, 
             ws_client=ws_client,
-            notifications_manager=app.state.notifications_manager 
+            notifications_manager=app.state.notifications_manager,
+            session_factory=session_factory,
         )
         app.state.data_products_manager = DataProductsManager(
-            db=db_session,
             ws_client=ws_client,
-            notifications_manager=app.state.notifications_manager
+            notifications_manager=app.state.notifications_manager,
+            session_factory=session_factory,
         )
         app.state.data_domain_manager = DataDomainManager(repository=data_domain_repo)
         app.state.data_contracts_manager = DataContractsManager(data_dir=data_dir)
-        app.state.semantic_models_manager = SemanticModelsManager(db=db_session, data_dir=Path(__file__).parent.parent / "data")
+        app.state.semantic_models_manager = SemanticModelsManager(data_dir=Path(__file__).parent.parent / "data", session_factory=session_factory)
+        # Team membership index backs team role overrides in permission checks
+        app.state.teams_manager = teams_manager
+        try:
+            with session_factory() as setup_db:
+                teams_manager.refresh_membership_index(setup_db)
+        except Exception as e:
+            # Loaded lazily on the first permission check instead
+            logger.error(f"Failed to load team membership index: {e}", exc_info=True)
         # Also register in global app_state fallback
         try:
             from src.common.app_state import set_app_state_manager
@@ -169,6 +197,31 @@ def initialize_managers(app: FastAPI):
         notifications_manager = getattr(app.state, 'notifications_manager', None)
         # Add other managers: Compliance, Estate, MDM, Security, Entitlements, Catalog Commander...
 
+        # Instantiate and store TagsManager (before SearchManager so tags are indexed and pushed as deltas)
+        try:
+            tags_manager = TagsManager(
+                namespace_repo=tag_namespace_repo,
+                tag_repository=tag_repo,
+                permission_repo=tag_namespace_permission_repo
+                # entity_assoc_repo will be used when integrating with other features
+            )
+            app.state.tags_manager = tags_manager
+            SEARCHABLE_ASSET_MANAGERS.append(tags_manager) # Register for search
+            logger.info("TagsManager initialized and registered for search.")
+
+            # Ensure default tag namespace exists (using a new session for this setup task)
+            with session_factory() as setup_db:
+                try:
+                    tags_manager.get_or_create_default_namespace(setup_db, user_email="system@startup.ucapp")
+                    logger.info("Default tag namespace ensured.")
+                except Exception as e_ns:
+                    logger.error(f"Failed to ensure default tag namespace: {e_ns}", exc_info=True)
+                    # Decide if this is a fatal error for startup
+
+        except Exception as e:
+            logger.error(f"Error initializing TagsManager: {e}", exc_info=True)
+            # Decide if this is a fatal error
+
         # --- Instantiate Search Manager --- 
         # Dynamically collect manager instances that inherit from SearchableAsset
         # Iterate directly over the values stored in app.state._state dictionary
@@ -193,34 +246,17 @@ def initialize_managers(app: FastAPI):
             logger.error("Could not find or access app.state._state dictionary to scan for managers.")
 
         logger.info(f"Found {len(searchable_managers_instances)} managers inheriting from SearchableAsset by checking app.state._state.values().")
-        app.state.search_manager = SearchManager(searchable_managers=searchable_managers_instances)
+        app.state.search_manager = SearchManager(
+            searchable_managers=searchable_managers_instances,
+            build_timeout_seconds=settings.SEARCH_INDEX_BUILD_TIMEOUT_SECONDS,
+            build_max_workers=settings.SEARCH_INDEX_BUILD_MAX_WORKERS,
+            snapshot_path=settings.SEARCH_INDEX_SNAPSHOT_PATH,
+            query_cache_size=settings.SEARCH_QUERY_CACHE_SIZE,
+        )
+        # Incremental updates keep the index current; the periodic full rebuild is a consistency fallback
+        app.state.search_manager.start_periodic_rebuild(settings.SEARCH_INDEX_REBUILD_INTERVAL_SECONDS)
         logger.info("SearchManager initialized.")
 
-        # Instantiate and store TagsManager
-        try:
-            tags_manager = TagsManager(
-                namespace_repo=tag_namespace_repo,
-                tag_repository=tag_repo,
-                permission_repo=tag_namespace_permission_repo
-                # entity_assoc_repo will be used when integrating with other features
-            )
-            app.state.tags_manager = tags_manager
-            SEARCHABLE_ASSET_MANAGERS.append(tags_manager) # Register for search
-            logger.info("TagsManager initialized and registered for search.")
-
-            # Ensure default tag namespace exists (using a new session for this setup task)
-            with session_factory() as setup_db:
-                try:
-                    tags_manager.get_or_create_default_namespace(setup_db, user_email="system@startup.ucapp")
-                    logger.info("Default tag namespace ensured.")
-                except Exception as e_ns:
-                    logger.error(f"Failed to ensure default tag namespace: {e_ns}", exc_info=True)
-                    # Decide if this is a fatal error for startup
-
-        except Exception as e:
-            logger.error(f"Error initializing TagsManager: {e}", exc_info=True)
-            # Decide if this is a fatal error
-
         # --- Instantiate MetadataManager (if it exists and needs to be in app.state) --- 
         # This was removed in previous steps as tag CRUD moved to TagsManager
         # If MetadataManager still has other responsibilities, initialize it here.
@@ -234,7 +270,9 @@ def initialize_managers(app: FastAPI):
         logger.info("All managers instantiated and stored in app.state.")
         
         # --- Ensure default roles exist using the manager method --- 
-        app.state.settings_manager.ensure_default_roles_exist()
+        app.state.settings_manager.ensure_default_roles_exist(db=db_session)
+        # One-time data fix-up, kept off the (read-only) role listing path
+        app.state.settings_manager.backfill_role_home_sections(db=db_session)
 
         # --- Preload Compliance demo data so home dashboard has data on first load ---
         try:
@@ -408,6 +446,11 @@ def load_initial_data(app: FastAPI) -> None:
         except Exception:
             pass
 
+        # The search index was built before demo data existed; refresh it once now
+        search_manager = getattr(app.state, 'search_manager', None)
+        if search_manager:
+            search_manager.build_index()
+
         # No final commit needed here if managers commit internally or role creation already committed
         logger.info("Initial data loading process completed for all managers.")
 